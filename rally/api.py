@@ -22,6 +22,7 @@ import jinja2.meta
 import jsonschema
 
 from rally.benchmark import engine
+from rally.benchmark.processing import timeline
 from rally.common.i18n import _
 from rally.common import log as logging
 from rally.common import utils
@@ -176,7 +177,8 @@ class Task(object):
         benchmark_engine.validate()
 
     @classmethod
-    def start(cls, deployment, config, task=None, abort_on_sla_failure=False):
+    def start(cls, deployment, config, task=None, abort_on_sla_failure=False,
+              reuse_contexts=False, max_cpu_count=None):
         """Start a task.
 
         Task is a list of benchmarks that will be called one by one, results of
@@ -188,6 +190,11 @@ class Task(object):
         :param abort_on_sla_failure: if True, the execution of a benchmark
                                      scenario will stop when any SLA check
                                      for it fails
+        :param reuse_contexts: if True, contexts are kept alive between
+                               benchmark scenarios with equivalent context
+                               configs instead of being created for each one
+        :param max_cpu_count: max number of CPUs used by all benchmark
+                              scenarios that are run at the same time
         """
         deployment = objects.Deployment.get(deployment)
         task = task or objects.Task(deployment_uuid=deployment["uuid"])
@@ -195,7 +202,8 @@ class Task(object):
                                                          deployment["uuid"]))
         benchmark_engine = engine.BenchmarkEngine(
             config, task, admin=deployment["admin"], users=deployment["users"],
-            abort_on_sla_failure=abort_on_sla_failure)
+            abort_on_sla_failure=abort_on_sla_failure,
+            reuse_contexts=reuse_contexts, max_cpu_count=max_cpu_count)
 
         try:
             benchmark_engine.validate()
@@ -209,9 +217,63 @@ class Task(object):
             raise
 
     @classmethod
-    def abort(cls, task_uuid):
-        """Abort running task."""
-        raise NotImplementedError()
+    def import_results(cls, deployment, results, tag=None):
+        """Create a finished task with already existing results.
+
+        :param deployment: UUID or name of the deployment
+        :param results: iterable of workloads results in the format of
+                        `rally task results'
+        :param tag: tag for this task
+        :returns: Task object
+        """
+        task = cls.create(deployment, tag)
+        try:
+            for result in results:
+                task.append_results(result["key"], {
+                    "raw": result["result"],
+                    "sla": result["sla"],
+                    "load_duration": result["load_duration"],
+                    "full_duration": result["full_duration"],
+                    "contexts": result.get("contexts", []),
+                    "warmup": result.get("warmup", []),
+                    "runner_stats": result.get("runner_stats", {})})
+        except Exception as e:
+            task.set_failed(log=[str(type(e)), str(e)])
+            raise
+        task.update_status(consts.TaskStatus.FINISHED)
+        return task
+
+    @classmethod
+    def abort(cls, task_uuid, soft=False):
+        """Abort running task.
+
+        Abort is asynchronous: the engine that runs the task stops the
+        load, cleans up contexts, stores partial results and sets "aborted"
+        status of the task.
+
+        :param task_uuid: The UUID of the task.
+        :param soft: if True, iterations in progress are finished, otherwise
+                     worker processes are terminated
+        :raises: :class:`rally.exceptions.TaskInvalidStatus` if the task is
+                 not running
+        """
+        objects.Task.get(task_uuid).abort(soft=soft)
+
+    @classmethod
+    def get_timeline(cls, task_uuid, window=None):
+        """Get load statistics of task workloads per time window.
+
+        :param task_uuid: The UUID of the task.
+        :param window: float, length of window in seconds. By default
+                       load of every workload is divided into
+                       timeline.WINDOWS windows.
+        :returns: list of dicts with "key" of workload and its "timeline",
+                  see rally.benchmark.processing.timeline.timeline()
+        """
+        return [{"key": result["key"],
+                 "timeline": timeline.timeline(result["data"]["raw"],
+                                               window=window)}
+                for result in objects.Task.get(task_uuid).get_results()]
 
     @classmethod
     def delete(cls, task_uuid, force=False):
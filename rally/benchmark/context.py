@@ -14,19 +14,28 @@
 #    under the License.
 
 import abc
+import contextlib
+import copy
+import json
+import sys
+import threading
 
 import jsonschema
 import six
+from six.moves import queue
 
 from rally.benchmark import functional
+from rally.common import costilius
+from rally.common import httpstats
 from rally.common import log as logging
 from rally.common.plugin import plugin
+from rally.common import utils
 from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 
 
-def context(name, order, hidden=False):
+def context(name, order, hidden=False, per_workload=False, depends_on=None):
     """Context class wrapper.
 
     Each context class has to be wrapped by context() wrapper. It
@@ -39,11 +48,21 @@ def context(name, order, hidden=False):
                   Contexts with smaller order are run first
     :param hidden: If it is true you won't be able to specify context via
                    task config
+    :param per_workload: If it is true the context is set up and cleaned up
+                         around every workload even if other contexts are
+                         reused between workloads (see ContextPool)
+    :param depends_on: Names of contexts that have to be set up before this
+                       one, they should have smaller order. Contexts that
+                       don't depend on each other are set up concurrently.
+                       If it is None the context waits for all contexts
+                       that precede it in order of execution
     """
     def wrapper(cls):
         cls = plugin.configure(name=name)(cls)
         cls._meta_set("order", order)
         cls._meta_set("hidden", hidden)
+        cls._meta_set("per_workload", per_workload)
+        cls._meta_set("depends_on", depends_on)
         return cls
 
     return wrapper
@@ -92,6 +111,14 @@ class Context(plugin.Plugin, functional.FunctionalMixin):
     def get_order(cls):
         return cls._meta_get("order")
 
+    @classmethod
+    def is_per_workload(cls):
+        return cls._meta_get("per_workload")
+
+    @classmethod
+    def get_dependencies(cls):
+        return cls._meta_get("depends_on")
+
     @abc.abstractmethod
     def setup(self):
         """Set context of benchmark."""
@@ -108,11 +135,25 @@ class Context(plugin.Plugin, functional.FunctionalMixin):
 
 
 class ContextManager(object):
-    """Create context environment and run method inside it."""
+    """Create context environment and run method inside it.
+
+    Contexts are set up in order of dependencies between them, independent
+    contexts are set up concurrently. Cleanup goes in reverse order: context
+    is cleaned up after all contexts that depend on it.
+
+    Durations and numbers of API calls of setup and cleanup of every context
+    and number of resources created by its setup are saved to stats.
+    """
+
+    # Keys of stats of context that are set by its setup and cleanup
+    STATS_KEYS = {"setup": ("setup_duration", "setup_api_calls", "resources"),
+                  "cleanup": ("cleanup_duration", "cleanup_api_calls")}
 
     def __init__(self, context_obj):
         self._visited = []
         self.context_obj = context_obj
+        # Stats of every context by its name
+        self.stats = costilius.OrderedDict()
 
     @staticmethod
     def validate(ctx, non_hidden=False):
@@ -123,26 +164,117 @@ class ContextManager(object):
         ctxlst = map(Context.get, self.context_obj["config"])
         return sorted(map(lambda ctx: ctx(self.context_obj), ctxlst))
 
+    @classmethod
+    def get_stats(cls, stats, name):
+        """Return stats of context by name, add empty ones if missing."""
+        if name not in stats:
+            stats[name] = dict((key, None) for keys in cls.STATS_KEYS.values()
+                               for key in keys)
+        return stats[name]
+
+    @staticmethod
+    def _get_dependencies(ctxlst):
+        """Return names of contexts that every context has to wait for.
+
+        :param ctxlst: contexts sorted in order of execution
+        """
+        dependencies = {}
+        for i, ctx in enumerate(ctxlst):
+            depends_on = ctx.get_dependencies()
+            if depends_on is None:
+                dependencies[ctx.get_name()] = set(
+                    c.get_name() for c in ctxlst[:i])
+                continue
+            dependencies[ctx.get_name()] = set()
+            for dep in ctxlst:
+                if dep.get_name() not in depends_on:
+                    continue
+                # Edges go from later contexts to earlier ones only, so there
+                # are no cycles
+                if not dep < ctx:
+                    raise exceptions.InvalidContextSetup(
+                        reason="context %(ctx)s depends on context %(dep)s "
+                               "that doesn't have smaller order"
+                               % {"ctx": ctx.get_name(),
+                                  "dep": dep.get_name()})
+                dependencies[ctx.get_name()].add(dep.get_name())
+        return dependencies
+
+    def _run_concurrently(self, ctxlst, dependencies, method):
+        """Call method for every context after contexts it waits for.
+
+        Failures of cleanup are logged. After the first failure of setup no
+        more contexts are started, the ones that are already running are
+        waited for and the failure is re-raised.
+        """
+        finished = queue.Queue()
+
+        def run(ctx):
+            exc_info = None
+            api_stats = httpstats.Stats()
+            with httpstats.collect(api_stats):
+                with utils.Timer() as timer:
+                    try:
+                        getattr(ctx, method)()
+                    except Exception as e:
+                        if method == "cleanup":
+                            LOG.error("Context %s failed during cleanup."
+                                      % ctx.get_name())
+                            LOG.exception(e)
+                        else:
+                            exc_info = sys.exc_info()
+            finished.put((ctx, timer.duration(), api_stats, exc_info))
+
+        pending = list(ctxlst)
+        done = set()
+        running = 0
+        error = None
+        while True:
+            if error is None:
+                ready = [c for c in pending
+                         if dependencies[c.get_name()] <= done]
+                # Contexts are compared by order, so they are filtered out
+                # by dependencies rather than removed by value
+                pending = [c for c in pending
+                           if not dependencies[c.get_name()] <= done]
+                for ctx in ready:
+                    if method == "setup":
+                        self._visited.append(ctx)
+                    running += 1
+                    threading.Thread(target=run, args=(ctx,)).start()
+            if not running:
+                break
+            ctx, duration, api_stats, exc_info = finished.get()
+            running -= 1
+            done.add(ctx.get_name())
+            ctx_stats = self.get_stats(self.stats, ctx.get_name())
+            ctx_stats.update(zip(self.STATS_KEYS[method],
+                                 (duration, api_stats.api_calls,
+                                  api_stats.resources)))
+            if exc_info and error is None:
+                error = exc_info
+        if error:
+            six.reraise(*error)
+
     def setup(self):
         """Creates benchmark environment from config."""
 
         self._visited = []
-        for ctx in self._get_sorted_context_lst():
-            self._visited.append(ctx)
-            ctx.setup()
-
+        ctxlst = self._get_sorted_context_lst()
+        self._run_concurrently(ctxlst, self._get_dependencies(ctxlst),
+                               "setup")
         return self.context_obj
 
     def cleanup(self):
         """Destroys benchmark environment."""
 
         ctxlst = self._visited or self._get_sorted_context_lst()
-        for ctx in ctxlst[::-1]:
-            try:
-                ctx.cleanup()
-            except Exception as e:
-                LOG.error("Context %s failed during cleanup." % ctx.get_name())
-                LOG.exception(e)
+        dependents = dict((ctx.get_name(), set()) for ctx in ctxlst)
+        for name, depends_on in six.iteritems(
+                self._get_dependencies(sorted(ctxlst))):
+            for dep in depends_on:
+                dependents[dep].add(name)
+        self._run_concurrently(ctxlst[::-1], dependents, "cleanup")
 
     def __enter__(self):
         try:
@@ -153,3 +285,153 @@ class ContextManager(object):
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         self.cleanup()
+
+
+class ContextPool(object):
+    """Keeps contexts alive between workloads with equivalent configs.
+
+    Setting up contexts like users, images or networks may take much
+    longer than the workload itself, while a lot of workloads of a task
+    have the same context config. The pool sets up such contexts once and
+    cleans them up after the last workload that uses them.
+
+    Per-workload contexts (e.g. cleanup of resources created by scenarios)
+    are still set up and cleaned up around every workload, after shared
+    contexts are set up. They are not taken into account when configs of
+    workloads are compared. Names of shared contexts are passed to them as
+    "shared_contexts" of context object, so that they keep resources of
+    shared contexts intact.
+
+    Typical usage:
+        pool = ContextPool()
+        for context_obj in workloads:
+            pool.register(context_obj)
+        for context_obj in workloads:
+            with pool.workload(context_obj):
+                run_workload(context_obj)
+        pool.cleanup()
+    """
+
+    # Keys of context object that are different for every workload
+    WORKLOAD_KEYS = ("config", "scenario_name", "shared_contexts")
+
+    def __init__(self):
+        self._shared = {}
+        # Workloads may be run concurrently
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _split_config(config):
+        shared = {}
+        per_workload = {}
+        for name, ctx_config in six.iteritems(config):
+            if Context.get(name).is_per_workload():
+                per_workload[name] = ctx_config
+            else:
+                shared[name] = ctx_config
+        return shared, per_workload
+
+    @classmethod
+    def get_key(cls, context_obj):
+        """Return key that is the same for equivalent context configs."""
+        shared = cls._split_config(context_obj["config"])[0]
+        return json.dumps(shared, sort_keys=True)
+
+    def register(self, context_obj):
+        """Register one more workload that will use the contexts."""
+        key = self.get_key(context_obj)
+        with self._lock:
+            if key not in self._shared:
+                self._shared[key] = {"refs": 0, "manager": None,
+                                     "lock": threading.Lock()}
+            self._shared[key]["refs"] += 1
+
+    @staticmethod
+    def _copy_stats(manager, stats, method):
+        for name, ctx_stats in six.iteritems(manager.stats):
+            ContextManager.get_stats(stats, name).update(
+                (key, ctx_stats[key])
+                for key in ContextManager.STATS_KEYS[method])
+
+    def _acquire(self, key, context_obj, stats):
+        with self._lock:
+            shared = self._shared[key]
+        # Concurrent workloads with the same contexts wait for the first
+        # one to set them up
+        with shared["lock"]:
+            if shared["manager"] is None:
+                shared_obj = dict(context_obj)
+                # Contexts put their defaults to config, it shouldn't change
+                # config of workload
+                shared_obj["config"] = copy.deepcopy(self._split_config(
+                    context_obj["config"])[0])
+                manager = ContextManager(shared_obj)
+                try:
+                    # ContextManager cleans up partially created contexts on
+                    # error
+                    manager.__enter__()
+                finally:
+                    self._copy_stats(manager, stats, "setup")
+                shared["manager"] = manager
+            return shared["manager"].context_obj
+
+    def _release(self, key, stats):
+        with self._lock:
+            shared = self._shared[key]
+            shared["refs"] -= 1
+            if shared["refs"] > 0:
+                return
+            del self._shared[key]
+        if shared["manager"] is not None:
+            shared["manager"].cleanup()
+            self._copy_stats(shared["manager"], stats, "cleanup")
+
+    @contextlib.contextmanager
+    def workload(self, context_obj, stats=None):
+        """Run workload inside of shared and per-workload contexts.
+
+        context_obj is filled with data of shared contexts (e.g. users) so
+        it can be passed to runner as usual.
+
+        :param context_obj: context object of workload, it should be
+                            registered before
+        :param stats: dict to save stats of contexts to, like
+                      ContextManager.stats. Shared contexts have stats of
+                      setup or cleanup only in workloads that actually set
+                      them up or cleaned them up
+        """
+        if stats is None:
+            stats = {}
+        key = self.get_key(context_obj)
+        try:
+            shared_obj = self._acquire(key, context_obj, stats)
+            for k, v in six.iteritems(shared_obj):
+                if k not in self.WORKLOAD_KEYS:
+                    context_obj[k] = v
+
+            per_workload_obj = dict(context_obj)
+            per_workload_obj["config"] = self._split_config(
+                context_obj["config"])[1]
+            # Per-workload contexts shouldn't destroy resources of shared
+            # ones, e.g. cleanup keeps resources that exist before workload
+            per_workload_obj["shared_contexts"] = sorted(
+                shared_obj["config"])
+            manager = ContextManager(per_workload_obj)
+            try:
+                with manager:
+                    for k, v in six.iteritems(per_workload_obj):
+                        if k not in self.WORKLOAD_KEYS:
+                            context_obj[k] = v
+                    yield context_obj
+            finally:
+                stats.update(manager.stats)
+        finally:
+            self._release(key, stats)
+
+    def cleanup(self):
+        """Destroy contexts left after workloads that weren't run."""
+        with self._lock:
+            shared, self._shared = self._shared, {}
+        for key in shared:
+            if shared[key]["manager"] is not None:
+                shared[key]["manager"].cleanup()
@@ -0,0 +1,283 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Generation of the load by a few Rally worker services.
+
+Worker service listens on host:port and registers itself in the DB under
+"host:port" hostname, then marks itself as active every
+worker_heartbeat_interval seconds. Coordinator, i.e. "distributed" runner,
+connects to workers that were active recently, sends each of them a job
+with its share of the load and receives results of iterations back as soon
+as they are finished.
+
+Jobs contain scenario context with credentials and are pickled, so workers
+should be reachable only from trusted hosts and share worker_authkey with
+the coordinator. The key has no default value, neither workers nor
+coordinator are started until it's set. All workers should have the same
+plugins as the coordinator.
+"""
+
+import datetime
+from multiprocessing import connection
+import threading
+
+from oslo_config import cfg
+from oslo_utils import timeutils
+
+from rally.benchmark import runner
+from rally.benchmark.scenarios import base as scenario_base
+from rally.benchmark import utils
+from rally.common.i18n import _
+from rally.common import log as logging
+from rally import db
+from rally import exceptions
+
+
+LOG = logging.getLogger(__name__)
+
+DISTRIBUTED_OPTS = [
+    cfg.FloatOpt("worker_heartbeat_interval",
+                 default=5.0,
+                 help="Interval between heartbeats of Rally worker service"),
+    cfg.FloatOpt("worker_heartbeat_timeout",
+                 default=30.0,
+                 help="Workers that didn't send heartbeat for so many "
+                      "seconds are not used for distributed load"),
+    cfg.StrOpt("worker_authkey",
+               secret=True,
+               help="Secret key shared by Rally worker services and "
+                    "distributed runner. Workers unpickle jobs, so anyone "
+                    "who knows the key may run any code on them. It has no "
+                    "default, workers and distributed runner don't work "
+                    "until it's set")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark",
+                               title="benchmark options")
+CONF.register_group(benchmark_group)
+CONF.register_opts(DISTRIBUTED_OPTS, group=benchmark_group)
+
+# Options of runner config that set the amount of load and are divided
+# between workers
+SPLIT_KEYS = ("times", "concurrency", "rps")
+
+# Messages from coordinator to worker that abort the job, hard abort
+# terminates iterations in progress
+ABORT = "abort"
+HARD_ABORT = "hard_abort"
+
+
+def get_authkey():
+    """Return the key that authenticates connections with workers.
+
+    :raises WorkerAuthKeyNotSet: if worker_authkey option is not set
+    """
+    if not CONF.benchmark.worker_authkey:
+        raise exceptions.WorkerAuthKeyNotSet()
+    return CONF.benchmark.worker_authkey.encode("utf-8")
+
+
+def get_address(hostname):
+    """Return address of worker service registered under hostname."""
+    host, port = hostname.rsplit(":", 1)
+    return host, int(port)
+
+
+def connect(hostname):
+    """Connect to worker service.
+
+    :param hostname: hostname of the worker in the DB
+    :returns: multiprocessing.connection.Connection object
+    """
+    return connection.Client(get_address(hostname), authkey=get_authkey())
+
+
+def get_active_workers():
+    """Return sorted hostnames of workers that sent heartbeat recently."""
+    updated_after = timeutils.utcnow() - datetime.timedelta(
+        seconds=CONF.benchmark.worker_heartbeat_timeout)
+    return sorted(w["hostname"]
+                  for w in db.worker_list(updated_after=updated_after))
+
+
+def split_config(config, parts):
+    """Divide the load of runner config between workers.
+
+    Values of SPLIT_KEYS options are divided as evenly as possible ("rps"
+    is divided exactly, so that all parts have the same rate), other
+    options are the same for every part. Only options that are present in
+    config are divided, so the options that the runner uses by default
+    should be set. Number of parts is decreased, so that every part gets
+    at least one iteration and one concurrent iteration.
+
+    :param config: runner config
+    :param parts: max number of parts
+    :returns: list of runner configs
+    """
+    for key in ("times", "concurrency"):
+        if key in config:
+            parts = min(parts, config[key])
+
+    configs = [dict(config) for i in range(parts)]
+    for key in SPLIT_KEYS:
+        if key not in config:
+            continue
+        if key == "rps":
+            for part_config in configs:
+                part_config[key] = float(config[key]) / parts
+            continue
+        share, overhead = divmod(config[key], parts)
+        for i, part_config in enumerate(configs):
+            part_config[key] = share + (i < overhead)
+    return configs
+
+
+class WorkerService(object):
+    """Service that runs jobs of distributed load."""
+
+    def __init__(self, host, port):
+        """Worker service constructor.
+
+        :param host: host to listen on, other workers and coordinator use it
+                     as the address of the service
+        :param port: port to listen on, 0 means an arbitrary free port
+        """
+        self.host = host
+        self.port = port
+        self.hostname = None
+        self._listener = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Listen for jobs and register the worker in the DB."""
+        self._listener = connection.Listener((self.host, self.port),
+                                             authkey=get_authkey())
+        self.port = self._listener.address[1]
+        self.hostname = "%s:%d" % (self.host, self.port)
+        try:
+            db.register_worker({"hostname": self.hostname})
+        except exceptions.WorkerAlreadyRegistered:
+            # The previous run of the service wasn't stopped gracefully
+            db.update_worker(self.hostname)
+
+        heartbeat = threading.Thread(target=self._heartbeat)
+        heartbeat.daemon = True
+        heartbeat.start()
+        LOG.info(_("Worker %s is started") % self.hostname)
+
+    def stop(self):
+        """Stop listening for jobs and unregister the worker."""
+        self._stopped.set()
+        self._listener.close()
+        try:
+            db.unregister_worker(self.hostname)
+        except exceptions.WorkerNotFound:
+            pass
+        LOG.info(_("Worker %s is stopped") % self.hostname)
+
+    def serve(self):
+        """Accept and run jobs in separate threads until stopped."""
+        while not self._stopped.is_set():
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                if self._stopped.is_set():
+                    break
+                LOG.warning(_("Failed to accept connection: %s") % e)
+                continue
+            thread = threading.Thread(target=self._run_job, args=(conn,))
+            thread.daemon = True
+            thread.start()
+
+    def _heartbeat(self):
+        while True:
+            self._stopped.wait(CONF.benchmark.worker_heartbeat_interval)
+            if self._stopped.is_set():
+                break
+            try:
+                db.update_worker(self.hostname)
+            except Exception as e:
+                LOG.warning(_("Worker %(worker)s failed to send heartbeat: "
+                              "%(error)s") % {"worker": self.hostname,
+                                              "error": e})
+
+    def _run_job(self, conn):
+        """Run the load of the job and send its results back.
+
+        Job is a dict with "task_uuid", "name" of the scenario, runner
+        "config", scenario "context" and preprocessed "args". Results are
+        sent as ("warmup", result) and ("result", result) messages, the job
+        ends with ("done", None) or ("error", formatted exception) message.
+
+        :param conn: connection with coordinator
+        """
+        try:
+            job = conn.recv()
+            cls_name, method_name = job["name"].split(".", 1)
+            cls = scenario_base.Scenario.get_by_name(cls_name)
+            runner_obj = runner.ScenarioRunner.get(job["config"]["type"])(
+                {"uuid": job["task_uuid"]}, job["config"])
+        except Exception as e:
+            LOG.exception(e)
+            conn.send(("error", utils.format_exc(e)))
+            conn.close()
+            return
+
+        LOG.info(_("Worker %(worker)s runs %(name)s of task %(task)s") %
+                 {"worker": self.hostname, "name": job["name"],
+                  "task": job["task_uuid"]})
+        errors = []
+
+        def run_load():
+            try:
+                runner_obj.run_load(cls, method_name, job["context"],
+                                    job["args"])
+            except Exception as e:
+                LOG.exception(e)
+                errors.append(utils.format_exc(e))
+
+        thread = threading.Thread(target=run_load)
+        thread.start()
+        try:
+            while True:
+                # Results are sent after the check, so that the last ones
+                # aren't lost
+                is_done = not thread.is_alive()
+                if conn.poll(0.01):
+                    message = conn.recv()
+                    if message in (ABORT, HARD_ABORT):
+                        runner_obj.abort(hard=message == HARD_ABORT)
+                while runner_obj.warmup_queue:
+                    conn.send(("warmup",
+                               dict(runner_obj.warmup_queue.popleft())))
+                while runner_obj.result_queue:
+                    conn.send(("result",
+                               dict(runner_obj.result_queue.popleft())))
+                if is_done:
+                    break
+            if errors:
+                conn.send(("error", errors[0]))
+            else:
+                conn.send(("done", None))
+        except (EOFError, IOError) as e:
+            LOG.warning(_("Worker %(worker)s lost connection with "
+                          "coordinator of task %(task)s: %(error)s") %
+                        {"worker": self.hostname, "task": job["task_uuid"],
+                         "error": e})
+            runner_obj.abort()
+        finally:
+            thread.join()
+            conn.close()
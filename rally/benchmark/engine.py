@@ -14,6 +14,7 @@
 #    under the License.
 
 import json
+import multiprocessing
 import threading
 import time
 import traceback
@@ -22,9 +23,11 @@ import jsonschema
 import six
 
 from rally.benchmark import context
+from rally.benchmark.processing import sketch
 from rally.benchmark import runner
 from rally.benchmark.scenarios import base as base_scenario
 from rally.benchmark import sla
+from rally.common import costilius
 from rally.common.i18n import _
 from rally.common import log as logging
 from rally.common import utils as rutils
@@ -38,6 +41,9 @@ from rally.plugins.openstack.context import users as users_ctx
 
 LOG = logging.getLogger(__name__)
 
+# Interval in seconds between checks whether abort of the task is requested
+ABORT_CHECK_INTERVAL = 1
+
 
 CONFIG_SCHEMA = {
     "type": "object",
@@ -64,6 +70,9 @@ CONFIG_SCHEMA = {
                     "sla": {
                         "type": "object"
                     },
+                    "group": {
+                        "type": "string"
+                    },
                 },
                 "additionalProperties": False
             }
@@ -72,6 +81,30 @@ CONFIG_SCHEMA = {
 }
 
 
+class _Stage(object):
+    """Concurrent workloads of one group.
+
+    Workloads may share tenants (reused contexts or existing users), so
+    cleanup of any of them may delete resources that others still use.
+    Workloads of the stage wait for loads of each other to finish before
+    their contexts are cleaned up.
+    """
+
+    def __init__(self, size):
+        self._running = size
+        self._cond = threading.Condition()
+
+    def load_finished(self):
+        with self._cond:
+            self._running -= 1
+            self._cond.notify_all()
+
+    def wait(self):
+        with self._cond:
+            while self._running:
+                self._cond.wait()
+
+
 class BenchmarkEngine(object):
     """The Benchmark engine class is used to execute benchmark scenarios.
 
@@ -95,7 +128,8 @@ class BenchmarkEngine(object):
     """
 
     def __init__(self, config, task, admin=None, users=None,
-                 abort_on_sla_failure=False):
+                 abort_on_sla_failure=False, reuse_contexts=False,
+                 max_cpu_count=None):
         """BenchmarkEngine constructor.
 
         :param config: The configuration with specified benchmark scenarios
@@ -104,12 +138,21 @@ class BenchmarkEngine(object):
         :param users: List of dicts with user credentials
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
+        :param reuse_contexts: True if contexts should be kept alive between
+                               workloads with equivalent context configs
+        :param max_cpu_count: Max number of CPUs used by worker processes of
+                              all workloads that are run at the same time,
+                              all CPUs of the host by default
         """
         self.config = config
         self.task = task
         self.admin = admin and objects.Endpoint(**admin) or None
         self.existing_users = users or []
         self.abort_on_sla_failure = abort_on_sla_failure
+        self.reuse_contexts = reuse_contexts
+        self.max_cpu_count = max_cpu_count
+        # "soft" or "hard" when abort of the task is requested
+        self.abort_mode = None
 
     @rutils.log_task_wrapper(LOG.info, _("Task validation check cloud."))
     def _check_cloud(self):
@@ -131,7 +174,8 @@ class BenchmarkEngine(object):
         for scenario, values in six.iteritems(config):
             for pos, kw in enumerate(values):
                 try:
-                    runner.ScenarioRunner.validate(kw.get("runner", {}))
+                    runner.ScenarioRunner.validate(kw.get("runner", {}),
+                                                   kw.get("sla", {}))
                     context.ContextManager.validate(kw.get("context", {}),
                                                     non_hidden=True)
                     sla.SLA.validate(kw.get("sla", {}))
@@ -222,6 +266,30 @@ class BenchmarkEngine(object):
 
         return context_obj
 
+    def _watch_abort(self, stopped):
+        """Poll the task status until abort is requested or stopped is set.
+
+        Soft abort lets iterations in progress finish, hard abort terminates
+        them. Contexts are cleaned up and results are stored in both cases,
+        remaining workloads are skipped.
+
+        :param stopped: threading.Event that stops polling
+        """
+        while not stopped.is_set():
+            try:
+                status = objects.Task.get_status(self.task["uuid"])
+            except Exception as e:
+                LOG.warning(_("Failed to get status of task %(task)s: "
+                              "%(error)s") % {"task": self.task["uuid"],
+                                              "error": e})
+                status = None
+            if status == consts.TaskStatus.SOFT_ABORTING:
+                self.abort_mode = "soft"
+            elif status == consts.TaskStatus.ABORTING:
+                self.abort_mode = "hard"
+                return
+            stopped.wait(ABORT_CHECK_INTERVAL)
+
     @rutils.log_task_wrapper(LOG.info, _("Benchmarking."))
     def run(self):
         """Run the benchmark according to the test configuration.
@@ -232,39 +300,131 @@ class BenchmarkEngine(object):
                   corresponding benchmark test launches
         """
         self.task.update_status(consts.TaskStatus.RUNNING)
+        workloads = []
         for name in self.config:
             for n, kw in enumerate(self.config[name]):
-                key = {"name": name, "pos": n, "kw": kw}
-                LOG.info("Running benchmark with key: \n%s"
-                         % json.dumps(key, indent=2))
-                runner_obj = self._get_runner(kw)
-                is_done = threading.Event()
-                unexpected_failure = {}
-                consumer = threading.Thread(
-                    target=self.consume_results,
-                    args=(key, self.task, is_done, unexpected_failure,
-                          runner_obj))
-                consumer.start()
-                context_obj = self._prepare_context(kw.get("context", {}),
-                                                    name, self.admin)
-                self.duration = 0
-                self.full_duration = 0
-                try:
-                    with rutils.Timer() as timer:
-                        with context.ContextManager(context_obj):
-                            self.duration = runner_obj.run(
+                workloads.append((name, n, kw, self._prepare_context(
+                    kw.get("context", {}), name, self.admin)))
+
+        context_pool = None
+        if self.reuse_contexts:
+            context_pool = context.ContextPool()
+            for name, n, kw, context_obj in workloads:
+                context_pool.register(context_obj)
+
+        stopped = threading.Event()
+        watcher = threading.Thread(target=self._watch_abort, args=(stopped,))
+        watcher.daemon = True
+        watcher.start()
+        try:
+            for stage in self._get_stages(workloads):
+                if self.abort_mode:
+                    LOG.info("Task %s is aborted, remaining benchmarks are "
+                             "skipped" % self.task["uuid"])
+                    break
+                if len(stage) == 1:
+                    self._run_workload(*stage[0], context_pool=context_pool,
+                                       cpu_limit=self.max_cpu_count)
+                    continue
+
+                # Concurrent workloads share CPUs, so that their worker
+                # processes don't starve each other
+                max_cpu_count = (self.max_cpu_count or
+                                 multiprocessing.cpu_count())
+                cpu_limit = max(1, max_cpu_count // len(stage))
+                stage_obj = _Stage(len(stage))
+                threads = [threading.Thread(
+                    target=self._run_workload, args=workload,
+                    kwargs={"context_pool": context_pool,
+                            "cpu_limit": cpu_limit,
+                            "stage": stage_obj}) for workload in stage]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            stopped.set()
+            watcher.join()
+            if context_pool:
+                context_pool.cleanup()
+        self.task.update_status(consts.TaskStatus.ABORTED if self.abort_mode
+                                else consts.TaskStatus.FINISHED)
+
+    @staticmethod
+    def _get_stages(workloads):
+        """Split workloads into stages that are run one by one.
+
+        Workloads of the same "group" form one stage and are run
+        concurrently, the stage starts in place of its first workload.
+        Contexts of its workloads are cleaned up only after loads of all
+        of them are finished. Every workload without group is a stage by
+        itself.
+        """
+        stages = []
+        groups = {}
+        for workload in workloads:
+            group = workload[2].get("group")
+            if group is None:
+                stages.append([workload])
+            elif group in groups:
+                groups[group].append(workload)
+            else:
+                groups[group] = [workload]
+                stages.append(groups[group])
+        return stages
+
+    def _run_workload(self, name, pos, kw, context_obj, context_pool=None,
+                      cpu_limit=None, stage=None):
+        key = {"name": name, "pos": pos, "kw": kw}
+        LOG.info("Running benchmark with key: \n%s"
+                 % json.dumps(key, indent=2))
+        runner_obj = self._get_runner(kw)
+        runner_obj.cpu_limit = cpu_limit
+        runner_obj.sla_config = kw.get("sla", {})
+        is_done = threading.Event()
+        unexpected_failure = {}
+        durations = {"load_duration": 0, "full_duration": 0, "contexts": []}
+        consumer = threading.Thread(
+            target=self.consume_results,
+            args=(key, self.task, is_done, unexpected_failure, runner_obj,
+                  durations))
+        consumer.start()
+        if context_pool:
+            ctx_stats = costilius.OrderedDict()
+            ctx_manager = context_pool.workload(context_obj, ctx_stats)
+        else:
+            ctx_manager = context.ContextManager(context_obj)
+            ctx_stats = ctx_manager.stats
+        load_finished = False
+        try:
+            with rutils.Timer() as timer:
+                with ctx_manager:
+                    try:
+                        # Abort could be requested while contexts were set up
+                        if not self.abort_mode:
+                            durations["load_duration"] = runner_obj.run(
                                 name, context_obj, kw.get("args", {}))
-                except Exception as e:
-                    LOG.exception(e)
-                    unexpected_failure["exc"] = e
-                finally:
-                    self.full_duration = timer.duration()
-                    is_done.set()
-                    consumer.join()
-        self.task.update_status(consts.TaskStatus.FINISHED)
+                    finally:
+                        if stage:
+                            load_finished = True
+                            stage.load_finished()
+                            stage.wait()
+        except Exception as e:
+            LOG.exception(e)
+            unexpected_failure["exc"] = e
+        finally:
+            if stage and not load_finished:
+                # Setup of contexts failed
+                stage.load_finished()
+            durations["full_duration"] = timer.duration()
+            durations["contexts"] = [dict(stats, name=ctx_name)
+                                     for ctx_name, stats
+                                     in six.iteritems(ctx_stats)]
+            is_done.set()
+            consumer.join()
 
     def consume_results(self, key, task, is_done, unexpected_failure,
-                        runner_obj):
+                        runner_obj, durations):
         """Consume scenario runner results from queue and send them to db.
 
         Has to be run from different thread simultaneously with the runner.run
@@ -277,10 +437,20 @@ class BenchmarkEngine(object):
         :param unexpected_failure: Dictionary object with information about
                                    unexpected exception.
         :param runner_obj: ScenarioRunner object that was used to run a task
+        :param durations: dict with "load_duration" and "full_duration" of
+                          workload and "contexts" with stats of setup and
+                          cleanup of every context, they are set before
+                          is_done
         """
         results = []
         sla_checker = sla.SLAChecker(key["kw"])
         while True:
+            if self.abort_mode:
+                # Runner clears the abort flag when it starts, so it's set
+                # again till the runner is done
+                sla_checker.set_aborted_manually()
+                runner_obj.abort(hard=self.abort_mode == "hard")
+
             if runner_obj.result_queue:
                 result = runner_obj.result_queue.popleft()
                 results.append(result)
@@ -296,7 +466,16 @@ class BenchmarkEngine(object):
             if unexpected_failure.get("exc"):
                 sla_checker.set_unexpected_failure(unexpected_failure["exc"])
 
+        # Sketches allow to compare results without processing all
+        # iterations again, see rally.benchmark.processing.compare
         task.append_results(key, {"raw": results,
-                                  "load_duration": self.duration,
-                                  "full_duration": self.full_duration,
-                                  "sla": sla_checker.results()})
+                                  "warmup": list(runner_obj.warmup_queue),
+                                  "load_duration": durations[
+                                      "load_duration"],
+                                  "full_duration": durations[
+                                      "full_duration"],
+                                  "contexts": durations["contexts"],
+                                  "runner_stats": runner_obj.stats,
+                                  "sla": sla_checker.results(),
+                                  "sketches": sketch.workload_sketches(
+                                      results)})
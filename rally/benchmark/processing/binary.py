@@ -0,0 +1,293 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compact binary format of task results.
+
+Results of a 1M iterations workload take gigabytes as JSON, which is
+slow to transfer and to parse. This format stores iterations by
+columns, numeric columns as packed doubles, and compresses every
+workload separately, so results are written and read workload by
+workload.
+
+File layout:
+
+    MAGIC, format version (uint16)
+    for every workload:
+        length of compressed record (uint32), CRC32 of it (uint32)
+        zlib compressed record:
+            length of header (uint32), JSON header, packed columns
+    end marker: zero length and zero CRC32
+
+All numbers are little-endian.
+"""
+
+import gc
+import json
+import math
+import struct
+import zlib
+
+import six
+
+from rally.common.i18n import _
+from rally.common import costilius
+from rally import exceptions
+
+
+MAGIC = b"RALLYRES"
+VERSION = 1
+
+_VERSION = struct.Struct("<H")
+_RECORD = struct.Struct("<II")
+_UINT = struct.Struct("<I")
+
+_NUMBER_TYPES = six.integer_types + (float,)
+
+# Column names of values that every iteration has
+_TIMESTAMP = "timestamp"
+_DURATION = "duration"
+_IDLE_DURATION = "idle_duration"
+# Iterations are tagged with concurrency by some runners only
+_CONCURRENCY = "concurrency"
+_ATOMIC_KEYS = "atomic_keys"
+_OUTPUT_KEYS = "output_keys"
+
+
+def _is_number(value):
+    return value is None or (isinstance(value, _NUMBER_TYPES) and
+                             not isinstance(value, bool))
+
+
+def _add_keyed(columns, prefix, values, keysets, keysets_index, idx):
+    """Put dict values to columns, remember the set of keys."""
+    keys = tuple(values)
+    try:
+        keyset = keysets_index[keys]
+    except KeyError:
+        keyset = keysets_index[keys] = len(keysets)
+        keysets.append(list(keys))
+    for key, value in six.iteritems(values):
+        column = columns.setdefault(prefix + key, [])
+        if len(column) < idx:
+            column.extend([None] * (idx - len(column)))
+        column.append(value)
+    return keyset
+
+
+def _encode(result):
+    iterations = result["result"]
+    size = len(iterations)
+    columns = costilius.OrderedDict(
+        (name, []) for name in (_TIMESTAMP, _DURATION, _IDLE_DURATION))
+    keyed = costilius.OrderedDict()
+    atomic_keys = []
+    output_keys = []
+    atomic_keysets, atomic_index = [], {}
+    output_keysets, output_index = [], {}
+    errors = []
+    output_errors = []
+
+    concurrency = [r.get(_CONCURRENCY) for r in iterations]
+    if any(c is not None for c in concurrency):
+        columns[_CONCURRENCY] = concurrency
+
+    for idx, r in enumerate(iterations):
+        columns[_TIMESTAMP].append(r.get("timestamp"))
+        columns[_DURATION].append(r["duration"])
+        columns[_IDLE_DURATION].append(r["idle_duration"])
+        atomic_keys.append(_add_keyed(keyed, "atomic:", r["atomic_actions"],
+                                      atomic_keysets, atomic_index, idx))
+        output_keys.append(_add_keyed(keyed, "output:",
+                                      r["scenario_output"]["data"],
+                                      output_keysets, output_index, idx))
+        if r["error"]:
+            errors.append([idx, r["error"]])
+        if r["scenario_output"]["errors"]:
+            output_errors.append([idx, r["scenario_output"]["errors"]])
+
+    for name, column in six.iteritems(keyed):
+        column.extend([None] * (size - len(column)))
+        columns[name] = column
+
+    packed = []
+    json_columns = {}
+    header_columns = [[_ATOMIC_KEYS, "I"], [_OUTPUT_KEYS, "I"]]
+    for values in (atomic_keys, output_keys):
+        packed.append(struct.pack("<%dI" % size, *values))
+    for name, values in six.iteritems(columns):
+        if all(_is_number(v) for v in values):
+            header_columns.append([name, "d"])
+            packed.append(struct.pack(
+                "<%dd" % size,
+                *[float("nan") if v is None else v for v in values]))
+        else:
+            json_columns[name] = values
+
+    header = json.dumps({
+        "key": result["key"],
+        "sla": result["sla"],
+        "load_duration": result["load_duration"],
+        "full_duration": result["full_duration"],
+        "contexts": result.get("contexts", []),
+        # Warm-up is short, so it is stored as is
+        "warmup": result.get("warmup", []),
+        "runner_stats": result.get("runner_stats", {}),
+        "iterations": size,
+        "columns": header_columns,
+        "json_columns": json_columns,
+        "atomic_keysets": atomic_keysets,
+        "output_keysets": output_keysets,
+        "errors": errors,
+        "output_errors": output_errors
+    }).encode("utf-8")
+    return b"".join([_UINT.pack(len(header)), header] + packed)
+
+
+def _keyed_rows(columns, prefix, keysets, keysets_column):
+    """Restore dicts of iterations from columns."""
+    keysets = [(keys, [columns[prefix + key] for key in keys])
+               for keys in keysets]
+    if len(keysets) == 1:
+        # The most common case, all iterations have the same keys
+        keys, values = keysets[0]
+        if not keys:
+            return [{} for i in keysets_column]
+        return [dict(zip(keys, row)) for row in zip(*values)]
+    rows = []
+    for idx, keyset in enumerate(keysets_column):
+        keys, values = keysets[keyset]
+        rows.append(dict(zip(keys, [column[idx] for column in values])))
+    return rows
+
+
+def _decode_record(data):
+    header_size = _UINT.unpack_from(data)[0]
+    offset = _UINT.size + header_size
+    header = json.loads(data[_UINT.size:offset].decode("utf-8"))
+    size = header["iterations"]
+
+    columns = {}
+    for name, typecode in header["columns"]:
+        fmt = "<%d%s" % (size, typecode)
+        values = struct.unpack_from(fmt, data, offset)
+        offset += struct.calcsize(fmt)
+        if typecode == "d":
+            values = [None if math.isnan(v) else v for v in values]
+        columns[name] = values
+    columns.update(header["json_columns"])
+
+    atomic = _keyed_rows(columns, "atomic:", header["atomic_keysets"],
+                         columns[_ATOMIC_KEYS])
+    output = _keyed_rows(columns, "output:", header["output_keysets"],
+                         columns[_OUTPUT_KEYS])
+    errors = dict(header["errors"])
+    output_errors = dict(header["output_errors"])
+    concurrency = columns.get(_CONCURRENCY, [None] * size)
+    iterations = []
+    for idx, (timestamp, duration, idle_duration) in enumerate(zip(
+            columns[_TIMESTAMP], columns[_DURATION],
+            columns[_IDLE_DURATION])):
+        iteration = {
+            "duration": duration,
+            "idle_duration": idle_duration,
+            "error": errors.get(idx, []),
+            "atomic_actions": atomic[idx],
+            "scenario_output": {"data": output[idx],
+                                "errors": output_errors.get(idx, "")}
+        }
+        if timestamp is not None:
+            iteration["timestamp"] = timestamp
+        if concurrency[idx] is not None:
+            iteration[_CONCURRENCY] = int(concurrency[idx])
+        iterations.append(iteration)
+
+    return {"key": header["key"],
+            "sla": header["sla"],
+            "result": iterations,
+            "load_duration": header["load_duration"],
+            "full_duration": header["full_duration"],
+            "contexts": header.get("contexts", []),
+            "warmup": header.get("warmup", []),
+            "runner_stats": header.get("runner_stats", {})}
+
+
+def _decode(data):
+    # Millions of containers are created here and none of them is garbage,
+    # cyclic GC would only walk through them again and again
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _decode_record(data)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def dump(results, out):
+    """Write task results to binary file.
+
+    :param results: iterable of workloads results in the format of
+                    `rally task results'
+    :param out: file-like object opened in binary mode
+    """
+    out.write(MAGIC + _VERSION.pack(VERSION))
+    for result in results:
+        record = zlib.compress(_encode(result))
+        out.write(_RECORD.pack(len(record), zlib.crc32(record) & 0xffffffff))
+        out.write(record)
+    out.write(_RECORD.pack(0, 0))
+
+
+def is_binary(path):
+    """Check whether the file contains results in binary format."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def load(inp):
+    """Read task results from binary file workload by workload.
+
+    :param inp: file-like object opened in binary mode
+    :returns: generator of workloads results in the format of
+              `rally task results'
+    :raises InvalidResultsFile: if file is broken or its format version
+                                isn't supported
+    """
+    name = getattr(inp, "name", "<stream>")
+
+    def read(size):
+        data = inp.read(size)
+        if len(data) != size:
+            raise exceptions.InvalidResultsFile(
+                path=name, reason=_("unexpected end of file"))
+        return data
+
+    if inp.read(len(MAGIC)) != MAGIC:
+        raise exceptions.InvalidResultsFile(
+            path=name, reason=_("it isn't a binary results file"))
+    version = _VERSION.unpack(read(_VERSION.size))[0]
+    if version > VERSION:
+        raise exceptions.InvalidResultsFile(
+            path=name, reason=_("unsupported format version %d") % version)
+
+    while True:
+        size, checksum = _RECORD.unpack(read(_RECORD.size))
+        if not size:
+            return
+        record = read(size)
+        if zlib.crc32(record) & 0xffffffff != checksum:
+            raise exceptions.InvalidResultsFile(
+                path=name, reason=_("checksum mismatch"))
+        yield _decode(zlib.decompress(record))
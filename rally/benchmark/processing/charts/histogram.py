@@ -13,28 +13,51 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import bisect
 import math
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _sort(data):
+    """Return sorted data, as numpy array if numpy is available."""
+    if numpy is not None:
+        return numpy.sort(numpy.asarray(data))
+    return sorted(data)
+
 
 class Histogram:
     """Represents a Histogram chart."""
 
-    def __init__(self, data, number_of_bins, method=None, key=None):
+    def __init__(self, data, number_of_bins, method=None, key=None,
+                 sorted_data=None):
         """Initialize a Histogram object
 
         :param data: a list of numbers
         :param number_of_bins: an integer
         :param description: a string
         :param key: a string
+        :param sorted_data: data sorted by _sort(), it is calculated if
+                            not specified
         """
         self.data = data
         self.number_of_bins = number_of_bins
         self.method = method
         self.key = key
 
+        if sorted_data is None:
+            sorted_data = _sort(data)
+        self.sorted_data = sorted_data
+
         self.size = len(data)
-        self.min_data = min(data)
-        self.max_data = max(data)
+        self.min_data = sorted_data[0]
+        self.max_data = sorted_data[-1]
+        if numpy is not None:
+            self.min_data = self.min_data.item()
+            self.max_data = self.max_data.item()
         self.bin_width = self._calculate_bin_width()
 
         self.x_axis = self._calculate_x_axis()
@@ -50,13 +73,23 @@ class Histogram:
                 for i in range(1, self.number_of_bins + 1)]
 
     def _calculate_y_axis(self):
-        """Return a list with the values of the y axis."""
-        y_axis = [0] * len(self.x_axis)
-        for data_point in self.data:
-            for i, bin in enumerate(self.x_axis):
-                if data_point <= bin:
-                    y_axis[i] += 1
-                    break
+        """Return a list with the values of the y axis.
+
+        Data point belongs to the first bin which upper bound is not less
+        than the point, so number of points up to the end of each bin is
+        found by binary search in sorted data.
+        """
+        if numpy is not None:
+            cumulative = numpy.searchsorted(self.sorted_data, self.x_axis,
+                                            side="right")
+            return numpy.diff(numpy.concatenate(([0], cumulative))).tolist()
+
+        y_axis = []
+        previous = 0
+        for bin in self.x_axis:
+            cumulative = bisect.bisect_right(self.sorted_data, bin, previous)
+            y_axis.append(cumulative - previous)
+            previous = cumulative
         return y_axis
 
 
@@ -107,3 +140,18 @@ def hvariety(data):
             "number_of_bins": calculate_number_of_bins_half(data),
         }
     ]
+
+
+def histograms(data, key=None):
+    """Build histograms of data for all methods from hvariety().
+
+    Data is sorted only once and shared by all histograms.
+
+    :param data: a list of numbers
+    :param key: a string
+    :returns: list of Histogram objects
+    """
+    sorted_data = _sort(data)
+    return [Histogram(data, h["number_of_bins"], h["method"], key,
+                      sorted_data=sorted_data)
+            for h in hvariety(data)]
@@ -0,0 +1,254 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Comparison of two benchmark tasks.
+
+Workloads of tasks are aligned by scenario name and arguments, then
+durations of every atomic action (and of the whole iterations) are
+compared by sketches (see rally.benchmark.processing.sketch):
+
+ * Mann-Whitney U test shows whether durations of one task tend to be
+   bigger than durations of another one, without any assumptions about
+   their distribution;
+ * percentiles are reported with distribution-free confidence intervals
+   calculated from order statistics, so non-overlapping intervals mean
+   the percentile has changed.
+
+Both use only counts of values in sketch buckets, so comparing tasks
+with millions of iterations takes milliseconds if sketches are stored
+with results.
+"""
+
+import json
+import math
+
+from rally.benchmark.processing import sketch as sketch_
+from rally.ui import utils as ui_utils
+
+
+PERCENTILES = (("median", 0.5), ("90%ile", 0.9), ("95%ile", 0.95))
+
+# Durations of the whole iterations are compared as this action
+TOTAL = "total"
+
+
+def _z_score(confidence):
+    """Return z such that P(|X| < z) = confidence for X ~ N(0, 1)."""
+    low, high = 0.0, 10.0
+    for i in range(60):
+        middle = (low + high) / 2
+        if math.erf(middle / math.sqrt(2)) < confidence:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def mann_whitney(sketch1, sketch2):
+    """Compare two samples with Mann-Whitney U test.
+
+    Values of the same bucket are considered equal, normal
+    approximation with tie correction is used.
+
+    :returns: (U statistic of the first sample, two-sided p-value) or
+              None if any sample is empty
+    """
+    n1, n2 = sketch1.count, sketch2.count
+    if not n1 or not n2:
+        return None
+
+    counts = {}
+    for idx, sketch in enumerate((sketch1, sketch2)):
+        for value, count in sketch.bins():
+            counts.setdefault(value, [0, 0])[idx] += count
+
+    u = 0.0
+    below = 0
+    ties = 0
+    for value in sorted(counts):
+        c1, c2 = counts[value]
+        u += c1 * (below + c2 / 2.0)
+        below += c2
+        ties += (c1 + c2) ** 3 - (c1 + c2)
+
+    n = n1 + n2
+    variance = n1 * n2 / 12.0 * ((n + 1) - float(ties) / (n * (n - 1)))
+    if variance <= 0:
+        # All values are equal
+        return u, 1.0
+    z = (u - n1 * n2 / 2.0) / math.sqrt(variance)
+    return u, math.erfc(abs(z) / math.sqrt(2))
+
+
+def percentile_ci(sketch, percent, confidence=0.95):
+    """Return confidence interval of percentile.
+
+    Number of values below the percentile has binomial distribution, so
+    the interval is bounded by values with ranks around count * percent.
+
+    :returns: (lower, upper) or None if sketch is empty
+    """
+    if not sketch.count:
+        return None
+    center = (sketch.count - 1) * percent
+    half = _z_score(confidence) * math.sqrt(
+        sketch.count * percent * (1 - percent))
+    return (sketch.value_at_rank(int(math.floor(center - half))),
+            sketch.value_at_rank(int(math.ceil(center + half))))
+
+
+def _delta(value1, value2):
+    """Return change in percents."""
+    if value1 is None or value2 is None or not value1:
+        return None
+    return (value2 - value1) * 100.0 / value1
+
+
+def compare_durations(action, sketch1, sketch2, alpha=0.05):
+    """Compare durations of an action.
+
+    :param action: str, name of the action
+    :param sketch1: Sketch of durations of the first task
+    :param sketch2: Sketch of durations of the second task
+    :param alpha: float, significance level
+    :returns: dict with comparison
+    """
+    test = mann_whitney(sketch1, sketch2)
+    p_value = test and test[1]
+    significant = p_value is not None and p_value < alpha
+
+    result = {
+        "action": action,
+        "count": [sketch1.count, sketch2.count],
+        "mean": {"values": [sketch1.mean(), sketch2.mean()],
+                 "delta": _delta(sketch1.mean(), sketch2.mean())},
+        "p_value": p_value,
+        "significant": significant,
+        "change": None
+    }
+    for name, percent in PERCENTILES:
+        values = [sketch1.percentile(percent), sketch2.percentile(percent)]
+        ci = [percentile_ci(sketch1, percent, 1 - alpha),
+              percentile_ci(sketch2, percent, 1 - alpha)]
+        result[name] = {
+            "values": values,
+            "delta": _delta(*values),
+            "ci": ci,
+            "significant": bool(ci[0] and ci[1] and (ci[0][1] < ci[1][0] or
+                                                     ci[1][1] < ci[0][0]))}
+
+    if significant:
+        # U is bigger than half of pairs if the first task is slower
+        result["change"] = ("faster" if test[0] > (sketch1.count *
+                                                   sketch2.count / 2.0)
+                            else "slower")
+    return result
+
+
+def get_sketches(workload):
+    """Return sketches of workload, calculate them if they aren't stored.
+
+    :param workload: dict with "sketches" or iterations in "result"
+    """
+    return workload.get("sketches") or sketch_.workload_sketches(
+        workload["result"])
+
+
+def _workload_id(key):
+    return key["name"], json.dumps(key["kw"].get("args", {}),
+                                   sort_keys=True)
+
+
+class TaskComparison(object):
+
+    def __init__(self, workloads1, workloads2, alpha=0.05):
+        """Compare two benchmark tasks.
+
+        Workloads with the same scenario name and arguments are compared,
+        if a task has several such workloads they are compared in order.
+
+        :param workloads1: list of workloads of the older task, dicts with
+                           "key" and either precalculated "sketches" or
+                           iterations in "result"
+        :param workloads2: list of workloads of the newer task
+        :param alpha: float, significance level of tests
+        """
+        self.alpha = alpha
+        self.workloads = self._compare(workloads1, workloads2)
+
+    def _compare(self, workloads1, workloads2):
+        newer = {}
+        for idx, workload in enumerate(workloads2):
+            newer.setdefault(_workload_id(workload["key"]), []).append(idx)
+
+        comparison = []
+        for workload in workloads1:
+            same = newer.get(_workload_id(workload["key"]))
+            if same:
+                comparison.append(self._compare_workloads(
+                    workload, workloads2[same.pop(0)]))
+            else:
+                comparison.append(self._workload_status(workload, "removed"))
+        for idx in sorted(i for added in newer.values() for i in added):
+            comparison.append(self._workload_status(workloads2[idx], "added"))
+        return comparison
+
+    def _workload_status(self, workload, status):
+        return {"name": workload["key"]["name"],
+                "args": workload["key"]["kw"].get("args", {}),
+                "status": status,
+                "pos": [workload["key"]["pos"]]}
+
+    def _compare_workloads(self, workload1, workload2):
+        sketches1 = get_sketches(workload1)
+        sketches2 = get_sketches(workload2)
+
+        actions = [compare_durations(
+            TOTAL, sketch_.Sketch.from_dict(sketches1["total"]),
+            sketch_.Sketch.from_dict(sketches2["total"]), self.alpha)]
+        for action in sorted(set(sketches1["atomic"]) |
+                             set(sketches2["atomic"])):
+            sketch1, sketch2 = [
+                sketch_.Sketch.from_dict(s["atomic"][action])
+                if action in s["atomic"] else sketch_.Sketch()
+                for s in (sketches1, sketches2)]
+            actions.append(compare_durations(action, sketch1, sketch2,
+                                             self.alpha))
+
+        result = self._workload_status(workload1, "compared")
+        result.update({
+            "pos": [workload1["key"]["pos"], workload2["key"]["pos"]],
+            "iterations": [sketches1["iterations"], sketches2["iterations"]],
+            "errors": [sketches1["errors"], sketches2["errors"]],
+            "actions": actions
+        })
+        return result
+
+    def regressions(self):
+        """Return list of (workload name, action) that became slower."""
+        return [(workload["name"], action["action"])
+                for workload in self.workloads
+                if workload["status"] == "compared"
+                for action in workload["actions"]
+                if action["change"] == "slower"]
+
+    def to_json(self):
+        return json.dumps({"alpha": self.alpha, "workloads": self.workloads},
+                          sort_keys=True, indent=4)
+
+    def to_html(self):
+        template = ui_utils.get_template("task/compare.mako")
+        return template.render(alpha=self.alpha, workloads=self.workloads,
+                               percentiles=[p for p, v in PERCENTILES])
@@ -0,0 +1,172 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Downsampling of chart series.
+
+Every strategy takes a list of numbers and the max number of points and
+returns list of points [(idx, value), ...] where idx starts from 1. Unlike
+averaging of neighbours, these strategies keep extreme values, so latency
+spikes of huge runs are still visible in reports. Series of one stacked
+chart are downsampled together by select(), so they have the same points.
+"""
+
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _to_floats(data):
+    return [float(v) if v else 0.0 for v in data]
+
+
+def _to_points(values, indices):
+    return [(idx + 1, values[idx]) for idx in indices]
+
+
+def _min_max_indices(values, limit):
+    size = len(values)
+    if size <= limit:
+        return list(range(size))
+
+    bucket_size = int(math.ceil(size / (limit // 2.0)))
+    buckets = int(math.ceil(float(size) / bucket_size))
+
+    if numpy is not None:
+        padded = numpy.full(buckets * bucket_size, numpy.nan)
+        padded[:size] = values
+        padded = padded.reshape(buckets, bucket_size)
+        offsets = numpy.arange(buckets) * bucket_size
+        mins = (numpy.nanargmin(padded, axis=1) + offsets).tolist()
+        maxs = (numpy.nanargmax(padded, axis=1) + offsets).tolist()
+    else:
+        mins = []
+        maxs = []
+        for start in range(0, size, bucket_size):
+            bucket = range(start, min(start + bucket_size, size))
+            mins.append(min(bucket, key=values.__getitem__))
+            maxs.append(max(bucket, key=values.__getitem__))
+
+    indices = []
+    for lo, hi in zip(mins, maxs):
+        indices.extend(sorted(set((lo, hi))))
+    return indices
+
+
+def min_max(data, limit):
+    """Keep min and max values of every bucket.
+
+    Data is split into limit / 2 buckets of the same size. Both min and
+    max points of a bucket are kept in their original order.
+
+    :param data: list of numbers
+    :param limit: max number of points in result, it should be >= 2
+    :returns: list of points [(idx, value), ...]
+    """
+    values = _to_floats(data)
+    return _to_points(values, _min_max_indices(values, limit))
+
+
+def _lttb_indices(values, limit):
+    size = len(values)
+    if size <= limit or limit < 3:
+        return list(range(size))
+
+    every = float(size - 2) / (limit - 2)
+    if numpy is not None:
+        array = numpy.asarray(values)
+
+    selected = [0]
+    a = 0
+    for i in range(limit - 2):
+        start = int(math.floor(i * every)) + 1
+        end = int(math.floor((i + 1) * every)) + 1
+        next_start = end
+        next_end = min(int(math.floor((i + 2) * every)) + 1, size)
+        if next_start >= next_end:
+            # The last bucket is followed by the last point
+            next_start, next_end = size - 1, size
+
+        if numpy is not None:
+            avg_x = (next_start + next_end - 1) / 2.0
+            avg_y = array[next_start:next_end].mean()
+            xs = numpy.arange(start, end)
+            areas = numpy.abs((a - avg_x) * (array[start:end] - values[a]) -
+                              (a - xs) * (avg_y - values[a]))
+            a = start + int(areas.argmax())
+        else:
+            avg_x = (next_start + next_end - 1) / 2.0
+            avg_y = math.fsum(values[next_start:next_end]) / (
+                next_end - next_start)
+            a = max(range(start, end),
+                    key=lambda x: abs((a - avg_x) * (values[x] - values[a]) -
+                                      (a - x) * (avg_y - values[a])))
+        selected.append(a)
+    selected.append(size - 1)
+    return selected
+
+
+def lttb(data, limit):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    First and last points are always kept, other points are split into
+    limit - 2 buckets. From every bucket the point that forms the largest
+    triangle with the previously selected point and the average point of
+    the next bucket is selected, so the shape of the series is preserved.
+
+    :param data: list of numbers
+    :param limit: max number of points in result, it should be >= 3
+    :returns: list of points [(idx, value), ...]
+    """
+    values = _to_floats(data)
+    return _to_points(values, _lttb_indices(values, limit))
+
+
+STRATEGIES = {
+    "min_max": min_max,
+    "lttb": lttb,
+}
+
+_INDICES = {
+    "min_max": _min_max_indices,
+    "lttb": _lttb_indices,
+}
+
+
+def select(series, limit, strategy):
+    """Downsample a few series of one chart to the same indices.
+
+    Stacked charts need the same x values in every series, so indices
+    that the strategy selects in every series are merged. Each series
+    gets limit / len(series) points, so the result fits the limit.
+
+    :param series: list of lists of numbers, all of the same length
+    :param limit: max number of points in every result series
+    :param strategy: name of strategy from STRATEGIES
+    :returns: list of lists of points [(idx, value), ...], one per series
+    """
+    get_indices = _INDICES[strategy]
+    series = [_to_floats(data) for data in series]
+    if not series or len(series[0]) <= limit:
+        return [_to_points(values, range(len(values))) for values in series]
+
+    part = max(limit // len(series), 3)
+    indices = set()
+    for values in series:
+        indices.update(get_indices(values, part))
+    indices = sorted(indices)
+    return [_to_points(values, indices) for values in series]
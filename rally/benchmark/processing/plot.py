@@ -13,53 +13,78 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import copy
 import json
 
 import six
 
 from rally.benchmark.processing.charts import histogram as histo
+from rally.benchmark.processing import steps
+from rally.benchmark.processing import timeline
 from rally.benchmark.processing import utils
+from rally.common import costilius
 from rally.ui import utils as ui_utils
 
 
+# Data of workloads which is loaded by report only on demand
+DETAILS_KEYS = ("config", "iterations", "atomic", "timeline", "table_cols",
+                "table_rows", "output", "output_errors", "errors", "contexts",
+                "steps", "runner_stats")
+
+DATA_BLOCKS_MARKER = "<!-- data blocks -->"
+
+# Series of huge runs are downsampled by keeping min and max values of
+# buckets, so spikes aren't hidden. All series of a stacked chart keep the
+# same iterations.
+DOWNSAMPLING = "min_max"
+
+
+def _add_to_column(columns, name, idx, value):
+    """Put value to column, pad with zeros iterations without the value."""
+    try:
+        column = columns[name]
+    except KeyError:
+        column = columns[name] = []
+    if len(column) < idx:
+        column.extend([0] * (idx - len(column)))
+    column.append(value)
+
+
+def _pad_columns(columns, size):
+    for column in columns.values():
+        if len(column) < size:
+            column.extend([0] * (size - len(column)))
+
+
 def _prepare_data(data):
+    """Aggregate iterations of a workload into columns.
+
+    Each iteration is read once and data isn't modified. Values missed
+    in some iterations are zeros in columns, durations of failed
+    iterations are zeros too (no sense to display them).
+    """
+    result = data["result"]
     durations = []
     idle_durations = []
-    atomic_durations = {}
-    output = {}
+    success_durations = []
+    atomic = costilius.OrderedDict()
+    atomic_success = costilius.OrderedDict()
+    atomic_table = costilius.OrderedDict()
+    output = costilius.OrderedDict()
     output_errors = []
-    output_stacked = []
     errors = []
 
-    # NOTE(maretskiy): We need this extra iteration
-    # to determine something that we should know about the data
-    # before starting its processing.
-    atomic_names = set()
-    output_names = set()
-    for r in data["result"]:
-        atomic_names.update(r["atomic_actions"].keys())
-        output_names.update(r["scenario_output"]["data"].keys())
-
-    for idx, r in enumerate(data["result"]):
-        # NOTE(maretskiy): Sometimes we miss iteration data.
-        # So we care about data integrity by setting zero values
-        if len(r["atomic_actions"]) < len(atomic_names):
-            for atomic_name in atomic_names:
-                r["atomic_actions"].setdefault(atomic_name, 0)
-
-        if len(r["scenario_output"]["data"]) < len(output_names):
-            for output_name in output_names:
-                r["scenario_output"]["data"].setdefault(output_name, 0)
-
+    for idx, r in enumerate(result):
         if r["scenario_output"]["errors"]:
             output_errors.append((idx, r["scenario_output"]["errors"]))
 
         for param, value in r["scenario_output"]["data"].items():
-            try:
-                output[param].append(value)
-            except KeyError:
-                output[param] = [value]
+            _add_to_column(output, param, idx, value)
+
+        for action, duration in r["atomic_actions"].items():
+            _add_to_column(atomic, action, idx, duration)
+            column = atomic_table.setdefault(action, [])
+            if duration is not None:
+                column.append(duration)
 
         if r["error"]:
             type_, message, traceback = r["error"]
@@ -67,50 +92,55 @@ def _prepare_data(data):
                            "type": type_,
                            "message": message,
                            "traceback": traceback})
-
-            # NOTE(maretskiy): Reset failed durations (no sense to display)
-            r["duration"] = 0
-            r["idle_duration"] = 0
+            durations.append(0)
+            idle_durations.append(0)
+            continue
 
         durations.append(r["duration"])
         idle_durations.append(r["idle_duration"])
-
-        for met, duration in r["atomic_actions"].items():
-            try:
-                atomic_durations[met].append(duration)
-            except KeyError:
-                atomic_durations[met] = [duration]
-
-    for k, v in six.iteritems(output):
-        output_stacked.append({"key": k, "values": utils.compress(v)})
-
-    for k, v in six.iteritems(atomic_durations):
-        atomic_durations[k] = utils.compress(v)
+        success_durations.append(r["duration"])
+        for action, duration in r["atomic_actions"].items():
+            # in case any single atomic action failed, put 0
+            _add_to_column(atomic_success, action, len(success_durations) - 1,
+                           duration or 0.0)
+
+    _pad_columns(output, len(result))
+    _pad_columns(atomic, len(result))
+    _pad_columns(atomic_success, len(success_durations))
+
+    output_stacked = [
+        {"key": k, "values": v} for k, v in zip(
+            output, utils.compress_series(list(output.values()),
+                                          strategy=DOWNSAMPLING))]
+    atomic_durations = costilius.OrderedDict(zip(
+        atomic, utils.compress_series(list(atomic.values()),
+                                      strategy=DOWNSAMPLING)))
+    durations, idle_durations = utils.compress_series(
+        [durations, idle_durations], strategy=DOWNSAMPLING)
 
     return {
         "total_durations": {
-            "duration": utils.compress(durations),
-            "idle_duration": utils.compress(idle_durations)},
+            "duration": durations,
+            "idle_duration": idle_durations},
         "atomic_durations": atomic_durations,
+        "success_durations": success_durations,
+        "atomic_success_durations": atomic_success,
+        "atomic_table_durations": atomic_table,
         "output": output_stacked,
         "output_errors": output_errors,
         "errors": errors,
+        "iterations_num": len(result),
         "sla": data["sla"],
         "load_duration": data["load_duration"],
         "full_duration": data["full_duration"],
     }
 
 
-def _process_main_duration(result, data):
-    histogram_data = [r["duration"] for r in result["result"]
-                      if not r["error"]]
+def _process_main_duration(data):
+    histogram_data = data["success_durations"]
     histograms = []
     if histogram_data:
-        hvariety = histo.hvariety(histogram_data)
-        for i in range(len(hvariety)):
-            histograms.append(histo.Histogram(histogram_data,
-                                              hvariety[i]["number_of_bins"],
-                                              hvariety[i]["method"]))
+        histograms = histo.histograms(histogram_data)
 
     stacked_area = []
     for key in "duration", "idle_duration":
@@ -137,70 +167,14 @@ def _process_main_duration(result, data):
     }
 
 
-def _process_atomic(result, data):
-
-    def avg(lst, key=None):
-        lst = lst if not key else map(lambda x: x[key], lst)
-        return utils.mean(lst)
-
-    # NOTE(boris-42): In our result["result"] we have next structure:
-    #                 {"error": NoneOrDict,
-    #                  "atomic_actions": {
-    #                       "action1": <duration>,
-    #                       "action2": <duration>
-    #                   }
-    #                 }
-    #                 Our goal is to get next structure:
-    #                 [{"key": $atomic_actions.action,
-    #                   "values": [[order, $atomic_actions.duration
-    #                              if not $error else 0], ...}]
-    #
-    #                 Order of actions in "atomic_action" is similar for
-    #                 all iteration. So we should take first non "error"
-    #                 iteration. And get in atomitc_iter list:
-    #                 [{"key": "action", "values":[]}]
-    stacked_area = []
-    for row in result["result"]:
-        if not row["error"] and "atomic_actions" in row:
-            stacked_area = [{"key": a, "values": []}
-                            for a in row["atomic_actions"]]
-            break
-
-    # NOTE(boris-42): pie is similar to stacked_area, only difference is in
-    #                 structure of values. In case of $error we shouldn't put
-    #                 anything in pie. In case of non error we should put just
-    #                 $atomic_actions.duration (without order)
-    pie = []
-    histogram_data = []
-    if stacked_area:
-        pie = copy.deepcopy(stacked_area)
-        histogram_data = copy.deepcopy(stacked_area)
-        for i, res in enumerate(result["result"]):
-            # in case of error put (order, 0.0) to all actions of stacked area
-            if res["error"]:
-                for k in range(len(stacked_area)):
-                    stacked_area[k]["values"].append([i + 1, 0.0])
-                continue
-
-            # in case of non error put real durations to pie and stacked area
-            for j, action in enumerate(res["atomic_actions"].keys()):
-                # in case any single atomic action failed, put 0
-                action_duration = res["atomic_actions"][action] or 0.0
-                pie[j]["values"].append(action_duration)
-                histogram_data[j]["values"].append(action_duration)
-
-    # filter out empty action lists in pie / histogram to avoid errors
-    pie = filter(lambda x: x["values"], pie)
-    histogram_data = [x for x in histogram_data if x["values"]]
-
-    histograms = [[] for atomic_action in range(len(histogram_data))]
-    for i, atomic_action in enumerate(histogram_data):
-        hvariety = histo.hvariety(atomic_action["values"])
-        for v in range(len(hvariety)):
-            histograms[i].append(histo.Histogram(atomic_action["values"],
-                                                 hvariety[v]["number_of_bins"],
-                                                 hvariety[v]["method"],
-                                                 atomic_action["key"]))
+def _process_atomic(data):
+    # NOTE(boris-42): In case of $error we shouldn't put anything in pie
+    #                 and histograms, so they are built from durations of
+    #                 successful iterations only.
+    successful = [(name, durations) for name, durations
+                  in six.iteritems(data["atomic_success_durations"])
+                  if durations]
+
     stacked_area = []
     for name, durations in six.iteritems(data["atomic_durations"]):
         stacked_area.append({
@@ -211,103 +185,184 @@ def _process_atomic(result, data):
     return {
         "histogram": [[
             {
-                "key": action.key,
+                "key": histogram.key,
                 "disabled": i,
-                "method": action.method,
+                "method": histogram.method,
                 "values": [{"x": round(x, 2), "y": y}
-                           for x, y in zip(action.x_axis, action.y_axis)]
-            } for action in atomic_action_list]
-            for i, atomic_action_list in enumerate(histograms)
+                           for x, y in zip(histogram.x_axis,
+                                           histogram.y_axis)]
+            } for histogram in histo.histograms(durations, name)]
+            for i, (name, durations) in enumerate(successful)
         ],
         "iter": stacked_area,
-        "pie": [{"key": x["key"], "value": avg(x["values"])} for x in pie]
+        "pie": [{"key": name, "value": utils.mean(durations)}
+                for name, durations in successful]
     }
 
 
-def _get_atomic_action_durations(result):
-    raw = result.get("result", [])
-    actions_data = utils.get_atomic_actions_data(raw)
-    table = []
-    total = []
-    for action in actions_data:
-        durations = actions_data[action]
-        if durations:
-            data = [action,
-                    round(min(durations), 3),
-                    round(utils.median(durations), 3),
-                    round(utils.percentile(durations, 0.90), 3),
-                    round(utils.percentile(durations, 0.95), 3),
-                    round(max(durations), 3),
-                    round(utils.mean(durations), 3),
-                    "%.1f%%" % (len(durations) * 100.0 / len(raw)),
-                    len(raw)]
-        else:
-            data = [action, None, None, None, None, None, None, 0, len(raw)]
-
-        # Save 'total' - it must be appended last
-        if action == "total":
-            total = data
-            continue
-        table.append(data)
+def _process_timeline(result):
+    windows = timeline.timeline(result["result"])["windows"]
+
+    def series(key, get_value, precision=2):
+        # Windows without values (e.g. percentiles of windows where all
+        # iterations failed) are skipped, so gaps don't look like zeros
+        return {"key": key,
+                "values": [(round(w["time"], 2), round(get_value(w),
+                                                       precision))
+                           for w in windows if get_value(w) is not None]}
+
+    return {
+        "throughput": [series("iterations/sec", lambda w: w["throughput"])],
+        "concurrency": [series("concurrency", lambda w: w["concurrency"])],
+        "errors": [series("failures (%)",
+                          lambda w: w["errors_rate"] * 100, precision=1)],
+        "percentiles": [
+            series(name, lambda w, name=name: w["percentiles"][name],
+                   precision=3)
+            for name, percent in timeline.PERCENTILES]
+    }
+
+
+def _process_steps(result):
+    levels = steps.steps(result["result"])
+
+    def series(key, get_value, precision=2):
+        return {"key": key,
+                "values": [(s["concurrency"], round(get_value(s), precision))
+                           for s in levels if get_value(s) is not None]}
+
+    return {
+        "table": [[s["concurrency"],
+                   round(s["duration"], 2),
+                   s["iterations"],
+                   s["throughput"] and round(s["throughput"], 2),
+                   "%.1f%%" % (s["errors_rate"] * 100)] +
+                  [s["percentiles"][name] and round(s["percentiles"][name], 3)
+                   for name, percent in timeline.PERCENTILES]
+                  for s in levels],
+        "throughput": [series("iterations/sec", lambda s: s["throughput"])],
+        "percentiles": [
+            series(name, lambda s, name=name: s["percentiles"][name],
+                   precision=3)
+            for name, percent in timeline.PERCENTILES]
+    }
 
-    if total:
-        table.append(total)
 
+def _get_durations_row(action, durations, iterations_num):
+    if not durations:
+        return [action, None, None, None, None, None, None, 0,
+                iterations_num]
+    durations = sorted(durations)
+    return [action,
+            round(durations[0], 3),
+            round(utils.median(durations, presorted=True), 3),
+            round(utils.percentile(durations, 0.90, presorted=True), 3),
+            round(utils.percentile(durations, 0.95, presorted=True), 3),
+            round(durations[-1], 3),
+            round(utils.mean(durations), 3),
+            "%.1f%%" % (len(durations) * 100.0 / iterations_num),
+            iterations_num]
+
+
+def _get_atomic_action_durations(data):
+    iterations_num = data["iterations_num"]
+    table = [_get_durations_row(action, durations, iterations_num)
+             for action, durations
+             in six.iteritems(data["atomic_table_durations"])]
+    # 'total' must be appended last
+    table.append(_get_durations_row("total", data["success_durations"],
+                                    iterations_num))
     return table
 
 
-def _process_results(results):
-    output = []
+def _process_result(result):
+    table_cols = ["Action",
+                  "Min (sec)",
+                  "Median (sec)",
+                  "90%ile (sec)",
+                  "95%ile (sec)",
+                  "Max (sec)",
+                  "Avg (sec)",
+                  "Success",
+                  "Count"]
+    scenario_name, kw, pos = (result["key"]["name"],
+                              result["key"]["kw"], result["key"]["pos"])
+    data = _prepare_data(result)
+    table_rows = _get_atomic_action_durations(data)
+    iterations = _process_main_duration(data)
+    cls = scenario_name.split(".")[0]
+    met = scenario_name.split(".")[1]
+    name = "%s%s" % (met, (pos and " [%d]" % (int(pos) + 1) or ""))
+
+    return {
+        "cls": cls,
+        "met": met,
+        "pos": int(pos),
+        "name": name,
+        "runner": kw["runner"]["type"],
+        "config": json.dumps({scenario_name: [kw]}, indent=2),
+        "iterations": iterations,
+        "atomic": _process_atomic(data),
+        "timeline": _process_timeline(result),
+        "steps": _process_steps(result),
+        "table_cols": table_cols,
+        "table_rows": table_rows,
+        "output": data["output"],
+        "output_errors": data["output_errors"],
+        "errors": data["errors"],
+        "errors_num": len(data["errors"]),
+        "histogram_methods": [h["method"] for h in iterations["histogram"]],
+        "load_duration": data["load_duration"],
+        "full_duration": data["full_duration"],
+        "contexts": result.get("contexts", []),
+        "runner_stats": result.get("runner_stats", {}),
+        "sla": data["sla"],
+        "sla_success": all([sla["success"] for sla in data["sla"]]),
+        "iterations_num": data["iterations_num"],
+    }
+
+
+def _json_block(block_id, data):
+    # "</" inside of JSON would close the script element
+    return ('<script type="application/json" id="%s">%s</script>\n'
+            % (block_id, json.dumps(data).replace("</", "<\\/")))
+
+
+def write_report(results, out):
+    """Write HTML report to file-like object.
+
+    Results are processed one by one, so results may be a generator that
+    loads them lazily. Charts data of every workload is written to its own
+    JSON block, which is parsed by the report only when the workload is
+    opened. Only short summaries of workloads are kept in memory.
+
+    :param results: iterable of workloads results
+    :param out: file-like object
+    """
+    template = ui_utils.get_template("task/report.mako")
+    head, tail = template.render(
+        data_blocks=DATA_BLOCKS_MARKER).split(DATA_BLOCKS_MARKER)
+    out.write(head)
+
     source_dict = {}
-    for result in results:
-        table_cols = ["Action",
-                      "Min (sec)",
-                      "Median (sec)",
-                      "90%ile (sec)",
-                      "95%ile (sec)",
-                      "Max (sec)",
-                      "Avg (sec)",
-                      "Success",
-                      "Count"]
-        table_rows = _get_atomic_action_durations(result)
-        scenario_name, kw, pos = (result["key"]["name"],
-                                  result["key"]["kw"], result["key"]["pos"])
-        data = _prepare_data(result)
-        cls = scenario_name.split(".")[0]
-        met = scenario_name.split(".")[1]
-        name = "%s%s" % (met, (pos and " [%d]" % (int(pos) + 1) or ""))
-
-        try:
-            source_dict[scenario_name].append(kw)
-        except KeyError:
-            source_dict[scenario_name] = [kw]
-        output.append({
-            "cls": cls,
-            "met": met,
-            "pos": int(pos),
-            "name": name,
-            "runner": kw["runner"]["type"],
-            "config": json.dumps({scenario_name: [kw]}, indent=2),
-            "iterations": _process_main_duration(result, data),
-            "atomic": _process_atomic(result, data),
-            "table_cols": table_cols,
-            "table_rows": table_rows,
-            "output": data["output"],
-            "output_errors": data["output_errors"],
-            "errors": data["errors"],
-            "load_duration": data["load_duration"],
-            "full_duration": data["full_duration"],
-            "sla": data["sla"],
-            "sla_success": all([sla["success"] for sla in data["sla"]]),
-            "iterations_num": len(result["result"]),
-        })
-    source = json.dumps(source_dict, indent=2, sort_keys=True)
-    scenarios = sorted(output, key=lambda r: "%s%s" % (r["cls"], r["name"]))
-    return source, scenarios
+    scenarios = []
+    for idx, result in enumerate(results):
+        scenario = _process_result(result)
+        details = dict((key, scenario.pop(key)) for key in DETAILS_KEYS)
+        scenario["details_id"] = "workload-%d" % idx
+        out.write(_json_block(scenario["details_id"], details))
+        scenarios.append(scenario)
+        source_dict.setdefault(result["key"]["name"], []).append(
+            result["key"]["kw"])
+
+    scenarios.sort(key=lambda r: "%s%s" % (r["cls"], r["name"]))
+    out.write(_json_block("scenarios", scenarios))
+    out.write(_json_block("source", json.dumps(source_dict, indent=2,
+                                               sort_keys=True)))
+    out.write(tail)
 
 
 def plot(results):
-    template = ui_utils.get_template("task/report.mako")
-    source, scenarios = _process_results(results)
-    return template.render(data=json.dumps(scenarios),
-                           source=json.dumps(source))
+    out = six.StringIO()
+    write_report(results, out)
+    return out.getvalue()
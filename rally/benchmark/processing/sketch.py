@@ -0,0 +1,190 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compact summaries of durations.
+
+Sketch keeps counts of values in buckets with exponentially growing
+bounds, so any quantile is known with relative error not bigger than
+the accuracy, while the sketch of millions of durations takes only a
+few hundreds of buckets. Sketches are calculated when results are
+stored, so results of huge tasks can be compared without processing
+all iterations again.
+"""
+
+import math
+
+import six
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Relative error of quantiles
+ACCURACY = 0.01
+
+
+class Sketch(object):
+    """Mergeable log-bucketed histogram of non-negative values."""
+
+    def __init__(self, values=(), accuracy=ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self.add_all(values)
+
+    def _index(self, value):
+        return int(math.ceil(math.log(value) / self._log_gamma))
+
+    def _value(self, index):
+        # The middle of bucket in terms of relative error
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value):
+        if value > 0:
+            index = self._index(value)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        else:
+            self.zeros += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def add_all(self, values):
+        if not len(values):
+            return
+        if numpy is None:
+            values = list(values)
+            positive = [v for v in values if v > 0]
+            for value in positive:
+                index = self._index(value)
+                self.buckets[index] = self.buckets.get(index, 0) + 1
+            low, high = min(values), max(values)
+        else:
+            values = numpy.asarray(values, dtype=float)
+            positive = values[values > 0]
+            indexes, counts = numpy.unique(
+                numpy.ceil(numpy.log(positive) / self._log_gamma),
+                return_counts=True)
+            for index, count in zip(indexes.tolist(), counts.tolist()):
+                index = int(index)
+                self.buckets[index] = self.buckets.get(index, 0) + count
+            low, high = values.min().item(), values.max().item()
+            values = values.tolist()
+
+        self.zeros += len(values) - len(positive)
+        self.count += len(values)
+        self.sum += math.fsum(values)
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other):
+        """Add values of other sketch with the same accuracy."""
+        for index, count in six.iteritems(other.buckets):
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.sum += other.sum
+        for value in other.min, other.max:
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def bins(self):
+        """Return sorted list of (value, count), zeros go first."""
+        bins = [(self._value(i), c) for i, c in sorted(self.buckets.items())]
+        if self.zeros:
+            bins.insert(0, (0.0, self.zeros))
+        return bins
+
+    def value_at_rank(self, rank):
+        """Return value that is at position rank (0-based) of sorted values.
+
+        :param rank: int, it is clipped to [0, count - 1]
+        """
+        if not self.count:
+            return None
+        rank = max(0, min(rank, self.count - 1))
+        seen = 0
+        for value, count in self.bins():
+            seen += count
+            if seen > rank:
+                return max(self.min, min(value, self.max))
+
+    def percentile(self, percent):
+        """Return approximate percentile of values.
+
+        :param percent: float value from 0.0 to 1.0
+        """
+        if not self.count:
+            return None
+        return self.value_at_rank(int(round((self.count - 1) * percent)))
+
+    def to_dict(self):
+        return {"accuracy": self.accuracy,
+                "buckets": sorted(self.buckets.items()),
+                "zeros": self.zeros,
+                "count": self.count,
+                "sum": self.sum,
+                "min": self.min,
+                "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(accuracy=data["accuracy"])
+        sketch.buckets = dict((int(i), c) for i, c in data["buckets"])
+        sketch.zeros = data["zeros"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch
+
+
+def workload_sketches(iterations):
+    """Calculate sketches of durations of successful iterations.
+
+    :param iterations: list of iterations results of a workload
+    :returns: dict with number of "iterations" and "errors", "total"
+              sketch of durations and sketches of "atomic" actions
+              durations; sketches are in to_dict() format
+    """
+    total = []
+    atomic = {}
+    errors = 0
+    for r in iterations:
+        if r["error"]:
+            errors += 1
+            continue
+        total.append(r["duration"])
+        for action, duration in six.iteritems(r["atomic_actions"]):
+            if duration is not None:
+                atomic.setdefault(action, []).append(duration)
+    return {"iterations": len(iterations),
+            "errors": errors,
+            "total": Sketch(total).to_dict(),
+            "atomic": dict((action, Sketch(durations).to_dict())
+                           for action, durations in six.iteritems(atomic))}
@@ -0,0 +1,86 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Analysis of iterations by concurrency levels of the load.
+
+Runners that change concurrency during the load (e.g. ramp_up) tag each
+iteration with the concurrency it was started at. Statistics of the
+levels give throughput and latency as functions of concurrency, i.e.
+the capacity curve of the cloud, from a single workload.
+"""
+
+import bisect
+
+from rally.benchmark.processing import timeline
+from rally.benchmark.processing import utils
+
+
+def _end(iteration):
+    return (iteration["timestamp"] + iteration["duration"] +
+            iteration["idle_duration"])
+
+
+def steps(iterations):
+    """Calculate load statistics per concurrency level.
+
+    Level lasts from the start of its first iteration till the start of
+    the first iteration of the next level (the last level lasts till the
+    end of the load). Throughput of the level is the number of iterations
+    of any level finished during it per second, durations are taken from
+    iterations started at the level.
+
+    :param iterations: list of iterations results of a workload,
+                       iterations without "concurrency" are ignored
+    :returns: list of dicts in order of levels with keys "concurrency",
+              "time" (offset of the level from the start of the first
+              one), "duration", "iterations", "errors", "errors_rate"
+              (0.0 - 1.0), "throughput" (iterations/sec, None for levels
+              of zero duration) and "percentiles" of durations of
+              successful iterations (None if there aren't any)
+    """
+    levels = {}
+    for r in iterations:
+        if "concurrency" in r:
+            levels.setdefault(r["concurrency"], []).append(r)
+    if not levels:
+        return []
+
+    bounds = sorted((min(r["timestamp"] for r in level), concurrency)
+                    for concurrency, level in levels.items())
+    ends = sorted(_end(r) for level in levels.values() for r in level)
+    started_at = bounds[0][0]
+
+    result = []
+    for idx, (start, concurrency) in enumerate(bounds):
+        end = bounds[idx + 1][0] if idx + 1 < len(bounds) else ends[-1]
+        duration = end - start
+        finished = (bisect.bisect_right(ends, end) -
+                    bisect.bisect_right(ends, start))
+        level = levels[concurrency]
+        errors = len([r for r in level if r["error"]])
+        durations = sorted(r["duration"] for r in level if not r["error"])
+        result.append({
+            "concurrency": concurrency,
+            "time": start - started_at,
+            "duration": duration,
+            "iterations": len(level),
+            "errors": errors,
+            "errors_rate": float(errors) / len(level),
+            "throughput": finished / duration if duration else None,
+            "percentiles": dict(
+                (name, utils.percentile(durations, percent, presorted=True))
+                for name, percent in timeline.PERCENTILES)
+        })
+    return result
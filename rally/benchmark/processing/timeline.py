@@ -0,0 +1,117 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Time-bucketed analysis of iterations.
+
+Iterations are grouped into windows of equal length by wall-clock time,
+which shows how the load and the cloud behaved during the run, e.g. when
+throughput stopped growing while latency kept going up.
+"""
+
+import math
+
+from rally.benchmark.processing import utils
+
+
+# Default number of windows the load is divided into
+WINDOWS = 100
+
+PERCENTILES = (("median", 0.5), ("90%ile", 0.9), ("95%ile", 0.95),
+               ("99%ile", 0.99))
+
+
+def timeline(iterations, window=None, windows=WINDOWS):
+    """Calculate load statistics per time window.
+
+    Iteration belongs to the window where it finished. Concurrency is the
+    average number of iterations in flight, so iteration that overlaps
+    several windows is counted in each of them for the overlapped time.
+
+    :param iterations: list of iterations results of a workload
+    :param window: float, length of window in seconds, by default load
+                   duration is divided into `windows' windows
+    :param windows: int, number of windows if window length isn't specified
+    :returns: dict with keys:
+              "started_at" - timestamp of the first iteration start,
+              "window" - length of windows in seconds,
+              "windows" - list of dicts with keys "time" (offset of window
+              from "started_at"), "duration", "iterations", "errors",
+              "throughput" (iterations/sec), "concurrency", "errors_rate"
+              (0.0 - 1.0) and "percentiles" of durations of successful
+              iterations (None if there aren't any)
+    """
+    if not iterations:
+        return {"started_at": None, "window": window, "windows": []}
+
+    spans = [(r["timestamp"],
+              r["timestamp"] + r["duration"] + r["idle_duration"])
+             for r in iterations]
+    started_at = min(s for s, e in spans)
+    duration = max(e for s, e in spans) - started_at
+    if not window:
+        window = duration / windows or 1.0
+    # round() protects from 100.00000001 windows because of floats
+    count = max(1, int(math.ceil(round(duration / window, 6))))
+
+    def index(offset):
+        return min(int(offset / window), count - 1)
+
+    busy = [0.0] * count
+    # +1/-1 marks of windows fully covered by iterations
+    covered = [0] * (count + 1)
+    finished = [0] * count
+    failed = [0] * count
+    durations = [[] for i in range(count)]
+
+    for (start, end), r in zip(spans, iterations):
+        start -= started_at
+        end -= started_at
+        first, last = index(start), index(end)
+
+        finished[last] += 1
+        if r["error"]:
+            failed[last] += 1
+        else:
+            durations[last].append(r["duration"])
+
+        if first == last:
+            busy[first] += end - start
+        else:
+            busy[first] += (first + 1) * window - start
+            busy[last] += end - last * window
+            covered[first + 1] += 1
+            covered[last] -= 1
+
+    result = []
+    in_flight = 0
+    for i in range(count):
+        in_flight += covered[i]
+        length = min(window, duration - i * window) or window
+        values = sorted(durations[i])
+        result.append({
+            "time": i * window,
+            "duration": length,
+            "iterations": finished[i],
+            "errors": failed[i],
+            "throughput": finished[i] / length,
+            "concurrency": (busy[i] + in_flight * window) / length,
+            "errors_rate": float(failed[i]) / finished[i] if finished[i]
+            else 0.0,
+            "percentiles": dict(
+                (name, utils.percentile(values, percent, presorted=True))
+                for name, percent in PERCENTILES)
+        })
+
+    return {"started_at": started_at, "window": window, "windows": result}
@@ -15,6 +15,7 @@
 
 import math
 
+from rally.benchmark.processing import downsampling
 from rally.common.i18n import _
 from rally import exceptions
 
@@ -32,17 +33,19 @@ def mean(values):
     return math.fsum(values) / len(values)
 
 
-def median(values):
+def median(values, presorted=False):
     """Find the sample median of a list of values.
 
     :parameter values: non-empty list of numbers
+    :parameter presorted: True if values are already sorted
 
     :returns: float value
      """
     if not values:
         raise ValueError(_("no median for empty data"))
 
-    values = sorted(values)
+    if not presorted:
+        values = sorted(values)
     size = len(values)
 
     if size % 2 == 1:
@@ -52,17 +55,19 @@ def median(values):
         return (values[index - 1] + values[index]) / 2.0
 
 
-def percentile(values, percent):
+def percentile(values, percent, presorted=False):
     """Find the percentile of a list of values.
 
     :parameter values: list of numbers
     :parameter percent: float value from 0.0 to 1.0
+    :parameter presorted: True if values are already sorted
 
     :returns: the percentile of values
     """
     if not values:
         return None
-    values.sort()
+    if not presorted:
+        values.sort()
     k = (len(values) - 1) * percent
     f = math.floor(k)
     c = math.ceil(k)
@@ -96,19 +101,44 @@ def get_atomic_actions_data(raw_data):
     return actions_data
 
 
-def compress(data, limit=1000, merge=None, normalize=None):
+def compress_series(series, limit=1000, normalize=None, strategy="min_max"):
+    """Enumerate and reduce a few lists of values to the same indices.
+
+    :param series: list of data lists of the same length, e.g. series of
+                   one stacked chart
+    :param limit: int, max length of every result list
+    :param normalize: function that guarantees sanity of value
+    :param strategy: name of downsampling strategy from
+                     downsampling.STRATEGIES
+    :returns: list of items lists [(idx1, value1), (idx2, value2) ...]
+    """
+    if not normalize:
+        normalize = lambda i: i and round(float(i), 2) or 0.0
+
+    return [[(idx, normalize(v)) for idx, v in points]
+            for points in downsampling.select(series, limit, strategy)]
+
+
+def compress(data, limit=1000, merge=None, normalize=None, strategy=None):
     """Enumerate and reduce list of values.
 
     :param data: data list
     :param limit: int, max length of result list
     :param merge: function that merges two values
     :param normalize: function that guarantees sanity of value
+    :param strategy: name of downsampling strategy from
+                     downsampling.STRATEGIES, by default neighbour values
+                     are merged
     :returns: items list [(idx1, value1), (idx2, value2) ...]
     """
 
     if not normalize:
         normalize = lambda i: i and round(float(i), 2) or 0.0
 
+    if strategy and len(data) > limit:
+        return [(idx, normalize(v)) for idx, v
+                in downsampling.STRATEGIES[strategy](data, limit)]
+
     if not merge:
         merge = lambda a, b: normalize((a + normalize(b)) / 2)
 
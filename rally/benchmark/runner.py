@@ -17,23 +17,47 @@ import abc
 import collections
 import multiprocessing
 import random
+import sys
+import threading
 import time
 
 import jsonschema
 import six
+from six import moves
 
 from rally.benchmark.scenarios import base as scenario_base
 from rally.benchmark import types
 from rally.benchmark import utils
+from rally.common.i18n import _
 from rally.common import log as logging
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
 from rally import consts
+from rally import exceptions
 from rally import osclients
 
 
 LOG = logging.getLogger(__name__)
 
+# Schema of "warmup" option of runners, warm-up is limited either by number
+# of iterations or by duration in seconds
+WARMUP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "iterations": {
+            "type": "integer",
+            "minimum": 1
+        },
+        "duration": {
+            "type": "number",
+            "minimum": 0
+        }
+    },
+    "minProperties": 1,
+    "maxProperties": 1,
+    "additionalProperties": False
+}
+
 
 def format_result_on_timeout(exc, timeout):
     return {
@@ -95,8 +119,93 @@ def _run_scenario_once(args):
                 "atomic_actions": scenario.atomic_actions()}
 
 
-def _worker_thread(queue, args):
-    queue.put(_run_scenario_once(args))
+class _IterationThread(threading.Thread):
+    """Thread that runs a single scenario iteration with a timeout.
+
+    Threads can't be killed, so the iteration that runs longer than timeout
+    is orphaned: the timeout result is put to the queue instead of its
+    result, which is dropped when the iteration is finished. Orphaned
+    threads are daemonic, so they don't keep worker process alive.
+    """
+
+    def __init__(self, queue, args, timeout=0):
+        """Iteration thread constructor.
+
+        :param queue: queue object to put the result to
+        :param args: args of _run_scenario_once()
+        :param timeout: iteration's timeout, 0 means no timeout
+        """
+        super(_IterationThread, self).__init__()
+        self.daemon = True
+        self.queue = queue
+        self.args = args
+        self.timeout = timeout
+        self.started_at = None
+        self._lock = threading.Lock()
+        self._finished = False
+        self._timed_out = False
+
+    def start(self):
+        self.started_at = time.time()
+        super(_IterationThread, self).start()
+
+    def run(self):
+        result = _run_scenario_once(self.args)
+        with self._lock:
+            self._finished = True
+            if not self._timed_out:
+                self.queue.put(result)
+
+    def check_timeout(self):
+        """Orphan the iteration if it runs longer than timeout.
+
+        :returns: True if the iteration is orphaned by this call
+        """
+        if (not self.timeout or self._finished or
+                time.time() - self.started_at < self.timeout):
+            return False
+        with self._lock:
+            if self._finished:
+                return False
+            self._timed_out = True
+            iteration, cls, method_name, context, kwargs = self.args
+            LOG.warning("Task %(task)s | ITER: %(iteration)s timed out after "
+                        "%(timeout)s seconds" %
+                        {"task": context["task"]["uuid"],
+                         "iteration": iteration, "timeout": self.timeout})
+            result = format_result_on_timeout(
+                multiprocessing.TimeoutError(
+                    "Iteration %s is not finished in %s seconds" %
+                    (iteration, self.timeout)), self.timeout)
+            result["timestamp"] = self.started_at
+            self.queue.put(result)
+            return True
+
+
+def _release_threads(pool, orphans):
+    """Remove finished and timed out iteration threads from the pool.
+
+    :param pool: deque of running _IterationThread objects
+    :param orphans: list of orphaned threads, timed out threads are added
+                    to it and finished ones are removed
+    """
+    for i in range(len(pool)):
+        thread = pool.popleft()
+        if thread.check_timeout():
+            orphans.append(thread)
+        elif thread.is_alive():
+            pool.append(thread)
+        else:
+            thread.join()
+    orphans[:] = [thread for thread in orphans if thread.is_alive()]
+
+
+def _log_orphans(orphans):
+    """Log orphaned iterations that are abandoned by the worker."""
+    orphans = [thread for thread in orphans if thread.is_alive()]
+    if orphans:
+        LOG.warning("%d timed out iterations are still running, they are "
+                    "abandoned" % len(orphans))
 
 
 def _log_worker_info(**info):
@@ -120,6 +229,10 @@ class ScenarioRunnerResult(dict):
             "duration": {
                 "type": "number"
             },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
             "timestamp": {
                 "type": "number"
             },
@@ -175,10 +288,27 @@ class ScenarioRunner(plugin.Plugin):
     periodically for a given number of times or seconds.
     These strategies should be implemented in subclasses of ScenarioRunner
     in the_run_scenario() method.
+
+    If runner config has "warmup" option, the same strategy is run before
+    the load for the given number of iterations or seconds. Results of
+    warm-up iterations are put to warmup_queue instead of result_queue, so
+    they don't affect SLA and statistics.
     """
 
     CONFIG_SCHEMA = {}
 
+    # Runners that adjust the load to SLA can't work without SLA criteria
+    REQUIRES_SLA = False
+
+    # Value of runner option that limits the load, which is big enough to
+    # run it until warm-up is stopped
+    UNLIMITED = sys.maxsize
+
+    # Seconds that worker processes are given to exit after hard abort,
+    # they are terminated only then to not break the result queue which
+    # they may be writing to
+    HARD_ABORT_GRACE_PERIOD = 1.0
+
     def __init__(self, task, config):
         """Runner constructor.
 
@@ -191,13 +321,39 @@ class ScenarioRunner(plugin.Plugin):
         self.task = task
         self.config = config
         self.result_queue = collections.deque()
+        self.warmup_queue = collections.deque()
         self.aborted = multiprocessing.Event()
+        # Warm-up is stopped by the aborted event too, the lock guarantees
+        # that abort() called at the end of warm-up isn't lost
+        self._abort_lock = threading.Lock()
+        self._abort_requested = False
+        self._hard_abort = False
+        self._warmup = None
+        # Worker processes that are joined, hard abort terminates them
+        self._processes = ()
+        # Max number of CPUs that the engine allows runner to use, e.g. when
+        # a few workloads are run concurrently
+        self.cpu_limit = None
+        # "sla" section of the workload config, it's set by the engine for
+        # runners that adjust the load to SLA
+        self.sla_config = {}
+        # Runner specific data about the load, which is stored with results
+        self.stats = {}
 
     @staticmethod
-    def validate(config):
-        """Validates runner's part of task config."""
+    def validate(config, sla_config=None):
+        """Validates runner's part of task config.
+
+        :param config: runner section of workload config
+        :param sla_config: sla section of workload config, it's checked
+                           only if it's not None
+        """
         runner = ScenarioRunner.get(config.get("type", "serial"))
         jsonschema.validate(config, runner.CONFIG_SCHEMA)
+        if runner.REQUIRES_SLA and sla_config is not None and not sla_config:
+            raise exceptions.InvalidTaskException(
+                message=_("Runner %s requires SLA criteria in \"sla\" "
+                          "section of the workload") % runner.get_name())
 
     @abc.abstractmethod
     def _run_scenario(self, cls, method_name, context, args):
@@ -217,18 +373,96 @@ class ScenarioRunner(plugin.Plugin):
         cls_name, method_name = name.split(".", 1)
         cls = scenario_base.Scenario.get_by_name(cls_name)
 
-        self.aborted.clear()
-
         # NOTE(boris-42): processing @types decorators
         args = types.preprocess(cls, method_name, context, args)
 
+        return self.run_load(cls, method_name, context, args)
+
+    def run_load(self, cls, method_name, context, args):
+        """Run warm-up and the load with already preprocessed args.
+
+        :returns: duration of the load in seconds
+        """
+        self.aborted.clear()
+        self._abort_requested = False
+        self._hard_abort = False
+
+        if self.config.get("warmup"):
+            self._run_warmup(cls, method_name, context, args)
+
         with rutils.Timer() as timer:
             self._run_scenario(cls, method_name, context, args)
         return timer.duration()
 
-    def abort(self):
-        """Abort the execution of further benchmark scenario iterations."""
-        self.aborted.set()
+    def abort(self, hard=False):
+        """Abort the execution of further benchmark scenario iterations.
+
+        :param hard: if True, worker processes that don't exit in
+                     HARD_ABORT_GRACE_PERIOD are terminated, so results of
+                     iterations in progress are lost. Otherwise these
+                     iterations are finished.
+        """
+        with self._abort_lock:
+            self._abort_requested = True
+            self._hard_abort = self._hard_abort or hard
+            self.aborted.set()
+
+    def _terminate_processes(self):
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+
+    def _get_warmup_config(self, warmup):
+        """Return runner config for warm-up.
+
+        Runners limited by number of iterations run warm-up iterations the
+        same way, warm-up limited by duration is stopped by abort event.
+        Runners with other limits should override this method.
+
+        :param warmup: "warmup" option of runner config
+        """
+        return dict(self.config,
+                    times=warmup.get("iterations", self.UNLIMITED))
+
+    def _stop_warmup(self):
+        with self._abort_lock:
+            if self._warmup is not None:
+                self.aborted.set()
+
+    def _run_warmup(self, cls, method_name, context, args):
+        warmup = self.config["warmup"]
+        config = self.config
+        self.config = self._get_warmup_config(warmup)
+        self._warmup = warmup
+        timer = None
+        if "duration" in warmup:
+            timer = threading.Timer(warmup["duration"], self._stop_warmup)
+            timer.start()
+        try:
+            LOG.info("Running %s of warm-up" % ", ".join(
+                "%s %s" % (v, k) for k, v in six.iteritems(warmup)))
+            self._run_scenario(cls, method_name, context, args)
+        finally:
+            if timer:
+                timer.cancel()
+            with self._abort_lock:
+                self.config = config
+                self._warmup = None
+                if not self._abort_requested:
+                    self.aborted.clear()
+
+    def _get_max_cpu_used(self):
+        """Return number of CPUs that worker processes are allowed to use.
+
+        It's limited by "max_cpu_count" of runner config and by cpu_limit
+        set by the engine.
+        """
+        cpu_count = multiprocessing.cpu_count()
+        max_cpu_used = min(cpu_count,
+                           self.config.get("max_cpu_count", cpu_count))
+        if self.cpu_limit:
+            max_cpu_used = min(max_cpu_used, self.cpu_limit)
+        return max_cpu_used
 
     @staticmethod
     def _create_process_pool(processes_to_start, worker_process,
@@ -259,17 +493,38 @@ class ScenarioRunner(plugin.Plugin):
         :param process_pool: pool of processes to join
         :result_queue: multiprocessing.Queue that receives the results
         """
+        self._processes = tuple(process_pool)
+        terminate_at = None
         while process_pool:
+            if self._hard_abort:
+                # Results are received till processes are terminated, so
+                # they aren't blocked on writing to the full queue
+                if terminate_at is None:
+                    terminate_at = time.time() + self.HARD_ABORT_GRACE_PERIOD
+                elif time.time() >= terminate_at:
+                    self._terminate_processes()
+
             while process_pool and not process_pool[0].is_alive():
                 process_pool.popleft().join()
 
-            if result_queue.empty():
-                # sleep a bit to avoid 100% usage of CPU by this method
-                time.sleep(0.001)
-
-            while not result_queue.empty():
-                self._send_result(result_queue.get())
+            # timeout avoids 100% usage of CPU by this method
+            self._receive_results(result_queue, timeout=0.001)
+        self._receive_results(result_queue, timeout=0.01)
         result_queue.close()
+        self._processes = ()
+
+    def _receive_results(self, result_queue, timeout):
+        """Send results from the queue till it's empty for timeout seconds.
+
+        :param result_queue: multiprocessing.Queue that receives the results
+        :param timeout: seconds to wait for the next result
+        """
+        while True:
+            try:
+                result = result_queue.get(timeout=timeout)
+            except moves.queue.Empty:
+                return
+            self._send_result(result)
 
     def _send_result(self, result):
         """Send partial result to consumer.
@@ -278,7 +533,15 @@ class ScenarioRunner(plugin.Plugin):
                        ScenarioRunnerResult schema, otherwise
                        ValidationError is raised.
         """
-        self.result_queue.append(ScenarioRunnerResult(result))
+        result = ScenarioRunnerResult(result)
+        if self._warmup is None:
+            self.result_queue.append(result)
+            return
+        self.warmup_queue.append(result)
+        # Some runners can't be limited by number of iterations
+        if len(self.warmup_queue) >= self._warmup.get("iterations",
+                                                      self.UNLIMITED):
+            self._stop_warmup()
 
     def _log_debug_info(self, **info):
         """Log runner parameters for debugging.
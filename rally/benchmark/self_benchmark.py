@@ -0,0 +1,188 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Self-benchmark of scenario runners.
+
+Dummy.dummy does nothing, so running it shows how much load the runners
+themselves are able to generate and how much overhead they add.
+"""
+
+import math
+import multiprocessing
+import resource
+
+from rally.benchmark import runner
+from rally.common import log as logging
+from rally import objects
+from rally.plugins.common.scenarios.dummy import dummy
+
+
+LOG = logging.getLogger(__name__)
+
+RUNNERS = ["serial", "constant", "constant_for_duration", "rps"]
+
+# rps runner is launched with rate that is proportional to concurrency,
+# so bigger concurrency means bigger load.
+RPS_PER_CONCURRENT_ITERATION = 100
+
+SCENARIO = "%s.dummy" % dummy.Dummy.__name__
+
+
+def _get_context():
+    endpoint = objects.Endpoint("http://localhost/", "self-benchmark",
+                                "self-benchmark", "self-benchmark")
+    return {
+        "task": {"uuid": "self-benchmark"},
+        "admin": {"endpoint": endpoint},
+        "users": [{"id": "self-benchmark", "endpoint": endpoint,
+                   "tenant_id": "self-benchmark"}],
+        "tenants": {"self-benchmark": {"name": "self-benchmark"}}
+    }
+
+
+def _get_runner_config(runner_type, concurrency, times, duration):
+    if runner_type == "serial":
+        return {"type": runner_type, "times": times}
+    if runner_type == "constant":
+        return {"type": runner_type, "times": times,
+                "concurrency": concurrency}
+    if runner_type == "constant_for_duration":
+        return {"type": runner_type, "duration": duration,
+                "concurrency": concurrency}
+    if runner_type == "rps":
+        return {"type": runner_type, "times": times,
+                "rps": concurrency * RPS_PER_CONCURRENT_ITERATION,
+                "max_concurrency": concurrency}
+    raise ValueError("Self-benchmark doesn't support runner %s" % runner_type)
+
+
+def _get_workers_count(config):
+    """Return number of processes that runner uses for given config."""
+    cpu_count = multiprocessing.cpu_count()
+    if config["type"] == "serial":
+        return 1
+    if config["type"] == "constant":
+        return min(cpu_count, config["times"], config["concurrency"])
+    if config["type"] == "constant_for_duration":
+        return config["concurrency"]
+    return min(cpu_count, config["times"], config["max_concurrency"])
+
+
+def _get_cpu_time():
+    """Return CPU time used by this process and its finished children."""
+    cpu_time = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        cpu_time += usage.ru_utime + usage.ru_stime
+    return cpu_time
+
+
+def _get_lag(config, load_duration, results):
+    """Calculate average scheduling lag of iterations (in seconds).
+
+    For rps runner lag is how much iterations were started later than
+    they were scheduled. Other runners should start next iteration as soon
+    as a previous one is finished, so for them lag is the time that every
+    concurrent slot spent outside of the scenario per iteration.
+    """
+    if not results:
+        return 0.0
+    if config["type"] == "rps":
+        starts = sorted(r["timestamp"] for r in results)
+        period = 1.0 / config["rps"]
+        return math.fsum(max(0.0, start - (starts[0] + i * period))
+                         for i, start in enumerate(starts)) / len(starts)
+    concurrency = config.get("concurrency", 1)
+    busy = math.fsum(r["duration"] + r["idle_duration"] for r in results)
+    return max(0.0, load_duration * concurrency - busy) / len(results)
+
+
+def run_once(runner_type, concurrency, times=1000, duration=10.0):
+    """Run Dummy.dummy with specified runner and measure the runner.
+
+    :param runner_type: str, name of scenario runner
+    :param concurrency: int, concurrency of iterations
+    :param times: int, number of iterations (if runner supports it)
+    :param duration: float, load duration for constant_for_duration runner
+    :returns: dict with measurements
+    """
+    config = _get_runner_config(runner_type, concurrency, times, duration)
+    workers = _get_workers_count(config)
+    runner_obj = runner.ScenarioRunner.get(runner_type)(
+        {"uuid": "self-benchmark"}, config)
+
+    cpu_time = _get_cpu_time()
+    load_duration = runner_obj.run(SCENARIO, _get_context(), {})
+    cpu_time = _get_cpu_time() - cpu_time
+
+    results = list(runner_obj.result_queue)
+    errors = len([r for r in results if r["error"]])
+    iterations = len(results)
+    return {
+        "runner": runner_type,
+        "concurrency": config.get("concurrency",
+                                  config.get("max_concurrency", 1)),
+        "config": config,
+        "iterations": iterations,
+        "errors": errors,
+        "workers": workers,
+        "load_duration": load_duration,
+        "throughput": iterations / load_duration if load_duration else 0.0,
+        "lag": _get_lag(config, load_duration, results),
+        "cpu_per_worker": (cpu_time / workers / load_duration * 100
+                           if load_duration else 0.0)
+    }
+
+
+def run(runners=None, concurrency=None, times=1000, duration=10.0):
+    """Run self-benchmark for runners at increasing concurrency.
+
+    :param runners: list of runner names, all supported runners by default
+    :param concurrency: list of concurrency levels, [1, 10, 50] by default
+    :param times: int, number of iterations for each run
+    :param duration: float, load duration for constant_for_duration runner
+    :returns: list of dicts with measurements (see run_once())
+    """
+    results = []
+    for runner_type in runners or RUNNERS:
+        levels = sorted(concurrency or [1, 10, 50])
+        # serial runner doesn't support concurrency
+        if runner_type == "serial":
+            levels = levels[:1]
+        for level in levels:
+            LOG.info("Self-benchmark of %(runner)s runner with concurrency "
+                     "%(concurrency)s" % {"runner": runner_type,
+                                          "concurrency": level})
+            results.append(run_once(runner_type, level, times=times,
+                                    duration=duration))
+    return results
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Find runs that became slower than baseline.
+
+    :param results: list of measurements returned by run()
+    :param baseline: list of measurements of previous run()
+    :param tolerance: float, allowed throughput decrease (0.2 is 20%)
+    :returns: list of tuples (measurement, baseline measurement)
+    """
+    baseline = dict(((b["runner"], b["concurrency"]), b) for b in baseline)
+    regressions = []
+    for result in results:
+        base = baseline.get((result["runner"], result["concurrency"]))
+        if base and result["throughput"] < (base["throughput"] *
+                                            (1 - tolerance)):
+            regressions.append((result, base))
+    return regressions
@@ -42,6 +42,7 @@ class SLAChecker(object):
         self.config = config
         self.unexpected_failure = None
         self.aborted = False
+        self.aborted_manually = False
         self.sla_criteria = [SLA.get(name)(criterion_value)
                              for name, criterion_value
                              in config.get("sla", {}).items()]
@@ -62,6 +63,10 @@ class SLAChecker(object):
             results.append(_format_result(
                 "aborted_on_sla", False,
                 _("Task was aborted due to SLA failure(s).")))
+        if self.aborted_manually:
+            results.append(_format_result(
+                "aborted_manually", False,
+                _("Task was aborted due to abort signal.")))
         if self.unexpected_failure:
             results.append(_format_result(
                 "something_went_wrong", False,
@@ -71,6 +76,9 @@ class SLAChecker(object):
     def set_aborted(self):
         self.aborted = True
 
+    def set_aborted_manually(self):
+        self.aborted_manually = True
+
     def set_unexpected_failure(self, exc):
         self.unexpected_failure = exc
 
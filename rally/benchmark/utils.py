@@ -18,7 +18,6 @@ import time
 import traceback
 
 import jsonschema
-from novaclient import exceptions as nova_exc
 import six
 
 from rally.common.i18n import _
@@ -167,6 +166,7 @@ def infinite_run_args_generator(args_func):
 
 def check_service_status(client, service_name):
     """Check if given openstack service is enabled and state is up."""
+    from novaclient import exceptions as nova_exc
     try:
         for service in client.services.list():
             if service_name in str(service):
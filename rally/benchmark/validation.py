@@ -18,8 +18,6 @@ import functools
 import os
 import re
 
-from glanceclient import exc as glance_exc
-from novaclient import exceptions as nova_exc
 import six
 
 from rally.benchmark import types as types
@@ -270,6 +268,7 @@ def _get_validated_image(config, clients, param_name):
                 "min_disk": image_context.get("min_disk", 0)
             }
             return (ValidationResult(True), image)
+    from glanceclient import exc as glance_exc
     try:
         image_id = types.ImageResourceType.transform(
             clients=clients, resource_config=image_args)
@@ -298,6 +297,7 @@ def _get_validated_flavor(config, clients, param_name):
     if not flavor_value:
         msg = "Parameter %s is not specified." % param_name
         return (ValidationResult(False, msg), None)
+    from novaclient import exceptions as nova_exc
     try:
         flavor_id = types.FlavorResourceType.transform(
             clients=clients, resource_config=flavor_value)
@@ -560,6 +560,22 @@ def required_contexts(config, clients, deployment, *context_names):
         return ValidationResult(False, message)
 
 
+@validator
+def required_runner(config, clients, deployment, *runner_types):
+    """Validator checks if benchmark uses one of specified runners.
+
+    :param *runner_types: list of runner types that are able to run
+                          the benchmark
+    """
+    runner_type = config.get("runner", {}).get("type", "serial")
+    if runner_type not in runner_types:
+        message = (_("Benchmark requires one of the following runners: %("
+                     "required)s, but `%(actual)s` is specified") %
+                   {"required": ", ".join(runner_types),
+                    "actual": runner_type})
+        return ValidationResult(False, message)
+
+
 @validator
 def required_openstack(config, clients, deployment, admin=False, users=False):
     """Validator that requires OpenStack admin or (and) users.
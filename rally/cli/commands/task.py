@@ -22,12 +22,17 @@ import sys
 import webbrowser
 
 import jsonschema
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 import yaml
 
 from rally import api
+from rally.benchmark.processing import binary
+from rally.benchmark.processing import compare as compare_
 from rally.benchmark.processing import plot
+from rally.benchmark.processing import steps
 from rally.benchmark.processing import utils
+from rally.benchmark import self_benchmark
 from rally.cli import cliutils
 from rally.cli import envutils
 from rally.common import fileutils
@@ -183,9 +188,19 @@ class TaskCommands(object):
                    dest="abort_on_sla_failure",
                    help="Abort the execution of a benchmark scenario when"
                         "any SLA check for it fails")
+    @cliutils.args("--reuse-contexts", action="store_true",
+                   dest="reuse_contexts",
+                   help="Keep contexts (users, images, etc.) alive between "
+                        "benchmark scenarios with the same context config "
+                        "instead of creating them for each scenario")
+    @cliutils.args("--max-cpu-count", type=int, dest="max_cpu_count",
+                   help="Max number of CPUs used by benchmark scenarios that "
+                        "are run concurrently (have the same \"group\"). "
+                        "All CPUs by default")
     @envutils.with_default_deployment(cli_arg_name="deployment")
     def start(self, task, deployment=None, task_args=None, task_args_file=None,
-              tag=None, do_use=False, abort_on_sla_failure=False):
+              tag=None, do_use=False, abort_on_sla_failure=False,
+              reuse_contexts=False, max_cpu_count=None):
         """Start benchmark task.
 
         :param task: a file with yaml/json task
@@ -201,6 +216,11 @@ class TaskCommands(object):
         :param abort_on_sla_failure: if True, the execution of a benchmark
                                      scenario will stop when any SLA check
                                      for it fails
+        :param reuse_contexts: if True, contexts are kept alive between
+                               benchmark scenarios with equivalent context
+                               configs
+        :param max_cpu_count: max number of CPUs used by benchmark scenarios
+                              that are run concurrently
         """
         try:
             input_task = self._load_task(task, task_args, task_args_file)
@@ -218,20 +238,31 @@ class TaskCommands(object):
             if do_use:
                 self.use(task["uuid"])
             api.Task.start(deployment, input_task, task=task,
-                           abort_on_sla_failure=abort_on_sla_failure)
+                           abort_on_sla_failure=abort_on_sla_failure,
+                           reuse_contexts=reuse_contexts,
+                           max_cpu_count=max_cpu_count)
             self.detailed(task_id=task["uuid"])
         except exceptions.InvalidConfigException:
             return(1)
 
     @cliutils.args("--uuid", type=str, dest="task_id", help="UUID of task")
+    @cliutils.args("--soft", action="store_true",
+                   help="Finish iterations in progress instead of "
+                        "terminating them")
     @envutils.with_default_task_id
-    def abort(self, task_id=None):
+    def abort(self, task_id=None, soft=False):
         """Abort started benchmarking task.
 
+        New iterations are not started, contexts are cleaned up and results
+        of finished iterations are stored. Benchmarks that are not started
+        yet are skipped.
+
         :param task_id: Task uuid
+        :param soft: if False, iterations in progress are terminated
         """
 
-        api.Task.abort(task_id)
+        api.Task.abort(task_id, soft=soft)
+        print(_("Task %s is being aborted") % task_id)
 
     @cliutils.args("--uuid", type=str, dest="task_id", help="UUID of task")
     @envutils.with_default_task_id
@@ -292,6 +323,74 @@ class TaskCommands(object):
                                 formatters=formatters)
             print()
 
+        def _print_contexts_data(contexts):
+            headers = ["context", "setup duration", "cleanup duration",
+                       "setup API calls", "cleanup API calls", "resources"]
+            keys = [h.lower().replace(" ", "_") for h in headers[1:]]
+            formatters = dict(
+                (header, cliutils.pretty_float_formatter(
+                    key, 3 if key.endswith("_duration") else None))
+                for header, key in zip(headers[1:], keys))
+            table_rows = [rutils.Struct(context=ctx["name"],
+                                        **dict((key, ctx.get(key))
+                                               for key in keys))
+                          for ctx in contexts]
+            cliutils.print_list(table_rows,
+                                fields=headers,
+                                formatters=formatters,
+                                table_label="Contexts")
+
+        def _print_steps_data(levels):
+            fields = ["concurrency", "duration", "iterations", "throughput",
+                      "failures", "median", "90%ile", "95%ile", "99%ile"]
+            labels = ["concurrency", "duration", "iterations",
+                      "iterations/sec", "failures", "median", "90%ile",
+                      "95%ile", "99%ile"]
+            formatters = dict(
+                (field, cliutils.pretty_float_formatter(field, 3))
+                for field in ("duration", "throughput", "median", "90%ile",
+                              "95%ile", "99%ile"))
+            table_rows = [
+                rutils.Struct(failures="%.1f%%" % (level["errors_rate"] * 100),
+                              **dict(level, **level["percentiles"]))
+                for level in levels]
+            cliutils.print_list(table_rows,
+                                fields=fields,
+                                field_labels=labels,
+                                formatters=formatters,
+                                table_label="Concurrency levels")
+
+        def _print_probes_data(runner_stats):
+            fields = ["probe", "rps", "throughput", "iterations", "errors",
+                      "sla"]
+            labels = ["probe", "target rps", "iterations/sec", "iterations",
+                      "failures", "sla"]
+            formatters = dict(
+                (field, cliutils.pretty_float_formatter(field, 2))
+                for field in ("rps", "throughput"))
+            table_rows = [
+                rutils.Struct(probe=idx,
+                              sla="Passed" if probe["success"] else "Failed",
+                              **dict((k, probe[k]) for k in fields[1:-1]))
+                for idx, probe in enumerate(runner_stats["probes"], 1)]
+            cliutils.print_list(table_rows,
+                                fields=fields,
+                                field_labels=labels,
+                                formatters=formatters,
+                                table_label="Throughput search")
+            capacity = runner_stats["capacity"]
+            print(_("Capacity: %s") % (_("not found") if capacity is None
+                                       else "%.2f rps" % capacity))
+
+        def _print_workers_data(workers):
+            fields = ["hostname", "iterations", "status"]
+            table_rows = [rutils.Struct(**dict((k, worker[k])
+                                               for k in fields))
+                          for worker in workers]
+            cliutils.print_list(table_rows,
+                                fields=fields,
+                                table_label="Workers")
+
         task = db.task_get_detailed(task_id)
 
         if task is None:
@@ -365,6 +464,22 @@ class TaskCommands(object):
 
             print(_("Load duration: %s") % result["data"]["load_duration"])
             print(_("Full duration: %s") % result["data"]["full_duration"])
+            if result["data"].get("warmup"):
+                print(_("Warm-up iterations (excluded from statistics): %d")
+                      % len(result["data"]["warmup"]))
+
+            if result["data"].get("contexts"):
+                _print_contexts_data(result["data"]["contexts"])
+
+            levels = steps.steps(raw)
+            if levels:
+                _print_steps_data(levels)
+
+            runner_stats = result["data"].get("runner_stats", {})
+            if runner_stats.get("probes"):
+                _print_probes_data(runner_stats)
+            if runner_stats.get("workers"):
+                _print_workers_data(runner_stats["workers"])
 
             # NOTE(hughsaunders): ssrs=scenario specific results
             ssrs = []
@@ -435,7 +550,10 @@ class TaskCommands(object):
         results = [{"key": x["key"], "result": x["data"]["raw"],
                     "sla": x["data"]["sla"],
                     "load_duration": x["data"]["load_duration"],
-                    "full_duration": x["data"]["full_duration"]}
+                    "full_duration": x["data"]["full_duration"],
+                    "contexts": x["data"].get("contexts", []),
+                    "warmup": x["data"].get("warmup", []),
+                    "runner_stats": x["data"].get("runner_stats", {})}
                    for x in objects.Task.get(task_id).get_results()]
 
         if results:
@@ -445,6 +563,69 @@ class TaskCommands(object):
                     "available when it is finished.") % task_id)
             return(1)
 
+    @cliutils.args("--uuid", type=str, dest="task_id", help="uuid of task")
+    @cliutils.args("--out", type=str, dest="out", required=True,
+                   help="Path to output file.")
+    @envutils.with_default_task_id
+    def export(self, task_id=None, out=None):
+        """Export task results to compact binary file.
+
+        The file is much smaller and faster to load than JSON output of
+        `rally task results'. It can be imported to another Rally database
+        by `rally task import' or passed to `rally task report' directly.
+
+        :param task_id: Task uuid
+        :param out: str, output file name
+        """
+        results = objects.Task.get(task_id).get_results()
+        if not results:
+            print(_("The task %s is still running, results will become "
+                    "available when it is finished.") % task_id)
+            return(1)
+
+        with open(os.path.expanduser(out), "wb") as f:
+            binary.dump(({"key": x["key"], "result": x["data"]["raw"],
+                          "sla": x["data"]["sla"],
+                          "load_duration": x["data"]["load_duration"],
+                          "full_duration": x["data"]["full_duration"],
+                          "contexts": x["data"].get("contexts", []),
+                          "warmup": x["data"].get("warmup", []),
+                          "runner_stats": x["data"].get("runner_stats",
+                                                        {})}
+                         for x in results), f)
+
+    @cliutils.alias("import")
+    @cliutils.args("--file", type=str, dest="results_file", required=True,
+                   help="Path to binary or JSON file with task results.")
+    @cliutils.args("--deployment", type=str, dest="deployment",
+                   help="UUID or name of a deployment")
+    @cliutils.args("--tag", help="Tag for this task")
+    @envutils.with_default_deployment(cli_arg_name="deployment")
+    def import_results(self, results_file, deployment=None, tag=None):
+        """Import task results as a new finished task.
+
+        :param results_file: Path to file exported by `rally task export'
+                             or with JSON output of `rally task results'
+        :param deployment: UUID or name of a deployment
+        :param tag: optional tag for this task
+        """
+        if not os.path.exists(os.path.expanduser(results_file)):
+            print(_("ERROR: File not found: %s") % results_file,
+                  file=sys.stderr)
+            return(1)
+
+        try:
+            task = api.Task.import_results(
+                deployment, self._read_results_file(results_file), tag=tag)
+        except (jsonschema.ValidationError,
+                exceptions.InvalidResultsFile) as e:
+            self._print_invalid_results(e)
+            return(1)
+
+        print(_("Task %s is imported.") % task["uuid"])
+        print(_("* To plot HTML graphics with imported results, run:"))
+        print("\trally task report %s --out output.html" % task["uuid"])
+
     @cliutils.args("--deployment", type=str, dest="deployment",
                    help="List tasks from specified deployment."
                    "By default tasks listed from active deployment.")
@@ -456,19 +637,37 @@ class TaskCommands(object):
                    " Available statuses: %s" % ", ".join(consts.TaskStatus))
     @cliutils.args("--uuids-only", action="store_true",
                    dest="uuids_only", help="List task UUIDs only")
+    @cliutils.args("--tag", type=str, dest="tag",
+                   help="List tasks with specified tag.")
+    @cliutils.args("--from", type=str, dest="created_after",
+                   help="List tasks created at or after this date/time, "
+                        "e.g. 2015-06-01 or 2015-06-01T12:00:00Z.")
+    @cliutils.args("--to", type=str, dest="created_before",
+                   help="List tasks created before this date/time.")
+    @cliutils.args("--limit", type=int, dest="limit",
+                   help="Max number of the newest tasks to list.")
+    @cliutils.args("--marker", type=str, dest="marker",
+                   help="UUID of the oldest task of the previous page, "
+                        "tasks created before it are listed.")
     @envutils.with_default_deployment(cli_arg_name="deployment")
     def list(self, deployment=None, all_deployments=False, status=None,
-             uuids_only=False):
+             uuids_only=False, tag=None, created_after=None,
+             created_before=None, limit=None, marker=None):
         """List tasks, started and finished.
 
-        Displayed tasks could be filtered by status or deployment.
-        By default 'rally task list' will display tasks from active deployment
-        without filtering by status.
+        Displayed tasks could be filtered by status, deployment, tag and
+        creation time. By default 'rally task list' will display tasks from
+        active deployment without filtering by status.
         :param deployment: UUID or name of deployment
         :param status: task status to filter by.
             Available task statuses are in rally.consts.TaskStatus
         :param all_deployments: display tasks from all deployments
         :param uuids_only: list task UUIDs only
+        :param tag: task tag to filter by
+        :param created_after: list tasks created at or after this time
+        :param created_before: list tasks created before this time
+        :param limit: max number of the newest tasks to list
+        :param marker: UUID of the task to list tasks created before it
         """
 
         filters = {}
@@ -487,6 +686,21 @@ class TaskCommands(object):
         if not all_deployments:
             filters.setdefault("deployment", deployment)
 
+        for name, value in (("created_after", created_after),
+                            ("created_before", created_before)):
+            if value:
+                try:
+                    filters[name] = timeutils.normalize_time(
+                        timeutils.parse_isotime(value))
+                except ValueError:
+                    print(_("Error: Invalid date/time '%s'.") % value,
+                          file=sys.stderr)
+                    return(1)
+        for name, value in (("tag", tag), ("limit", limit),
+                            ("marker", marker)):
+            if value is not None:
+                filters[name] = value
+
         task_list = [task.to_dict() for task in objects.Task.list(**filters)]
 
         for x in task_list:
@@ -501,6 +715,11 @@ class TaskCommands(object):
             cliutils.print_list(
                 task_list,
                 headers, sortby_index=headers.index("created_at"))
+            if limit and len(task_list) == limit:
+                print(_("* To list older tasks, use:\n"
+                        "\trally task list --limit %(limit)s "
+                        "--marker %(marker)s") % {
+                      "limit": limit, "marker": task_list[-1]["uuid"]})
         else:
             if status:
                 print(_("There are no tasks in '%s' status. "
@@ -511,7 +730,8 @@ class TaskCommands(object):
                         "\trally task start"))
 
     @cliutils.args("--tasks", dest="tasks", nargs="+",
-                   help="uuids of tasks or json files with task results")
+                   help="uuids of tasks or json or binary files with task "
+                        "results")
     @cliutils.args("--out", type=str, dest="out", required=True,
                    help="Path to output file.")
     @cliutils.args("--open", dest="open_it", action="store_true",
@@ -539,40 +759,115 @@ class TaskCommands(object):
 
         tasks = isinstance(tasks, list) and tasks or [tasks]
 
-        results = []
+        for task_file_or_uuid in tasks:
+            if not (os.path.exists(os.path.expanduser(task_file_or_uuid)) or
+                    uuidutils.is_uuid_like(task_file_or_uuid)):
+                print(_("ERROR: Invalid UUID or file name passed: %s"
+                        ) % task_file_or_uuid,
+                      file=sys.stderr)
+                return 1
+
+        # Results are loaded task by task while the report is written, so
+        # the report is removed if any of them fails
+        results = self._load_results(tasks)
+        output_file = os.path.expanduser(out)
+        opened = written = False
+
+        try:
+            if out_format == "html":
+                opened = True
+                with open(output_file, "w+") as f:
+                    plot.write_report(results, f)
+                written = True
+                if open_it:
+                    webbrowser.open_new_tab("file://" + os.path.realpath(out))
+            elif out_format == "junit":
+                test_suite = junit.JUnit("Rally test suite")
+                for result in results:
+                    if (isinstance(result["sla"], list) and
+                       not all([sla["success"] for sla in result["sla"]])):
+                        outcome = junit.JUnit.FAILURE
+                    else:
+                        outcome = junit.JUnit.SUCCESS
+                    test_suite.add_test(result["key"]["name"],
+                                        result["full_duration"],
+                                        outcome=outcome)
+                opened = True
+                with open(output_file, "w+") as f:
+                    f.write(test_suite.to_xml())
+                written = True
+            else:
+                print(_("Invalid output format: %s") % out_format,
+                      file=sys.stderr)
+                return 1
+        except (jsonschema.ValidationError,
+                exceptions.InvalidResultsFile) as e:
+            self._print_invalid_results(e)
+            return 1
+        finally:
+            if opened and not written and os.path.exists(output_file):
+                os.remove(output_file)
+
+    def _print_invalid_results(self, e):
+        if isinstance(e, exceptions.InvalidResultsFile):
+            print(_("ERROR: %s") % e, file=sys.stderr)
+            return
+        print(_("ERROR: Invalid task result format in %s")
+              % e.task_file, file=sys.stderr)
+        if logging.is_debug():
+            print(e, file=sys.stderr)
+        else:
+            print(e.message, file=sys.stderr)
+
+    def _read_results_file(self, task_file):
+        """Load results from binary or JSON file one by one.
+
+        :param task_file: path to file with results
+        :raises jsonschema.ValidationError: if results in JSON file are
+                                            invalid, the file name is
+                                            saved to task_file attribute
+        :raises InvalidResultsFile: if binary file is broken
+        """
+        path = os.path.expanduser(task_file)
+        if binary.is_binary(path):
+            # Binary files have checksums, no need to validate them
+            with open(path, "rb") as f:
+                for result in binary.load(f):
+                    yield result
+            return
+
+        with open(path, "r") as inp_js:
+            tasks_results = json.load(inp_js)
+        for result in tasks_results:
+            try:
+                jsonschema.validate(result, objects.task.TASK_RESULT_SCHEMA)
+            except jsonschema.ValidationError as e:
+                e.task_file = task_file
+                raise
+            yield result
+
+    def _load_results(self, tasks):
+        """Load results of tasks one by one.
+
+        :param tasks: list, UUIDs of tasks or paths to files with results
+        :raises jsonschema.ValidationError: if results in JSON file are
+                                            invalid, the file name is
+                                            saved to task_file attribute
+        :raises InvalidResultsFile: if binary file is broken
+        """
         processed_names = {}
         for task_file_or_uuid in tasks:
             if os.path.exists(os.path.expanduser(task_file_or_uuid)):
-                with open(os.path.expanduser(task_file_or_uuid),
-                          "r") as inp_js:
-                    tasks_results = json.load(inp_js)
-                    for result in tasks_results:
-                        try:
-                            jsonschema.validate(
-                                result,
-                                objects.task.TASK_RESULT_SCHEMA)
-                        except jsonschema.ValidationError as e:
-                            print(_("ERROR: Invalid task result format in %s")
-                                  % task_file_or_uuid, file=sys.stderr)
-                            if logging.is_debug():
-                                print(e, file=sys.stderr)
-                            else:
-                                print(e.message, file=sys.stderr)
-                            return 1
-
-            elif uuidutils.is_uuid_like(task_file_or_uuid):
+                tasks_results = self._read_results_file(task_file_or_uuid)
+            else:
                 tasks_results = map(
                     lambda x: {"key": x["key"],
                                "sla": x["data"]["sla"],
                                "result": x["data"]["raw"],
                                "load_duration": x["data"]["load_duration"],
-                               "full_duration": x["data"]["full_duration"]},
+                               "full_duration": x["data"]["full_duration"],
+                               "contexts": x["data"].get("contexts", [])},
                     objects.Task.get(task_file_or_uuid).get_results())
-            else:
-                print(_("ERROR: Invalid UUID or file name passed: %s"
-                        ) % task_file_or_uuid,
-                      file=sys.stderr)
-                return 1
 
             for task_result in tasks_results:
                 if task_result["key"]["name"] in processed_names:
@@ -581,32 +876,7 @@ class TaskCommands(object):
                         task_result["key"]["name"]]
                 else:
                     processed_names[task_result["key"]["name"]] = 0
-                results.append(task_result)
-
-        output_file = os.path.expanduser(out)
-
-        if out_format == "html":
-            with open(output_file, "w+") as f:
-                f.write(plot.plot(results))
-            if open_it:
-                webbrowser.open_new_tab("file://" + os.path.realpath(out))
-        elif out_format == "junit":
-            test_suite = junit.JUnit("Rally test suite")
-            for result in results:
-                if (isinstance(result["sla"], list) and
-                   not all([sla["success"] for sla in result["sla"]])):
-                    outcome = junit.JUnit.FAILURE
-                else:
-                    outcome = junit.JUnit.SUCCESS
-                test_suite.add_test(result["key"]["name"],
-                                    result["full_duration"],
-                                    outcome=outcome)
-            with open(output_file, "w+") as f:
-                f.write(test_suite.to_xml())
-        else:
-            print(_("Invalid output format: %s") % out_format,
-                  file=sys.stderr)
-            return 1
+                yield task_result
 
     @cliutils.args("--force", action="store_true", help="force delete")
     @cliutils.args("--uuid", type=str, dest="task_id", nargs="*",
@@ -646,7 +916,8 @@ class TaskCommands(object):
         :param task_id: Task uuid.
         :returns: Number of failed criteria.
         """
-        results = objects.Task.get(task_id).get_results()
+        # SLA verdicts are stored apart from raw iterations
+        results = objects.Task.get(task_id).get_results(raw=False)
         failed_criteria = 0
         data = []
         STATUS_PASS = "PASS"
@@ -668,6 +939,190 @@ class TaskCommands(object):
                                        "status", "detail"))
         return failed_criteria
 
+    @cliutils.args("--task-1", type=str, dest="task1", required=True,
+                   help="UUID or results file of the first (older) task")
+    @cliutils.args("--task-2", type=str, dest="task2", required=True,
+                   help="UUID or results file of the second (newer) task")
+    @cliutils.args("--json", action="store_true", dest="output_json",
+                   help="Print comparison in JSON format.")
+    @cliutils.args("--html", action="store_true", dest="output_html",
+                   help="Print comparison in HTML format.")
+    @cliutils.args("--output-file", type=str, dest="output_file",
+                   help="If specified, output will be saved to given file")
+    @cliutils.args("--alpha", type=float, dest="alpha",
+                   help="Significance level of statistical tests "
+                        "(default: 0.05)")
+    @cliutils.suppress_warnings
+    def compare(self, task1=None, task2=None, output_json=False,
+                output_html=False, output_file=None, alpha=0.05):
+        """Compare durations of two tasks.
+
+        Workloads are aligned by scenario name and arguments. For every
+        atomic action (and for the whole iteration) change of durations
+        is checked with Mann-Whitney U test, changes of percentiles are
+        reported with their confidence intervals.
+
+        :param task1: UUID or results file of the first task
+        :param task2: UUID or results file of the second task
+        :param output_json: print comparison in JSON format
+        :param output_html: print comparison in HTML format
+        :param output_file: if specified, output will be saved to given file
+        :param alpha: significance level of statistical tests
+        :returns: 1 if durations of any action became significantly
+                  bigger, None otherwise
+        """
+        if output_json and output_html:
+            print(_("Please specify only one output format, either --json "
+                    "or --html."), file=sys.stderr)
+            return(1)
+
+        try:
+            comparison = compare_.TaskComparison(
+                self._load_workloads(task1), self._load_workloads(task2),
+                alpha=alpha)
+        except (jsonschema.ValidationError,
+                exceptions.InvalidResultsFile) as e:
+            self._print_invalid_results(e)
+            return(1)
+
+        if output_json or output_html:
+            result = comparison.to_json() if output_json else (
+                comparison.to_html())
+            if output_file:
+                with open(os.path.expanduser(output_file), "w+") as f:
+                    f.write(result)
+            else:
+                print(result)
+        else:
+            self._print_comparison(comparison)
+
+        if comparison.regressions():
+            return(1)
+
+    def _load_workloads(self, task_file_or_uuid):
+        if os.path.exists(os.path.expanduser(task_file_or_uuid)):
+            return list(self._read_results_file(task_file_or_uuid))
+        task = objects.Task.get(task_file_or_uuid)
+        # Stored sketches are enough to compare workloads, so iterations are
+        # loaded only for old results which don't have sketches
+        results = task.get_results(raw=False)
+        if not all(x["data"].get("sketches") for x in results):
+            results = task.get_results()
+        return [{"key": x["key"], "result": x["data"].get("raw", []),
+                 "sketches": x["data"].get("sketches")}
+                for x in results]
+
+    def _print_comparison(self, comparison):
+        def stat(data, fmt="%.3f"):
+            values = ["n/a" if v is None else fmt % v
+                      for v in data["values"]]
+            delta = "" if data["delta"] is None else (
+                " (%+.1f%%)" % data["delta"])
+            return "%s -> %s%s%s" % (values[0], values[1], delta,
+                                     " *" if data.get("significant") else "")
+
+        percentiles = [name for name, percent in compare_.PERCENTILES]
+        headers = (["action", "count", "mean"] + percentiles +
+                   ["p-value", "change"])
+        for workload in comparison.workloads:
+            print(cliutils.make_header("%s %s" % (
+                workload["name"], json.dumps(workload["args"],
+                                             sort_keys=True))))
+            if workload["status"] != "compared":
+                print(_("Workload is %s") % workload["status"])
+                continue
+            print(_("Iterations: %(iterations)s, failures: %(errors)s") % {
+                "iterations": " -> ".join(map(str, workload["iterations"])),
+                "errors": " -> ".join(map(str, workload["errors"]))})
+            rows = []
+            for action in workload["actions"]:
+                row = [action["action"],
+                       " -> ".join(map(str, action["count"])),
+                       stat(action["mean"])]
+                row.extend(stat(action[name]) for name in percentiles)
+                row.append("n/a" if action["p_value"] is None
+                           else "%.4f" % action["p_value"])
+                row.append(action["change"] or "")
+                rows.append(rutils.Struct(**dict(zip(headers, row))))
+            cliutils.print_list(rows, fields=headers, sortby_index=None)
+        print(_("* Percentiles with non-overlapping confidence intervals "
+                "are marked with *"))
+
+    @cliutils.alias("self-benchmark")
+    @cliutils.args("--runners", dest="runners", nargs="+",
+                   help="Runners to benchmark (default: %s)"
+                        % " ".join(self_benchmark.RUNNERS))
+    @cliutils.args("--concurrency", dest="concurrency", nargs="+", type=int,
+                   help="Concurrency levels (default: 1 10 50)")
+    @cliutils.args("--times", dest="times", type=int,
+                   help="Number of iterations for each run (default: 1000)")
+    @cliutils.args("--duration", dest="duration", type=float,
+                   help="Load duration in seconds for constant_for_duration "
+                        "runner (default: 10)")
+    @cliutils.args("--out", type=str, dest="out",
+                   help="Path to JSON file to store results in.")
+    @cliutils.args("--baseline", type=str, dest="baseline",
+                   help="Path to JSON file with results of a previous "
+                        "self-benchmark to compare with.")
+    @cliutils.args("--tolerance", dest="tolerance", type=float,
+                   help="Allowed decrease of throughput comparing with "
+                        "baseline (default: 0.2 that means 20%%)")
+    def self_benchmark(self, runners=None, concurrency=None, times=1000,
+                       duration=10.0, out=None, baseline=None,
+                       tolerance=0.2):
+        """Measure overhead of scenario runners using Dummy.dummy scenario.
+
+        Each runner executes Dummy.dummy (that does nothing) at increasing
+        concurrency. Achieved throughput, scheduling lag and CPU usage per
+        worker process are printed and optionally stored to a file that can
+        be used as a baseline of next runs.
+
+        :param runners: list of runner names
+        :param concurrency: list of concurrency levels
+        :param times: number of iterations for each run
+        :param duration: load duration for constant_for_duration runner
+        :param out: path to file to store results in
+        :param baseline: path to file with results of a previous run
+        :param tolerance: allowed decrease of throughput
+        :returns: 1 if some runner is slower than baseline, None otherwise
+        """
+        results = self_benchmark.run(runners=runners, concurrency=concurrency,
+                                     times=times, duration=duration)
+
+        headers = ["runner", "concurrency", "iterations", "errors",
+                   "workers", "load duration", "iterations/sec",
+                   "lag (ms)", "cpu per worker (%)"]
+        float_cols = headers[-4:]
+        formatters = dict(zip(float_cols,
+                              [cliutils.pretty_float_formatter(col, 3)
+                               for col in float_cols]))
+        rows = [rutils.Struct(**dict(zip(headers, [
+            r["runner"], r["concurrency"], r["iterations"], r["errors"],
+            r["workers"], r["load_duration"], r["throughput"],
+            r["lag"] * 1000, r["cpu_per_worker"]]))) for r in results]
+        cliutils.print_list(rows, fields=headers, formatters=formatters,
+                            sortby_index=None,
+                            table_label="Runners self-benchmark")
+
+        if out:
+            with open(os.path.expanduser(out), "w+") as f:
+                f.write(json.dumps(results, sort_keys=True, indent=4))
+
+        if baseline:
+            with open(os.path.expanduser(baseline), "r") as f:
+                regressions = self_benchmark.compare(results, json.load(f),
+                                                     tolerance=tolerance)
+            for result, base in regressions:
+                print(_("Regression: %(runner)s runner with concurrency "
+                        "%(concurrency)s: %(now).1f iterations/sec, baseline "
+                        "%(base).1f iterations/sec")
+                      % {"runner": result["runner"],
+                         "concurrency": result["concurrency"],
+                         "now": result["throughput"],
+                         "base": base["throughput"]})
+            if regressions:
+                return 1
+
     @cliutils.args("--task", type=str, dest="task", required=False,
                    help="UUID of the task")
     def use(self, task):
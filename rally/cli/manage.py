@@ -17,11 +17,15 @@
 
 from __future__ import print_function
 
+import socket
 import sys
 
 from rally import api
+from rally.benchmark import distributed
 from rally.cli import cliutils
 from rally.cli import envutils
+from rally.common.i18n import _
+from rally.common import utils
 from rally import db
 
 
@@ -71,9 +75,46 @@ class TempestCommands(object):
         api.Verification.reinstall_tempest(deployment, tempest_config, source)
 
 
+class WorkerCommands(object):
+    """Commands for Rally worker services that generate distributed load."""
+
+    @cliutils.args("--host", type=str, dest="host", required=False,
+                   help="Host to listen on, it should be reachable from "
+                        "Rally that runs tasks. Default is the hostname.")
+    @cliutils.args("--port", type=int, dest="port", required=False,
+                   help="Port to listen on. Default is a free port.")
+    def start(self, host=None, port=None):
+        """Start a worker service and run jobs until interrupted."""
+        service = distributed.WorkerService(host or socket.gethostname(),
+                                            port or 0)
+        service.start()
+        print(_("Worker %s is started") % service.hostname)
+        try:
+            service.serve()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.stop()
+
+    def list(self):
+        """List registered worker services."""
+        headers = ["hostname", "updated_at", "active"]
+        active = set(distributed.get_active_workers())
+        table_rows = [utils.Struct(hostname=worker["hostname"],
+                                   updated_at=worker["updated_at"],
+                                   active=worker["hostname"] in active)
+                      for worker in db.worker_list()]
+        if table_rows:
+            cliutils.print_list(table_rows, headers)
+        else:
+            print(_("There are no workers. To start a new worker, use:"
+                    "\nrally-manage worker start"))
+
+
 def main():
     categories = {"db": DBCommands,
-                  "tempest": TempestCommands}
+                  "tempest": TempestCommands,
+                  "worker": WorkerCommands}
     cliutils.run(sys.argv, categories)
 
 
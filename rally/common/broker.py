@@ -17,6 +17,7 @@ import collections
 import threading
 import time
 
+from rally.common import httpstats
 from rally.common.i18n import _
 from rally.common import log as logging
 
@@ -92,8 +93,10 @@ def run(publish, consume, consumers_count=1):
     is_published = threading.Event()
 
     consumers = []
+    # API calls of consumers are counted as calls of the caller
+    target = httpstats.inherit(_consumer)
     for i in range(consumers_count):
-        consumer = threading.Thread(target=_consumer,
+        consumer = threading.Thread(target=target,
                                     args=(consume, queue, is_published))
         consumer.start()
         consumers.append(consumer)
@@ -0,0 +1,123 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Statistics of HTTP requests sent to OpenStack APIs.
+
+All OpenStack clients send requests via the requests library, so they are
+counted by its transport adapter. Only requests sent by threads that
+collect statistics (see collect()) are counted, other threads pay nothing
+but a thread-local lookup.
+"""
+
+import contextlib
+import threading
+
+from requests import adapters
+from six.moves.urllib import parse
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_original_send = None
+
+# Successful POST requests to these paths don't create resources
+_NOT_CREATING_PATHS = ("/action", "/tokens")
+
+
+class Stats(object):
+    """Counters of API calls and created resources."""
+
+    def __init__(self):
+        self.api_calls = 0
+        self.resources = 0
+        # Several threads may collect to the same stats
+        self._lock = threading.Lock()
+
+    def add(self, method, url, status_code=None):
+        """Count a request.
+
+        Created resources are estimated by successful POST requests except
+        authentication and actions on existing resources.
+
+        :param method: HTTP method
+        :param url: requested URL
+        :param status_code: status of the response, None if the request
+                            failed without response
+        """
+        creating = (method == "POST" and status_code is not None and
+                    200 <= status_code < 300 and
+                    not parse.urlparse(url).path.rstrip("/").endswith(
+                        _NOT_CREATING_PATHS))
+        with self._lock:
+            self.api_calls += 1
+            if creating:
+                self.resources += 1
+
+
+def current():
+    """Return stats that the current thread collects to or None."""
+    return getattr(_local, "stats", None)
+
+
+def _send(adapter, request, *args, **kwargs):
+    stats = current()
+    if stats is None:
+        return _original_send(adapter, request, *args, **kwargs)
+    status_code = None
+    try:
+        response = _original_send(adapter, request, *args, **kwargs)
+        status_code = response.status_code
+        return response
+    finally:
+        stats.add(request.method, request.url, status_code)
+
+
+def install():
+    """Start counting requests, it is safe to call it many times."""
+    global _original_send
+
+    with _install_lock:
+        if _original_send is None:
+            _original_send = adapters.HTTPAdapter.send
+            adapters.HTTPAdapter.send = _send
+
+
+@contextlib.contextmanager
+def collect(stats):
+    """Count requests sent by the current thread to stats.
+
+    :param stats: Stats object, if it is None requests aren't counted
+    """
+    install()
+    previous = current()
+    _local.stats = stats
+    try:
+        yield stats
+    finally:
+        _local.stats = previous
+
+
+def inherit(func):
+    """Return func that counts requests to stats of the calling thread.
+
+    It is used for functions that are run by other threads on behalf of
+    the calling one.
+    """
+    stats = current()
+
+    def wrapper(*args, **kwargs):
+        with collect(stats):
+            return func(*args, **kwargs)
+
+    return wrapper
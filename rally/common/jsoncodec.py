@@ -0,0 +1,136 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""JSON codecs for big structures like task results.
+
+The fastest available implementation is used by default. Structures it
+can't handle (e.g. dicts with non-string keys) are processed by the
+standard json module. Note that orjson decodes integers bigger than 64
+bits as floats, task results don't contain such numbers.
+"""
+
+import gc
+import json
+import sys
+
+from rally.common import costilius
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Dicts keep insertion order since Python 3.7 and JSON parsers create
+# objects in document order, so e.g. atomic actions keep the order in which
+# they were run without decoding every object to OrderedDict.
+ORDERED_DICTS = sys.version_info >= (3, 7)
+
+
+class Codec(object):
+    """Pair of JSON encoding and decoding functions."""
+
+    def __init__(self, name, dumps, loads):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+
+def _std_dumps(obj):
+    return json.dumps(obj, sort_keys=False)
+
+
+def _std_loads(data):
+    if ORDERED_DICTS:
+        return json.loads(data)
+    return costilius.json_loads(data, object_pairs_hook=costilius.OrderedDict)
+
+
+def _orjson_dumps(obj):
+    return orjson.dumps(obj).decode("utf-8")
+
+
+STD_CODEC = Codec("json", _std_dumps, _std_loads)
+
+# Available codecs in order of preference
+_codecs = costilius.OrderedDict()
+_default = None
+
+
+def register(codec):
+    """Make codec available, the first registered codec is the default."""
+    global _default
+
+    _codecs[codec.name] = codec
+    if _default is None:
+        _default = codec
+
+
+def get_codecs():
+    """Return names of available codecs in order of preference."""
+    return list(_codecs)
+
+
+def get_codec(name=None):
+    """Return codec by name or the default codec."""
+    if name is None:
+        return _default
+    return _codecs[name]
+
+
+def use(name):
+    """Make codec with specified name the default one."""
+    global _default
+
+    _default = _codecs[name]
+
+
+def dumps(obj, codec=None):
+    """Serialize obj to JSON string."""
+    codec = codec or _default
+    if codec is not STD_CODEC:
+        try:
+            return codec.dumps(obj)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return STD_CODEC.dumps(obj)
+
+
+def _loads(data, codec):
+    if codec is not STD_CODEC:
+        try:
+            return codec.loads(data)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return STD_CODEC.loads(data)
+
+
+def loads(data, codec=None):
+    """Deserialize JSON string to Python object."""
+    # Decoded objects are never garbage, but big results consist of
+    # millions of them and cyclic GC would scan them many times
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _loads(data, codec or _default)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+# orjson builds plain dicts, so it keeps order of objects only when dicts do
+if orjson is not None and ORDERED_DICTS:
+    register(Codec("orjson", _orjson_dumps, orjson.loads))
+register(STD_CODEC)
@@ -14,6 +14,7 @@
 
 import itertools
 
+from rally.benchmark import distributed
 from rally.common import log
 from rally import exceptions
 from rally import osclients
@@ -41,7 +42,8 @@ def list_opts():
                          manila_utils.MANILA_BENCHMARK_OPTS,
                          nova_utils.NOVA_BENCHMARK_OPTS,
                          sahara_utils.SAHARA_TIMEOUT_OPTS,
-                         ec2_utils.EC2_BENCHMARK_OPTS)),
+                         ec2_utils.EC2_BENCHMARK_OPTS,
+                         distributed.DISTRIBUTED_OPTS)),
         ("image",
          itertools.chain(tempest_conf.IMAGE_OPTS)),
         ("users_context", itertools.chain(users.USER_CONTEXT_OPTS))
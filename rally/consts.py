@@ -55,6 +55,9 @@ class _TaskStatus(utils.ImmutableMixin, utils.EnumMixin):
     CLEANING_UP = "cleaning up"
     FINISHED = "finished"
     FAILED = "failed"
+    ABORTING = "aborting"
+    SOFT_ABORTING = "soft_aborting"
+    ABORTED = "aborted"
 
 
 class _DeployStatus(utils.ImmutableMixin, utils.EnumMixin):
@@ -85,13 +85,15 @@ def task_get_detailed_last():
     return IMPL.task_get_detailed_last()
 
 
-def task_get_detailed(uuid):
+def task_get_detailed(uuid, raw=True):
     """Returns task with results by uuid.
 
     :param uuid: UUID of the task.
+    :param raw: if False, data of results is loaded without raw iterations,
+                so it contains only light metadata like SLA and durations.
     :returns: task dict with data on the task and its results.
     """
-    return IMPL.task_get_detailed(uuid)
+    return IMPL.task_get_detailed(uuid, raw=raw)
 
 
 def task_create(values):
@@ -114,17 +116,45 @@ def task_update(uuid, values):
     return IMPL.task_update(uuid, values)
 
 
-def task_list(status=None, deployment=None):
-    """Get a list of tasks.
+def task_update_status(uuid, status, allowed_statuses):
+    """Update the status of a task only if its current status is allowed.
+
+    :param uuid: UUID of the task.
+    :param status: New status of the task.
+    :param allowed_statuses: List of statuses the task may be in.
+    :raises: :class:`rally.exceptions.TaskNotFound` if the task does not
+             exist, :class:`rally.exceptions.TaskInvalidStatus` if its
+             status is not allowed.
+    """
+    return IMPL.task_update_status(uuid, status, allowed_statuses)
+
+
+def task_list(status=None, deployment=None, tag=None, created_after=None,
+              created_before=None, limit=None, marker=None):
+    """Get a list of tasks, the newest tasks go first.
+
+    Only the columns needed for listing are returned: uuid, status, tag,
+    deployment_uuid, created_at, updated_at and deployment_name.
 
     :param status: Task status to filter the returned list on. If set to
                    None, all the tasks will be returned.
-    :param deployment_id: deployment UUID to filter the returned list on.
-                      if set to None tasks from all deployments well be
-                      returned.
+    :param deployment: deployment UUID or name to filter the returned list
+                       on. If set to None tasks from all deployments will be
+                       returned.
+    :param tag: tag to filter the returned list on.
+    :param created_after: datetime, return only tasks created at or after it.
+    :param created_before: datetime, return only tasks created before it.
+    :param limit: max number of tasks to return.
+    :param marker: UUID of the last task of the previous page, only tasks
+                   created before it are returned.
+    :raises: :class:`rally.exceptions.TaskNotFound` if the marker task does
+             not exist.
     :returns: A list of dicts with data on the tasks.
     """
-    return IMPL.task_list(status=status, deployment=deployment)
+    return IMPL.task_list(status=status, deployment=deployment, tag=tag,
+                          created_after=created_after,
+                          created_before=created_before, limit=limit,
+                          marker=marker)
 
 
 def task_delete(uuid, status=None):
@@ -142,13 +172,15 @@ def task_delete(uuid, status=None):
     return IMPL.task_delete(uuid, status=status)
 
 
-def task_result_get_all_by_uuid(task_uuid):
+def task_result_get_all_by_uuid(task_uuid, raw=True):
     """Get list of task results.
 
     :param task_uuid: string with UUID of Task instance.
+    :param raw: if False, data of results is loaded without raw iterations,
+                so it contains only light metadata like SLA and durations.
     :returns: list instances of TaskResult.
     """
-    return IMPL.task_result_get_all_by_uuid(task_uuid)
+    return IMPL.task_result_get_all_by_uuid(task_uuid, raw=raw)
 
 
 def task_result_create(task_uuid, key, data):
@@ -362,3 +394,13 @@ def update_worker(hostname):
     :raises: WorkerNotFound
     """
     IMPL.update_worker(hostname)
+
+
+def worker_list(updated_after=None):
+    """Get list of registered worker services.
+
+    :param updated_after: if not None, return only workers that were marked
+                          as active after this datetime.
+    :returns: a list of workers.
+    """
+    return IMPL.worker_list(updated_after=updated_after)
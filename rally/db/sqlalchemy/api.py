@@ -57,8 +57,27 @@ def get_backend():
     return Connection()
 
 
+class _Row(dict):
+    """Row of a projected query, its columns are keys and attributes."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
 class Connection(object):
 
+    # Tasks are listed without verification log and with deployment name,
+    # so listing doesn't load big columns and doesn't query deployments.
+    _TASK_LIST_COLUMNS = (models.Task.id, models.Task.uuid, models.Task.status,
+                          models.Task.tag, models.Task.deployment_uuid,
+                          models.Task.created_at, models.Task.updated_at,
+                          models.Deployment.name)
+    _TASK_LIST_KEYS = ("id", "uuid", "status", "tag", "deployment_uuid",
+                       "created_at", "updated_at", "deployment_name")
+
     def db_cleanup(self):
         global _FACADE
 
@@ -103,14 +122,20 @@ class Connection(object):
     def task_get(self, uuid):
         return self._task_get(uuid)
 
-    def task_get_detailed(self, uuid):
-        return (self.model_query(models.Task).
-                options(sa.orm.joinedload("results")).
-                filter_by(uuid=uuid).first())
+    def task_get_detailed(self, uuid, raw=True):
+        if raw:
+            return (self.model_query(models.Task).
+                    options(sa.orm.joinedload("results").undefer("data")).
+                    filter_by(uuid=uuid).first())
+
+        task = self.model_query(models.Task).filter_by(uuid=uuid).first()
+        if task is None:
+            return None
+        return _Row(task, results=self._task_result_summaries(uuid))
 
     def task_get_detailed_last(self):
         return (self.model_query(models.Task).
-                options(sa.orm.joinedload("results")).
+                options(sa.orm.joinedload("results").undefer("data")).
                 order_by(models.Task.id.desc()).first())
 
     def task_create(self, values):
@@ -127,19 +152,50 @@ class Connection(object):
             task.update(values)
         return task
 
-    def task_list(self, status=None, deployment=None):
-        query = self.model_query(models.Task)
+    def task_update_status(self, uuid, status, allowed_statuses):
+        session = get_session()
+        with session.begin():
+            count = (self.model_query(models.Task, session=session).
+                     filter(models.Task.uuid == uuid).
+                     filter(models.Task.status.in_(allowed_statuses)).
+                     update({"status": status}, synchronize_session=False))
+            if not count:
+                task = self._task_get(uuid, session=session)
+                raise exceptions.TaskInvalidStatus(
+                    uuid=uuid, require=", ".join(allowed_statuses),
+                    actual=task.status)
+
+    def task_list(self, status=None, deployment=None, tag=None,
+                  created_after=None, created_before=None, limit=None,
+                  marker=None):
+        session = get_session()
+        query = (session.query(*self._TASK_LIST_COLUMNS).
+                 join(models.Deployment,
+                      models.Task.deployment_uuid == models.Deployment.uuid))
 
-        filters = {}
         if status is not None:
-            filters["status"] = status
+            query = query.filter(models.Task.status == status)
         if deployment is not None:
-            filters["deployment_uuid"] = self.deployment_get(
-                deployment)["uuid"]
-
-        if filters:
-            query = query.filter_by(**filters)
-        return query.all()
+            query = query.filter(
+                models.Task.deployment_uuid == self.deployment_get(
+                    deployment)["uuid"])
+        if tag is not None:
+            query = query.filter(models.Task.tag == tag)
+        if created_after is not None:
+            query = query.filter(models.Task.created_at >= created_after)
+        if created_before is not None:
+            query = query.filter(models.Task.created_at < created_before)
+        if marker is not None:
+            marker_id = (session.query(models.Task.id).
+                         filter_by(uuid=marker).scalar())
+            if marker_id is None:
+                raise exceptions.TaskNotFound(uuid=marker)
+            query = query.filter(models.Task.id < marker_id)
+
+        query = query.order_by(models.Task.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return [_Row(zip(self._TASK_LIST_KEYS, row)) for row in query]
 
     def task_delete(self, uuid, status=None):
         session = get_session()
@@ -164,12 +220,28 @@ class Connection(object):
 
     def task_result_create(self, task_uuid, key, data):
         result = models.TaskResult()
-        result.update({"task_uuid": task_uuid, "key": key, "data": data})
+        # Summary doesn't have iterations
+        summary = dict((k, v) for k, v in data.items()
+                       if k not in ("raw", "warmup"))
+        result.update({"task_uuid": task_uuid, "key": key, "data": data,
+                       "summary": summary})
         result.save()
         return result
 
-    def task_result_get_all_by_uuid(self, uuid):
+    def _task_result_summaries(self, uuid):
+        query = (get_session().query(models.TaskResult.id,
+                                     models.TaskResult.task_uuid,
+                                     models.TaskResult.key,
+                                     models.TaskResult.summary).
+                 filter_by(task_uuid=uuid))
+        return [_Row(id=id_, task_uuid=task_uuid, key=key, data=summary)
+                for id_, task_uuid, key, summary in query]
+
+    def task_result_get_all_by_uuid(self, uuid, raw=True):
+        if not raw:
+            return self._task_result_summaries(uuid)
         return (self.model_query(models.TaskResult).
+                options(sa.orm.undefer("data")).
                 filter_by(task_uuid=uuid).all())
 
     def _deployment_get(self, deployment, session=None):
@@ -332,3 +404,9 @@ class Connection(object):
                  update({"updated_at": timeutils.utcnow()}))
         if count == 0:
             raise exceptions.WorkerNotFound(worker=hostname)
+
+    def worker_list(self, updated_after=None):
+        query = self.model_query(models.Worker)
+        if updated_after is not None:
+            query = query.filter(models.Worker.updated_at >= updated_after)
+        return query.all()
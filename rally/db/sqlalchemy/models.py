@@ -142,10 +142,15 @@ class Task(BASE, RallyBase):
         sa.Index("task_uuid", "uuid", unique=True),
         sa.Index("task_status", "status"),
         sa.Index("task_deployment", "deployment_uuid"),
+        sa.Index("task_created_at", "created_at"),
+        sa.Index("task_tag", "tag"),
     )
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
     uuid = sa.Column(sa.String(36), default=UUID, nullable=False)
+    # NOTE: Enum is a CHECK or ENUM constraint of the DB, so statuses added
+    # to consts.TaskStatus (e.g. "aborting" and "aborted") are rejected by
+    # existing DBs until "rally-manage db recreate"
     status = sa.Column(sa.Enum(*list(consts.TaskStatus),
                        name="enum_tasks_status"),
                        default=consts.TaskStatus.INIT,
@@ -174,7 +179,12 @@ class TaskResult(BASE, RallyBase):
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
 
     key = sa.Column(sa_types.MutableJSONEncodedDict, nullable=False)
-    data = sa.Column(sa_types.BigMutableJSONEncodedDict, nullable=False)
+    # Data without raw iterations: SLA, load durations, sketches etc.
+    summary = sa.Column(sa_types.BigMutableJSONEncodedDict)
+    # Raw iterations are big and slow to decode, so they are loaded only
+    # if it's asked explicitly.
+    data = sa.orm.deferred(
+        sa.Column(sa_types.BigMutableJSONEncodedDict, nullable=False))
 
     task_uuid = sa.Column(sa.String(36), sa.ForeignKey("tasks.uuid"))
     task = sa.orm.relationship(Task,
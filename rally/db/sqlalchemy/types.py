@@ -13,13 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import json
-
 from sqlalchemy.dialects import mysql as mysql_types
 from sqlalchemy.ext import mutable
 from sqlalchemy import types as sa_types
 
-from rally.common import costilius
+from rally.common import jsoncodec
 
 
 class JSONEncodedDict(sa_types.TypeDecorator):
@@ -29,13 +27,12 @@ class JSONEncodedDict(sa_types.TypeDecorator):
 
     def process_bind_param(self, value, dialect):
         if value is not None:
-            value = json.dumps(value, sort_keys=False)
+            value = jsoncodec.dumps(value)
         return value
 
     def process_result_value(self, value, dialect):
         if value is not None:
-            value = costilius.json_loads(
-                value, object_pairs_hook=costilius.OrderedDict)
+            value = jsoncodec.loads(value)
         return value
 
 
@@ -16,8 +16,6 @@
 import os
 import time
 
-import novaclient.exceptions
-
 from rally.benchmark import utils as benchmark_utils
 from rally.common.i18n import _
 from rally.common import log as logging
@@ -163,6 +161,7 @@ class OpenStackProvider(provider.ProviderFactory):
             "ssh_public_key_file", os.path.expanduser("~/.ssh/id_rsa.pub"))
         public_key = open(public_key_path, "r").read().strip()
         key_name = self.config["deployment_name"] + "-key"
+        import novaclient.exceptions
         try:
             key = self.nova.keypairs.find(name=key_name)
             self.nova.keypairs.delete(key.id)
@@ -216,6 +215,7 @@ class OpenStackProvider(provider.ProviderFactory):
         return servers
 
     def destroy_servers(self):
+        import novaclient.exceptions
         for resource in self.resources.get_all(type=SERVER_TYPE):
             try:
                 self.nova.servers.delete(resource["info"]["id"])
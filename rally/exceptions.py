@@ -91,6 +91,10 @@ class InvalidConfigException(RallyException):
     msg_fmt = _("This config has invalid schema: `%(message)s`")
 
 
+class InvalidResultsFile(RallyException):
+    msg_fmt = _("Invalid task results file %(path)s: %(reason)s")
+
+
 class InvalidRunnerResult(RallyException):
     msg_fmt = _("Type of result of `%(name)s` runner should be"
                 " `base.ScenarioRunnerResult`. Got: `%(results_type)s`")
@@ -255,6 +259,18 @@ class WorkerAlreadyRegistered(RallyException):
     msg_fmt = _("Worker %(worker)s already registered")
 
 
+class WorkersNotAvailable(RallyException):
+    msg_fmt = _("%(required)s active workers required, but only "
+                "%(available)s found")
+
+
+class WorkerAuthKeyNotSet(RallyException):
+    msg_fmt = _("Option worker_authkey of [benchmark] section is not set. "
+                "It's a secret key that Rally worker services and "
+                "distributed runner share, it should be set in config of "
+                "all of them")
+
+
 class SaharaClusterFailure(RallyException):
     msg_fmt = _("Sahara cluster %(name)s has failed to %(action)s. "
                 "Reason: '%(reason)s'")
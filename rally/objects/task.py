@@ -20,6 +20,42 @@ from rally import consts
 from rally import db
 
 
+_ITERATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "atomic_actions": {
+            "type": "object"
+        },
+        "concurrency": {
+            "type": "integer"
+        },
+        "duration": {
+            "type": "number"
+        },
+        "error": {
+            "type": "array"
+        },
+        "idle_duration": {
+            "type": "number"
+        },
+        "scenario_output": {
+            "type": "object",
+            "properties": {
+                "data": {
+                    "type": "object"
+                },
+                "errors": {
+                    "type": "string"
+                },
+            },
+            "required": ["data", "errors"]
+        },
+    },
+    "required": ["atomic_actions", "duration", "error",
+                 "idle_duration", "scenario_output"]
+}
+
+
 TASK_RESULT_SCHEMA = {
     "type": "object",
     "$schema": consts.JSON_SCHEMA,
@@ -58,45 +94,34 @@ TASK_RESULT_SCHEMA = {
         },
         "result": {
             "type": "array",
-            "items": {
-                "type": "object",
-                "properties": {
-                    "atomic_actions": {
-                        "type": "object"
-                    },
-                    "duration": {
-                        "type": "number"
-                    },
-                    "error": {
-                        "type": "array"
-                    },
-                    "idle_duration": {
-                        "type": "number"
-                    },
-                    "scenario_output": {
-                        "type": "object",
-                        "properties": {
-                            "data": {
-                                "type": "object"
-                            },
-                            "errors": {
-                                "type": "string"
-                            },
-                        },
-                        "required": ["data", "errors"]
-                    },
-                },
-                "required": ["atomic_actions", "duration", "error",
-                             "idle_duration", "scenario_output"]
-            },
+            "items": _ITERATION_SCHEMA,
             "minItems": 1
         },
+        "warmup": {
+            "type": "array",
+            "items": _ITERATION_SCHEMA
+        },
+        "runner_stats": {
+            "type": "object"
+        },
         "load_duration": {
             "type": "number",
         },
         "full_duration": {
             "type": "number",
         },
+        "contexts": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string"
+                    },
+                },
+                "required": ["name"]
+            }
+        },
     },
     "required": ["key", "sla", "result", "load_duration",
                  "full_duration"],
@@ -128,8 +153,10 @@ class Task(object):
 
     def to_dict(self):
         db_task = self.task
-        deployment_name = db.deployment_get(self.task.deployment_uuid)["name"]
-        db_task["deployment_name"] = deployment_name
+        if "deployment_name" not in db_task:
+            deployment_name = db.deployment_get(
+                self.task.deployment_uuid)["name"]
+            db_task["deployment_name"] = deployment_name
         return db_task
 
     @staticmethod
@@ -137,8 +164,15 @@ class Task(object):
         return Task(db.task_get(uuid))
 
     @staticmethod
-    def list(status=None, deployment=None):
-        return [Task(db_task) for db_task in db.task_list(status, deployment)]
+    def list(status=None, deployment=None, tag=None, created_after=None,
+             created_before=None, limit=None, marker=None):
+        return [Task(db_task) for db_task in db.task_list(
+            status, deployment, tag=tag, created_after=created_after,
+            created_before=created_before, limit=limit, marker=marker)]
+
+    @staticmethod
+    def get_status(uuid):
+        return db.task_get(uuid)["status"]
 
     @staticmethod
     def delete_by_uuid(uuid, status=None):
@@ -154,12 +188,30 @@ class Task(object):
     def update_verification_log(self, log):
         self._update({"verification_log": json.dumps(log)})
 
+    def abort(self, soft=False):
+        """Request the engine that runs the task to abort it.
+
+        :param soft: if True, iterations in progress are finished, otherwise
+                     they are terminated. Soft abort may be turned into hard
+                     one, but not vice versa.
+        :raises: :class:`rally.exceptions.TaskInvalidStatus` if the task is
+                 not running
+        """
+        if soft:
+            status = consts.TaskStatus.SOFT_ABORTING
+            allowed_statuses = [consts.TaskStatus.RUNNING]
+        else:
+            status = consts.TaskStatus.ABORTING
+            allowed_statuses = [consts.TaskStatus.RUNNING,
+                                consts.TaskStatus.SOFT_ABORTING]
+        db.task_update_status(self.task["uuid"], status, allowed_statuses)
+
     def set_failed(self, log=""):
         self._update({"status": consts.TaskStatus.FAILED,
                       "verification_log": json.dumps(log)})
 
-    def get_results(self):
-        return db.task_result_get_all_by_uuid(self.task["uuid"])
+    def get_results(self, raw=True):
+        return db.task_result_get_all_by_uuid(self.task["uuid"], raw=raw)
 
     def append_results(self, key, value):
         db.task_result_create(self.task["uuid"], key, value)
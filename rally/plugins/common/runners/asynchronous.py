@@ -0,0 +1,357 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+import sys
+import time
+import traceback
+import weakref
+
+from rally.benchmark import runner
+from rally.common.i18n import _
+from rally.common import log as logging
+from rally.common import utils
+from rally import consts
+from rally import exceptions
+from rally import osclients
+
+
+LOG = logging.getLogger(__name__)
+
+# Callables that release resources shared by iterations of an event loop,
+# e.g. HTTP sessions, they are called before the loop is closed
+_LOOP_CLEANUPS = weakref.WeakKeyDictionary()
+
+
+def _import_asyncio():
+    # loop.create_future() appeared in Python 3.5.2
+    if sys.version_info < (3, 5, 2):
+        raise exceptions.RallyException(
+            _("asyncio runner requires Python 3.5.2 or higher"))
+    import asyncio
+    return asyncio
+
+
+def _is_awaitable(obj):
+    asyncio = _import_asyncio()
+    return asyncio.iscoroutine(obj) or hasattr(obj, "add_done_callback")
+
+
+class _EventLoopWorker(object):
+    """Runs scenario iterations as tasks of one event loop.
+
+    Scenario method may return a coroutine or a future. Such iteration is
+    finished when the returned coroutine/future is done, so one OS thread
+    is able to keep a lot of iterations in flight. Scenarios that return
+    anything else are treated as usual synchronous ones.
+    """
+
+    def __init__(self, loop, queue, iteration_gen, times, concurrency, rps,
+                 timeout, context, cls, method_name, args, aborted):
+        self.loop = loop
+        self.queue = queue
+        self.iteration_gen = iteration_gen
+        self.times = times
+        self.concurrency = concurrency
+        self.rps = rps
+        self.timeout = timeout
+        self.context = context
+        self.cls = cls
+        self.method_name = method_name
+        self.args = args
+        self.aborted = aborted
+
+        self.in_flight = 0
+        self.started = 0
+        self.stopped = False
+        # Scheduling waits for a free slot, it's resumed by finished iteration
+        self.waiting = False
+        self.start_time = None
+        self.done = loop.create_future()
+
+    def run(self, delay=0):
+        self.start_time = time.time() + delay
+        if self.rps:
+            self.loop.call_later(delay, self._schedule)
+        else:
+            for i in range(self.concurrency):
+                self.loop.call_later(delay, self._start_iteration)
+        self.loop.run_until_complete(self.done)
+
+    def _schedule(self):
+        """Start iterations with the required rate."""
+        if self.stopped:
+            return
+        if self.in_flight < self.concurrency:
+            self._start_iteration()
+            next_start = self.start_time + float(self.started) / self.rps
+            self.loop.call_later(max(0, next_start - time.time()),
+                                 self._schedule)
+        else:
+            self.waiting = True
+
+    def _start_iteration(self):
+        if self.stopped:
+            return
+        iteration = next(self.iteration_gen)
+        if iteration >= self.times or self.aborted.is_set():
+            self.stopped = True
+            self._check_done()
+            return
+
+        self.started += 1
+        self.in_flight += 1
+
+        context = runner._get_scenario_context(self.context)
+        context["iteration"] = iteration
+        scenario = self.cls(
+            context=context,
+            admin_clients=osclients.Clients(context["admin"]["endpoint"]),
+            clients=osclients.Clients(context["user"]["endpoint"]))
+
+        started_at = time.time()
+        try:
+            output = getattr(scenario, self.method_name)(**self.args)
+            if _is_awaitable(output):
+                asyncio = _import_asyncio()
+                future = asyncio.ensure_future(output, loop=self.loop)
+                if self.timeout:
+                    future = asyncio.ensure_future(
+                        asyncio.wait_for(future, self.timeout),
+                        loop=self.loop)
+                future.add_done_callback(
+                    lambda f: self._finish_iteration(scenario, started_at, f))
+                return
+        except Exception as e:
+            self._send_result(scenario, started_at, error=e)
+        else:
+            self._send_result(scenario, started_at, output=output)
+        self._iteration_finished()
+
+    def _finish_iteration(self, scenario, started_at, future):
+        if future.cancelled():
+            asyncio = _import_asyncio()
+            self._send_result(scenario, started_at,
+                              error=asyncio.CancelledError())
+        elif future.exception():
+            self._send_result(scenario, started_at, error=future.exception())
+        else:
+            self._send_result(scenario, started_at, output=future.result())
+        self._iteration_finished()
+
+    def _iteration_finished(self):
+        self.in_flight -= 1
+        if self.waiting:
+            self.waiting = False
+            self.loop.call_soon(self._schedule)
+        elif not self.rps:
+            # Start next iteration from the loop, not from here, to avoid
+            # recursion in case of synchronous scenarios
+            self.loop.call_soon(self._start_iteration)
+        self._check_done()
+
+    def _check_done(self):
+        if self.stopped and not self.in_flight and not self.done.done():
+            self.done.set_result(None)
+
+    def _send_result(self, scenario, started_at, output=None, error=None):
+        duration = time.time() - started_at
+        if error is not None:
+            if logging.is_debug():
+                LOG.exception(error)
+            error = [error.__class__.__name__, str(error),
+                     "".join(traceback.format_exception(
+                         type(error), error,
+                         getattr(error, "__traceback__", None)))]
+        self.queue.put({
+            "duration": duration - scenario.idle_duration(),
+            "timestamp": started_at,
+            "idle_duration": scenario.idle_duration(),
+            "error": error or [],
+            "scenario_output": output or {"errors": "", "data": {}},
+            "atomic_actions": scenario.atomic_actions()
+        })
+
+
+def add_loop_cleanup(loop, cleanup):
+    """Call cleanup before the event loop of the worker is closed.
+
+    :param loop: event loop of the worker
+    :param cleanup: callable without arguments, coroutine or future returned
+                    by it is run on the loop till it's done
+    """
+    _LOOP_CLEANUPS.setdefault(loop, []).append(cleanup)
+
+
+def _cleanup_loop(loop):
+    for cleanup in _LOOP_CLEANUPS.pop(loop, []):
+        try:
+            result = cleanup()
+            if _is_awaitable(result):
+                loop.run_until_complete(result)
+        except Exception as e:
+            LOG.warning(_("Failed to release resources of event loop: %s")
+                        % e)
+
+
+def _worker_process(queue, iteration_gen, timeout, concurrency, rps, times,
+                    context, cls, method_name, args, aborted, info):
+    """Run scenario iterations on the event loop of this process.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param timeout: iteration's timeout
+    :param concurrency: max number of iterations in flight
+    :param rps: number of iterations to be started per second, if it's
+                None then next iteration is started as soon as any previous
+                one is finished
+    :param times: total number of scenario iterations to be run
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param info: info about all processes count and counter of launched process
+    """
+    asyncio = _import_asyncio()
+
+    runner._log_worker_info(times=times, concurrency=concurrency, rps=rps,
+                            timeout=timeout, cls=cls, method_name=method_name,
+                            args=args)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        worker = _EventLoopWorker(loop, queue, iteration_gen, times,
+                                  concurrency, rps, timeout, context, cls,
+                                  method_name, args, aborted)
+        # Rate based workers are started with a shift to spread iterations
+        # of all processes evenly in time
+        delay = 0
+        if rps:
+            delay = ((1.0 / rps) * info["processes_counter"] /
+                     info["processes_to_start"])
+        worker.run(delay)
+    finally:
+        _cleanup_loop(loop)
+        loop.close()
+
+
+@runner.configure(name="asyncio")
+class AsyncioScenarioRunner(runner.ScenarioRunner):
+    """Runs coroutine-capable scenarios on event loops of worker processes.
+
+    Every worker process runs a single asyncio event loop, so the number
+    of iterations in flight is not limited by the number of threads. This
+    makes it possible to keep tens of thousands of concurrent I/O-bound
+    iterations (e.g. HTTP requests) with small memory usage.
+
+    Scenarios should return a coroutine or a future, e.g. see
+    AsyncHttpRequests scenarios. Synchronous scenarios block the event
+    loop, so they are executed one-by-one within each worker process.
+
+    If "rps" is specified then iterations are started with this frequency
+    and "concurrency" limits the number of iterations in flight (they are
+    not limited by default), otherwise
+    "concurrency" iterations are executed all the time, like the constant
+    runner does.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "rps": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "timeout": {
+                "type": "number",
+                "minimum": 0
+            },
+            "max_cpu_count": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "warmup": runner.WARMUP_SCHEMA
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    }
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified benchmark scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+
+        :returns: List of results fore each single scenario iteration,
+                  where each result is a dictionary
+        """
+        _import_asyncio()
+
+        times = self.config.get("times", 1)
+        rps = self.config.get("rps")
+        # Rate is the limit of the load, so by default any number of
+        # iterations may be in flight
+        concurrency = self.config.get("concurrency", times if rps else 1)
+        timeout = self.config.get("timeout", 0)  # 0 means no timeout
+        iteration_gen = utils.RAMInt()
+
+        max_cpu_used = self._get_max_cpu_used()
+
+        processes_to_start = min(max_cpu_used, times, concurrency)
+        concurrency_per_worker, concurrency_overhead = divmod(
+            concurrency, processes_to_start)
+        rps_per_worker = rps and float(rps) / processes_to_start
+
+        self._log_debug_info(times=times, concurrency=concurrency, rps=rps,
+                             timeout=timeout, max_cpu_used=max_cpu_used,
+                             processes_to_start=processes_to_start,
+                             concurrency_per_worker=concurrency_per_worker,
+                             concurrency_overhead=concurrency_overhead,
+                             rps_per_worker=rps_per_worker)
+
+        result_queue = multiprocessing.Queue()
+
+        def worker_args_gen(concurrency_overhead):
+            while True:
+                yield (result_queue, iteration_gen, timeout,
+                       concurrency_per_worker + (concurrency_overhead and 1),
+                       rps_per_worker, times, context, cls, method_name,
+                       args, self.aborted)
+                if concurrency_overhead:
+                    concurrency_overhead -= 1
+
+        process_pool = self._create_process_pool(
+            processes_to_start, _worker_process,
+            worker_args_gen(concurrency_overhead))
+        self._join_processes(process_pool, result_queue)
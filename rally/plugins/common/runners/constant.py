@@ -15,7 +15,6 @@
 
 import collections
 import multiprocessing
-import threading
 import time
 
 from rally.benchmark import runner
@@ -39,7 +38,8 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times, context,
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
-    :param timeout: operation's timeout
+    :param timeout: iteration's timeout, slot of the iteration that runs
+                    longer is released and the timeout result is sent
     :param concurrency: number of concurrently running scenario iterations
     :param times: total number of scenario iterations to be run
     :param context: scenario context object
@@ -52,8 +52,8 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times, context,
     """
 
     pool = collections.deque()
-    alive_threads_in_pool = 0
-    finished_threads_in_pool = 0
+    # Timed out iterations that are still running
+    orphans = []
 
     runner._log_worker_info(times=times, concurrency=concurrency,
                             timeout=timeout, cls=cls, method_name=method_name,
@@ -63,40 +63,25 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times, context,
     while iteration < times and not aborted.is_set():
         scenario_context = runner._get_scenario_context(context)
         scenario_args = (iteration, cls, method_name, scenario_context, args)
-        worker_args = (queue, scenario_args)
 
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
+        thread = runner._IterationThread(queue, scenario_args, timeout)
         thread.start()
-        pool.append((thread, time.time()))
-        alive_threads_in_pool += 1
-
-        while alive_threads_in_pool == concurrency:
-            prev_finished_threads_in_pool = finished_threads_in_pool
-            finished_threads_in_pool = 0
-            for t in pool:
-                if not t[0].isAlive():
-                    finished_threads_in_pool += 1
-
-            alive_threads_in_pool -= finished_threads_in_pool
-            alive_threads_in_pool += prev_finished_threads_in_pool
-
-            if alive_threads_in_pool < concurrency:
-                # NOTE(boris-42): cleanup pool array. This is required because
-                # in other case array length will be equal to times which
-                # is unlimited big
-                while pool and not pool[0][0].isAlive():
-                    pool.popleft()[0].join()
-                    finished_threads_in_pool -= 1
-                break
+        pool.append(thread)
 
+        # Slot of the iteration is released as soon as it's finished or
+        # timed out
+        runner._release_threads(pool, orphans)
+        while len(pool) >= concurrency:
             # we should wait to not create big noise with these checks
             time.sleep(0.001)
+            runner._release_threads(pool, orphans)
         iteration = next(iteration_gen)
 
-    # Wait until all threads are done
+    # Wait until all threads are done or timed out
     while pool:
-        pool.popleft()[0].join()
+        pool[0].join(0.001)
+        runner._release_threads(pool, orphans)
+    runner._log_orphans(orphans)
 
 
 @runner.configure(name="constant")
@@ -111,6 +96,10 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
     number of concurrent scenarios which execute during a single
     iteration in order to simulate the activities of multiple users
     placing load on the cloud under test.
+
+    Iterations that run longer than "timeout" seconds are abandoned,
+    so they don't hold the load back, and timeout errors are reported
+    as their results.
     """
 
     CONFIG_SCHEMA = {
@@ -135,7 +124,8 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
             "max_cpu_count": {
                 "type": "integer",
                 "minimum": 1
-            }
+            },
+            "warmup": runner.WARMUP_SCHEMA
         },
         "required": ["type"],
         "additionalProperties": False
@@ -163,9 +153,7 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
         concurrency = self.config.get("concurrency", 1)
         iteration_gen = utils.RAMInt()
 
-        cpu_count = multiprocessing.cpu_count()
-        max_cpu_used = min(cpu_count,
-                           self.config.get("max_cpu_count", cpu_count))
+        max_cpu_used = self._get_max_cpu_used()
 
         processes_to_start = min(max_cpu_used, times, concurrency)
         concurrency_per_worker, concurrency_overhead = divmod(
@@ -225,12 +213,17 @@ class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
             "timeout": {
                 "type": "number",
                 "minimum": 1
-            }
+            },
+            "warmup": runner.WARMUP_SCHEMA
         },
         "required": ["type", "duration"],
         "additionalProperties": False
     }
 
+    def _get_warmup_config(self, warmup):
+        return dict(self.config,
+                    duration=warmup.get("duration", self.UNLIMITED))
+
     @staticmethod
     def _iter_scenario_args(cls, method, ctx, args, aborted):
         def _scenario_args(i):
@@ -273,7 +266,7 @@ class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
 
             self._send_result(result)
 
-            if time.time() - start > duration:
+            if time.time() - start > duration or self.aborted.is_set():
                 break
 
         pool.terminate()
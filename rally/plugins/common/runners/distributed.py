@@ -0,0 +1,248 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import threading
+import time
+
+from oslo_config import cfg
+from six import moves
+
+from rally.benchmark import distributed
+from rally.benchmark import runner
+from rally.common import log as logging
+from rally import consts
+from rally import exceptions
+from rally.plugins.common.runners import constant
+from rally.plugins.common.runners import rps
+from rally.plugins.common.runners import serial
+
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+# Values of options that limit the load, which nested runners use by
+# default, they are divided between workers as well
+LOAD_DEFAULTS = {"times": 1, "concurrency": 1}
+
+
+def _get_runner_schema(runner_cls):
+    schema = copy.deepcopy(runner_cls.CONFIG_SCHEMA)
+    schema.pop("$schema", None)
+    schema["properties"]["type"] = {"enum": [runner_cls.get_name()]}
+    schema["required"] = list(set(schema.get("required", []) + ["type"]))
+    return schema
+
+
+def _receive_results(hostname, conn, queue, stopped):
+    """Put messages of the worker to the queue till its job is over."""
+    try:
+        while not stopped.is_set():
+            if not conn.poll(0.1):
+                continue
+            kind, data = conn.recv()
+            queue.put((hostname, kind, data))
+            if kind in ("done", "error"):
+                return
+    except (EOFError, IOError) as e:
+        queue.put((hostname, "lost", str(e)))
+
+
+@runner.configure(name="distributed")
+class DistributedScenarioRunner(runner.ScenarioRunner):
+    """Generates the load from a few Rally worker services.
+
+    The load of "runner" is divided between workers that sent heartbeat
+    recently: "times", "concurrency" and "rps" are split as evenly as
+    possible, other options are the same for all workers, e.g. every
+    worker runs the whole warm-up. Workers are started with
+    "rally-manage worker start" on the same or other hosts that share the
+    DB with Rally.
+
+    Results of iterations are streamed back as soon as they are finished,
+    so SLA and statistics are calculated for the whole load. Number of
+    iterations and the status of every worker are stored in runner stats.
+    If a worker fails or is lost, the load of other workers goes on;
+    workers that stop sending heartbeat are considered lost as well.
+    """
+
+    RUNNERS = (serial.SerialScenarioRunner,
+               constant.ConstantScenarioRunner,
+               constant.ConstantForDurationScenarioRunner,
+               rps.RPSScenarioRunner)
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "runner": {
+                "oneOf": [_get_runner_schema(cls) for cls in RUNNERS]
+            },
+            "workers": {
+                "type": "integer",
+                "minimum": 1
+            }
+        },
+        "required": ["type", "runner"],
+        "additionalProperties": False
+    }
+
+    def _get_workers(self):
+        workers = distributed.get_active_workers()
+        required = self.config.get("workers", 1)
+        if len(workers) < required:
+            raise exceptions.WorkersNotAvailable(required=required,
+                                                 available=len(workers))
+        return workers[:self.config.get("workers", len(workers))]
+
+    def _get_runner_config(self):
+        """Return nested runner config with defaults of load options."""
+        config = dict(self.config["runner"])
+        properties = runner.ScenarioRunner.get(
+            config["type"]).CONFIG_SCHEMA["properties"]
+        for key, value in LOAD_DEFAULTS.items():
+            if key in properties:
+                config.setdefault(key, value)
+        return config
+
+    def _mark_lost_workers(self, stats):
+        """Mark running workers that didn't send heartbeat as lost.
+
+        :param stats: dict with stats of every worker by hostname
+        :returns: number of workers that are marked as lost
+        """
+        active = set(distributed.get_active_workers())
+        error = ("Worker didn't send heartbeat for %d seconds"
+                 % CONF.benchmark.worker_heartbeat_timeout)
+        lost = 0
+        for hostname, worker_stats in stats.items():
+            if (worker_stats["status"] == "running" and
+                    hostname not in active):
+                worker_stats["status"] = "lost"
+                worker_stats["error"] = error
+                LOG.error("Worker %(worker)s lost: %(error)s" %
+                          {"worker": hostname, "error": error})
+                lost += 1
+        return lost
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified benchmark scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+
+        :returns: List of results fore each single scenario iteration,
+                  where each result is a dictionary
+        """
+        # Fail before any job is sent if workers can't be connected
+        distributed.get_authkey()
+        workers = self._get_workers()
+        configs = distributed.split_config(self._get_runner_config(),
+                                           len(workers))
+        workers = workers[:len(configs)]
+
+        self._log_debug_info(workers=workers, configs=configs)
+
+        # Task object is bound to the DB session, workers need only its uuid
+        context = dict(context, task={"uuid": self.task["uuid"]})
+        connections = []
+        try:
+            for hostname in workers:
+                connections.append(distributed.connect(hostname))
+            for conn, config in zip(connections, configs):
+                conn.send({"task_uuid": self.task["uuid"],
+                           "name": "%s.%s" % (cls.get_name(), method_name),
+                           "config": config,
+                           "context": context,
+                           "args": args})
+        except Exception:
+            for conn in connections:
+                conn.close()
+            raise
+
+        queue = moves.queue.Queue()
+        stopped = threading.Event()
+        threads = {}
+        for hostname, conn in zip(workers, connections):
+            thread = threading.Thread(target=_receive_results,
+                                      args=(hostname, conn, queue, stopped))
+            # Receiver of a partitioned worker may hang in recv()
+            thread.daemon = True
+            thread.start()
+            threads[hostname] = thread
+
+        stats = dict((hostname, {"hostname": hostname, "iterations": 0,
+                                 "status": "running"})
+                     for hostname in workers)
+        running = len(workers)
+        abort_sent = None
+        heartbeat_checked = time.time()
+        while running:
+            if self._abort_requested:
+                # Soft abort may be followed by hard one
+                abort = (distributed.HARD_ABORT if self._hard_abort
+                         else distributed.ABORT)
+                if abort != abort_sent:
+                    for conn in connections:
+                        try:
+                            conn.send(abort)
+                        except IOError:
+                            pass
+                    abort_sent = abort
+
+            if (time.time() - heartbeat_checked >=
+                    CONF.benchmark.worker_heartbeat_interval):
+                heartbeat_checked = time.time()
+                running -= self._mark_lost_workers(stats)
+
+            try:
+                hostname, kind, data = queue.get(timeout=0.01)
+            except moves.queue.Empty:
+                continue
+
+            if stats[hostname]["status"] != "running":
+                # Late message of the worker that is already lost
+                continue
+            if kind == "result":
+                self._send_result(data)
+                stats[hostname]["iterations"] += 1
+            elif kind == "warmup":
+                self.warmup_queue.append(runner.ScenarioRunnerResult(data))
+            else:
+                running -= 1
+                if kind == "done":
+                    stats[hostname]["status"] = "finished"
+                    continue
+                stats[hostname]["status"] = ("failed" if kind == "error"
+                                             else kind)
+                stats[hostname]["error"] = data
+                LOG.error("Worker %(worker)s %(status)s: %(error)s" %
+                          {"worker": hostname,
+                           "status": stats[hostname]["status"],
+                           "error": data[1] if kind == "error" else data})
+
+        stopped.set()
+        for hostname in workers:
+            if stats[hostname]["status"] != "lost":
+                threads[hostname].join()
+        for conn in connections:
+            conn.close()
+        self.stats = {"workers": [stats[hostname] for hostname in workers]}
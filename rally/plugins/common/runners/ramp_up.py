@@ -0,0 +1,231 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import math
+import multiprocessing
+import threading
+import time
+
+from rally.benchmark import runner
+from rally.common import utils
+from rally import consts
+
+
+class Schedule(object):
+    """Concurrency of the load as a function of time.
+
+    Concurrency grows from start to end by step every step_duration
+    seconds. Linear schedule spreads every step over its step_duration,
+    increasing concurrency by one at a time. The end concurrency is held
+    for step_duration seconds too.
+    """
+
+    def __init__(self, start, end, step, step_duration, linear=False):
+        self.start = start
+        self.end = end
+        self.step = step
+        self.step_duration = step_duration
+        self.linear = linear
+        steps = float(end - start) / step
+        if not linear:
+            steps = math.ceil(steps)
+        self.duration = (steps + 1) * step_duration
+
+    def concurrency(self, elapsed):
+        """Return concurrency at the moment or None if the load is over.
+
+        :param elapsed: seconds since the start of the load
+        """
+        if elapsed >= self.duration:
+            return None
+        if self.linear:
+            growth = int(elapsed * self.step / self.step_duration)
+        else:
+            growth = int(elapsed / self.step_duration) * self.step
+        return min(self.start + growth, self.end)
+
+
+def _worker_thread(queue, concurrency, args):
+    result = runner._run_scenario_once(args)
+    result["concurrency"] = concurrency
+    queue.put(result)
+
+
+def _worker_process(queue, iteration_gen, schedule, started_at, context,
+                    cls, method_name, args, aborted, info):
+    """Run the scenario in threads following the schedule.
+
+    Every process keeps its share of the scheduled concurrency of
+    iterations running. New iteration is started as soon as another one
+    is finished, so load is closed-loop. Each result is tagged with the
+    concurrency the iteration was started at.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param schedule: Schedule of the load
+    :param started_at: timestamp of the load start
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param info: info about all processes count and counter of launched process
+    """
+    processes, index = info["processes_to_start"], info["processes_counter"]
+    pool = collections.deque()
+
+    runner._log_worker_info(start=schedule.start, end=schedule.end,
+                            step=schedule.step,
+                            step_duration=schedule.step_duration,
+                            linear=schedule.linear, cls=cls,
+                            method_name=method_name, args=args)
+
+    while not aborted.is_set():
+        concurrency = schedule.concurrency(time.time() - started_at)
+        if concurrency is None:
+            break
+        share = concurrency // processes + (index < concurrency % processes)
+
+        for i in range(len(pool)):
+            thread = pool.popleft()
+            if thread.is_alive():
+                pool.append(thread)
+            else:
+                thread.join()
+
+        while len(pool) < share:
+            scenario_context = runner._get_scenario_context(context)
+            scenario_args = (next(iteration_gen), cls, method_name,
+                             scenario_context, args)
+            thread = threading.Thread(target=_worker_thread,
+                                      args=(queue, concurrency,
+                                            scenario_args))
+            thread.start()
+            pool.append(thread)
+
+        # we should wait to not create big noise with these checks
+        time.sleep(0.001)
+
+    # Wait until all threads are done
+    while pool:
+        pool.popleft().join()
+
+
+@runner.configure(name="ramp_up")
+class RampUpScenarioRunner(runner.ScenarioRunner):
+    """Creates closed-loop load with growing concurrency.
+
+    Concurrency grows from start_concurrency to end_concurrency by step
+    every step_duration seconds, then end_concurrency is held for
+    step_duration seconds. With "linear" schedule concurrency grows by
+    one evenly during every step instead.
+
+    Each iteration is tagged with the concurrency it was started at, so
+    throughput and latency of every concurrency level, i.e. the point
+    where the cloud under test saturates, are found in a single workload.
+
+    Warm-up is run at start_concurrency.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "start_concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "end_concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "step": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "step_duration": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "schedule": {
+                "type": "string",
+                "enum": ["stepped", "linear"]
+            },
+            "max_cpu_count": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "warmup": runner.WARMUP_SCHEMA
+        },
+        "required": ["type", "end_concurrency", "step_duration"],
+        "additionalProperties": False
+    }
+
+    def _get_warmup_config(self, warmup):
+        # Constant load at the start concurrency till warm-up is stopped
+        start = self.config.get("start_concurrency", 1)
+        return dict(self.config, end_concurrency=start,
+                    step_duration=self.UNLIMITED)
+
+    def _get_schedule(self):
+        start = self.config.get("start_concurrency", 1)
+        return Schedule(start, max(start, self.config["end_concurrency"]),
+                        self.config.get("step", 1),
+                        self.config["step_duration"],
+                        linear=self.config.get("schedule") == "linear")
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified benchmark scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+
+        :returns: List of results fore each single scenario iteration,
+                  where each result is a dictionary
+        """
+        schedule = self._get_schedule()
+        iteration_gen = utils.RAMInt()
+
+        max_cpu_used = self._get_max_cpu_used()
+        processes_to_start = min(max_cpu_used, schedule.end)
+
+        self._log_debug_info(start=schedule.start, end=schedule.end,
+                             step=schedule.step,
+                             step_duration=schedule.step_duration,
+                             linear=schedule.linear,
+                             duration=schedule.duration,
+                             max_cpu_used=max_cpu_used,
+                             processes_to_start=processes_to_start)
+
+        result_queue = multiprocessing.Queue()
+        started_at = time.time()
+
+        def worker_args_gen():
+            while True:
+                yield (result_queue, iteration_gen, schedule, started_at,
+                       context, cls, method_name, args, self.aborted)
+
+        process_pool = self._create_process_pool(
+            processes_to_start, _worker_process, worker_args_gen())
+        self._join_processes(process_pool, result_queue)
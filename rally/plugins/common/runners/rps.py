@@ -15,10 +15,10 @@
 
 import collections
 import multiprocessing
-import threading
 import time
 
 from rally.benchmark import runner
+from rally.benchmark import sla
 from rally.common import log as logging
 from rally.common import utils
 from rally import consts
@@ -38,7 +38,8 @@ def _worker_process(queue, iteration_gen, timeout, rps, times,
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
-    :param timeout: operation's timeout
+    :param timeout: iteration's timeout, slot of the iteration that runs
+                    longer is released and the timeout result is sent
     :param rps: number of scenario iterations to be run per one second
     :param times: total number of scenario iterations to be run
     :param max_concurrent: maximum worker concurrency
@@ -52,6 +53,8 @@ def _worker_process(queue, iteration_gen, timeout, rps, times,
     """
 
     pool = collections.deque()
+    # Timed out iterations that are still running
+    orphans = []
     start = time.time()
     sleep = 1.0 / rps
 
@@ -66,9 +69,7 @@ def _worker_process(queue, iteration_gen, timeout, rps, times,
         scenario_context = runner._get_scenario_context(context)
         scenario_args = (next(iteration_gen), cls, method_name,
                          scenario_context, args)
-        worker_args = (queue, scenario_args)
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
+        thread = runner._IterationThread(queue, scenario_args, timeout)
         i += 1
         thread.start()
         pool.append(thread)
@@ -79,19 +80,20 @@ def _worker_process(queue, iteration_gen, timeout, rps, times,
         LOG.debug("Worker: %s rps: %s (requested rps: %s)" %
                   (i, real_rps, rps))
 
-        # try to join latest thread(s) until it finished, or until time to
-        # start new thread (if we have concurrent slots available)
+        # try to join latest thread(s) until they are finished or timed out,
+        # or until time to start new thread (if we have concurrent slots
+        # available)
         while i / (time.time() - start) > rps or len(pool) >= max_concurrent:
             if pool:
                 pool[0].join(0.001)
-                if not pool[0].isAlive():
-                    pool.popleft()
+                runner._release_threads(pool, orphans)
             else:
                 time.sleep(0.001)
 
     while pool:
-        thr = pool.popleft()
-        thr.join()
+        pool[0].join(0.001)
+        runner._release_threads(pool, orphans)
+    runner._log_orphans(orphans)
 
 
 @runner.configure(name="rps")
@@ -105,6 +107,9 @@ class RPSScenarioRunner(runner.ScenarioRunner):
     An example of a rps scenario is booting 1 VM per second. This
     execution type is thus very helpful in understanding the maximal load that
     a certain cloud can handle.
+
+    An iteration that exceeds "timeout" seconds gets a timeout error as its
+    result and stops counting towards max_concurrency.
     """
 
     CONFIG_SCHEMA = {
@@ -133,7 +138,8 @@ class RPSScenarioRunner(runner.ScenarioRunner):
             "max_cpu_count": {
                 "type": "integer",
                 "minimum": 1
-            }
+            },
+            "warmup": runner.WARMUP_SCHEMA
         },
         "additionalProperties": False
     }
@@ -159,9 +165,7 @@ class RPSScenarioRunner(runner.ScenarioRunner):
         timeout = self.config.get("timeout", 0)  # 0 means no timeout
         iteration_gen = utils.RAMInt()
 
-        cpu_count = multiprocessing.cpu_count()
-        max_cpu_used = min(cpu_count,
-                           self.config.get("max_cpu_count", cpu_count))
+        max_cpu_used = self._get_max_cpu_used()
 
         processes_to_start = min(max_cpu_used, times,
                                  self.config.get("max_concurrency", times))
@@ -210,3 +214,206 @@ class RPSScenarioRunner(runner.ScenarioRunner):
             processes_to_start, _worker_process,
             worker_args_gen(times_overhead, concurrency_overhead))
         self._join_processes(process_pool, result_queue)
+
+
+class _Probe(object):
+    """Results of the load at a single rate."""
+
+    def __init__(self, rps, sla_config):
+        self.rps = rps
+        self.iterations = 0
+        self.errors = 0
+        self.sla_checker = sla.SLAChecker({"sla": sla_config})
+
+    def add_iteration(self, result):
+        self.iterations += 1
+        if result["error"]:
+            self.errors += 1
+        self.sla_checker.add_iteration(result)
+
+    def to_dict(self, duration):
+        sla_results = self.sla_checker.results()
+        return {"rps": self.rps,
+                "iterations": self.iterations,
+                "errors": self.errors,
+                "duration": duration,
+                "throughput": self.iterations / duration if duration else None,
+                "sla": sla_results,
+                "success": bool(self.iterations) and all(
+                    r["success"] for r in sla_results)}
+
+
+@runner.configure(name="auto_rps")
+class AutoRPSScenarioRunner(RPSScenarioRunner):
+    """Scenario runner that searches for the maximum sustainable rate.
+
+    The load is run with the specified frequency for probe_duration
+    seconds, results of such probe are checked against SLA of the
+    workload. The rate is doubled until SLA fails (up to max_rps) or
+    halved until it holds, then the interval between the highest passed
+    and the lowest failed rates is bisected until it gets narrower than
+    precision (relative to the passed rate) or max_probes probes are run.
+    So the workload must have "sla" section with at least one criterion.
+
+    The highest rate at which SLA holds (the capacity) is loaded then for
+    a fixed number of times, these iterations are the results of the
+    workload. Capacity and all the probes are reported in runner stats.
+    Warm-up is run at start_rps.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "start_rps": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "max_rps": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "probe_duration": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "precision": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "max_probes": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "timeout": {
+                "type": "number",
+            },
+            "max_concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "max_cpu_count": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "warmup": runner.WARMUP_SCHEMA
+        },
+        "required": ["type", "start_rps"],
+        "additionalProperties": False
+    }
+
+    # Without SLA criteria every probe passes and capacity is meaningless
+    REQUIRES_SLA = True
+
+    def __init__(self, task, config):
+        super(AutoRPSScenarioRunner, self).__init__(task, config)
+        self._probe = None
+
+    def _get_warmup_config(self, warmup):
+        return dict(self.config, rps=self.config["start_rps"],
+                    times=warmup.get("iterations", self.UNLIMITED))
+
+    def _send_result(self, result):
+        if self._probe is None or self._warmup is not None:
+            super(AutoRPSScenarioRunner, self)._send_result(result)
+        else:
+            self._probe.add_iteration(runner.ScenarioRunnerResult(result))
+
+    def _get_times(self, rps):
+        return max(1, int(round(rps * self.config.get("probe_duration", 60))))
+
+    def _run_rps(self, rps, times, cls, method_name, context, args):
+        config = self.config
+        self.config = dict(config, rps=rps, times=times)
+        try:
+            super(AutoRPSScenarioRunner, self)._run_scenario(
+                cls, method_name, context, args)
+        finally:
+            self.config = config
+
+    def _run_probe(self, rps, cls, method_name, context, args):
+        """Run the load at the rate and check it against SLA."""
+        self._probe = _Probe(rps, self.sla_config)
+        try:
+            with utils.Timer() as timer:
+                self._run_rps(rps, self._get_times(rps),
+                              cls, method_name, context, args)
+        finally:
+            probe, self._probe = self._probe, None
+        result = probe.to_dict(timer.duration())
+        self.stats["probes"].append(result)
+        LOG.info("Probe of %(rps)s rps: %(iterations)d iterations, "
+                 "%(errors)d errors, SLA %(status)s" %
+                 dict(result, status="passed" if result["success"]
+                      else "failed"))
+        return result["success"]
+
+    def _find_capacity(self, probe):
+        """Search for the maximum rate that passes probe.
+
+        :param probe: function that returns True if the load at the given
+                      rate meets SLA
+        :returns: the highest passed rate or None if no rate passed
+        """
+        max_rps = self.config.get("max_rps")
+        precision = self.config.get("precision", 0.1)
+        rps = self.config["start_rps"]
+        if max_rps:
+            rps = min(rps, max_rps)
+        passed = failed = None
+
+        for i in range(self.config.get("max_probes", 10)):
+            if self.aborted.is_set():
+                break
+            if probe(rps):
+                passed = rps
+            else:
+                failed = rps
+
+            if failed is None:
+                if max_rps and rps >= max_rps:
+                    break
+                rps = min(rps * 2, max_rps) if max_rps else rps * 2
+            elif passed is None:
+                rps /= 2.0
+            elif failed - passed <= precision * passed:
+                break
+            else:
+                rps = (passed + failed) / 2.0
+        return passed
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Find capacity with probes and run the load at it.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+        """
+        if self._warmup is not None:
+            return super(AutoRPSScenarioRunner, self)._run_scenario(
+                cls, method_name, context, args)
+
+        self.stats = {"capacity": None, "probes": []}
+        capacity = self._find_capacity(
+            lambda rps: self._run_probe(rps, cls, method_name, context, args))
+        self.stats["capacity"] = capacity
+        LOG.info("Capacity: %s rps" % capacity)
+        if capacity is None or self.aborted.is_set():
+            return
+
+        self._run_rps(capacity,
+                      self.config.get("times", self._get_times(capacity)),
+                      cls, method_name, context, args)
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from six import moves
+
 from rally.benchmark import runner
 from rally import consts
 
@@ -40,7 +42,8 @@ class SerialScenarioRunner(runner.ScenarioRunner):
             "times": {
                 "type": "integer",
                 "minimum": 1
-            }
+            },
+            "warmup": runner.WARMUP_SCHEMA
         },
         "additionalProperties": True
     }
@@ -65,7 +68,7 @@ class SerialScenarioRunner(runner.ScenarioRunner):
         """
         times = self.config.get("times", 1)
 
-        for i in range(times):
+        for i in moves.range(times):
             if self.aborted.is_set():
                 break
             run_args = (i, cls, method_name,
@@ -13,6 +13,7 @@
 import random
 
 from rally.benchmark.scenarios import base
+from rally.benchmark import validation
 from rally.plugins.common.scenarios.requests import utils
 
 
@@ -49,3 +50,66 @@ class HttpRequests(utils.RequestScenario):
         request = random.choice(requests)
         request.setdefault("status_code", status_code)
         self._check_request(**request)
+
+
+class HttpSessionRequests(utils.SessionRequestScenario):
+    """Benchmark scenarios for HTTP requests over keep-alive connections.
+
+    Each worker process keeps its connections open between iterations,
+    so these scenarios are able to generate much higher request rates
+    than HttpRequests ones.
+    """
+
+    @base.scenario()
+    def check_request(self, url, method, status_code, **kwargs):
+        """Make request and check it with expected response.
+
+        Atomic actions contain breakdown of the response time.
+
+        :param url: url for the Request object
+        :param method: method for the Request object
+        :param status_code: expected response code
+        :param kwargs: optional additional request parameters
+        """
+        self._session_request(url, method, status_code, **kwargs)
+
+    @base.scenario()
+    def check_pipeline(self, requests, status_code=200, variables=None):
+        """Make sequence of requests and check their responses.
+
+        URLs are templates, e.g. "http://localhost/servers/{server_id}"
+        where server_id is either specified in variables or extracted from
+        response of previous request:
+
+            {"url": "http://localhost/servers", "method": "POST",
+             "extract": {"server_id": "server.id"}}
+
+        :param requests: list of request dicts with "url" and optional
+                         "method", "status_code", "name", "extract" and
+                         additional request parameters
+        :param status_code: expected response code, it is used only for
+                            requests without their own status_code
+        :param variables: dict with initial values of URL variables
+        """
+        self._run_pipeline(requests, status_code=status_code,
+                           variables=variables)
+
+
+class AsyncHttpRequests(utils.AsyncRequestScenario):
+    """Benchmark scenarios for HTTP requests run by asyncio runner.
+
+    Iterations don't block the event loop while waiting for responses,
+    so a lot of requests may be in flight at the same time.
+    """
+
+    @validation.required_runner("asyncio")
+    @base.scenario()
+    def check_request(self, url, method, status_code, **kwargs):
+        """Make request and check it with expected response.
+
+        :param url: url for the Request object
+        :param method: method for the Request object
+        :param status_code: expected response code
+        :param kwargs: optional additional request parameters
+        """
+        return self._check_request_async(url, method, status_code, **kwargs)
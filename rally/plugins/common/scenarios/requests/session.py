@@ -0,0 +1,150 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Keep-alive HTTP session that measures connection establishment.
+
+Runners start a new thread for every iteration, so the session is shared
+by all threads of a worker process. The session's connection pool is
+thread-safe, connections are reused between iterations and DNS lookup,
+TCP connect and TLS handshake are done only for new connections.
+"""
+
+import contextlib
+import os
+import socket
+import threading
+import time
+
+import requests
+from requests import adapters
+from requests.packages import urllib3
+
+
+# Max number of idle connections that are kept per host. It should be
+# bigger than the concurrency of one worker process, otherwise extra
+# connections are closed after every request.
+POOL_MAXSIZE = 1000
+
+_local = threading.local()
+_lock = threading.Lock()
+_session = {}
+
+
+def _add_timing(name, duration):
+    timings = getattr(_local, "timings", None)
+    if timings is not None:
+        timings[name] += duration
+
+
+class _TimedConnectionMixin(object):
+
+    def _new_conn(self):
+        dns_host = getattr(self, "_dns_host", None)
+        if dns_host is None:
+            # Old urllib3 resolves the host by itself
+            started_at = time.time()
+            conn = super(_TimedConnectionMixin, self)._new_conn()
+            _add_timing("connect", time.time() - started_at)
+            return conn
+
+        started_at = time.time()
+        try:
+            address = socket.getaddrinfo(dns_host, self.port, 0,
+                                         socket.SOCK_STREAM)[0][4][0]
+        except socket.gaierror:
+            # Let urllib3 raise its own error
+            address = dns_host
+        resolved_at = time.time()
+        _add_timing("dns", resolved_at - started_at)
+
+        self._dns_host = address
+        try:
+            conn = super(_TimedConnectionMixin, self)._new_conn()
+        finally:
+            self._dns_host = dns_host
+        _add_timing("connect", time.time() - resolved_at)
+        return conn
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin,
+                           urllib3.connection.HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin,
+                            urllib3.connection.HTTPSConnection):
+
+    def connect(self):
+        timings = getattr(_local, "timings", None)
+        if timings is None:
+            return super(_TimedHTTPSConnection, self).connect()
+
+        # TLS handshake is what connect() does besides _new_conn()
+        tcp_before = timings["dns"] + timings["connect"]
+        started_at = time.time()
+        super(_TimedHTTPSConnection, self).connect()
+        tcp_duration = timings["dns"] + timings["connect"] - tcp_before
+        timings["tls"] += max(0.0, time.time() - started_at - tcp_duration)
+
+
+class _TimedHTTPConnectionPool(urllib3.HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(adapters.HTTPAdapter):
+    """HTTP adapter which connections report their establishment time."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(TimedHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool}
+
+
+def get_session():
+    """Return keep-alive session of the current process.
+
+    Connections must not be shared with the parent process, so every
+    forked worker process creates its own session.
+    """
+    pid = os.getpid()
+    if pid not in _session:
+        with _lock:
+            if pid not in _session:
+                session = requests.Session()
+                adapter = TimedHTTPAdapter(pool_maxsize=POOL_MAXSIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session.clear()
+                _session[pid] = session
+    return _session[pid]
+
+
+@contextlib.contextmanager
+def connection_timings():
+    """Collect connection establishment timings of requests in this thread.
+
+    Yields dict with "dns", "connect" and "tls" durations (in seconds),
+    they stay zero if requests reused already established connections.
+    """
+    _local.timings = timings = {"dns": 0.0, "connect": 0.0, "tls": 0.0}
+    try:
+        yield timings
+    finally:
+        _local.timings = None
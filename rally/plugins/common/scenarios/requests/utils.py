@@ -10,10 +10,38 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+import weakref
+
 import requests
 
 from rally.benchmark.scenarios import base
 from rally.common.i18n import _
+from rally.plugins.common.runners import asynchronous
+from rally.plugins.common.scenarios.requests import session
+
+
+# aiohttp sessions keep connections alive, so they are shared by all
+# iterations that are running on the same event loop and closed when the
+# loop is stopped.
+_SESSIONS = weakref.WeakKeyDictionary()
+
+
+def _get_session(loop):
+    """Return aiohttp session of the event loop.
+
+    It should be called from a coroutine or a callback of the loop, because
+    aiohttp binds the session to the running loop.
+    """
+    import aiohttp
+
+    if loop not in _SESSIONS:
+        # Connections count is limited by the runner's concurrency
+        _SESSIONS[loop] = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=0))
+        asynchronous.add_loop_cleanup(
+            loop, lambda: _SESSIONS.pop(loop).close())
+    return _SESSIONS[loop]
 
 
 class RequestScenario(base.Scenario):
@@ -36,3 +64,149 @@ class RequestScenario(base.Scenario):
             error_msg = _("Expected HTTP request code is `%s` actual `%s`")
             raise ValueError(
                 error_msg % (status_code, resp.status_code))
+
+
+class SessionRequestScenario(base.Scenario):
+    """Base class for Request scenarios that reuse keep-alive connections.
+
+    Every request adds atomic actions with the breakdown of its response
+    time: DNS lookup, TCP connect, TLS handshake, time to first byte and
+    transfer of the response body. Connection establishment durations are
+    zero when already established connection is reused.
+    """
+
+    BREAKDOWN = ("dns", "connect", "tls", "ttfb", "transfer")
+
+    def _session_request(self, url, method, status_code=None,
+                         name="requests", **kwargs):
+        """Make request using keep-alive session of the worker process.
+
+        :param url: Uniform resource locator
+        :param method: Type of request method (GET | POST ..)
+        :param status_code: Expected status code of request, it is not
+                            checked if None
+        :param name: prefix of names of atomic actions
+        :param kwargs: Optional additional request parameters
+        :raises: ValueError if return http status code
+                 not equal to expected status code
+        :returns: requests.Response object with loaded content
+        """
+        kwargs["stream"] = True
+        with session.connection_timings() as timings:
+            started_at = time.time()
+            resp = session.get_session().request(method, url, **kwargs)
+            # Response headers are received, load the body
+            headers_received_at = time.time()
+            resp.content
+            finished_at = time.time()
+
+        timings["ttfb"] = max(0.0, headers_received_at - started_at -
+                              timings["dns"] - timings["connect"] -
+                              timings["tls"])
+        timings["transfer"] = finished_at - headers_received_at
+        for action in self.BREAKDOWN:
+            self._add_atomic_actions("%s.%s" % (name, action),
+                                     timings[action])
+
+        if status_code is not None and status_code != resp.status_code:
+            error_msg = _("Expected HTTP request code is `%s` actual `%s`")
+            raise ValueError(error_msg % (status_code, resp.status_code))
+        return resp
+
+    def _render(self, template, variables):
+        try:
+            return template.format(**variables)
+        except KeyError as e:
+            raise ValueError(_("Variable %s is not defined") % e)
+
+    def _extract(self, resp, path):
+        """Get value from JSON response by dot-separated path."""
+        value = resp.json()
+        for key in path.split("."):
+            if isinstance(value, list):
+                key = int(key)
+            value = value[key]
+        return value
+
+    def _run_pipeline(self, requests, status_code=None, variables=None):
+        """Make sequence of requests.
+
+        Strings in "url" fields are templates for str.format(). Variables
+        are "iteration" (number of the current iteration), specified ones
+        and those extracted from previous responses.
+
+        :param requests: list of request dicts with "url" and optional
+                         "method" (GET by default), "status_code",
+                         "name", "extract" ({variable: path in JSON
+                         response}) and additional request parameters
+        :param status_code: expected status code of requests without
+                            their own "status_code"
+        :param variables: dict with initial template variables
+        """
+        variables = dict(variables or {},
+                         iteration=self.context.get("iteration", 0))
+        for i, request in enumerate(requests):
+            request = dict(request)
+            extract = request.pop("extract", {})
+            request.setdefault("method", "GET")
+            request.setdefault("status_code", status_code)
+            request.setdefault("name", "requests.%d" % i)
+            request["url"] = self._render(request["url"], variables)
+
+            resp = self._session_request(**request)
+            for variable, path in extract.items():
+                variables[variable] = self._extract(resp, path)
+
+
+class AsyncRequestScenario(base.Scenario):
+    """Base class for Request scenarios that are run by asyncio runner."""
+
+    def _check_request_async(self, url, method, status_code, **kwargs):
+        """Start request and return future of its result.
+
+        The future is resolved when the response is received. Atomic action
+        "requests.check_request" is added when the request is finished.
+
+        :param status_code: Expected status code of request
+        :param url: Uniform resource locator
+        :param method: Type of request method (GET | POST ..)
+        :param kwargs: Optional additional request parameters
+        :returns: asyncio.Future which raises ValueError if returned http
+                  status code is not equal to expected status code
+        """
+        import asyncio
+
+        loop = asyncio.get_event_loop()
+        result = loop.create_future()
+        started_at = time.time()
+        request = asyncio.ensure_future(
+            _get_session(loop).request(method, url, **kwargs), loop=loop)
+
+        def on_response(future):
+            if result.done():
+                return
+            if future.cancelled():
+                result.cancel()
+                return
+            if future.exception():
+                result.set_exception(future.exception())
+                return
+            resp = future.result()
+            resp.release()
+            self._add_atomic_actions("requests.check_request",
+                                     time.time() - started_at)
+            if status_code != resp.status:
+                error_msg = _("Expected HTTP request code is `%s` actual `%s`")
+                result.set_exception(
+                    ValueError(error_msg % (status_code, resp.status)))
+            else:
+                result.set_result(None)
+
+        def on_result(future):
+            # Runner cancels the result on timeout, so cancel request too
+            if future.cancelled():
+                request.cancel()
+
+        request.add_done_callback(on_response)
+        result.add_done_callback(on_result)
+        return result
@@ -13,8 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import abc
 import sys
 
+import six
+
 from rally.benchmark import context
 from rally.common.i18n import _
 from rally.common import log as logging
@@ -31,7 +34,15 @@ class NoSuchCleanupResources(exceptions.RallyException):
     msg_fmt = _("Missing cleanup resource managers: %(message)s")
 
 
+@six.add_metaclass(abc.ABCMeta)
 class CleanupMixin(object):
+    """Deletes resources of the listed services after the workload.
+
+    If contexts like users or images are shared by a few workloads (see
+    rally.benchmark.context.ContextPool), resources which exist before the
+    workload are created by these contexts and are used by the next
+    workloads. Their ids are saved at setup and they are not deleted.
+    """
 
     CONFIG_SCHEMA = {
         "type": "array",
@@ -42,12 +53,28 @@ class CleanupMixin(object):
         "additionalProperties": False
     }
 
+    @abc.abstractmethod
+    def _get_cleanup_args(self):
+        """Return arguments of manager.cleanup() besides names and exclude.
+
+        :returns: dict with admin_required, users and optionally admin
+        """
+
     def setup(self):
-        pass
+        self.preserved = set()
+        if self.context.get("shared_contexts"):
+            self.preserved = manager.list_resource_ids(
+                names=self.config, **self._get_cleanup_args())
+
+    def _cleanup(self):
+        manager.cleanup(names=self.config,
+                        exclude=getattr(self, "preserved", None),
+                        **self._get_cleanup_args())
 
 
 # NOTE(amaretskiy): Set order to run this just before UserCleanup
-@context.context(name="admin_cleanup", order=(sys.maxsize - 1), hidden=True)
+@context.context(name="admin_cleanup", order=(sys.maxsize - 1), hidden=True,
+                 per_workload=True)
 class AdminCleanup(CleanupMixin, context.Context):
     """Context class for admin resources cleanup."""
 
@@ -63,16 +90,19 @@ class AdminCleanup(CleanupMixin, context.Context):
                      % missing)
             raise NoSuchCleanupResources(missing)
 
+    def _get_cleanup_args(self):
+        return {"admin_required": True,
+                "admin": self.context["admin"],
+                "users": self.context.get("users", [])}
+
     @rutils.log_task_wrapper(LOG.info, _("admin resources cleanup"))
     def cleanup(self):
-        manager.cleanup(names=self.config,
-                        admin_required=True,
-                        admin=self.context["admin"],
-                        users=self.context.get("users", []))
+        self._cleanup()
 
 
 # NOTE(amaretskiy): Set maximum order to run this last
-@context.context(name="cleanup", order=sys.maxsize, hidden=True)
+@context.context(name="cleanup", order=sys.maxsize, hidden=True,
+                 per_workload=True)
 class UserCleanup(CleanupMixin, context.Context):
     """Context class for user resources cleanup."""
 
@@ -88,8 +118,10 @@ class UserCleanup(CleanupMixin, context.Context):
                      % missing)
             raise NoSuchCleanupResources(missing)
 
+    def _get_cleanup_args(self):
+        return {"admin_required": False,
+                "users": self.context.get("users", [])}
+
     @rutils.log_task_wrapper(LOG.info, _("user resources cleanup"))
     def cleanup(self):
-        manager.cleanup(names=self.config,
-                        admin_required=False,
-                        users=self.context.get("users", []))
+        self._cleanup()
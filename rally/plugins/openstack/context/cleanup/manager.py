@@ -28,7 +28,7 @@ LOG = logging.getLogger(__name__)
 
 class SeekAndDestroy(object):
 
-    def __init__(self, manager_cls, admin, users):
+    def __init__(self, manager_cls, admin, users, exclude=None):
         """Resource deletion class.
 
         This class contains method exterminate() that finds and deletes
@@ -37,10 +37,12 @@ class SeekAndDestroy(object):
         :param manager_cls: subclass of base.ResourceManager
         :param admin: admin endpoint like in context["admin"]
         :param users: users endpoints like in context["users"]
+        :param exclude: ids of resources that shouldn't be deleted
         """
         self.manager_cls = manager_cls
         self.admin = admin
         self.users = users or []
+        self.exclude = exclude or set()
 
     @staticmethod
     def _get_cached_client(user, cache=None):
@@ -131,6 +133,9 @@ class SeekAndDestroy(object):
             def _publish(admin, user, manager):
                 try:
                     for raw_resource in rutils.retry(3, manager.list):
+                        if (self.exclude and self._resource_id(raw_resource)
+                                in self.exclude):
+                            continue
                         queue.append((admin, user, raw_resource))
                 except Exception as e:
                     LOG.warning(
@@ -163,6 +168,16 @@ class SeekAndDestroy(object):
 
         return publisher
 
+    def _resource_id(self, raw_resource):
+        return self.manager_cls(resource=raw_resource).id()
+
+    def list_ids(self):
+        """Return ids of all resources that exterminate() would delete."""
+        jobs = []
+        self._gen_publisher()(jobs)
+        return set(self._resource_id(raw_resource)
+                   for admin, user, raw_resource in jobs)
+
     def _gen_consumer(self):
         """Generate method that consumes single deletion job."""
 
@@ -244,7 +259,23 @@ def find_resource_managers(names=None, admin_required=None):
     return resource_managers
 
 
-def cleanup(names=None, admin_required=None, admin=None, users=None):
+def list_resource_ids(names=None, admin_required=None, admin=None,
+                      users=None):
+    """Return ids of resources that cleanup() with the same args deletes.
+
+    :param names: the same as names argument of cleanup()
+    :param admin_required: the same as admin_required argument of cleanup()
+    :param admin: rally.objects.Endpoint that corresponds to OpenStack admin.
+    :param users: List of OpenStack users like in cleanup()
+    """
+    ids = set()
+    for manager in find_resource_managers(names, admin_required):
+        ids |= SeekAndDestroy(manager, admin, users).list_ids()
+    return ids
+
+
+def cleanup(names=None, admin_required=None, admin=None, users=None,
+            exclude=None):
     """Generic cleaner.
 
     This method goes through all plugins. Filter those and left only plugins
@@ -269,6 +300,8 @@ def cleanup(names=None, admin_required=None, admin=None, users=None):
                     "endpoint": <rally.objects.Endpoint>
 
                   }
+    :param exclude: ids of resources that shouldn't be deleted, e.g. ones
+                    created by contexts that are shared between workloads
     """
     for manager in find_resource_managers(names, admin_required):
-        SeekAndDestroy(manager, admin, users).exterminate()
+        SeekAndDestroy(manager, admin, users, exclude=exclude).exterminate()
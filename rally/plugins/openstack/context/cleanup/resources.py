@@ -14,8 +14,6 @@
 #    under the License.
 
 from boto import exception as boto_exception
-from neutronclient.common import exceptions as neutron_exceptions
-from saharaclient.api import base as saharaclient_base
 
 from rally.common import log as logging
 from rally.plugins.openstack.context.cleanup import base
@@ -174,6 +172,7 @@ class NeutronPort(NeutronMixin):
                 self.raw_resource["device_id"],
                 {"port_id": self.raw_resource["id"]})
         else:
+            from neutronclient.common import exceptions as neutron_exceptions
             try:
                 self._manager().delete_port(self.id())
             except neutron_exceptions.PortNotFoundClient:
@@ -342,6 +341,7 @@ class SaharaCluster(base.ResourceManager):
     # saharaclient/api/base.py#L145
 
     def is_deleted(self):
+        from saharaclient.api import base as saharaclient_base
         try:
             self._manager().get(self.id())
             return False
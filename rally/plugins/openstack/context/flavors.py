@@ -13,8 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from novaclient import exceptions as nova_exceptions
-
 from rally.benchmark import context
 from rally.common.i18n import _
 from rally.common import log as logging
@@ -25,7 +23,7 @@ from rally import osclients
 LOG = logging.getLogger(__name__)
 
 
-@context.context(name="flavors", order=340)
+@context.context(name="flavors", order=340, depends_on=[])
 class FlavorsGenerator(context.Context):
     """Context creates a list of flavors."""
 
@@ -73,6 +71,7 @@ class FlavorsGenerator(context.Context):
     @rutils.log_task_wrapper(LOG.info, _("Enter context: `flavors`"))
     def setup(self):
         """Create list of flavors."""
+        from novaclient import exceptions as nova_exceptions
         self.context["flavors"] = {}
 
         clients = osclients.Clients(self.context["admin"]["endpoint"])
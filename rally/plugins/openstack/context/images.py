@@ -25,7 +25,8 @@ from rally.plugins.openstack.scenarios.glance import utils as glance_utils
 LOG = logging.getLogger(__name__)
 
 
-@context.context(name="images", order=410)
+@context.context(name="images", order=410,
+                 depends_on=["users", "existing_users", "roles"])
 class ImageGenerator(context.Context):
     """Context class for adding images to each user for benchmarks."""
 
@@ -13,8 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import novaclient.exceptions
-
 from rally.benchmark import context
 from rally.common.i18n import _
 from rally.common import log as logging
@@ -26,7 +24,8 @@ from rally.plugins.openstack.context.cleanup import manager as resource_manager
 LOG = logging.getLogger(__name__)
 
 
-@context.context(name="keypair", order=310)
+@context.context(name="keypair", order=310,
+                 depends_on=["users", "existing_users", "quotas"])
 class Keypair(context.Context):
     KEYPAIR_NAME = "rally_ssh_key"
 
@@ -38,6 +37,7 @@ class Keypair(context.Context):
 
         # NOTE(hughsaunders): If keypair exists, it must be deleted as we can't
         # retrieve the private key
+        import novaclient.exceptions
         try:
             nova_client.keypairs.delete(keypair_name)
         except novaclient.exceptions.NotFound:
@@ -27,7 +27,8 @@ from rally.plugins.openstack.wrappers import network as network_wrapper
 LOG = logging.getLogger(__name__)
 
 
-@context.context(name="network", order=350)
+@context.context(name="network", order=350,
+                 depends_on=["users", "existing_users", "quotas", "roles"])
 class Network(context.Context):
     CONFIG_SCHEMA = {
         "type": "object",
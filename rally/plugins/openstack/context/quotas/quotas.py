@@ -29,7 +29,8 @@ from rally.plugins.openstack.context.quotas import nova_quotas
 LOG = logging.getLogger(__name__)
 
 
-@context.context(name="quotas", order=300)
+@context.context(name="quotas", order=300,
+                 depends_on=["users", "existing_users"])
 class Quotas(context.Context):
     """Context class for updating benchmarks' tenants quotas."""
 
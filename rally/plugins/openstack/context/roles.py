@@ -25,7 +25,8 @@ from rally import osclients
 LOG = logging.getLogger(__name__)
 
 
-@context.context(name="roles", order=330)
+@context.context(name="roles", order=330,
+                 depends_on=["users", "existing_users"])
 class RoleGenerator(context.Context):
     """Context class for adding temporary roles for benchmarks."""
 
@@ -26,7 +26,8 @@ from rally.plugins.openstack.scenarios.cinder import utils as cinder_utils
 LOG = logging.getLogger(__name__)
 
 
-@context.context(name="volumes", order=420)
+@context.context(name="volumes", order=420,
+                 depends_on=["users", "existing_users", "quotas", "roles"])
 class VolumeGenerator(context.Context):
     """Context class for adding volumes to each user for benchmarks."""
 
@@ -17,7 +17,6 @@ import random
 
 from oslo_config import cfg
 from oslo_utils import uuidutils
-from saharaclient.api import base as sahara_base
 
 from rally.benchmark.scenarios import base
 from rally.benchmark import utils as bench_utils
@@ -407,6 +406,7 @@ class SaharaScenario(base.Scenario):
             is_ready=self._is_cluster_deleted)
 
     def _is_cluster_deleted(self, cl_id):
+        from saharaclient.api import base as sahara_base
         try:
             self.clients("sahara").clusters.get(cl_id)
             return False
@@ -16,7 +16,6 @@
 import abc
 import collections
 
-from keystoneclient import exceptions
 import six
 
 from rally.common import log as logging
@@ -146,6 +145,7 @@ class KeystoneV2Wrapper(KeystoneWrapper):
 
 class KeystoneV3Wrapper(KeystoneWrapper):
     def _get_domain_id(self, domain_name_or_id):
+        from keystoneclient import exceptions
         try:
             # First try to find domain by ID
             return self.client.domains.get(domain_name_or_id).id
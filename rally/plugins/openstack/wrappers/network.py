@@ -25,9 +25,6 @@ from rally.common import utils
 from rally import consts
 from rally import exceptions
 
-from neutronclient.common import exceptions as neutron_exceptions
-from novaclient import exceptions as nova_exceptions
-
 
 LOG = logging.getLogger(__name__)
 
@@ -152,6 +149,7 @@ class NovaNetworkWrapper(NetworkWrapper):
         return {"id": fip.id, "ip": fip.ip}
 
     def _get_floating_ip(self, fip_id, do_raise=False):
+        from novaclient import exceptions as nova_exceptions
         try:
             fip = self.client.floating_ips.get(fip_id)
         except nova_exceptions.NotFound:
@@ -193,6 +191,7 @@ class NeutronWrapper(NetworkWrapper):
             "router:external": True})["networks"]
 
     def get_network(self, net_id=None, name=None):
+        from neutronclient.common import exceptions as neutron_exceptions
         net = None
         try:
             if net_id:
@@ -0,0 +1,67 @@
+## -*- coding: utf-8 -*-
+<%inherit file="/base.mako"/>
+
+<%block name="title_text">Tasks comparison</%block>
+
+<%block name="css">
+    .change-slower td.change { color:red; font-weight:bold }
+    .change-faster td.change { color:green; font-weight:bold }
+    .significant { font-weight:bold }
+    .delta { color:#999; font-size:11px }
+</%block>
+
+<%block name="header_text">tasks comparison</%block>
+
+<%def name="duration(value)">${"n/a" if value is None else "%.3f" % value}</%def>
+
+<%def name="delta(value)">${"" if value is None else "%+.1f%%" % value}</%def>
+
+<%def name="stat(data)">
+  <td class="${'significant' if data.get('significant') else ''}">
+    ${duration(data["values"][0])} &rarr; ${duration(data["values"][1])}
+    <span class="delta">${delta(data["delta"])}</span>
+</%def>
+
+<%block name="content">
+  <p>Durations are compared with Mann-Whitney U test, significance level is ${alpha}.
+     Percentiles with non-overlapping confidence intervals are in bold.</p>
+
+  % for workload in workloads:
+    <h2>${workload["name"]} <span class="delta">${workload["status"]}</span></h2>
+    <pre class="code">${workload["args"]}</pre>
+    % if workload["status"] == "compared":
+      <p>
+        Iterations: <b>${workload["iterations"][0]} &rarr; ${workload["iterations"][1]}</b> &nbsp;
+        Failures: <b>${workload["errors"][0]} &rarr; ${workload["errors"][1]}</b>
+      </p>
+      <table class="striped">
+        <thead>
+          <tr>
+            <th>Action
+            <th>Count
+            <th>Mean (sec)
+            % for name in percentiles:
+            <th>${name} (sec)
+            % endfor
+            <th>p-value
+            <th>Change
+          </tr>
+        </thead>
+        <tbody>
+          % for action in workload["actions"]:
+          <tr class="change-${action['change']}">
+            <td>${action["action"]}
+            <td>${action["count"][0]} &rarr; ${action["count"][1]}
+            ${stat(action["mean"])}
+            % for name in percentiles:
+            ${stat(action[name])}
+            % endfor
+            <td>${"n/a" if action["p_value"] is None else "%.4f" % action["p_value"]}
+            <td class="change">${action["change"] or ""}
+          </tr>
+          % endfor
+        </tbody>
+      </table>
+    % endif
+  % endfor
+</%block>
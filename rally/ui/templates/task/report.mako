@@ -75,7 +75,7 @@
         }
         if (uri.path in $scope.scenarios_map) {
           $scope.view = {is_scenario:true};
-          $scope.scenario = $scope.scenarios_map[uri.path];
+          $scope.scenario = $scope.loadDetails($scope.scenarios_map[uri.path]);
           $scope.nav_idx = $scope.nav_map[uri.path];
           $scope.showTab(uri.hash);
         } else {
@@ -92,6 +92,21 @@
         $scope.route($scope.location.uri())
       });
 
+      /* Data */
+
+      $scope.loadJSON = function(id) {
+        /* Data is kept in JSON blocks and parsed only when it is needed */
+        return JSON.parse(document.getElementById(id).textContent)
+      }
+
+      $scope.loadDetails = function(sc) {
+        if (! sc.details_loaded) {
+          angular.extend(sc, $scope.loadJSON(sc.details_id));
+          sc.details_loaded = true
+        }
+        return sc
+      }
+
       /* Navigation */
 
       $scope.showNav  = function(nav_idx) {
@@ -109,6 +124,10 @@
           id: "details",
           name: "Details",
           visible: function(){ return !! $scope.scenario.atomic.pie.length }
+        },{
+          id: "timeline",
+          name: "Timeline",
+          visible: function(){ return !! $scope.scenario.timeline.throughput[0].values.length }
         },{
           id: "output",
           name: "Output",
@@ -209,6 +228,20 @@
             .axisLabel("Iterations (frequency)")
             .tickFormat(d3.format("d"));
           this._render(selector, datum, chart)
+        },
+        line: function(selector, datum, y_label, x_label){
+          var chart = nv.models.lineChart()
+            .x(function(d) { return d[0] })
+            .y(function(d) { return d[1] })
+            .useInteractiveGuideline(true)
+            .forceY([0]);
+          chart.xAxis
+            .axisLabel(x_label || "Time since load start (seconds)")
+            .tickFormat(d3.format(",.1f"));
+          chart.yAxis
+            .axisLabel(y_label)
+            .tickFormat(d3.format(",.2f"));
+          this._render(selector, datum, chart)
         }
       };
 
@@ -242,6 +275,26 @@
         }
       }
 
+      $scope.renderTimeline = function() {
+        if (! $scope.scenario) {
+          return
+        }
+        var timeline = $scope.scenario.timeline;
+        Charts.line("#timeline-throughput", timeline.throughput,
+                    "Iterations per second");
+        Charts.line("#timeline-concurrency", timeline.concurrency,
+                    "Iterations in flight");
+        Charts.line("#timeline-errors", timeline.errors, "Failures (%)");
+        Charts.line("#timeline-percentiles", timeline.percentiles,
+                    "Duration (seconds)");
+        if ($scope.scenario.steps.table.length) {
+          Charts.line("#steps-throughput", $scope.scenario.steps.throughput,
+                      "Iterations per second", "Concurrency");
+          Charts.line("#steps-percentiles", $scope.scenario.steps.percentiles,
+                      "Duration (seconds)", "Concurrency")
+        }
+      }
+
       $scope.renderOutput = function() {
         if ($scope.scenario) {
           Charts.stack("#output-stack", $scope.scenario.output)
@@ -258,8 +311,8 @@
       /* Initialization */
 
       angular.element(document).ready(function(){
-        $scope.source = ${source};
-        $scope.scenarios = ${data};
+        $scope.source = $scope.loadJSON("source");
+        $scope.scenarios = $scope.loadJSON("scenarios");
         if (! $scope.scenarios.length) {
           return $scope.showError("Benchmark has empty scenarios data")
         }
@@ -309,10 +362,10 @@
 
           /* Compose histograms options, from first suitable scenario */
 
-          if (! $scope.histogramOptions.length && sc.iterations.histogram) {
-            for (var i in sc.iterations.histogram) {
+          if (! $scope.histogramOptions.length && sc.histogram_methods.length) {
+            for (var i in sc.histogram_methods) {
               $scope.histogramOptions.push({
-                label: sc.iterations.histogram[i].method,
+                label: sc.histogram_methods[i],
                 value: i
               })
             }
@@ -459,11 +512,11 @@
                 </span>
               <th class="sortable"
                   title="Number of errors occured"
-                  ng-click="ov_srt='errors.length'; ov_dir=!ov_dir">
+                  ng-click="ov_srt='errors_num'; ov_dir=!ov_dir">
                 Errors
                 <span class="arrow">
-                  <b ng-show="ov_srt=='errors.length' && !ov_dir">&#x25b4;</b>
-                  <b ng-show="ov_srt=='errors.length' && ov_dir">&#x25be;</b>
+                  <b ng-show="ov_srt=='errors_num' && !ov_dir">&#x25b4;</b>
+                  <b ng-show="ov_srt=='errors_num' && ov_dir">&#x25be;</b>
                 </span>
               <th class="sortable"
                   title="Whether SLA check is successful"
@@ -483,7 +536,7 @@
               <td>{{sc.full_duration | number:3}}
               <td>{{sc.iterations_num}}
               <td>{{sc.runner}}
-              <td>{{sc.errors.length}}
+              <td>{{sc.errors_num}}
               <td>
                 <span ng-show="sc.sla_success" class="status-pass">&#x2714;</span>
                 <span ng-hide="sc.sla_success" class="status-fail">&#x2716;</span>
@@ -542,6 +595,85 @@
             </table>
           </div>
 
+          <div ng-show="scenario.contexts.length">
+            <h2>Contexts</h2>
+            <table class="striped">
+              <thead>
+                <tr>
+                  <th>Context
+                  <th>Setup (sec)
+                  <th>Cleanup (sec)
+                  <th>Setup API calls
+                  <th>Cleanup API calls
+                  <th>Resources created
+                <tr>
+              </thead>
+              <tbody>
+                <tr ng-repeat="ctx in scenario.contexts track by $index">
+                  <td>{{ctx.name}}
+                  <td>{{ctx.setup_duration === null ? "n/a" : (ctx.setup_duration | number:3)}}
+                  <td>{{ctx.cleanup_duration === null ? "n/a" : (ctx.cleanup_duration | number:3)}}
+                  <td>{{ctx.setup_api_calls === null ? "n/a" : ctx.setup_api_calls}}
+                  <td>{{ctx.cleanup_api_calls === null ? "n/a" : ctx.cleanup_api_calls}}
+                  <td>{{ctx.resources === null ? "n/a" : ctx.resources}}
+                <tr>
+              </tbody>
+            </table>
+          </div>
+
+          <div ng-show="scenario.runner_stats.probes.length">
+            <h2>Throughput search</h2>
+            <p>
+              Capacity: <b>{{scenario.runner_stats.capacity === null ? "not found" : (scenario.runner_stats.capacity | number:2) + " rps"}}</b>
+            </p>
+            <table class="striped">
+              <thead>
+                <tr>
+                  <th>Probe
+                  <th>Target rps
+                  <th>Iterations/sec
+                  <th>Iterations
+                  <th>Failures
+                  <th>SLA
+                <tr>
+              </thead>
+              <tbody>
+                <tr class="rich"
+                    ng-repeat="probe in scenario.runner_stats.probes track by $index"
+                    ng-class="{'status-fail':!probe.success, 'status-pass':probe.success}">
+                  <td>{{$index + 1}}
+                  <td>{{probe.rps | number:2}}
+                  <td>{{probe.throughput === null ? "n/a" : (probe.throughput | number:2)}}
+                  <td>{{probe.iterations}}
+                  <td>{{probe.errors}}
+                  <td>{{probe.success ? "Passed" : "Failed"}}
+                <tr>
+              </tbody>
+            </table>
+          </div>
+
+          <div ng-show="scenario.runner_stats.workers.length">
+            <h2>Workers</h2>
+            <table class="striped">
+              <thead>
+                <tr>
+                  <th>Worker
+                  <th>Iterations
+                  <th>Status
+                <tr>
+              </thead>
+              <tbody>
+                <tr class="rich"
+                    ng-repeat="worker in scenario.runner_stats.workers track by $index"
+                    ng-class="{'status-fail':worker.status !== 'finished', 'status-pass':worker.status === 'finished'}">
+                  <td>{{worker.hostname}}
+                  <td>{{worker.iterations}}
+                  <td>{{worker.status}}
+                <tr>
+              </tbody>
+            </table>
+          </div>
+
           <h2>Total durations</h2>
           <table class="striped">
             <thead>
@@ -596,6 +728,64 @@
           </div>
         </script>
 
+        <script type="text/ng-template" id="timeline">
+          {{renderTimeline()}}
+
+          <h2>Throughput</h2>
+          <div class="chart">
+            <svg id="timeline-throughput"></svg>
+          </div>
+
+          <h2>Concurrency</h2>
+          <div class="chart">
+            <svg id="timeline-concurrency"></svg>
+          </div>
+
+          <h2>Failures rate</h2>
+          <div class="chart">
+            <svg id="timeline-errors"></svg>
+          </div>
+
+          <h2>Durations percentiles</h2>
+          <div class="chart">
+            <svg id="timeline-percentiles"></svg>
+          </div>
+
+          <div ng-show="scenario.steps.table.length">
+            <h2>Concurrency levels</h2>
+            <table class="striped">
+              <thead>
+                <tr>
+                  <th>Concurrency
+                  <th>Duration (sec)
+                  <th>Iterations
+                  <th>Iterations/sec
+                  <th>Failures
+                  <th>Median (sec)
+                  <th>90%ile (sec)
+                  <th>95%ile (sec)
+                  <th>99%ile (sec)
+                <tr>
+              </thead>
+              <tbody>
+                <tr ng-repeat="row in scenario.steps.table track by $index">
+                  <td ng-repeat="i in row track by $index">{{i === null ? "n/a" : i}}
+                <tr>
+              </tbody>
+            </table>
+
+            <h2>Throughput by concurrency</h2>
+            <div class="chart">
+              <svg id="steps-throughput"></svg>
+            </div>
+
+            <h2>Durations percentiles by concurrency</h2>
+            <div class="chart">
+              <svg id="steps-percentiles"></svg>
+            </div>
+          </div>
+        </script>
+
         <script type="text/ng-template" id="output">
           {{renderOutput()}}
 
@@ -645,6 +835,8 @@
 
     </div>
     <div class="clearfix"></div>
+
+    ${data_blocks}
 </%block>
 
 <%block name="js_after">
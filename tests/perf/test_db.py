@@ -0,0 +1,58 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.common import costilius
+from rally.common import jsoncodec
+from rally.db.sqlalchemy import types
+from tests.perf import utils
+
+
+# Size of task result blob used by JSON codec benchmarks
+BLOB_ITERATIONS = 100000
+
+
+class JSONCodecTestCase(utils.PerfTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        result = utils.generate_task_result(BLOB_ITERATIONS)
+        cls.data = {"raw": result["result"], "sla": result["sla"],
+                    "load_duration": result["load_duration"],
+                    "full_duration": result["full_duration"]}
+        cls.blob = jsoncodec.dumps(cls.data, codec=jsoncodec.STD_CODEC)
+
+    def test_codecs(self):
+        for name in jsoncodec.get_codecs():
+            codec = jsoncodec.get_codec(name)
+            duration = self.measure(jsoncodec.dumps, self.data, codec=codec)
+            self.assertNoRegression(
+                "db.json.%s.dumps.%d" % (name, BLOB_ITERATIONS), duration)
+            duration = self.measure(jsoncodec.loads, self.blob, codec=codec)
+            self.assertNoRegression(
+                "db.json.%s.loads.%d" % (name, BLOB_ITERATIONS), duration)
+
+    def test_result_column(self):
+        column = types.BigMutableJSONEncodedDict()
+        ordered_loads = self.measure(
+            costilius.json_loads, self.blob,
+            object_pairs_hook=costilius.OrderedDict)
+        duration = self.measure(column.process_result_value, self.blob, None)
+        self.assertNoRegression(
+            "db.json.column.loads.%d" % BLOB_ITERATIONS, duration)
+        # Decoding to OrderedDict is how the column worked before codecs
+        self.assertLess(duration, ordered_loads)
+        duration = self.measure(column.process_bind_param, self.data, None)
+        self.assertNoRegression(
+            "db.json.column.dumps.%d" % BLOB_ITERATIONS, duration)
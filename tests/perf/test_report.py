@@ -0,0 +1,85 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+
+from rally.benchmark.processing import binary
+from rally.benchmark.processing.charts import histogram as histo
+from rally.benchmark.processing import compare
+from rally.benchmark.processing import downsampling
+from rally.benchmark.processing import plot
+from rally.benchmark.processing import sketch
+from rally.benchmark.processing import timeline
+from tests.perf import utils
+
+
+class ReportTestCase(utils.PerfTestCase):
+
+    def test_plot(self):
+        for iterations in utils.ITERATIONS:
+            results = [utils.generate_task_result(iterations)]
+            duration = self.measure(plot.plot, results, repeat=1)
+            self.assertNoRegression("report.plot.%d" % iterations, duration)
+
+    def test_histograms(self):
+        for iterations in utils.ITERATIONS:
+            result = utils.generate_task_result(iterations)
+            durations = [r["duration"] for r in result["result"]]
+            duration = self.measure(histo.histograms, durations)
+            self.assertNoRegression("report.histograms.%d" % iterations,
+                                    duration)
+
+    def test_downsampling(self):
+        for iterations in utils.ITERATIONS:
+            result = utils.generate_task_result(iterations)
+            durations = [r["duration"] for r in result["result"]]
+            for name, strategy in sorted(downsampling.STRATEGIES.items()):
+                duration = self.measure(strategy, durations, 1000)
+                self.assertNoRegression(
+                    "report.downsampling.%s.%d" % (name, iterations),
+                    duration)
+
+    def test_timeline(self):
+        for iterations in utils.ITERATIONS:
+            result = utils.generate_task_result(iterations)
+            duration = self.measure(timeline.timeline, result["result"])
+            self.assertNoRegression("report.timeline.%d" % iterations,
+                                    duration)
+
+    def test_binary(self):
+        for iterations in utils.ITERATIONS:
+            results = [utils.generate_task_result(iterations)]
+            out = io.BytesIO()
+            duration = self.measure(binary.dump, results, out, repeat=1)
+            self.assertNoRegression("report.binary.dump.%d" % iterations,
+                                    duration)
+            out.seek(0)
+            duration = self.measure(lambda: list(binary.load(out)), repeat=1)
+            self.assertNoRegression("report.binary.load.%d" % iterations,
+                                    duration)
+
+    def test_compare(self):
+        for iterations in utils.ITERATIONS:
+            result = utils.generate_task_result(iterations)
+            duration = self.measure(sketch.workload_sketches,
+                                    result["result"])
+            self.assertNoRegression("report.sketches.%d" % iterations,
+                                    duration)
+
+            result["sketches"] = sketch.workload_sketches(result["result"])
+            duration = self.measure(compare.TaskComparison, [result],
+                                    [result])
+            self.assertNoRegression("report.compare.%d" % iterations,
+                                    duration)
@@ -0,0 +1,61 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally.benchmark import engine
+from rally.benchmark.scenarios import base
+from rally.common import utils as rutils
+from tests.perf import utils
+from tests.unit import fakes
+
+
+class ScenariosTestCase(utils.PerfTestCase):
+
+    def setUp(self):
+        super(ScenariosTestCase, self).setUp()
+        rutils.import_modules_from_package("rally.plugins")
+
+    def test_list_benchmark_scenarios(self):
+        duration = self.measure(base.Scenario.list_benchmark_scenarios)
+        self.assertNoRegression("scenarios.list", duration)
+
+    @mock.patch("rally.benchmark.engine.objects.Deployment.get",
+                return_value=fakes.FakeDeployment(uuid="fake_uuid"))
+    @mock.patch("rally.benchmark.engine.users_ctx.UserGenerator",
+                fakes.FakeUserContext)
+    @mock.patch("rally.benchmark.engine.osclients.Clients",
+                fakes.FakeClients)
+    def test_task_validation(self, mock_deployment_get):
+        workload = {"runner": {"type": "constant", "times": 1000,
+                               "concurrency": 10},
+                    "context": {"users": {"tenants": 2,
+                                          "users_per_tenant": 2}},
+                    "sla": {"failure_rate": {"max": 0}}}
+        config = {
+            "Dummy.dummy": [dict(workload, args={"sleep": 0})] * 50,
+            "Dummy.dummy_exception": [
+                dict(workload, args={"size_of_message": 5})] * 50,
+            "Dummy.dummy_exception_probability": [
+                dict(workload, args={"exception_probability": 0.5})] * 50
+        }
+        task = mock.MagicMock()
+        task.__getitem__.return_value = "fake_uuid"
+        eng = engine.BenchmarkEngine(config, task,
+                                     admin={"auth_url": "http://fake",
+                                            "username": "admin",
+                                            "password": "admin"})
+        duration = self.measure(eng.validate)
+        self.assertNoRegression("task.validation", duration)
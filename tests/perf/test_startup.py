@@ -0,0 +1,45 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.cli import main
+from tests.perf import utils
+
+
+CLI_SCRIPT = """
+import sys
+from rally.cli import main
+sys.argv = ["rally", "%s", "--help"]
+try:
+    main.main()
+except SystemExit:
+    pass
+"""
+
+PLUGINS_SCRIPT = """
+from rally.common import utils
+utils.import_modules_from_package("rally.plugins")
+"""
+
+
+class StartupTestCase(utils.PerfTestCase):
+
+    def test_cli_categories_startup(self):
+        for category in sorted(main.categories):
+            duration = self.measure_python(CLI_SCRIPT % category)
+            self.assertNoRegression("cli.%s" % category, duration)
+
+    def test_plugins_discovery(self):
+        duration = self.measure_python(PLUGINS_SCRIPT)
+        self.assertNoRegression("plugins.discovery", duration)
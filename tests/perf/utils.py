@@ -0,0 +1,152 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import unittest
+
+BASELINES_FILE = os.environ.get("RALLY_PERF_BASELINES",
+                                "rally-perf-baselines.json")
+
+# Measured duration may exceed baseline by this factor before the benchmark
+# is reported as a regression.
+TOLERANCE = float(os.environ.get("RALLY_PERF_TOLERANCE", 0.5))
+
+# Sizes of synthetic task results used by report benchmarks. Use
+# RALLY_PERF_ITERATIONS="1000,100000,1000000" to run the big ones.
+ITERATIONS = [int(i) for i in
+              os.environ.get("RALLY_PERF_ITERATIONS", "1000").split(",")]
+
+
+def generate_task_result(iterations, atomic_actions=("action_1", "action_2"),
+                         error_rate=0.05, name="Dummy.dummy", pos=0):
+    """Generate synthetic result of one workload.
+
+    :param iterations: int, number of iterations in result
+    :param atomic_actions: names of atomic actions of every iteration
+    :param error_rate: float, probability of iteration to fail
+    :param name: str, scenario name
+    :param pos: int, position of workload in task
+    :returns: dict in format of objects.Task.get_results() item
+    """
+    rand = random.Random(iterations)
+    raw = []
+    timestamp = 1434000000.0
+    for i in range(iterations):
+        actions = dict((a, rand.uniform(0.1, 2.0)) for a in atomic_actions)
+        error = []
+        if rand.random() < error_rate:
+            error = ["KeyError", "fake error", "Traceback: fake"]
+        raw.append({"duration": sum(actions.values()),
+                    "idle_duration": rand.uniform(0, 0.2),
+                    "timestamp": timestamp + i * 0.1,
+                    "error": error,
+                    "scenario_output": {"data": {}, "errors": ""},
+                    "atomic_actions": actions})
+    return {"key": {"name": name, "pos": pos,
+                    "kw": {"runner": {"type": "constant",
+                                      "times": iterations,
+                                      "concurrency": 10}}},
+            "result": raw,
+            "sla": [{"criterion": "failure_rate", "success": True,
+                     "detail": "Failure rate criteria 0.00% <= 5.00% <= "
+                               "100.00% - Passed"}],
+            "load_duration": iterations * 0.1,
+            "full_duration": iterations * 0.1 + 10}
+
+
+class Baselines(object):
+    """Durations of benchmarks stored between runs.
+
+    Baselines are kept in a JSON file (see RALLY_PERF_BASELINES). Baselines
+    are recorded only with RALLY_PERF_UPDATE_BASELINES=1, which overwrites
+    all of them with the current durations, otherwise a benchmark without
+    baseline fails.
+    """
+
+    def __init__(self, path=BASELINES_FILE):
+        self.path = path
+        self.update = bool(os.environ.get("RALLY_PERF_UPDATE_BASELINES"))
+        self.data = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.data = json.load(f)
+
+    def check(self, name, duration):
+        """Compare duration with baseline.
+
+        :param name: str, unique name of benchmark
+        :param duration: float, measured duration in seconds
+        :returns: tuple (is_regression, baseline duration), baseline is
+                  None if it isn't recorded
+        """
+        if self.update:
+            self.data[name] = duration
+            self.save()
+            return False, duration
+        baseline = self.data.get(name)
+        if baseline is None:
+            return True, None
+        return duration > baseline * (1 + TOLERANCE), baseline
+
+    def save(self):
+        with open(self.path, "w") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+
+
+class PerfTestCase(unittest.TestCase):
+    """Base class for benchmarks of Rally's own overhead."""
+
+    baselines = Baselines()
+
+    def measure(self, func, *args, **kwargs):
+        """Return the best duration of a few calls of func.
+
+        Best (not average) duration is used because it is the least
+        affected by noise of other processes on the host.
+        """
+        repeat = kwargs.pop("repeat", 3)
+        durations = []
+        for i in range(repeat):
+            started_at = time.time()
+            func(*args, **kwargs)
+            durations.append(time.time() - started_at)
+        return min(durations)
+
+    def measure_python(self, code, repeat=3):
+        """Return the best duration of running code in a new interpreter."""
+        with open(os.devnull, "w") as devnull:
+            return self.measure(subprocess.check_call,
+                                [sys.executable, "-c", code],
+                                stdout=devnull, stderr=devnull,
+                                repeat=repeat)
+
+    def assertNoRegression(self, name, duration):
+        is_regression, baseline = self.baselines.check(name, duration)
+        if baseline is None:
+            self.fail("There is no baseline for benchmark '%(name)s' in "
+                      "%(path)s. Run with RALLY_PERF_UPDATE_BASELINES=1 to "
+                      "record it." % {"name": name,
+                                      "path": self.baselines.path})
+        self.assertFalse(
+            is_regression,
+            "Benchmark '%(name)s' took %(duration).3f sec, baseline is "
+            "%(baseline).3f sec (tolerance %(tolerance)d%%)."
+            % {"name": name, "duration": duration, "baseline": baseline,
+               "tolerance": TOLERANCE * 100})
@@ -0,0 +1,65 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally.benchmark.processing.charts import histogram
+from tests.unit import test
+
+
+HISTOGRAM = "rally.benchmark.processing.charts.histogram"
+
+
+class HistogramTestCase(test.TestCase):
+
+    def _check_histogram(self):
+        data = [0.5, 4.0, 1.0, 2.5, 2.0, 1.5, 4.0]
+        h = histogram.Histogram(data, 4, "method", "key")
+
+        self.assertEqual(0.5, h.min_data)
+        self.assertEqual(4.0, h.max_data)
+        self.assertEqual([1.375, 2.25, 3.125, 4.0], h.x_axis)
+        self.assertEqual([2, 2, 1, 2], h.y_axis)
+        self.assertEqual(("method", "key"), (h.method, h.key))
+
+    def test_histogram(self):
+        self._check_histogram()
+
+    @mock.patch(HISTOGRAM + ".numpy", None)
+    def test_histogram_without_numpy(self):
+        self._check_histogram()
+
+    def test_histogram_same_values(self):
+        h = histogram.Histogram([3, 3, 3], 2)
+        self.assertEqual([3, 3], h.x_axis)
+        self.assertEqual([3, 0], h.y_axis)
+
+    @mock.patch(HISTOGRAM + "._sort", wraps=histogram._sort)
+    def test_histograms(self, mock__sort):
+        data = [3.0, 1.0, 2.0, 5.0]
+
+        histograms = histogram.histograms(data, "key")
+
+        mock__sort.assert_called_once_with(data)
+        self.assertEqual(
+            [(h["method"], h["number_of_bins"])
+             for h in histogram.hvariety(data)],
+            [(h.method, h.number_of_bins) for h in histograms])
+        for h in histograms:
+            self.assertEqual("key", h.key)
+            self.assertEqual(len(data), sum(h.y_axis))
+
+    def test_hvariety_empty_data(self):
+        self.assertRaises(ValueError, histogram.hvariety, [])
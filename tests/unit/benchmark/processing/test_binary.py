@@ -0,0 +1,149 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import struct
+
+import mock
+
+from rally.benchmark.processing import binary
+from rally import exceptions
+from tests.unit import test
+
+
+def get_result(name="Dummy.dummy", iterations=10):
+    return {
+        "key": {"name": name, "pos": 0, "kw": {"runner": {"type": "serial"}}},
+        "sla": [{"criterion": "max_seconds_per_iteration",
+                 "detail": "OK", "success": True}],
+        "load_duration": 12.3,
+        "full_duration": 14.5,
+        "contexts": [{"name": "users", "setup_duration": 1.5,
+                      "cleanup_duration": 0.5, "setup_api_calls": 10,
+                      "cleanup_api_calls": 5, "resources": 4}],
+        "warmup": [{"timestamp": 1433999999.0, "duration": 2.0,
+                    "idle_duration": 0, "error": [], "atomic_actions": {},
+                    "scenario_output": {"data": {}, "errors": ""}}],
+        "runner_stats": {"capacity": 2.5,
+                         "probes": [{"rps": 2.5, "success": True}]},
+        "result": [{"timestamp": 1434000000.0 + i,
+                    "duration": 1.5 + i,
+                    "idle_duration": 0.5,
+                    "error": [],
+                    "atomic_actions": {"action_1": 0.5 + i,
+                                       "action_2": 1.0},
+                    "scenario_output": {"data": {"value": i},
+                                        "errors": ""}}
+                   for i in range(iterations)]
+    }
+
+
+class BinaryTestCase(test.TestCase):
+
+    def dump(self, results):
+        out = io.BytesIO()
+        binary.dump(results, out)
+        out.seek(0)
+        return out
+
+    def test_dump_load(self):
+        results = [get_result("Dummy.dummy"), get_result("Dummy.other", 3)]
+
+        self.assertEqual(results, list(binary.load(self.dump(results))))
+
+    def test_dump_load_without_contexts(self):
+        result = get_result()
+        del result["contexts"]
+
+        loaded = list(binary.load(self.dump([result])))
+
+        self.assertEqual([dict(result, contexts=[])], loaded)
+
+    def test_dump_load_without_warmup(self):
+        result = get_result()
+        del result["warmup"]
+
+        loaded = list(binary.load(self.dump([result])))
+
+        self.assertEqual([dict(result, warmup=[])], loaded)
+
+    def test_dump_load_no_results(self):
+        self.assertEqual([], list(binary.load(self.dump([]))))
+
+    def test_dump_load_irregular_iterations(self):
+        result = get_result()
+        iterations = result["result"]
+        iterations[1]["error"] = ["Exception", "msg", "traceback"]
+        iterations[1]["atomic_actions"] = {"action_1": None}
+        iterations[2]["atomic_actions"] = {}
+        iterations[3]["atomic_actions"]["action_3"] = 3.0
+        iterations[4]["scenario_output"] = {"data": {"value": "foo",
+                                                     "flag": True},
+                                            "errors": "output error"}
+        del iterations[5]["timestamp"]
+
+        loaded = list(binary.load(self.dump([result])))
+
+        self.assertEqual([result], loaded)
+        self.assertIsInstance(
+            loaded[0]["result"][4]["scenario_output"]["data"]["flag"], bool)
+
+    def test_dump_load_concurrency(self):
+        result = get_result()
+        for i, iteration in enumerate(result["result"][1:]):
+            iteration["concurrency"] = i // 3 + 1
+
+        loaded = list(binary.load(self.dump([result])))
+
+        self.assertEqual([result], loaded)
+        self.assertIsInstance(loaded[0]["result"][1]["concurrency"], int)
+
+    def test_dump_is_compact(self):
+        result = get_result(iterations=1000)
+        dumped = self.dump([result]).getvalue()
+
+        self.assertLess(len(dumped), len(repr(result)) / 4)
+
+    def test_is_binary(self):
+        mock_open = mock.mock_open(read_data=binary.MAGIC + b"data")
+        with mock.patch("rally.benchmark.processing.binary.open",
+                        mock_open, create=True):
+            self.assertTrue(binary.is_binary("foo.bin"))
+        mock_open.assert_called_once_with("foo.bin", "rb")
+
+        mock_open = mock.mock_open(read_data=b"[{\"key\": {}}]")
+        with mock.patch("rally.benchmark.processing.binary.open",
+                        mock_open, create=True):
+            self.assertFalse(binary.is_binary("foo.json"))
+
+    def test_load_not_binary(self):
+        self.assertRaises(exceptions.InvalidResultsFile, list,
+                          binary.load(io.BytesIO(b"[{\"key\": {}}]")))
+
+    def test_load_unsupported_version(self):
+        data = binary.MAGIC + struct.pack("<H", binary.VERSION + 1)
+        self.assertRaises(exceptions.InvalidResultsFile, list,
+                          binary.load(io.BytesIO(data)))
+
+    def test_load_truncated(self):
+        data = self.dump([get_result()]).getvalue()
+        results = binary.load(io.BytesIO(data[:-20]))
+        self.assertRaises(exceptions.InvalidResultsFile, list, results)
+
+    def test_load_checksum_mismatch(self):
+        data = bytearray(self.dump([get_result()]).getvalue())
+        data[-20] ^= 0xff
+        results = binary.load(io.BytesIO(bytes(data)))
+        self.assertRaises(exceptions.InvalidResultsFile, list, results)
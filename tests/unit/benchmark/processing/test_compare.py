@@ -0,0 +1,198 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import mock
+
+from rally.benchmark.processing import compare
+from rally.benchmark.processing import sketch
+from tests.unit import test
+
+
+def get_workload(name, durations, pos=0, args=None, errors=0):
+    iterations = [{"duration": d, "error": [],
+                   "atomic_actions": {"action": d / 2}} for d in durations]
+    iterations += [{"duration": 0, "error": ["Exception", "msg", "trace"],
+                    "atomic_actions": {}} for i in range(errors)]
+    return {"key": {"name": name, "pos": pos,
+                    "kw": {"args": args or {}, "runner": {}}},
+            "result": iterations}
+
+
+class CompareTestCase(test.TestCase):
+
+    def test__z_score(self):
+        self.assertAlmostEqual(1.96, compare._z_score(0.95), places=2)
+        self.assertAlmostEqual(2.576, compare._z_score(0.99), places=2)
+
+    def test_mann_whitney(self):
+        s1 = sketch.Sketch([1, 2, 3, 4, 5] * 10)
+        s2 = sketch.Sketch([6, 7, 8, 9, 10] * 10)
+
+        u, p_value = compare.mann_whitney(s1, s2)
+
+        self.assertEqual(0, u)
+        self.assertLess(p_value, 0.0001)
+        u, p_value = compare.mann_whitney(s2, s1)
+        self.assertEqual(50 * 50, u)
+
+    def test_mann_whitney_same(self):
+        s = sketch.Sketch([1, 2, 3, 4, 5] * 10)
+
+        u, p_value = compare.mann_whitney(s, s)
+
+        self.assertEqual(50 * 50 / 2.0, u)
+        self.assertEqual(1.0, p_value)
+
+    def test_mann_whitney_all_equal(self):
+        self.assertEqual((2.0, 1.0), compare.mann_whitney(
+            sketch.Sketch([1, 1]), sketch.Sketch([1, 1])))
+
+    def test_mann_whitney_empty(self):
+        self.assertIsNone(compare.mann_whitney(sketch.Sketch([1]),
+                                               sketch.Sketch()))
+
+    def test_percentile_ci(self):
+        s = sketch.Sketch(range(1, 1001))
+
+        low, high = compare.percentile_ci(s, 0.5)
+
+        self.assertLess(low, s.percentile(0.5))
+        self.assertGreater(high, s.percentile(0.5))
+        self.assertLess(high - low, 100)
+        self.assertIsNone(compare.percentile_ci(sketch.Sketch(), 0.5))
+
+    def test_compare_durations(self):
+        result = compare.compare_durations(
+            "foo", sketch.Sketch([1.0] * 100 + [1.1] * 100),
+            sketch.Sketch([2.0] * 100 + [2.2] * 100))
+
+        self.assertEqual("foo", result["action"])
+        self.assertEqual([200, 200], result["count"])
+        self.assertTrue(result["significant"])
+        self.assertEqual("slower", result["change"])
+        self.assertAlmostEqual(100, result["mean"]["delta"])
+        for name, percent in compare.PERCENTILES:
+            self.assertTrue(result[name]["significant"])
+            self.assertAlmostEqual(100, result[name]["delta"], delta=5)
+
+    def test_compare_durations_faster(self):
+        result = compare.compare_durations(
+            "foo", sketch.Sketch([2.0] * 100), sketch.Sketch([1.0] * 100))
+
+        self.assertEqual("faster", result["change"])
+
+    def test_compare_durations_not_changed(self):
+        durations = [0.5 + 0.01 * i for i in range(100)]
+
+        result = compare.compare_durations(
+            "foo", sketch.Sketch(durations), sketch.Sketch(durations[::-1]))
+
+        self.assertFalse(result["significant"])
+        self.assertIsNone(result["change"])
+        self.assertEqual(0.0, result["median"]["delta"])
+        self.assertFalse(result["median"]["significant"])
+
+    def test_compare_durations_empty(self):
+        result = compare.compare_durations("foo", sketch.Sketch([1.0]),
+                                           sketch.Sketch())
+
+        self.assertIsNone(result["p_value"])
+        self.assertIsNone(result["change"])
+        self.assertIsNone(result["median"]["delta"])
+        self.assertFalse(result["median"]["significant"])
+
+    @mock.patch("rally.benchmark.processing.compare.sketch_")
+    def test_get_sketches(self, mock_sketch):
+        self.assertEqual("sketches", compare.get_sketches(
+            {"sketches": "sketches", "result": "iterations"}))
+        self.assertFalse(mock_sketch.workload_sketches.called)
+
+        self.assertEqual(
+            mock_sketch.workload_sketches.return_value,
+            compare.get_sketches({"sketches": None, "result": "iterations"}))
+        mock_sketch.workload_sketches.assert_called_once_with("iterations")
+
+
+class TaskComparisonTestCase(test.TestCase):
+
+    def test_workloads_alignment(self):
+        fast = [1.0] * 50
+        slow = [2.0] * 50
+        comparison = compare.TaskComparison(
+            [get_workload("A.a", fast),
+             get_workload("A.a", fast, pos=1, args={"size": 2}),
+             get_workload("A.b", fast),
+             get_workload("A.c", fast)],
+            [get_workload("A.a", fast, pos=0, args={"size": 2}),
+             get_workload("A.a", slow, pos=1, errors=2),
+             get_workload("A.c", fast),
+             get_workload("A.c", fast, pos=1),
+             get_workload("A.d", fast)])
+
+        self.assertEqual(
+            [("A.a", {}, "compared", [0, 1]),
+             ("A.a", {"size": 2}, "compared", [1, 0]),
+             ("A.b", {}, "removed", [0]),
+             ("A.c", {}, "compared", [0, 0]),
+             ("A.c", {}, "added", [1]),
+             ("A.d", {}, "added", [0])],
+            [(w["name"], w["args"], w["status"], w["pos"])
+             for w in comparison.workloads])
+
+        workload = comparison.workloads[0]
+        self.assertEqual([50, 52], workload["iterations"])
+        self.assertEqual([0, 2], workload["errors"])
+        self.assertEqual(["total", "action"],
+                         [a["action"] for a in workload["actions"]])
+        self.assertEqual([("A.a", "total"), ("A.a", "action")],
+                         comparison.regressions())
+
+    def test_compare_different_atomic_actions(self):
+        workload1 = get_workload("A.a", [1.0] * 10)
+        workload2 = get_workload("A.a", [1.0] * 10)
+        for iteration in workload2["result"]:
+            iteration["atomic_actions"] = {"other": 1.0}
+
+        comparison = compare.TaskComparison([workload1], [workload2])
+
+        actions = comparison.workloads[0]["actions"]
+        self.assertEqual(["total", "action", "other"],
+                         [a["action"] for a in actions])
+        self.assertEqual([10, 0], actions[1]["count"])
+        self.assertEqual([0, 10], actions[2]["count"])
+        self.assertEqual([], comparison.regressions())
+
+    def test_to_json(self):
+        comparison = compare.TaskComparison(
+            [get_workload("A.a", [1.0] * 10)],
+            [get_workload("A.a", [1.0] * 10)], alpha=0.01)
+
+        data = json.loads(comparison.to_json())
+
+        self.assertEqual(0.01, data["alpha"])
+        self.assertEqual(1, len(data["workloads"]))
+
+    def test_to_html(self):
+        comparison = compare.TaskComparison(
+            [get_workload("A.a", [1.0] * 10), get_workload("A.b", [1.0])],
+            [get_workload("A.a", [2.0] * 10)])
+
+        html = comparison.to_html()
+
+        self.assertIn("A.a", html)
+        self.assertIn("change-slower", html)
+        self.assertIn("removed", html)
@@ -0,0 +1,89 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally.benchmark.processing import downsampling
+from tests.unit import test
+
+
+DOWNSAMPLING = "rally.benchmark.processing.downsampling"
+
+
+class DownsamplingTestCase(test.TestCase):
+
+    def _check_min_max(self):
+        data = [1, 5, 2, 0, 3, 3, None, 4, 1, 8]
+        self.assertEqual(
+            [(2, 5.0), (4, 0.0), (7, 0.0), (8, 4.0), (9, 1.0), (10, 8.0)],
+            downsampling.min_max(data, 6))
+        # The last bucket has the only point
+        self.assertEqual(
+            [(1, 1.0), (2, 5.0), (4, 0.0), (5, 3.0), (7, 0.0), (8, 4.0),
+             (10, 8.0)],
+            downsampling.min_max(data, 8))
+        self.assertEqual([(1, 1.0), (2, 2.0)],
+                         downsampling.min_max([1, 2], 6))
+
+    def test_min_max(self):
+        self._check_min_max()
+
+    @mock.patch(DOWNSAMPLING + ".numpy", None)
+    def test_min_max_without_numpy(self):
+        self._check_min_max()
+
+    def _check_lttb(self):
+        data = [0, 1, 0, 10, 0, 1, 0, -7, 0, 1, 0, 0]
+        self.assertEqual(
+            [(1, 0.0), (4, 10.0), (8, -7.0), (12, 0.0)],
+            downsampling.lttb(data, 4))
+        self.assertEqual([(1, 1.0), (2, 2.0)],
+                         downsampling.lttb([1, 2], 4))
+
+        data = [float(i % 17) for i in range(1000)]
+        points = downsampling.lttb(data, 100)
+        self.assertEqual(100, len(points))
+        self.assertEqual((1, 0.0), points[0])
+        self.assertEqual((1000, data[-1]), points[-1])
+        indexes = [idx for idx, v in points]
+        self.assertEqual(sorted(set(indexes)), indexes)
+
+    def test_lttb(self):
+        self._check_lttb()
+
+    @mock.patch(DOWNSAMPLING + ".numpy", None)
+    def test_lttb_without_numpy(self):
+        self._check_lttb()
+
+    def test_lttb_same_with_and_without_numpy(self):
+        data = [(i * 7919) % 101 / 3.0 for i in range(5000)]
+        points = downsampling.lttb(data, 300)
+        with mock.patch(DOWNSAMPLING + ".numpy", None):
+            self.assertEqual(points, downsampling.lttb(data, 300))
+
+    def test_select(self):
+        series = [[1, 5, 2, 0, 3, 3, None, 4, 1, 8],
+                  [0, 0, 9, 0, 0, 0, 0, 0, 7, 0]]
+        # Min and max points of both series are kept in every series
+        self.assertEqual(
+            [[(1, 1.0), (2, 5.0), (3, 2.0), (4, 0.0), (6, 3.0), (7, 0.0),
+              (9, 1.0), (10, 8.0)],
+             [(1, 0.0), (2, 0.0), (3, 9.0), (4, 0.0), (6, 0.0), (7, 0.0),
+              (9, 7.0), (10, 0.0)]],
+            downsampling.select(series, 8, "min_max"))
+        self.assertEqual([[(1, 1.0), (2, 2.0)], [(1, 3.0), (2, 0.0)]],
+                         downsampling.select([[1, 2], [3, None]], 6,
+                                             "min_max"))
+        self.assertEqual([], downsampling.select([], 6, "lttb"))
@@ -26,43 +26,80 @@ PLOT = "rally.benchmark.processing.plot."
 
 
 class PlotTestCase(test.TestCase):
-    @mock.patch(PLOT + "ui_utils")
-    @mock.patch(PLOT + "_process_results")
-    def test_plot(self, mock_proc_results, mock_utils):
-        mock_render = mock.Mock(return_value="plot_html")
-        mock_utils.get_template = mock.Mock(
-            return_value=mock.Mock(render=mock_render))
-        task_data = [{"name": "a"}, {"name": "b"}]
-        task_source = "JSON"
-        mock_proc_results.return_value = (task_source, task_data)
+    @mock.patch(PLOT + "write_report")
+    def test_plot(self, mock_write_report):
+        mock_write_report.side_effect = lambda results, out: out.write(
+            "plot_html")
 
         result = plot.plot(["abc"])
 
         self.assertEqual(result, "plot_html")
-        mock_render.assert_called_once_with(
-            data=json.dumps(task_data),
-            source=json.dumps(task_source)
-        )
+        mock_write_report.assert_called_once_with(["abc"], mock.ANY)
+
+    @mock.patch(PLOT + "ui_utils")
+    @mock.patch(PLOT + "_process_result")
+    def test_write_report(self, mock_process_result, mock_utils):
+        mock_render = mock.Mock(
+            return_value="head%stail" % plot.DATA_BLOCKS_MARKER)
+        mock_utils.get_template.return_value = mock.Mock(render=mock_render)
+
+        def process_result(result):
+            scenario = dict((key, "%s_%s" % (key, result["key"]["pos"]))
+                            for key in plot.DETAILS_KEYS)
+            scenario.update({"cls": "Class", "name": result["key"]["name"]})
+            return scenario
+        mock_process_result.side_effect = process_result
+
+        results = [{"key": {"name": name, "pos": i, "kw": {"args": i}}}
+                   for i, name in enumerate(["b", "a</script>"])]
+        out = mock.Mock()
+
+        plot.write_report(iter(results), out)
+
         mock_utils.get_template.assert_called_once_with("task/report.mako")
+        mock_render.assert_called_once_with(
+            data_blocks=plot.DATA_BLOCKS_MARKER)
+        written = [c[0][0] for c in out.write.call_args_list]
+        self.assertEqual("head", written[0])
+        self.assertEqual("tail", written[-1])
+        self.assertEqual(6, len(written))
+
+        blocks = []
+        for block in written[1:-1]:
+            self.assertNotIn("</", block[block.index(">"):-len("</script>\n")])
+            prefix, data = block.split(">", 1)
+            blocks.append((prefix.split('id="')[1][:-1],
+                           json.loads(data[:-len("</script>\n")])))
 
-    @mock.patch(PLOT + "json.dumps")
+        self.assertEqual(("workload-0", dict(
+            (key, "%s_0" % key) for key in plot.DETAILS_KEYS)), blocks[0])
+        self.assertEqual("workload-1", blocks[1][0])
+        self.assertEqual(("scenarios", [
+            {"cls": "Class", "name": "a</script>", "details_id": "workload-1"},
+            {"cls": "Class", "name": "b", "details_id": "workload-0"}]),
+            blocks[2])
+        self.assertEqual(
+            ("source", json.dumps({"a</script>": [{"args": 1}],
+                                   "b": [{"args": 0}]},
+                                  indent=2, sort_keys=True)),
+            blocks[3])
+
+    @mock.patch(PLOT + "_process_steps")
+    @mock.patch(PLOT + "_process_timeline")
     @mock.patch(PLOT + "_prepare_data")
     @mock.patch(PLOT + "_process_atomic")
     @mock.patch(PLOT + "_get_atomic_action_durations")
     @mock.patch(PLOT + "_process_main_duration")
-    def test__process_results(self, mock_main_duration, mock_get_atomic,
-                              mock_atomic, mock_prepare, mock_dumps):
+    def test__process_result(self, mock_main_duration, mock_get_atomic,
+                             mock_atomic, mock_prepare, mock_timeline,
+                             mock_steps):
         sla = [{"success": True}]
-        result = ["iter_1", "iter_2"]
-        iterations = len(result)
         kw = {"runner": {"type": "foo_runner"}}
-        result_ = lambda i: {
-            "key": {"pos": i,
-                    "name": "Class.method",
-                    "kw": kw},
-            "result": result,
-            "sla": sla}
-        results = [result_(i) for i in (0, 1, 2)]
+        result = {"key": {"pos": 1, "name": "Class.method", "kw": kw},
+                  "result": ["iter_1", "iter_2"],
+                  "sla": sla,
+                  "contexts": [{"name": "users", "setup_duration": 1.0}],
+                  "runner_stats": {"capacity": 10.0}}
         table_cols = ["Action",
                       "Min (sec)",
                       "Median (sec)",
@@ -73,52 +110,49 @@ class PlotTestCase(test.TestCase):
                       "Success",
                       "Count"]
         atomic_durations = [["atomic_1"], ["atomic_2"]]
-        mock_prepare.side_effect = lambda i: {"errors": "errors_list",
-                                              "output": [],
-                                              "output_errors": [],
-                                              "sla": i["sla"],
-                                              "load_duration": 1234.5,
-                                              "full_duration": 6789.1}
-        mock_main_duration.return_value = "main_duration"
+        mock_prepare.return_value = {"errors": ["error_1", "error_2"],
+                                     "output": [],
+                                     "output_errors": [],
+                                     "iterations_num": 2,
+                                     "sla": sla,
+                                     "load_duration": 1234.5,
+                                     "full_duration": 6789.1}
+        iterations = {"histogram": [{"method": "foo"}, {"method": "bar"}]}
+        mock_main_duration.return_value = iterations
         mock_get_atomic.return_value = atomic_durations
         mock_atomic.return_value = "main_atomic"
-        mock_dumps.return_value = "JSON"
-
-        source, scenarios = plot._process_results(results)
-
-        source_dict = {"Class.method": [kw] * len(results)}
-        mock_dumps.assert_called_with(source_dict, indent=2,
-                                      sort_keys=True)
-        self.assertEqual(source, "JSON")
-
-        results = sorted(results, key=lambda r: "%s%s" % (r["key"]["name"],
-                                                          r["key"]["pos"]))
-        for i, r in enumerate(results):
-            config = json.dumps({r["key"]["name"]: [r["key"]["kw"]]}, indent=2)
-            pos = int(r["key"]["pos"])
-            cls = r["key"]["name"].split(".")[0]
-            met = r["key"]["name"].split(".")[1]
-            name = "%s%s" % (met, (pos and " [%d]" % (pos + 1) or ""))
-            self.assertEqual(scenarios[i], {
-                "cls": cls,
-                "pos": r["key"]["pos"],
-                "met": met,
-                "name": name,
-                "config": config,
-                "iterations": mock_main_duration.return_value,
-                "atomic": mock_atomic.return_value,
-                "table_cols": table_cols,
-                "table_rows": atomic_durations,
-                "errors": "errors_list",
-                "output": [],
-                "output_errors": [],
-                "runner": "foo_runner",
-                "sla": sla,
-                "sla_success": True,
-                "iterations_num": iterations,
-                "load_duration": 1234.5,
-                "full_duration": 6789.1
-            })
+
+        scenario = plot._process_result(result)
+
+        mock_prepare.assert_called_once_with(result)
+        mock_timeline.assert_called_once_with(result)
+        mock_steps.assert_called_once_with(result)
+        self.assertEqual({
+            "cls": "Class",
+            "pos": 1,
+            "met": "method",
+            "name": "method [2]",
+            "config": json.dumps({"Class.method": [kw]}, indent=2),
+            "iterations": iterations,
+            "atomic": "main_atomic",
+            "timeline": mock_timeline.return_value,
+            "steps": mock_steps.return_value,
+            "table_cols": table_cols,
+            "table_rows": atomic_durations,
+            "errors": ["error_1", "error_2"],
+            "errors_num": 2,
+            "histogram_methods": ["foo", "bar"],
+            "output": [],
+            "output_errors": [],
+            "runner": "foo_runner",
+            "sla": sla,
+            "sla_success": True,
+            "iterations_num": 2,
+            "load_duration": 1234.5,
+            "full_duration": 6789.1,
+            "contexts": [{"name": "users", "setup_duration": 1.0}],
+            "runner_stats": {"capacity": 10.0}
+        }, scenario)
 
     @testtools.skipIf(sys.version_info > (2, 9), "Problems with floating data")
     def test__process_main_time(self):
@@ -151,8 +185,7 @@ class PlotTestCase(test.TestCase):
             "full_duration": 6789.1
         }
 
-        output = plot._process_main_duration(result,
-                                             plot._prepare_data(result))
+        output = plot._process_main_duration(plot._prepare_data(result))
 
         self.assertEqual({
             "pie": [
@@ -196,41 +229,15 @@ class PlotTestCase(test.TestCase):
 
     @testtools.skipIf(sys.version_info > (2, 9), "Problems with floating data")
     def test__process_atomic_time(self):
-        result = {
-            "result": [
-                {
-                    "error": [],
-                    "atomic_actions": {
-                        "action1": 1,
-                        "action2": 2
-                    },
-                    "scenario_output": {"errors": [], "data": {}}
-                },
-                {
-                    "error": ["some", "error", "occurred"],
-                    "atomic_actions": {
-                        "action1": 1,
-                        "action2": 2
-                    },
-                    "scenario_output": {"errors": [], "data": {}}
-                },
-                {
-                    "error": [],
-                    "atomic_actions": {
-                        "action1": 3,
-                        "action2": 4
-                    },
-                    "scenario_output": {"errors": [], "data": {}}
-                }
-            ]
-        }
-
         data = {
             "atomic_durations": {
                 "action1": [(1, 1.0), (2, 0.0), (3, 3.0)],
-                "action2": [(1, 2.0), (2, 0.0), (3, 4.0)]}}
+                "action2": [(1, 2.0), (2, 0.0), (3, 4.0)]},
+            "atomic_success_durations": {
+                "action1": [1, 3],
+                "action2": [2, 4]}}
 
-        output = plot._process_atomic(result, data)
+        output = plot._process_atomic(data)
 
         self.assertEqual({
             "histogram": [
@@ -305,10 +312,10 @@ class PlotTestCase(test.TestCase):
             ]
         }, output)
 
-    @mock.patch("rally.benchmark.processing.utils.compress")
-    def test__prepare_data(self, mock_compress):
+    @mock.patch("rally.benchmark.processing.utils.compress_series")
+    def test__prepare_data(self, mock_compress_series):
 
-        mock_compress.side_effect = lambda i, **kv: i
+        mock_compress_series.side_effect = lambda i, **kv: i
         rows_num = 100
         load_duration = 1234.5
         full_duration = 6789.1
@@ -340,6 +347,7 @@ class PlotTestCase(test.TestCase):
         values_idle = [i * 0.2 for i in range(rows_num)]
         values_idle[42] = 0
         values_idle[52] = 0
+        success = [i for i in range(rows_num) if i not in (42, 52)]
 
         prepared_data = plot._prepare_data({"result": data,
                                             "load_duration": load_duration,
@@ -348,11 +356,13 @@ class PlotTestCase(test.TestCase):
                                             "key": "foo_key"})
         self.assertEqual(2, len(prepared_data["errors"]))
 
-        calls = [mock.call(values_atomic_a1),
-                 mock.call(values_atomic_a2),
-                 mock.call(values_duration),
-                 mock.call(values_idle)]
-        mock_compress.assert_has_calls(calls)
+        calls = [mock.call([["out_value"] * rows_num],
+                           strategy=plot.DOWNSAMPLING),
+                 mock.call([values_atomic_a1, values_atomic_a2],
+                           strategy=plot.DOWNSAMPLING),
+                 mock.call([values_duration, values_idle],
+                           strategy=plot.DOWNSAMPLING)]
+        self.assertEqual(calls, mock_compress_series.mock_calls)
 
         expected_output = [{"key": "out_key",
                             "values": ["out_value"] * rows_num}]
@@ -371,9 +381,90 @@ class PlotTestCase(test.TestCase):
                         "message": "bar",
                         "traceback": "foo",
                         "type": "spam"}],
+            "success_durations": [i * 3.1 for i in success],
+            "atomic_success_durations": {
+                "a1": [i + 0.1 for i in success],
+                "a2": [i + 0.8 for i in success]},
+            "atomic_table_durations": {"a1": values_atomic_a1,
+                                       "a2": values_atomic_a2},
             "output": expected_output,
             "output_errors": expected_output_errors,
+            "iterations_num": rows_num,
             "load_duration": load_duration,
             "full_duration": full_duration,
             "sla": sla,
         }, prepared_data)
+
+    def test__prepare_data_aligned_series(self):
+        data = []
+        for i in range(5000):
+            data.append({
+                "duration": (i * 7919) % 101 / 3.0,
+                "idle_duration": (i * 104729) % 97 / 5.0,
+                "error": [],
+                "atomic_actions": {"a1": (i * 31) % 13, "a2": (i * 17) % 7},
+                "scenario_output": {"errors": "",
+                                    "data": {"x": i % 11, "y": i % 5}}})
+
+        prepared_data = plot._prepare_data({"result": data,
+                                            "load_duration": 1,
+                                            "full_duration": 2,
+                                            "sla": []})
+
+        charts = [list(prepared_data["total_durations"].values()),
+                  list(prepared_data["atomic_durations"].values()),
+                  [o["values"] for o in prepared_data["output"]]]
+        for series in charts:
+            self.assertEqual(2, len(series))
+            xs = [x for x, y in series[0]]
+            self.assertGreater(5000, len(xs))
+            self.assertGreaterEqual(1000, len(xs))
+            self.assertEqual(xs, [x for x, y in series[1]])
+
+    @mock.patch(PLOT + "timeline.timeline")
+    def test__process_timeline(self, mock_timeline):
+        percentiles = lambda v: dict((name, v) for name, p
+                                     in plot.timeline.PERCENTILES)
+        mock_timeline.return_value = {"windows": [
+            {"time": 0.0, "throughput": 2.0, "concurrency": 1.55555,
+             "errors_rate": 0.0, "percentiles": percentiles(0.12345)},
+            {"time": 1.5, "throughput": 1.0, "concurrency": 1.0,
+             "errors_rate": 1.0, "percentiles": percentiles(None)}]}
+
+        result = plot._process_timeline({"result": "iterations"})
+
+        mock_timeline.assert_called_once_with("iterations")
+        self.assertEqual({
+            "throughput": [{"key": "iterations/sec",
+                            "values": [(0.0, 2.0), (1.5, 1.0)]}],
+            "concurrency": [{"key": "concurrency",
+                             "values": [(0.0, 1.56), (1.5, 1.0)]}],
+            "errors": [{"key": "failures (%)",
+                        "values": [(0.0, 0.0), (1.5, 100.0)]}],
+            "percentiles": [{"key": name, "values": [(0.0, 0.123)]}
+                            for name, p in plot.timeline.PERCENTILES]
+        }, result)
+
+    @mock.patch(PLOT + "steps.steps")
+    def test__process_steps(self, mock_steps):
+        percentiles = lambda v: dict((name, v) for name, p
+                                     in plot.timeline.PERCENTILES)
+        mock_steps.return_value = [
+            {"concurrency": 10, "duration": 60.12345, "iterations": 100,
+             "throughput": 1.66666, "errors_rate": 0.0,
+             "percentiles": percentiles(5.12345)},
+            {"concurrency": 20, "duration": 0.0, "iterations": 1,
+             "throughput": None, "errors_rate": 1.0,
+             "percentiles": percentiles(None)}]
+
+        result = plot._process_steps({"result": "iterations"})
+
+        mock_steps.assert_called_once_with("iterations")
+        self.assertEqual({
+            "table": [[10, 60.12, 100, 1.67, "0.0%"] + [5.123] * 4,
+                      [20, 0.0, 1, None, "100.0%"] + [None] * 4],
+            "throughput": [{"key": "iterations/sec",
+                            "values": [(10, 1.67)]}],
+            "percentiles": [{"key": name, "values": [(10, 5.123)]}
+                            for name, p in plot.timeline.PERCENTILES]
+        }, result)
@@ -0,0 +1,109 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import ddt
+import mock
+
+from rally.benchmark.processing import sketch
+from rally.benchmark.processing import utils
+from tests.unit import test
+
+
+@ddt.ddt
+class SketchTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SketchTestCase, self).setUp()
+        self.values = [0.001 * 1.01 ** i for i in range(1000)] + [0, 0]
+
+    def assertAccurate(self, expected, actual, accuracy=sketch.ACCURACY):
+        self.assertLessEqual(abs(actual - expected), expected * accuracy)
+
+    @ddt.data(True, False)
+    def test_sketch(self, use_numpy):
+        with mock.patch("rally.benchmark.processing.sketch.numpy",
+                        sketch.numpy if use_numpy else None):
+            s = sketch.Sketch(self.values)
+
+        self.assertEqual(1002, s.count)
+        self.assertEqual(2, s.zeros)
+        self.assertEqual(0, s.min)
+        self.assertEqual(self.values[999], s.max)
+        self.assertAlmostEqual(sum(self.values) / 1002, s.mean())
+        self.assertLess(len(s.buckets), 600)
+        values = sorted(self.values)
+        for percent in (0.1, 0.5, 0.9, 0.95, 0.99):
+            self.assertAccurate(
+                utils.percentile(values, percent, presorted=True),
+                s.percentile(percent))
+
+    def test_sketch_numpy_and_python_are_equal(self):
+        s = sketch.Sketch(self.values)
+        with mock.patch("rally.benchmark.processing.sketch.numpy", None):
+            self.assertEqual(s.to_dict(), sketch.Sketch(self.values).to_dict())
+
+    def test_sketch_empty(self):
+        s = sketch.Sketch()
+
+        self.assertEqual(0, s.count)
+        self.assertIsNone(s.mean())
+        self.assertIsNone(s.percentile(0.5))
+        self.assertIsNone(s.value_at_rank(0))
+
+    def test_value_at_rank(self):
+        s = sketch.Sketch([0, 1, 1, 5])
+
+        self.assertEqual(0, s.value_at_rank(-1))
+        self.assertEqual(0, s.value_at_rank(0))
+        self.assertAccurate(1, s.value_at_rank(1))
+        self.assertAccurate(1, s.value_at_rank(2))
+        self.assertEqual(5, s.value_at_rank(3))
+        self.assertEqual(5, s.value_at_rank(10))
+
+    def test_merge(self):
+        s = sketch.Sketch(self.values[:500])
+        s.merge(sketch.Sketch(self.values[500:]))
+        s.merge(sketch.Sketch())
+
+        self.assertEqual(sketch.Sketch(self.values).buckets, s.buckets)
+        self.assertEqual(1002, s.count)
+        self.assertEqual(0, s.min)
+        self.assertEqual(self.values[999], s.max)
+
+    def test_to_dict_from_dict(self):
+        s = sketch.Sketch(self.values)
+
+        restored = sketch.Sketch.from_dict(s.to_dict())
+
+        self.assertEqual(s.to_dict(), restored.to_dict())
+        self.assertEqual(s.percentile(0.9), restored.percentile(0.9))
+
+    def test_workload_sketches(self):
+        iterations = [
+            {"duration": 1.0, "error": [],
+             "atomic_actions": {"a": 0.5, "b": None}},
+            {"duration": 2.0, "error": ["Exception", "msg", "trace"],
+             "atomic_actions": {"a": 1.5}},
+            {"duration": 3.0, "error": [],
+             "atomic_actions": {"a": 2.5, "b": 0.1}}]
+
+        result = sketch.workload_sketches(iterations)
+
+        self.assertEqual(3, result["iterations"])
+        self.assertEqual(1, result["errors"])
+        self.assertEqual(sketch.Sketch([1.0, 3.0]).to_dict(), result["total"])
+        self.assertEqual({"a": sketch.Sketch([0.5, 2.5]).to_dict(),
+                          "b": sketch.Sketch([0.1]).to_dict()},
+                         result["atomic"])
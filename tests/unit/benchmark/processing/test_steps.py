@@ -0,0 +1,70 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.benchmark.processing import steps
+from rally.benchmark.processing import timeline
+from tests.unit import test
+
+
+def iteration(timestamp, duration, concurrency=None, error=False):
+    r = {"timestamp": timestamp, "duration": duration, "idle_duration": 0.0,
+         "error": ["Error", "msg", "trace"] if error else []}
+    if concurrency is not None:
+        r["concurrency"] = concurrency
+    return r
+
+
+class StepsTestCase(test.TestCase):
+
+    def test_steps_not_tagged(self):
+        self.assertEqual([], steps.steps([]))
+        self.assertEqual([], steps.steps([iteration(10, 1.0)]))
+
+    def test_steps(self):
+        iterations = (
+            # 1 iteration in flight during 10 seconds
+            [iteration(10 + i, 1.0, concurrency=1) for i in range(10)] +
+            # 2 iterations in flight during 10 seconds, one of them failed
+            [iteration(20 + i * 2 + j, 2.0, concurrency=2,
+                       error=(i == 0 and j == 0))
+             for i in range(5) for j in range(2)])
+
+        result = steps.steps(iterations)
+
+        self.assertEqual([1, 2], [s["concurrency"] for s in result])
+        self.assertEqual([0, 10], [s["time"] for s in result])
+        self.assertEqual([10, 11], [s["duration"] for s in result])
+        self.assertEqual([10, 10], [s["iterations"] for s in result])
+        self.assertEqual([0, 1], [s["errors"] for s in result])
+        self.assertEqual([0.0, 0.1], [s["errors_rate"] for s in result])
+        # The last iteration of the first level finishes at 20
+        self.assertEqual([1.0, 10 / 11.0], [s["throughput"] for s in result])
+        self.assertEqual(dict((name, 1.0) for name, p
+                              in timeline.PERCENTILES),
+                         result[0]["percentiles"])
+        self.assertEqual(dict((name, 2.0) for name, p
+                              in timeline.PERCENTILES),
+                         result[1]["percentiles"])
+
+    def test_steps_failed_level(self):
+        result = steps.steps([iteration(10, 0.0, concurrency=3, error=True)])
+
+        self.assertEqual([{"concurrency": 3, "time": 0, "duration": 0.0,
+                           "iterations": 1, "errors": 1, "errors_rate": 1.0,
+                           "throughput": None,
+                           "percentiles": dict(
+                               (name, None)
+                               for name, p in timeline.PERCENTILES)}],
+                         result)
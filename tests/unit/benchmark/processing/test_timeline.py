@@ -0,0 +1,89 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.benchmark.processing import timeline
+from tests.unit import test
+
+
+def iteration(timestamp, duration, idle_duration=0.0, error=False):
+    return {"timestamp": timestamp, "duration": duration,
+            "idle_duration": idle_duration,
+            "error": ["Error", "msg", "trace"] if error else []}
+
+
+class TimelineTestCase(test.TestCase):
+
+    def test_timeline_empty(self):
+        self.assertEqual({"started_at": None, "window": None, "windows": []},
+                         timeline.timeline([]))
+
+    def test_timeline(self):
+        iterations = [iteration(10 + i, 2.0, error=not i % 3)
+                      for i in range(10)]
+
+        result = timeline.timeline(iterations, window=2)
+
+        self.assertEqual(10, result["started_at"])
+        self.assertEqual(2, result["window"])
+        windows = result["windows"]
+        self.assertEqual([0, 2, 4, 6, 8, 10], [w["time"] for w in windows])
+        self.assertEqual([2, 2, 2, 2, 2, 1], [w["duration"] for w in windows])
+        self.assertEqual([0, 2, 2, 2, 2, 2],
+                         [w["iterations"] for w in windows])
+        self.assertEqual([0, 1, 1, 0, 1, 1], [w["errors"] for w in windows])
+        self.assertEqual([0.0, 1.0, 1.0, 1.0, 1.0, 2.0],
+                         [w["throughput"] for w in windows])
+        self.assertEqual([1.5, 2.0, 2.0, 2.0, 2.0, 1.0],
+                         [w["concurrency"] for w in windows])
+        self.assertEqual([0.0, 0.5, 0.5, 0.0, 0.5, 0.5],
+                         [w["errors_rate"] for w in windows])
+        self.assertEqual(dict((name, None) for name, p
+                              in timeline.PERCENTILES),
+                         windows[0]["percentiles"])
+        self.assertEqual(dict((name, 2.0) for name, p
+                              in timeline.PERCENTILES),
+                         windows[1]["percentiles"])
+
+    def test_timeline_long_iterations(self):
+        # Iteration spans several windows and has idle duration
+        iterations = [iteration(0.0, 5.0, idle_duration=1.0),
+                      iteration(1.0, 0.5)]
+
+        result = timeline.timeline(iterations, window=2)
+
+        windows = result["windows"]
+        self.assertEqual([1.25, 1.0, 1.0], [w["concurrency"] for w in windows])
+        self.assertEqual([1, 0, 1], [w["iterations"] for w in windows])
+        self.assertEqual([0.5, 0.0, 0.5], [w["throughput"] for w in windows])
+        self.assertEqual([0.5, None, 5.0],
+                         [w["percentiles"]["median"] for w in windows])
+
+    def test_timeline_default_window(self):
+        iterations = [iteration(i * 0.5, 0.5) for i in range(20)]
+
+        result = timeline.timeline(iterations, windows=5)
+
+        self.assertEqual(2.0, result["window"])
+        self.assertEqual([3, 4, 4, 4, 5],
+                         [w["iterations"] for w in result["windows"]])
+        self.assertEqual([1.0] * 5,
+                         [w["concurrency"] for w in result["windows"]])
+
+    def test_timeline_zero_duration(self):
+        result = timeline.timeline([iteration(1.0, 0.0)])
+
+        self.assertEqual(1.0, result["window"])
+        self.assertEqual(1, len(result["windows"]))
+        self.assertEqual(1.0, result["windows"][0]["throughput"])
@@ -34,6 +34,11 @@ class MathTestCase(test.TestCase):
         result = utils.percentile(lst, 1)
         self.assertEqual(result, 100)
 
+    def test_percentile_presorted(self):
+        lst = [3, 1, 2]
+        self.assertEqual(3, utils.percentile(lst, 0, presorted=True))
+        self.assertEqual([3, 1, 2], lst)
+
     def test_mean(self):
         lst = list(range(1, 100))
         result = utils.mean(lst)
@@ -59,6 +64,9 @@ class MathTestCase(test.TestCase):
         result = utils.median(lst)
         self.assertEqual(2.5, result)
 
+    def test_median_presorted(self):
+        self.assertEqual(1, utils.median([2, 1, 3], presorted=True))
+
     def test_median_empty_list(self):
         lst = []
         self.assertRaises(ValueError,
@@ -122,6 +130,25 @@ class MathTestCase(test.TestCase):
             utils.compress(mixed, normalize=alt_normalize, merge=alt_merge),
             [(1, "2"), (2, "5"), (3, "None"), (4, "0.5")])
 
+    def test_compress_with_strategy(self):
+        data = [1, 9, 2, 3, None, 4.444]
+        self.assertEqual(
+            [(1, 1.0), (2, 9.0), (5, 0.0), (6, 4.44)],
+            utils.compress(data, limit=4, strategy="min_max"))
+        self.assertEqual(utils.compress(data),
+                         utils.compress(data, strategy="min_max"))
+        self.assertRaises(KeyError, utils.compress, data, limit=4,
+                          strategy="unknown")
+
+    def test_compress_series(self):
+        series = [[1, 9, 2, 3, None, 4.444], [5, 0, 0, 0, 0, 7]]
+        self.assertEqual(
+            [[(2, 9.0), (5, 0.0), (6, 4.44)],
+             [(2, 0.0), (5, 0.0), (6, 7.0)]],
+            utils.compress_series(series, limit=4))
+        self.assertEqual([[(1, 1.0), (2, 9.0)]],
+                         utils.compress_series([[1, 9]]))
+
 
 class AtomicActionsDataTestCase(test.TestCase):
 
@@ -13,16 +13,57 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 
 import jsonschema
 import mock
 
 from rally.benchmark import context
+from rally.common import httpstats
 from rally import exceptions
 from tests.unit import fakes
 from tests.unit import test
 
 
+def fake_context_cls(calls, name, order, per_workload=False,
+                     depends_on=None):
+    """Return context class that records its setup and cleanup to calls."""
+
+    class FakeContext(object):
+
+        def __init__(self, ctx):
+            self.context = ctx
+            self.config = ctx["config"][name]
+
+        def __lt__(self, other):
+            return order < other.get_order()
+
+        @staticmethod
+        def get_name():
+            return name
+
+        @staticmethod
+        def get_order():
+            return order
+
+        @staticmethod
+        def is_per_workload():
+            return per_workload
+
+        @staticmethod
+        def get_dependencies():
+            return depends_on
+
+        def setup(self):
+            calls.append(("setup", name, self.config))
+            self.context[name] = "%s_data" % name
+
+        def cleanup(self):
+            calls.append(("cleanup", name, self.config))
+
+    return FakeContext
+
+
 class BaseContextTestCase(test.TestCase):
 
     def test_init(self):
@@ -237,3 +278,305 @@ class ContextManagerTestCase(test.TestCase):
         finally:
             mock_setup.assert_called_once_with()
             mock_cleanup.assert_called_once_with()
+
+    def _patch_contexts(self, **classes):
+        patcher = mock.patch("rally.benchmark.context.Context.get",
+                             side_effect=classes.get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_setup_and_cleanup_dependencies(self):
+        calls = []
+        self._patch_contexts(
+            users=fake_context_cls(calls, "users", 1),
+            quotas=fake_context_cls(calls, "quotas", 2, depends_on=["users"]),
+            images=fake_context_cls(calls, "images", 3,
+                                    depends_on=["users", "roles"]),
+            servers=fake_context_cls(calls, "servers", 4))
+        ctx_object = {"config": {"users": {}, "quotas": {}, "images": {},
+                                 "servers": {}}}
+
+        manager = context.ContextManager(ctx_object)
+        manager.setup()
+        setup = [c[1] for c in calls]
+        self.assertEqual("users", setup[0])
+        self.assertEqual(set(["quotas", "images"]), set(setup[1:3]))
+        self.assertEqual("servers", setup[3])
+
+        del calls[:]
+        manager.cleanup()
+        cleanup = [c[1] for c in calls]
+        self.assertEqual("servers", cleanup[0])
+        self.assertEqual(set(["quotas", "images"]), set(cleanup[1:3]))
+        self.assertEqual("users", cleanup[3])
+
+        self.assertEqual(set(["users", "quotas", "images", "servers"]),
+                         set(manager.stats))
+        for stats in manager.stats.values():
+            self.assertIsInstance(stats["setup_duration"], float)
+            self.assertIsInstance(stats["cleanup_duration"], float)
+
+    def test_stats(self):
+        calls = []
+        images = fake_context_cls(calls, "images", 1)
+
+        def setup(ctx):
+            stats = httpstats.current()
+            stats.add("POST", "http://glance/v1/images", 201)
+            stats.add("GET", "http://glance/v1/images/id", 200)
+
+        images.setup = setup
+        images.cleanup = lambda ctx: httpstats.current().add(
+            "DELETE", "http://glance/v1/images/id", 204)
+        self._patch_contexts(images=images)
+
+        manager = context.ContextManager({"config": {"images": {}}})
+        with manager:
+            pass
+
+        stats = manager.stats["images"]
+        self.assertEqual(2, stats["setup_api_calls"])
+        self.assertEqual(1, stats["resources"])
+        self.assertEqual(1, stats["cleanup_api_calls"])
+        self.assertIsNone(httpstats.current())
+
+    def test_setup_independent_contexts_concurrently(self):
+        calls = []
+        started = threading.Event()
+        first = fake_context_cls(calls, "first", 1, depends_on=[])
+        second = fake_context_cls(calls, "second", 2, depends_on=[])
+        # The first context can finish only if the second one is run at the
+        # same time
+        first.setup = lambda ctx: calls.append(("waited", started.wait(5)))
+        second.setup = lambda ctx: started.set()
+        self._patch_contexts(first=first, second=second)
+
+        context.ContextManager({"config": {"first": {},
+                                           "second": {}}}).setup()
+
+        self.assertEqual([("waited", True)], calls)
+
+    def test_setup_failure(self):
+        calls = []
+        failing = fake_context_cls(calls, "failing", 1, depends_on=[])
+        failing.setup = mock.Mock(side_effect=ValueError("boom"))
+        self._patch_contexts(
+            failing=failing,
+            dependent=fake_context_cls(calls, "dependent", 2,
+                                       depends_on=["failing"]))
+        manager = context.ContextManager({"config": {"failing": {},
+                                                     "dependent": {}}})
+
+        self.assertRaises(ValueError, manager.__enter__)
+        self.assertEqual([("cleanup", "failing", {})], calls)
+        self.assertIsInstance(manager.stats["failing"]["setup_duration"],
+                              float)
+        self.assertNotIn("dependent", manager.stats)
+
+    def test_setup_wrong_dependency(self):
+        calls = []
+        self._patch_contexts(
+            users=fake_context_cls(calls, "users", 2),
+            quotas=fake_context_cls(calls, "quotas", 1, depends_on=["users"]))
+        manager = context.ContextManager({"config": {"users": {},
+                                                     "quotas": {}}})
+
+        self.assertRaises(exceptions.InvalidContextSetup, manager.setup)
+        self.assertEqual([], calls)
+
+
+class ContextPoolTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ContextPoolTestCase, self).setUp()
+        self.calls = []
+        self.classes = {"users": fake_context_cls(self.calls, "users", 1),
+                        "images": fake_context_cls(self.calls, "images", 2),
+                        "cleanup": fake_context_cls(self.calls, "cleanup", 3,
+                                                    per_workload=True)}
+        patcher = mock.patch("rally.benchmark.context.Context.get",
+                             side_effect=self.classes.get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _context_obj(self, scenario_name, **config):
+        return {"task": "task", "scenario_name": scenario_name,
+                "config": config}
+
+    def test_get_key(self):
+        key = context.ContextPool.get_key
+        self.assertEqual(
+            key(self._context_obj("a", users={"tenants": 2},
+                                  cleanup=["nova"])),
+            key(self._context_obj("b", users={"tenants": 2},
+                                  cleanup=["cinder"])))
+        self.assertNotEqual(
+            key(self._context_obj("a", users={"tenants": 2})),
+            key(self._context_obj("a", users={"tenants": 3})))
+
+    def test_workload_reuses_contexts(self):
+        workloads = [
+            self._context_obj("a", users={"tenants": 2}, cleanup=["nova"]),
+            self._context_obj("b", users={"tenants": 2}, cleanup=["cinder"])]
+        pool = context.ContextPool()
+        for context_obj in workloads:
+            pool.register(context_obj)
+
+        stats = [{}, {}]
+        for context_obj, workload_stats in zip(workloads, stats):
+            with pool.workload(context_obj, workload_stats) as ctx:
+                self.assertIs(context_obj, ctx)
+                self.assertEqual("users_data", ctx["users"])
+                self.assertEqual("cleanup_data", ctx["cleanup"])
+                self.calls.append(("run", ctx["scenario_name"]))
+        pool.cleanup()
+
+        self.assertEqual([("setup", "users", {"tenants": 2}),
+                          ("setup", "cleanup", ["nova"]),
+                          ("run", "a"),
+                          ("cleanup", "cleanup", ["nova"]),
+                          ("setup", "cleanup", ["cinder"]),
+                          ("run", "b"),
+                          ("cleanup", "cleanup", ["cinder"]),
+                          ("cleanup", "users", {"tenants": 2})],
+                         self.calls)
+        # Shared contexts are set up by the first workload and cleaned up by
+        # the last one
+        self.assertIsNotNone(stats[0]["users"]["setup_duration"])
+        self.assertIsNone(stats[0]["users"]["cleanup_duration"])
+        self.assertIsNone(stats[1]["users"]["setup_duration"])
+        self.assertIsNotNone(stats[1]["users"]["cleanup_duration"])
+        self.assertEqual(0, stats[0]["users"]["setup_api_calls"])
+        self.assertIsNone(stats[1]["users"]["resources"])
+        for workload_stats in stats:
+            self.assertIsNotNone(workload_stats["cleanup"]["setup_duration"])
+            self.assertIsNotNone(
+                workload_stats["cleanup"]["cleanup_duration"])
+
+    def test_workload_passes_shared_contexts(self):
+        shared_contexts = []
+
+        class FakeCleanup(self.classes["cleanup"]):
+            def setup(self):
+                super(FakeCleanup, self).setup()
+                shared_contexts.append(self.context["shared_contexts"])
+
+        self.classes["cleanup"] = FakeCleanup
+        context_obj = self._context_obj("a", users={"tenants": 2},
+                                        images={}, cleanup=["nova"])
+        pool = context.ContextPool()
+        pool.register(context_obj)
+
+        with pool.workload(context_obj) as ctx:
+            self.assertNotIn("shared_contexts", ctx)
+        pool.cleanup()
+
+        self.assertEqual([["images", "users"]], shared_contexts)
+
+    @mock.patch("rally.plugins.openstack.context.cleanup.context.manager")
+    def test_workload_cleanup_keeps_shared_resources(self, mock_manager):
+        from rally.plugins.openstack.context.cleanup import (
+            context as cleanup_context)
+
+        # Resources of the cloud, shared "images" context creates an image
+        # and workloads create servers
+        resources = set()
+        images_cls = self.classes["images"]
+
+        class FakeImages(images_cls):
+            def setup(self):
+                super(FakeImages, self).setup()
+                resources.add("image")
+
+            def cleanup(self):
+                super(FakeImages, self).cleanup()
+                resources.discard("image")
+
+        def cleanup(names, exclude=None, **kwargs):
+            resources.intersection_update(exclude or set())
+
+        mock_manager.list_resource_ids.side_effect = (
+            lambda **kwargs: set(resources))
+        mock_manager.cleanup.side_effect = cleanup
+        self.classes.update({"images": FakeImages,
+                             "cleanup": cleanup_context.UserCleanup})
+
+        workloads = [dict(self._context_obj(name, users={"tenants": 2},
+                                            images={},
+                                            cleanup=["glance", "nova"]),
+                          task={"uuid": "task"})
+                     for name in ("a", "b")]
+        pool = context.ContextPool()
+        for context_obj in workloads:
+            pool.register(context_obj)
+
+        for context_obj in workloads:
+            with pool.workload(context_obj):
+                # Image is kept by cleanup of the previous workload
+                self.assertEqual({"image"}, resources)
+                resources.add("server_%s" % context_obj["scenario_name"])
+        pool.cleanup()
+
+        self.assertEqual(set(), resources)
+
+    def test_workload_different_contexts(self):
+        workloads = [self._context_obj("a", users={"tenants": 2}),
+                     self._context_obj("b", users={"tenants": 3}),
+                     self._context_obj("c", users={"tenants": 2})]
+        pool = context.ContextPool()
+        for context_obj in workloads:
+            pool.register(context_obj)
+
+        for context_obj in workloads:
+            with pool.workload(context_obj):
+                self.calls.append(("run", context_obj["scenario_name"]))
+
+        self.assertEqual([("setup", "users", {"tenants": 2}),
+                          ("run", "a"),
+                          ("setup", "users", {"tenants": 3}),
+                          ("run", "b"),
+                          ("cleanup", "users", {"tenants": 3}),
+                          ("run", "c"),
+                          ("cleanup", "users", {"tenants": 2})],
+                         self.calls)
+
+    def test_workload_setup_failure(self):
+        workloads = [self._context_obj("a", users={}, images={}),
+                     self._context_obj("b", users={}, images={})]
+        pool = context.ContextPool()
+        for context_obj in workloads:
+            pool.register(context_obj)
+
+        with mock.patch.object(self.classes["images"], "setup",
+                               side_effect=Exception("boom")):
+            with self.assertRaises(Exception):
+                with pool.workload(workloads[0]):
+                    self.calls.append(("run", "a"))
+
+        with pool.workload(workloads[1]):
+            self.calls.append(("run", "b"))
+
+        self.assertEqual([("setup", "users", {}),
+                          ("cleanup", "images", {}),
+                          ("cleanup", "users", {}),
+                          ("setup", "users", {}),
+                          ("setup", "images", {}),
+                          ("run", "b"),
+                          ("cleanup", "images", {}),
+                          ("cleanup", "users", {})],
+                         self.calls)
+
+    def test_cleanup(self):
+        workloads = [self._context_obj("a", users={}),
+                     self._context_obj("b", users={})]
+        pool = context.ContextPool()
+        for context_obj in workloads:
+            pool.register(context_obj)
+
+        with pool.workload(workloads[0]):
+            pass
+        pool.cleanup()
+        pool.cleanup()
+
+        self.assertEqual([("setup", "users", {}), ("cleanup", "users", {})],
+                         self.calls)
@@ -0,0 +1,233 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import multiprocessing
+import threading
+
+import mock
+from oslo_config import fixture
+
+from rally.benchmark import distributed
+from rally.benchmark import runner
+from rally import exceptions
+from tests.unit import test
+
+
+BASE = "rally.benchmark.distributed."
+
+
+class FakeRunner(runner.ScenarioRunner):
+
+    def _run_scenario(self, cls, method_name, context, args):
+        for i in range(self.config["times"]):
+            self._send_result({"duration": i, "idle_duration": 0,
+                               "timestamp": i, "error": [],
+                               "scenario_output": {"errors": "", "data": {}},
+                               "atomic_actions": {}})
+        if self.config.get("wait_abort"):
+            self.aborted.wait(5)
+
+
+class DistributedTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DistributedTestCase, self).setUp()
+        self.conf = self.useFixture(fixture.Config()).conf
+        self.conf.set_override("worker_authkey", "secret", "benchmark")
+
+    def test_get_address(self):
+        self.assertEqual(("10.0.0.1", 8000),
+                         distributed.get_address("10.0.0.1:8000"))
+
+    @mock.patch(BASE + "connection.Client")
+    def test_connect(self, mock_client):
+        self.assertEqual(mock_client.return_value,
+                         distributed.connect("host:8000"))
+        mock_client.assert_called_once_with(("host", 8000),
+                                            authkey=b"secret")
+
+    def test_get_authkey(self):
+        self.assertEqual(b"secret", distributed.get_authkey())
+
+    def test_get_authkey_not_set(self):
+        self.conf.clear_override("worker_authkey", "benchmark")
+
+        self.assertRaises(exceptions.WorkerAuthKeyNotSet,
+                          distributed.get_authkey)
+
+    @mock.patch(BASE + "timeutils.utcnow",
+                return_value=datetime.datetime(2015, 1, 1, 0, 1))
+    @mock.patch(BASE + "db.worker_list",
+                return_value=[{"hostname": "b:1"}, {"hostname": "a:1"}])
+    def test_get_active_workers(self, mock_worker_list, mock_utcnow):
+        self.assertEqual(["a:1", "b:1"], distributed.get_active_workers())
+        mock_worker_list.assert_called_once_with(
+            updated_after=datetime.datetime(2015, 1, 1, 0, 0, 30))
+
+    def test_split_config(self):
+        config = {"type": "constant", "times": 10, "concurrency": 3,
+                  "timeout": 5}
+
+        self.assertEqual(
+            [{"type": "constant", "times": 5, "concurrency": 2,
+              "timeout": 5},
+             {"type": "constant", "times": 5, "concurrency": 1,
+              "timeout": 5}],
+            distributed.split_config(config, 2))
+
+    def test_split_config_less_parts(self):
+        configs = distributed.split_config(
+            {"type": "constant", "times": 4, "concurrency": 2}, 3)
+
+        self.assertEqual([{"type": "constant", "times": 2, "concurrency": 1},
+                          {"type": "constant", "times": 2, "concurrency": 1}],
+                         configs)
+
+    def test_split_config_rps(self):
+        configs = distributed.split_config(
+            {"type": "rps", "times": 7, "rps": 5.0}, 2)
+
+        self.assertEqual([{"type": "rps", "times": 4, "rps": 2.5},
+                          {"type": "rps", "times": 3, "rps": 2.5}], configs)
+
+        configs = distributed.split_config(
+            {"type": "rps", "times": 100, "rps": 1}, 4)
+
+        self.assertEqual([{"type": "rps", "times": 25, "rps": 0.25}] * 4,
+                         configs)
+
+    def test_split_config_duration(self):
+        config = {"type": "constant_for_duration", "duration": 10}
+
+        self.assertEqual([config] * 3, distributed.split_config(config, 3))
+
+
+class WorkerServiceTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WorkerServiceTestCase, self).setUp()
+        self.conf = self.useFixture(fixture.Config()).conf
+        self.conf.set_override("worker_authkey", "secret", "benchmark")
+        self.service = distributed.WorkerService("127.0.0.1", 0)
+
+    @mock.patch(BASE + "threading.Thread")
+    @mock.patch(BASE + "db")
+    def test_start_stop(self, mock_db, mock_thread):
+        self.service.start()
+
+        self.assertNotEqual(0, self.service.port)
+        self.assertEqual("127.0.0.1:%d" % self.service.port,
+                         self.service.hostname)
+        mock_db.register_worker.assert_called_once_with(
+            {"hostname": self.service.hostname})
+        mock_thread.return_value.start.assert_called_once_with()
+
+        self.service.stop()
+
+        mock_db.unregister_worker.assert_called_once_with(
+            self.service.hostname)
+
+    @mock.patch(BASE + "threading.Thread")
+    @mock.patch(BASE + "db")
+    def test_start_already_registered(self, mock_db, mock_thread):
+        mock_db.register_worker.side_effect = (
+            exceptions.WorkerAlreadyRegistered(worker="fake"))
+
+        self.service.start()
+        self.service.stop()
+
+        mock_db.update_worker.assert_called_once_with(self.service.hostname)
+
+    @mock.patch(BASE + "connection.Listener")
+    @mock.patch(BASE + "db")
+    def test_start_authkey_not_set(self, mock_db, mock_listener):
+        self.conf.clear_override("worker_authkey", "benchmark")
+
+        self.assertRaises(exceptions.WorkerAuthKeyNotSet, self.service.start)
+        self.assertFalse(mock_listener.called)
+        self.assertFalse(mock_db.register_worker.called)
+
+    @mock.patch(BASE + "db")
+    def test_heartbeat(self, mock_db):
+        self.service.hostname = "127.0.0.1:1"
+        self.service._stopped = mock.Mock()
+        self.service._stopped.is_set.side_effect = [False, False, True]
+
+        self.service._heartbeat()
+
+        self.service._stopped.wait.assert_has_calls([mock.call(5.0)] * 3)
+        mock_db.update_worker.assert_has_calls(
+            [mock.call("127.0.0.1:1")] * 2)
+
+    @mock.patch(BASE + "runner.ScenarioRunner.get", return_value=FakeRunner)
+    @mock.patch(BASE + "scenario_base.Scenario.get_by_name")
+    def _run_job(self, job, mock_get_by_name, mock_get, abort=None):
+        coordinator, conn = multiprocessing.Pipe()
+        thread = threading.Thread(target=self.service._run_job,
+                                  args=(conn,))
+        thread.start()
+        coordinator.send(job)
+        messages = []
+        while not messages or messages[-1][0] not in ("done", "error"):
+            messages.append(coordinator.recv())
+            if abort and len(messages) == 1:
+                coordinator.send(abort)
+        thread.join()
+        return messages
+
+    def test__run_job(self):
+        messages = self._run_job({"task_uuid": "uuid", "name": "Dummy.dummy",
+                                  "config": {"type": "fake", "times": 2,
+                                             "warmup": {"iterations": 1}},
+                                  "context": {}, "args": {}})
+
+        self.assertEqual(["warmup", "result", "result", "done"],
+                         [kind for kind, data in messages])
+        self.assertEqual([0, 1],
+                         [data["duration"] for kind, data in messages[1:3]])
+
+    def test__run_job_abort(self):
+        messages = self._run_job({"task_uuid": "uuid", "name": "Dummy.dummy",
+                                  "config": {"type": "fake", "times": 1,
+                                             "wait_abort": True},
+                                  "context": {}, "args": {}},
+                                 abort=distributed.ABORT)
+
+        self.assertEqual(["result", "done"], [kind for kind, data in messages])
+
+    @mock.patch.object(FakeRunner, "abort")
+    def test__run_job_hard_abort(self, mock_abort):
+        mock_abort.side_effect = lambda hard: self.assertTrue(hard)
+        messages = self._run_job({"task_uuid": "uuid", "name": "Dummy.dummy",
+                                  "config": {"type": "fake", "times": 1},
+                                  "context": {}, "args": {}},
+                                 abort=distributed.HARD_ABORT)
+
+        self.assertEqual(["result", "done"], [kind for kind, data in messages])
+
+    def test__run_job_failed(self):
+        messages = self._run_job({"task_uuid": "uuid", "name": "Dummy.dummy",
+                                  "config": {"type": "fake"},
+                                  "context": {}, "args": {}})
+
+        self.assertEqual(1, len(messages))
+        self.assertEqual("error", messages[0][0])
+        self.assertEqual("KeyError", messages[0][1][0])
+
+    def test__run_job_wrong_job(self):
+        messages = self._run_job({"task_uuid": "uuid"})
+
+        self.assertEqual("error", messages[0][0])
@@ -17,6 +17,7 @@
 
 import collections
 import copy
+import threading
 
 import jsonschema
 import mock
@@ -30,6 +31,12 @@ from tests.unit import test
 
 class BenchmarkEngineTestCase(test.TestCase):
 
+    def setUp(self):
+        super(BenchmarkEngineTestCase, self).setUp()
+        self.mock_get_status = mock.patch(
+            "rally.benchmark.engine.objects.Task.get_status",
+            return_value=consts.TaskStatus.RUNNING).start()
+
     def test_init(self):
         config = mock.MagicMock()
         task = mock.MagicMock()
@@ -129,7 +136,7 @@ class BenchmarkEngineTestCase(test.TestCase):
         config = {"sca": [{"context": "a"}], "scb": [{"runner": "b"}]}
         eng = engine.BenchmarkEngine(mock.MagicMock(), mock.MagicMock())
         eng._validate_config_syntax(config)
-        mock_runner.assert_has_calls([mock.call({}), mock.call("b")],
+        mock_runner.assert_has_calls([mock.call({}, {}), mock.call("b", {})],
                                      any_order=True)
         mock_context.assert_has_calls([mock.call("a", non_hidden=True),
                                        mock.call({}, non_hidden=True)],
@@ -294,6 +301,203 @@ class BenchmarkEngineTestCase(test.TestCase):
         eng = engine.BenchmarkEngine(config, task)
         eng.run()
 
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine.consume_results")
+    @mock.patch("rally.benchmark.engine.base_scenario.Scenario")
+    @mock.patch("rally.benchmark.engine.runner.ScenarioRunner")
+    @mock.patch("rally.benchmark.engine.context.ContextManager")
+    @mock.patch("rally.benchmark.engine.context.ContextPool")
+    def test_run_reuse_contexts(self, mock_context_pool,
+                                mock_context_manager, mock_runner,
+                                mock_scenario, mock_consume):
+        config = {
+            "a.benchmark": [{"context": {"context_a": {"a": 1}}},
+                            {"context": {"context_a": {"a": 1}}}]
+        }
+        task = mock.MagicMock()
+        eng = engine.BenchmarkEngine(config, task, reuse_contexts=True)
+        eng.run()
+
+        pool = mock_context_pool.return_value
+        self.assertEqual(2, pool.register.call_count)
+        self.assertEqual(2, pool.workload.call_count)
+        self.assertEqual([c[0][0] for c in pool.register.call_args_list],
+                         [c[0][0] for c in pool.workload.call_args_list])
+        pool.cleanup.assert_called_once_with()
+        self.assertFalse(mock_context_manager.called)
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine.consume_results")
+    @mock.patch("rally.benchmark.engine.runner.ScenarioRunner")
+    @mock.patch("rally.benchmark.engine.context.ContextManager")
+    def test__run_workload_sla_config(self, mock_context_manager,
+                                      mock_runner, mock_consume):
+        kw = {"runner": {"type": "a"}, "sla": {"failure_rate": {"max": 0}}}
+        eng = engine.BenchmarkEngine({}, mock.MagicMock())
+
+        eng._run_workload("a.benchmark", 0, kw, {}, cpu_limit=2)
+
+        runner_obj = mock_runner.get.return_value.return_value
+        self.assertEqual(kw["sla"], runner_obj.sla_config)
+        self.assertEqual(2, runner_obj.cpu_limit)
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine.consume_results")
+    @mock.patch("rally.benchmark.engine.runner.ScenarioRunner")
+    @mock.patch("rally.benchmark.engine.context.ContextManager")
+    def test__run_workload_aborted(self, mock_context_manager, mock_runner,
+                                   mock_consume):
+        eng = engine.BenchmarkEngine({}, mock.MagicMock())
+        eng.abort_mode = "soft"
+
+        eng._run_workload("a.benchmark", 0, {}, {})
+
+        runner_obj = mock_runner.get.return_value.return_value
+        self.assertFalse(runner_obj.run.called)
+        ctx_manager = mock_context_manager.return_value
+        ctx_manager.__enter__.assert_called_once_with()
+        self.assertTrue(ctx_manager.__exit__.called)
+        self.assertTrue(mock_consume.called)
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine.consume_results")
+    @mock.patch("rally.benchmark.engine.runner.ScenarioRunner")
+    @mock.patch("rally.benchmark.engine.context.ContextManager")
+    def test__run_workload_stage(self, mock_context_manager, mock_runner,
+                                 mock_consume):
+        events = []
+        ctx_manager = mock_context_manager.return_value
+        ctx_manager.__exit__.side_effect = (
+            lambda *args: events.append("cleanup"))
+        runner_obj = mock_runner.get.return_value.return_value
+        stage = engine._Stage(2)
+        runner_obj.run.side_effect = lambda *args: events.append("load")
+        eng = engine.BenchmarkEngine({}, mock.MagicMock())
+
+        thread = threading.Thread(target=eng._run_workload,
+                                  args=("a.benchmark", 0, {}, {}),
+                                  kwargs={"stage": stage})
+        thread.start()
+        thread.join(0.1)
+        # Cleanup waits for the load of the other workload of the stage
+        self.assertTrue(thread.is_alive())
+        self.assertEqual(["load"], events)
+
+        eng._run_workload("a.benchmark", 1, {}, {}, stage=stage)
+        thread.join()
+        self.assertEqual(["load", "load", "cleanup", "cleanup"], events)
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine.consume_results")
+    @mock.patch("rally.benchmark.engine.runner.ScenarioRunner")
+    @mock.patch("rally.benchmark.engine.context.ContextManager")
+    def test__run_workload_stage_setup_failed(self, mock_context_manager,
+                                              mock_runner, mock_consume):
+        ctx_manager = mock_context_manager.return_value
+        ctx_manager.__enter__.side_effect = Exception("Setup failed")
+        stage = mock.Mock()
+        eng = engine.BenchmarkEngine({}, mock.MagicMock())
+
+        eng._run_workload("a.benchmark", 0, {}, {}, stage=stage)
+
+        stage.load_finished.assert_called_once_with()
+        self.assertFalse(stage.wait.called)
+
+    def test__watch_abort(self):
+        self.mock_get_status.side_effect = [consts.TaskStatus.RUNNING,
+                                            consts.TaskStatus.SOFT_ABORTING,
+                                            consts.TaskStatus.ABORTING]
+        modes = []
+        stopped = mock.Mock()
+        stopped.is_set.return_value = False
+        stopped.wait.side_effect = lambda interval: modes.append(
+            eng.abort_mode)
+        eng = engine.BenchmarkEngine({}, {"uuid": "uuid"})
+
+        eng._watch_abort(stopped)
+
+        self.assertEqual([None, "soft"], modes)
+        self.assertEqual("hard", eng.abort_mode)
+        self.mock_get_status.assert_has_calls([mock.call("uuid")] * 3)
+        stopped.wait.assert_has_calls(
+            [mock.call(engine.ABORT_CHECK_INTERVAL)] * 2)
+
+    def test__watch_abort_stopped(self):
+        stopped = mock.Mock()
+        stopped.is_set.side_effect = [False, False, True]
+        self.mock_get_status.side_effect = [Exception("DB is unavailable"),
+                                            consts.TaskStatus.RUNNING]
+        eng = engine.BenchmarkEngine({}, {"uuid": "uuid"})
+
+        eng._watch_abort(stopped)
+
+        self.assertIsNone(eng.abort_mode)
+        self.assertEqual(2, self.mock_get_status.call_count)
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine._run_workload")
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine._prepare_context")
+    def test_run_aborted(self, mock_prepare_context, mock_run_workload):
+        task = mock.MagicMock()
+        config = {"a.benchmark": [{}, {}], "b.benchmark": [{}]}
+        eng = engine.BenchmarkEngine(config, task)
+
+        def run_workload(*args, **kwargs):
+            eng.abort_mode = "soft"
+
+        mock_run_workload.side_effect = run_workload
+
+        eng.run()
+
+        self.assertEqual(1, mock_run_workload.call_count)
+        task.update_status.assert_has_calls([
+            mock.call(consts.TaskStatus.RUNNING),
+            mock.call(consts.TaskStatus.ABORTED)
+        ])
+
+    def test__get_stages(self):
+        workloads = [("a", 0, {}, {}),
+                     ("a", 1, {"group": "g"}, {}),
+                     ("b", 0, {}, {}),
+                     ("b", 1, {"group": "g"}, {}),
+                     ("c", 0, {"group": "h"}, {})]
+        self.assertEqual(
+            [[workloads[0]], [workloads[1], workloads[3]], [workloads[2]],
+             [workloads[4]]],
+            engine.BenchmarkEngine._get_stages(workloads))
+
+    @mock.patch("rally.benchmark.engine.multiprocessing.cpu_count",
+                return_value=8)
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine._run_workload")
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine._prepare_context")
+    def test_run_concurrent_workloads(self, mock_prepare_context,
+                                      mock_run_workload, mock_cpu_count):
+        config = collections.OrderedDict([
+            ("a.benchmark", [{"group": "g"}, {}]),
+            ("b.benchmark", [{"group": "g"}, {"group": "g"}])])
+        eng = engine.BenchmarkEngine(config, mock.MagicMock())
+        eng.run()
+
+        ctx = mock_prepare_context.return_value
+        mock_run_workload.assert_has_calls([
+            mock.call("a.benchmark", 0, {"group": "g"}, ctx,
+                      context_pool=None, cpu_limit=2, stage=mock.ANY),
+            mock.call("b.benchmark", 0, {"group": "g"}, ctx,
+                      context_pool=None, cpu_limit=2, stage=mock.ANY),
+            mock.call("b.benchmark", 1, {"group": "g"}, ctx,
+                      context_pool=None, cpu_limit=2, stage=mock.ANY)],
+            any_order=True)
+        stages = set(c[1]["stage"] for c
+                     in mock_run_workload.call_args_list[:3])
+        self.assertEqual(1, len(stages))
+        self.assertIsInstance(stages.pop(), engine._Stage)
+        self.assertEqual(
+            mock.call("a.benchmark", 1, {}, ctx, context_pool=None,
+                      cpu_limit=None),
+            mock_run_workload.call_args_list[-1])
+
+        mock_run_workload.reset_mock()
+        eng = engine.BenchmarkEngine(config, mock.MagicMock(),
+                                     max_cpu_count=4)
+        eng.run()
+        self.assertEqual(
+            [1, 1, 1, 4],
+            [c[1]["cpu_limit"] for c in mock_run_workload.call_args_list])
+
     @mock.patch("rally.benchmark.engine.LOG")
     @mock.patch("rally.benchmark.engine.BenchmarkEngine.consume_results")
     @mock.patch("rally.benchmark.engine.base_scenario.Scenario")
@@ -365,8 +569,9 @@ class BenchmarkEngineTestCase(test.TestCase):
         self.assertEqual(result, expected_result)
         mock_meta.assert_called_once_with(name, "context")
 
+    @mock.patch("rally.benchmark.engine.sketch.workload_sketches")
     @mock.patch("rally.benchmark.sla.SLAChecker")
-    def test_consume_results(self, mock_sla):
+    def test_consume_results(self, mock_sla, mock_sketches):
         mock_sla_instance = mock.MagicMock()
         mock_sla.return_value = mock_sla_instance
         key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
@@ -376,19 +581,28 @@ class BenchmarkEngineTestCase(test.TestCase):
         }
         runner = mock.MagicMock()
         runner.result_queue = collections.deque([1, 2])
+        runner.warmup_queue = collections.deque([0])
         is_done = mock.MagicMock()
         is_done.isSet.side_effect = [False, False, True]
         eng = engine.BenchmarkEngine(config, task)
-        eng.duration = 123
-        eng.full_duration = 456
-        eng.consume_results(key, task, is_done, {}, runner)
+        durations = {"load_duration": 123, "full_duration": 456,
+                     "contexts": []}
+        eng.consume_results(key, task, is_done, {}, runner, durations)
         mock_sla.assert_called_once_with({"fake": 2})
         expected_iteration_calls = [mock.call(1), mock.call(2)]
         self.assertEqual(expected_iteration_calls,
                          mock_sla_instance.add_iteration.mock_calls)
-
+        mock_sketches.assert_called_once_with([1, 2])
+        task.append_results.assert_called_once_with(key, {
+            "raw": [1, 2], "warmup": [0], "load_duration": 123,
+            "full_duration": 456, "contexts": [],
+            "runner_stats": runner.stats,
+            "sla": mock_sla_instance.results.return_value,
+            "sketches": mock_sketches.return_value})
+
+    @mock.patch("rally.benchmark.engine.sketch.workload_sketches")
     @mock.patch("rally.benchmark.sla.SLAChecker")
-    def test_consume_results_sla_failure_abort(self, mock_sla):
+    def test_consume_results_sla_failure_abort(self, mock_sla, mock_sketches):
         mock_sla_instance = mock.MagicMock()
         mock_sla.return_value = mock_sla_instance
         mock_sla_instance.add_iteration.side_effect = [True, True, False,
@@ -403,14 +617,36 @@ class BenchmarkEngineTestCase(test.TestCase):
         is_done = mock.MagicMock()
         is_done.isSet.side_effect = [False, False, False, False, True]
         eng = engine.BenchmarkEngine(config, task, abort_on_sla_failure=True)
-        eng.duration = 123
-        eng.full_duration = 456
-        eng.consume_results(key, task, is_done, {}, runner)
+        durations = {"load_duration": 123, "full_duration": 456,
+                     "contexts": []}
+        eng.consume_results(key, task, is_done, {}, runner, durations)
         mock_sla.assert_called_once_with({"fake": 2})
         self.assertTrue(runner.abort.called)
 
+    @mock.patch("rally.benchmark.engine.sketch.workload_sketches")
+    @mock.patch("rally.benchmark.sla.SLAChecker")
+    def test_consume_results_aborted(self, mock_sla, mock_sketches):
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        runner = mock.MagicMock()
+        runner.result_queue = collections.deque([1])
+        is_done = mock.MagicMock()
+        is_done.isSet.side_effect = [False, True]
+        eng = engine.BenchmarkEngine({}, task)
+        eng.abort_mode = "hard"
+        durations = {"load_duration": 123, "full_duration": 456,
+                     "contexts": []}
+
+        eng.consume_results(key, task, is_done, {}, runner, durations)
+
+        runner.abort.assert_called_with(hard=True)
+        self.assertTrue(mock_sla.return_value.set_aborted_manually.called)
+        self.assertEqual([1], task.append_results.call_args[0][1]["raw"])
+
+    @mock.patch("rally.benchmark.engine.sketch.workload_sketches")
     @mock.patch("rally.benchmark.sla.SLAChecker")
-    def test_consume_results_sla_failure_continue(self, mock_sla):
+    def test_consume_results_sla_failure_continue(self, mock_sla,
+                                                  mock_sketches):
         mock_sla_instance = mock.MagicMock()
         mock_sla.return_value = mock_sla_instance
         mock_sla_instance.add_iteration.side_effect = [True, True, False,
@@ -425,8 +661,8 @@ class BenchmarkEngineTestCase(test.TestCase):
         is_done = mock.MagicMock()
         is_done.isSet.side_effect = [False, False, False, False, True]
         eng = engine.BenchmarkEngine(config, task, abort_on_sla_failure=False)
-        eng.duration = 123
-        eng.full_duration = 456
-        eng.consume_results(key, task, is_done, {}, runner)
+        durations = {"load_duration": 123, "full_duration": 456,
+                     "contexts": []}
+        eng.consume_results(key, task, is_done, {}, runner, durations)
         mock_sla.assert_called_once_with({"fake": 2})
         self.assertEqual(0, runner.abort.call_count)
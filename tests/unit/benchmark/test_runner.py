@@ -18,6 +18,7 @@ import multiprocessing
 
 import jsonschema
 import mock
+from six import moves
 
 from rally.benchmark import runner
 from rally.benchmark.scenarios import base as scenario_base
@@ -29,6 +30,12 @@ from tests.unit import test
 BASE = "rally.benchmark.runner."
 
 
+def get_result(duration):
+    return {"duration": duration, "idle_duration": 0, "error": [],
+            "scenario_output": {"errors": "", "data": {}},
+            "atomic_actions": {}}
+
+
 class ScenarioHelpersTestCase(test.TestCase):
 
     @mock.patch(BASE + "utils.format_exc")
@@ -156,6 +163,86 @@ class ScenarioHelpersTestCase(test.TestCase):
                          ["Exception", "Something went wrong"])
 
 
+class IterationThreadTestCase(test.TestCase):
+
+    def setUp(self):
+        super(IterationThreadTestCase, self).setUp()
+        self.results = []
+        self.queue = mock.Mock(put=self.results.append)
+        self.args = (3, fakes.FakeScenario, "do_it",
+                     {"task": {"uuid": "uuid"}}, {})
+
+    @mock.patch(BASE + "_run_scenario_once", return_value="result")
+    def test_run(self, mock_run_scenario_once):
+        thread = runner._IterationThread(self.queue, self.args, 10)
+        thread.start()
+        thread.join()
+
+        self.assertTrue(thread.daemon)
+        self.assertEqual(["result"], self.results)
+        self.assertFalse(thread.check_timeout())
+        mock_run_scenario_once.assert_called_once_with(self.args)
+
+    @mock.patch(BASE + "time.time", return_value=100)
+    def test_check_timeout(self, mock_time):
+        thread = runner._IterationThread(self.queue, self.args, 10)
+        thread.started_at = 95
+
+        self.assertFalse(thread.check_timeout())
+        self.assertEqual([], self.results)
+
+        mock_time.return_value = 105
+        self.assertTrue(thread.check_timeout())
+        self.assertEqual(1, len(self.results))
+        result = self.results[0]
+        self.assertEqual(10, result["duration"])
+        self.assertEqual(95, result["timestamp"])
+        self.assertEqual(["TimeoutError",
+                          "Iteration 3 is not finished in 10 seconds"],
+                         result["error"][:2])
+        runner.ScenarioRunnerResult(result)
+
+        # Result of the orphaned iteration is dropped
+        with mock.patch(BASE + "_run_scenario_once", return_value="result"):
+            thread.run()
+        self.assertEqual(1, len(self.results))
+
+    @mock.patch(BASE + "time.time", return_value=1000)
+    def test_check_timeout_no_timeout(self, mock_time):
+        thread = runner._IterationThread(self.queue, self.args)
+        thread.started_at = 0
+
+        self.assertFalse(thread.check_timeout())
+        self.assertEqual([], self.results)
+
+    def test_release_threads(self):
+        finished = mock.Mock(**{"check_timeout.return_value": False,
+                                "is_alive.return_value": False})
+        running = mock.Mock(**{"check_timeout.return_value": False,
+                               "is_alive.return_value": True})
+        timed_out = mock.Mock(**{"check_timeout.return_value": True,
+                                 "is_alive.return_value": True})
+        orphan = mock.Mock(**{"is_alive.return_value": False})
+        pool = collections.deque([finished, running, timed_out])
+        orphans = [orphan]
+
+        runner._release_threads(pool, orphans)
+
+        self.assertEqual([running], list(pool))
+        self.assertEqual([timed_out], orphans)
+        finished.join.assert_called_once_with()
+        self.assertFalse(timed_out.join.called)
+
+    @mock.patch(BASE + "LOG")
+    def test_log_orphans(self, mock_log):
+        runner._log_orphans([mock.Mock(**{"is_alive.return_value": False})])
+        self.assertFalse(mock_log.warning.called)
+
+        runner._log_orphans([mock.Mock(**{"is_alive.return_value": True})])
+        mock_log.warning.assert_called_once_with(
+            "1 timed out iterations are still running, they are abandoned")
+
+
 class ScenarioRunnerResultTestCase(test.TestCase):
 
     def test_validate(self):
@@ -195,9 +282,7 @@ class ScenarioRunnerTestCase(test.TestCase):
 
     @mock.patch(BASE + "rutils.Timer.duration", return_value=10)
     def test_run(self, mock_duration):
-        runner_obj = serial.SerialScenarioRunner(
-            mock.MagicMock(),
-            mock.MagicMock())
+        runner_obj = serial.SerialScenarioRunner(mock.MagicMock(), {})
 
         runner_obj._run_scenario = mock.MagicMock()
 
@@ -225,6 +310,79 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner_obj._run_scenario.assert_called_once_with(
             cls, method_name, context_obj, expected_config_kwargs)
 
+    @mock.patch(BASE + "types.preprocess",
+                side_effect=lambda cls, method, ctx, args: args)
+    @mock.patch(BASE + "scenario_base.Scenario.get_by_name")
+    def test_run_warmup_iterations(self, mock_get_by_name,
+                                   mock_preprocess):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(), {"times": 3, "warmup": {"iterations": 2}})
+        configs = []
+
+        def run_scenario(cls, method_name, context, args):
+            configs.append(runner_obj.config)
+            for i in range(runner_obj.config["times"]):
+                runner_obj._send_result(get_result(i))
+
+        runner_obj._run_scenario = run_scenario
+        runner_obj.run("Dummy.dummy", {"task": {}}, {})
+
+        self.assertEqual([{"times": 2, "warmup": {"iterations": 2}},
+                          {"times": 3, "warmup": {"iterations": 2}}],
+                         configs)
+        self.assertEqual(2, len(runner_obj.warmup_queue))
+        self.assertEqual(3, len(runner_obj.result_queue))
+        self.assertFalse(runner_obj.aborted.is_set())
+
+    def test_run_warmup_iterations_stopped(self):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(), {"times": 3, "warmup": {"iterations": 2}})
+        # Runner that doesn't limit number of iterations
+        runner_obj._get_warmup_config = lambda warmup: runner_obj.config
+
+        def run_scenario(cls, method_name, context, args):
+            while not runner_obj.aborted.is_set():
+                runner_obj._send_result(get_result(0))
+
+        runner_obj._run_scenario = run_scenario
+        runner_obj._run_warmup(mock.Mock(), "dummy", {}, {})
+
+        self.assertEqual(2, len(runner_obj.warmup_queue))
+        self.assertFalse(runner_obj.aborted.is_set())
+
+    @mock.patch(BASE + "types.preprocess",
+                side_effect=lambda cls, method, ctx, args: args)
+    @mock.patch(BASE + "scenario_base.Scenario.get_by_name")
+    def test_run_warmup_duration(self, mock_get_by_name,
+                                 mock_preprocess):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(), {"times": 1, "warmup": {"duration": 0.01}})
+        configs = []
+
+        def run_scenario(cls, method_name, context, args):
+            configs.append(runner_obj.config)
+            runner_obj._send_result(get_result(0))
+            if runner_obj.config["times"] > 1:
+                self.assertTrue(runner_obj.aborted.wait(5))
+
+        runner_obj._run_scenario = run_scenario
+        runner_obj.run("Dummy.dummy", {"task": {}}, {})
+
+        self.assertEqual(runner.ScenarioRunner.UNLIMITED,
+                         configs[0]["times"])
+        self.assertEqual(1, configs[1]["times"])
+        self.assertEqual(1, len(runner_obj.warmup_queue))
+        self.assertEqual(1, len(runner_obj.result_queue))
+
+    def test_run_warmup_aborted(self):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(), {"times": 3, "warmup": {"iterations": 1}})
+        runner_obj._run_scenario = lambda *args: runner_obj.abort()
+
+        runner_obj._run_warmup(mock.Mock(), "dummy", {}, {})
+
+        self.assertTrue(runner_obj.aborted.is_set())
+
     def test_runner_send_result_exception(self):
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -241,6 +399,77 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner_obj.abort()
         self.assertTrue(runner_obj.aborted.is_set())
 
+    def test_abort_hard(self):
+        runner_obj = serial.SerialScenarioRunner(mock.MagicMock(), {})
+        alive = mock.Mock(**{"is_alive.return_value": True})
+        runner_obj._processes = (alive,)
+
+        runner_obj.abort()
+        self.assertFalse(runner_obj._hard_abort)
+
+        runner_obj.abort(hard=True)
+        self.assertTrue(runner_obj.aborted.is_set())
+        self.assertTrue(runner_obj._hard_abort)
+        # Processes are terminated by _join_processes after grace period
+        self.assertFalse(alive.terminate.called)
+
+    def test__terminate_processes(self):
+        runner_obj = serial.SerialScenarioRunner(mock.MagicMock(), {})
+        alive = mock.Mock(**{"is_alive.return_value": True})
+        finished = mock.Mock(**{"is_alive.return_value": False})
+        runner_obj._processes = (alive, finished)
+
+        runner_obj._terminate_processes()
+
+        alive.terminate.assert_called_once_with()
+        self.assertFalse(finished.terminate.called)
+
+    def test__join_processes_hard_aborted(self):
+        process = mock.Mock()
+        process.is_alive.side_effect = lambda: not process.terminate.called
+        mock_result_queue = mock.Mock()
+        mock_result_queue.get.side_effect = moves.queue.Empty
+        runner_obj = serial.SerialScenarioRunner(mock.MagicMock(), {})
+        runner_obj.HARD_ABORT_GRACE_PERIOD = 0
+
+        runner_obj.abort(hard=True)
+        runner_obj._join_processes(collections.deque([process]),
+                                   mock_result_queue)
+
+        process.terminate.assert_called_once_with()
+        process.join.assert_called_once_with()
+        self.assertEqual((), runner_obj._processes)
+
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__join_processes_hard_aborted_grace_period(self,
+                                                       mock_send_result):
+        process = mock.Mock()
+        process.is_alive.side_effect = [True, True, False]
+        mock_result_queue = mock.Mock()
+        mock_result_queue.get.side_effect = [
+            "result", moves.queue.Empty, moves.queue.Empty,
+            moves.queue.Empty, moves.queue.Empty]
+        runner_obj = serial.SerialScenarioRunner(mock.MagicMock(), {})
+
+        runner_obj.abort(hard=True)
+        runner_obj._join_processes(collections.deque([process]),
+                                   mock_result_queue)
+
+        self.assertFalse(process.terminate.called)
+        process.join.assert_called_once_with()
+        mock_send_result.assert_called_once_with("result")
+
+    @mock.patch(BASE + "multiprocessing.cpu_count", return_value=8)
+    def test__get_max_cpu_used(self, mock_cpu_count):
+        runner_obj = serial.SerialScenarioRunner(mock.MagicMock(), {})
+        self.assertEqual(8, runner_obj._get_max_cpu_used())
+        runner_obj.cpu_limit = 3
+        self.assertEqual(3, runner_obj._get_max_cpu_used())
+        runner_obj.config = {"max_cpu_count": 2}
+        self.assertEqual(2, runner_obj._get_max_cpu_used())
+        runner_obj.cpu_limit = None
+        self.assertEqual(2, runner_obj._get_max_cpu_used())
+
     def test__create_process_pool(self):
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -264,8 +493,10 @@ class ScenarioRunnerTestCase(test.TestCase):
         process = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
         processes = 10
         process_pool = collections.deque([process] * processes)
-        mock_result_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
+        mock_result_queue = mock.MagicMock()
+        mock_result_queue.get.side_effect = ["result_1", "result_2",
+                                             moves.queue.Empty,
+                                             moves.queue.Empty]
 
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -274,4 +505,7 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner_obj._join_processes(process_pool, mock_result_queue)
 
         self.assertEqual(processes, process.join.call_count)
+        self.assertEqual([mock.call("result_1"), mock.call("result_2")],
+                         mock_send_result.mock_calls)
+        mock_result_queue.get.assert_called_with(timeout=0.01)
         mock_result_queue.close.assert_called_once_with()
@@ -0,0 +1,100 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally.benchmark import self_benchmark
+from tests.unit import test
+
+
+class SelfBenchmarkTestCase(test.TestCase):
+
+    def test__get_runner_config(self):
+        self.assertEqual(
+            {"type": "serial", "times": 10},
+            self_benchmark._get_runner_config("serial", 5, 10, 1))
+        self.assertEqual(
+            {"type": "constant", "times": 10, "concurrency": 5},
+            self_benchmark._get_runner_config("constant", 5, 10, 1))
+        self.assertEqual(
+            {"type": "constant_for_duration", "duration": 1,
+             "concurrency": 5},
+            self_benchmark._get_runner_config("constant_for_duration",
+                                              5, 10, 1))
+        self.assertEqual(
+            {"type": "rps", "times": 10, "rps": 500, "max_concurrency": 5},
+            self_benchmark._get_runner_config("rps", 5, 10, 1))
+        self.assertRaises(ValueError, self_benchmark._get_runner_config,
+                          "unknown", 5, 10, 1)
+
+    @mock.patch("rally.benchmark.self_benchmark.multiprocessing.cpu_count",
+                return_value=4)
+    def test__get_workers_count(self, mock_cpu_count):
+        self.assertEqual(1, self_benchmark._get_workers_count(
+            {"type": "serial", "times": 10}))
+        self.assertEqual(2, self_benchmark._get_workers_count(
+            {"type": "constant", "times": 10, "concurrency": 2}))
+        self.assertEqual(4, self_benchmark._get_workers_count(
+            {"type": "constant", "times": 10, "concurrency": 20}))
+        self.assertEqual(20, self_benchmark._get_workers_count(
+            {"type": "constant_for_duration", "concurrency": 20}))
+        self.assertEqual(3, self_benchmark._get_workers_count(
+            {"type": "rps", "times": 3, "max_concurrency": 20}))
+
+    def test__get_lag(self):
+        self.assertEqual(0.0, self_benchmark._get_lag({}, 1, []))
+
+        results = [{"timestamp": 10.0}, {"timestamp": 10.6},
+                   {"timestamp": 11.0}]
+        self.assertAlmostEqual(
+            0.1 / 3, self_benchmark._get_lag({"type": "rps", "rps": 2},
+                                             2, results))
+
+        results = [{"duration": 0.5, "idle_duration": 0.1}] * 4
+        self.assertAlmostEqual(
+            0.4, self_benchmark._get_lag({"type": "constant",
+                                          "concurrency": 2}, 2, results))
+
+    def test_run_once(self):
+        result = self_benchmark.run_once("serial", 1, times=5)
+        self.assertEqual("serial", result["runner"])
+        self.assertEqual(1, result["concurrency"])
+        self.assertEqual(5, result["iterations"])
+        self.assertEqual(0, result["errors"])
+        self.assertEqual(1, result["workers"])
+        for key in ("load_duration", "throughput", "lag", "cpu_per_worker"):
+            self.assertGreaterEqual(result[key], 0)
+
+    @mock.patch("rally.benchmark.self_benchmark.run_once")
+    def test_run(self, mock_run_once):
+        results = self_benchmark.run(runners=["serial", "rps"],
+                                     concurrency=[10, 1], times=5,
+                                     duration=2)
+        self.assertEqual([mock_run_once.return_value] * 3, results)
+        self.assertEqual(
+            [mock.call("serial", 1, times=5, duration=2),
+             mock.call("rps", 1, times=5, duration=2),
+             mock.call("rps", 10, times=5, duration=2)],
+            mock_run_once.mock_calls)
+
+    def test_compare(self):
+        baseline = [{"runner": "rps", "concurrency": 1, "throughput": 100},
+                    {"runner": "rps", "concurrency": 10, "throughput": 100}]
+        results = [{"runner": "rps", "concurrency": 1, "throughput": 90},
+                   {"runner": "rps", "concurrency": 10, "throughput": 70},
+                   {"runner": "serial", "concurrency": 1, "throughput": 1}]
+        self.assertEqual([(results[1], baseline[1])],
+                         self_benchmark.compare(results, baseline,
+                                                tolerance=0.2))
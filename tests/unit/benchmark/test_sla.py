@@ -69,6 +69,15 @@ class SLACheckerTestCase(test.TestCase):
               "detail": "Task was aborted due to SLA failure(s)."}],
             sla_checker.results())
 
+    def test_set_aborted_manually(self):
+        sla_checker = sla.SLAChecker({"sla": {}})
+        self.assertEqual([], sla_checker.results())
+        sla_checker.set_aborted_manually()
+        self.assertEqual(
+            [{"criterion": "aborted_manually", "success": False,
+              "detail": "Task was aborted due to abort signal."}],
+            sla_checker.results())
+
     def test__format_result(self):
         name = "some_name"
         success = True
@@ -613,6 +613,18 @@ class ValidatorsTestCase(test.TestCase):
                            None, None)
         self.assertTrue(result.is_valid, result.msg)
 
+    def test_required_runner(self):
+        validator = self._unwrap_validator(validation.required_runner,
+                                           "asyncio")
+        result = validator({"runner": {"type": "asyncio"}}, None, None)
+        self.assertTrue(result.is_valid, result.msg)
+
+        result = validator({"runner": {"type": "constant"}}, None, None)
+        self.assertFalse(result.is_valid, result.msg)
+
+        result = validator({}, None, None)
+        self.assertFalse(result.is_valid, result.msg)
+
     def test_required_openstack_with_admin(self):
         validator = self._unwrap_validator(validation.required_openstack,
                                            admin=True)
@@ -114,7 +114,9 @@ class TaskCommandsTestCase(test.TestCase):
         self.task.start(task_path, deployment_id)
         mock_api.assert_called_once_with(deployment_id, {"some": "json"},
                                          task=mock_create_task.return_value,
-                                         abort_on_sla_failure=False)
+                                         abort_on_sla_failure=False,
+                                         reuse_contexts=False,
+                                         max_cpu_count=None)
         mock_load.assert_called_once_with(task_path, None, None)
 
     @mock.patch("rally.cli.commands.task.TaskCommands._load_task",
@@ -144,14 +146,20 @@ class TaskCommandsTestCase(test.TestCase):
         mock_api.Task.create.assert_called_once_with("deployment", "tag")
         mock_api.Task.start.assert_called_once_with(
             "deployment", mock_load.return_value,
-            task=mock_api.Task.create.return_value, abort_on_sla_failure=False)
+            task=mock_api.Task.create.return_value, abort_on_sla_failure=False,
+            reuse_contexts=False, max_cpu_count=None)
 
     @mock.patch("rally.cli.commands.task.api")
     def test_abort(self, mock_api):
         test_uuid = "17860c43-2274-498d-8669-448eff7b073f"
         mock_api.Task.abort = mock.MagicMock()
         self.task.abort(test_uuid)
-        task.api.Task.abort.assert_called_once_with(test_uuid)
+        task.api.Task.abort.assert_called_once_with(test_uuid, soft=False)
+
+    @mock.patch("rally.cli.commands.task.api")
+    def test_abort_soft(self, mock_api):
+        self.task.abort("uuid", soft=True)
+        mock_api.Task.abort.assert_called_once_with("uuid", soft=True)
 
     @mock.patch("rally.cli.commands.task.envutils.get_global")
     def test_abort_no_task_id(self, mock_default):
@@ -247,6 +255,97 @@ class TaskCommandsTestCase(test.TestCase):
 
         self.task.detailed(test_uuid, iterations_data=True)
 
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_detailed_contexts(self, mock_db, mock_print_list):
+        contexts = [{"name": "users", "setup_duration": 1.23456,
+                     "cleanup_duration": None, "setup_api_calls": 12,
+                     "cleanup_api_calls": None, "resources": 4}]
+        mock_db.task_get_detailed.return_value = {
+            "id": "task", "uuid": "uuid", "status": "finished",
+            "results": [{"key": {"name": "fake_name", "pos": 0, "kw": {}},
+                         "data": {"load_duration": 1.0, "full_duration": 2.0,
+                                  "raw": [], "contexts": contexts}}]}
+
+        self.task.detailed("uuid")
+
+        calls = [c for c in mock_print_list.call_args_list
+                 if c[1].get("table_label") == "Contexts"]
+        self.assertEqual(1, len(calls))
+        rows, fields = calls[0][0][0], calls[0][1]["fields"]
+        formatters = calls[0][1]["formatters"]
+        self.assertEqual(["users", 1.235, "n/a", 12, "n/a", 4],
+                         [rows[0].context] + [formatters[f](rows[0])
+                                              for f in fields[1:]])
+
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.steps.steps")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_detailed_steps(self, mock_db, mock_steps, mock_print_list):
+        mock_db.task_get_detailed.return_value = {
+            "id": "task", "uuid": "uuid", "status": "finished",
+            "results": [{"key": {"name": "fake_name", "pos": 0, "kw": {}},
+                         "data": {"load_duration": 1.0, "full_duration": 2.0,
+                                  "raw": []}}]}
+        mock_steps.return_value = [
+            {"concurrency": 10, "duration": 60.12345, "iterations": 100,
+             "throughput": 1.66666, "errors_rate": 0.02,
+             "percentiles": {"median": 1.0, "90%ile": 2.0, "95%ile": 3.0,
+                             "99%ile": None}}]
+
+        self.task.detailed("uuid")
+
+        mock_steps.assert_called_once_with([])
+        calls = [c for c in mock_print_list.call_args_list
+                 if c[1].get("table_label") == "Concurrency levels"]
+        self.assertEqual(1, len(calls))
+        rows, fields = calls[0][0][0], calls[0][1]["fields"]
+        formatters = calls[0][1]["formatters"]
+        self.assertEqual(
+            [10, 60.123, 100, 1.667, "2.0%", 1.0, 2.0, 3.0, "n/a"],
+            [formatters[f](rows[0]) if f in formatters
+             else getattr(rows[0], f) for f in fields])
+
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.db")
+    def test_detailed_runner_stats(self, mock_db, mock_print_list):
+        probes = [{"rps": 2, "throughput": 1.98765, "iterations": 20,
+                   "errors": 0, "success": True},
+                  {"rps": 4, "throughput": None, "iterations": 0,
+                   "errors": 0, "success": False}]
+        workers = [{"hostname": "host1:1", "iterations": 20,
+                    "status": "finished"},
+                   {"hostname": "host2:1", "iterations": 0, "status": "lost",
+                    "error": "connection reset"}]
+        mock_db.task_get_detailed.return_value = {
+            "id": "task", "uuid": "uuid", "status": "finished",
+            "results": [{"key": {"name": "fake_name", "pos": 0, "kw": {}},
+                         "data": {"load_duration": 1.0, "full_duration": 2.0,
+                                  "raw": [],
+                                  "runner_stats": {"capacity": 2,
+                                                   "probes": probes,
+                                                   "workers": workers}}}]}
+
+        self.task.detailed("uuid")
+
+        calls = [c for c in mock_print_list.call_args_list
+                 if c[1].get("table_label") == "Throughput search"]
+        self.assertEqual(1, len(calls))
+        rows, fields = calls[0][0][0], calls[0][1]["fields"]
+        formatters = calls[0][1]["formatters"]
+        self.assertEqual(
+            [[1, 2, 1.99, 20, 0, "Passed"], [2, 4, "n/a", 0, 0, "Failed"]],
+            [[formatters[f](row) if f in formatters else getattr(row, f)
+              for f in fields] for row in rows])
+
+        calls = [c for c in mock_print_list.call_args_list
+                 if c[1].get("table_label") == "Workers"]
+        self.assertEqual(1, len(calls))
+        rows, fields = calls[0][0][0], calls[0][1]["fields"]
+        self.assertEqual(
+            [["host1:1", 20, "finished"], ["host2:1", 0, "lost"]],
+            [[getattr(row, f) for f in fields] for row in rows])
+
     @mock.patch("rally.cli.commands.task.db")
     @mock.patch("rally.cli.commands.task.logging")
     def test_detailed_task_failed(self, mock_logging, mock_db):
@@ -291,6 +390,9 @@ class TaskCommandsTestCase(test.TestCase):
                                 "result": x["data"]["raw"],
                                 "load_duration": x["data"]["load_duration"],
                                 "full_duration": x["data"]["full_duration"],
+                                "contexts": [],
+                                "warmup": [],
+                                "runner_stats": {},
                                 "sla": x["data"]["sla"]}, data)
         mock_results = mock.Mock(return_value=data)
         mock_get.return_value = mock.Mock(get_results=mock_results)
@@ -317,6 +419,200 @@ class TaskCommandsTestCase(test.TestCase):
                         " available when it is finished." % task_id)
         mock_stdout.write.assert_has_calls([mock.call(expected_out)])
 
+    @mock.patch("rally.cli.commands.task.TaskCommands._print_comparison")
+    @mock.patch("rally.cli.commands.task.TaskCommands._load_workloads")
+    @mock.patch("rally.cli.commands.task.compare_.TaskComparison")
+    def test_compare(self, mock_comparison, mock_load, mock_print):
+        mock_load.side_effect = lambda task: "workloads_%s" % task
+        mock_comparison.return_value.regressions.return_value = []
+
+        self.assertIsNone(self.task.compare("t1", "t2", alpha=0.1))
+
+        mock_comparison.assert_called_once_with("workloads_t1",
+                                                "workloads_t2", alpha=0.1)
+        mock_print.assert_called_once_with(mock_comparison.return_value)
+
+    @mock.patch("rally.cli.commands.task.TaskCommands._load_workloads")
+    @mock.patch("rally.cli.commands.task.compare_.TaskComparison")
+    def test_compare_regressions(self, mock_comparison, mock_load):
+        comparison = mock_comparison.return_value
+        comparison.regressions.return_value = [("A.a", "total")]
+        comparison.to_json.return_value = "json"
+        comparison.to_html.return_value = "html"
+
+        mock_open = mock.mock_open()
+        with mock.patch("rally.cli.commands.task.open", mock_open,
+                        create=True):
+            self.assertEqual(1, self.task.compare(
+                "t1", "t2", output_html=True, output_file="/tmp/c.html"))
+        mock_open.assert_called_once_with("/tmp/c.html", "w+")
+        mock_open.return_value.write.assert_called_once_with("html")
+
+        self.assertEqual(1, self.task.compare("t1", "t2", output_json=True))
+
+    def test_compare_both_formats(self):
+        self.assertEqual(1, self.task.compare("t1", "t2", output_json=True,
+                                              output_html=True))
+
+    @mock.patch("rally.cli.commands.task.TaskCommands._load_workloads",
+                side_effect=exceptions.InvalidResultsFile(path="foo.bin",
+                                                          reason="bar"))
+    def test_compare_invalid_file(self, mock_load):
+        self.assertEqual(1, self.task.compare("foo.bin", "t2"))
+
+    @mock.patch("rally.cli.commands.task.os.path.exists", return_value=False)
+    @mock.patch("rally.cli.commands.task.objects.Task.get")
+    def test__load_workloads_from_db(self, mock_get, mock_exists):
+        mock_get.return_value.get_results.return_value = [
+            {"key": "key_1", "data": {"sketches": "s_1"}},
+            {"key": "key_2", "data": {"sketches": "s_2"}}]
+
+        self.assertEqual(
+            [{"key": "key_1", "result": [], "sketches": "s_1"},
+             {"key": "key_2", "result": [], "sketches": "s_2"}],
+            self.task._load_workloads("task_uuid"))
+        mock_get.assert_called_once_with("task_uuid")
+        mock_get.return_value.get_results.assert_called_once_with(raw=False)
+
+    @mock.patch("rally.cli.commands.task.os.path.exists", return_value=False)
+    @mock.patch("rally.cli.commands.task.objects.Task.get")
+    def test__load_workloads_from_db_without_sketches(self, mock_get,
+                                                      mock_exists):
+        mock_get.return_value.get_results.side_effect = [
+            [{"key": "key_1", "data": {"sketches": "s_1"}},
+             {"key": "key_2", "data": {}}],
+            [{"key": "key_1", "data": {"raw": "raw_1", "sketches": "s_1"}},
+             {"key": "key_2", "data": {"raw": "raw_2"}}]]
+
+        self.assertEqual(
+            [{"key": "key_1", "result": "raw_1", "sketches": "s_1"},
+             {"key": "key_2", "result": "raw_2", "sketches": None}],
+            self.task._load_workloads("task_uuid"))
+        mock_get.return_value.get_results.assert_has_calls(
+            [mock.call(raw=False), mock.call()])
+
+    @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
+    @mock.patch("rally.cli.commands.task.TaskCommands._read_results_file",
+                return_value=iter(["result_1"]))
+    def test__load_workloads_from_file(self, mock_read, mock_exists):
+        self.assertEqual(["result_1"], self.task._load_workloads("foo.bin"))
+        mock_read.assert_called_once_with("foo.bin")
+
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    def test__print_comparison(self, mock_print_list):
+        comparison = task.compare_.TaskComparison(
+            [{"key": {"name": "A.a", "pos": 0, "kw": {}},
+              "result": [{"duration": 1.0, "error": [],
+                          "atomic_actions": {"foo": 0.5}}] * 10},
+             {"key": {"name": "A.b", "pos": 0, "kw": {}},
+              "result": [{"duration": 1.0, "error": [],
+                          "atomic_actions": {}}]}],
+            [{"key": {"name": "A.a", "pos": 0, "kw": {}},
+              "result": [{"duration": 2.0, "error": [],
+                          "atomic_actions": {}}] * 10}])
+
+        self.task._print_comparison(comparison)
+
+        self.assertEqual(1, mock_print_list.call_count)
+        rows = mock_print_list.call_args[0][0]
+        self.assertEqual(["total", "foo"], [r.action for r in rows])
+        self.assertEqual("slower", rows[0].change)
+        self.assertEqual("10 -> 0", rows[1].count)
+
+    @mock.patch("rally.cli.commands.task.binary.dump")
+    @mock.patch("rally.cli.commands.task.open",
+                side_effect=mock.mock_open(), create=True)
+    @mock.patch("rally.cli.commands.task.objects.Task.get")
+    def test_export(self, mock_get, mock_open, mock_dump):
+        data = [{"key": "foo_key",
+                 "data": {"raw": "foo_raw", "sla": [],
+                          "load_duration": "lo_duration",
+                          "full_duration": "fu_duration"}}]
+        mock_get.return_value.get_results.return_value = data
+        dumped = []
+        mock_dump.side_effect = lambda results, f: dumped.extend(results)
+
+        self.task.export("foo_task_id", out="/tmp/foo.bin")
+
+        mock_get.assert_called_once_with("foo_task_id")
+        mock_open.assert_called_once_with("/tmp/foo.bin", "wb")
+        mock_dump.assert_called_once_with(mock.ANY, mock_open.side_effect())
+        self.assertEqual([{"key": "foo_key", "result": "foo_raw", "sla": [],
+                           "load_duration": "lo_duration",
+                           "full_duration": "fu_duration",
+                           "contexts": [], "warmup": [],
+                           "runner_stats": {}}], dumped)
+
+    @mock.patch("rally.cli.commands.task.binary.dump")
+    @mock.patch("rally.cli.commands.task.objects.Task.get")
+    def test_export_no_data(self, mock_get, mock_dump):
+        mock_get.return_value.get_results.return_value = []
+
+        self.assertEqual(1, self.task.export("foo_task_id", out="foo.bin"))
+        self.assertFalse(mock_dump.called)
+
+    @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
+    @mock.patch("rally.cli.commands.task.TaskCommands._read_results_file")
+    @mock.patch("rally.cli.commands.task.api.Task.import_results")
+    def test_import_results(self, mock_import, mock_read, mock_exists):
+        mock_import.return_value = {"uuid": "foo_uuid"}
+
+        self.assertIsNone(self.task.import_results(
+            "/tmp/foo.bin", deployment="foo_deployment", tag="foo"))
+
+        mock_read.assert_called_once_with("/tmp/foo.bin")
+        mock_import.assert_called_once_with(
+            "foo_deployment", mock_read.return_value, tag="foo")
+
+    @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
+    @mock.patch("rally.cli.commands.task.TaskCommands._read_results_file")
+    @mock.patch("rally.cli.commands.task.api.Task.import_results",
+                side_effect=exceptions.InvalidResultsFile(path="foo.bin",
+                                                          reason="bar"))
+    def test_import_results_invalid(self, mock_import, mock_read,
+                                    mock_exists):
+        self.assertEqual(1, self.task.import_results(
+            "foo.bin", deployment="foo_deployment"))
+
+    @mock.patch("rally.cli.commands.task.os.path.exists", return_value=False)
+    @mock.patch("rally.cli.commands.task.api.Task.import_results")
+    def test_import_results_not_found(self, mock_import, mock_exists):
+        self.assertEqual(1, self.task.import_results(
+            "foo.bin", deployment="foo_deployment"))
+        self.assertFalse(mock_import.called)
+
+    @mock.patch("rally.cli.commands.task.binary")
+    @mock.patch("rally.cli.commands.task.open",
+                side_effect=mock.mock_open(), create=True)
+    def test__read_results_file_binary(self, mock_open, mock_binary):
+        mock_binary.is_binary.return_value = True
+        mock_binary.load.return_value = iter(["result_1", "result_2"])
+
+        results = list(self.task._read_results_file("foo.bin"))
+
+        self.assertEqual(["result_1", "result_2"], results)
+        mock_binary.is_binary.assert_called_once_with("foo.bin")
+        mock_open.assert_called_once_with("foo.bin", "rb")
+        mock_binary.load.assert_called_once_with(mock_open.side_effect())
+
+    @mock.patch("rally.cli.commands.task.jsonschema.validate")
+    @mock.patch("rally.cli.commands.task.json.load")
+    @mock.patch("rally.cli.commands.task.binary.is_binary",
+                return_value=False)
+    @mock.patch("rally.cli.commands.task.open",
+                side_effect=mock.mock_open(), create=True)
+    def test__read_results_file_json(self, mock_open, mock_is_binary,
+                                     mock_json_load, mock_validate):
+        mock_json_load.return_value = ["result_1", "result_2"]
+
+        results = list(self.task._read_results_file("foo.json"))
+
+        self.assertEqual(["result_1", "result_2"], results)
+        mock_open.assert_called_once_with("foo.json", "r")
+        mock_validate.assert_has_calls([
+            mock.call("result_1", task.objects.task.TASK_RESULT_SCHEMA),
+            mock.call("result_2", task.objects.task.TASK_RESULT_SCHEMA)])
+
     @mock.patch("rally.cli.commands.task.jsonschema.validate",
                 return_value=None)
     @mock.patch("rally.cli.commands.task.os.path.realpath",
@@ -343,20 +639,23 @@ class TaskCommandsTestCase(test.TestCase):
                     "result": x["data"]["raw"],
                     "sla": x["data"]["sla"],
                     "load_duration": x["data"]["load_duration"],
-                    "full_duration": x["data"]["full_duration"]}
+                    "full_duration": x["data"]["full_duration"],
+                    "contexts": []}
                    for x in data]
         mock_results = mock.Mock(return_value=data)
         mock_get.return_value = mock.Mock(get_results=mock_results)
-        mock_plot.plot.return_value = "html_report"
+        reports = []
+        mock_plot.write_report.side_effect = (
+            lambda results, out: reports.append(list(results)))
 
         def reset_mocks():
             for m in mock_get, mock_web, mock_plot, mock_open:
                 m.reset_mock()
         self.task.report(tasks=task_id, out="/tmp/%s.html" % task_id)
         mock_open.assert_called_once_with("/tmp/%s.html" % task_id, "w+")
-        mock_plot.plot.assert_called_once_with(results)
-
-        mock_open.side_effect().write.assert_called_once_with("html_report")
+        self.assertEqual([results], reports)
+        mock_plot.write_report.assert_called_once_with(
+            mock.ANY, mock_open.side_effect())
         mock_get.assert_called_once_with(task_id)
 
         reset_mocks()
@@ -399,21 +698,24 @@ class TaskCommandsTestCase(test.TestCase):
                                "result": x["data"]["raw"],
                                "sla": x["data"]["sla"],
                                "load_duration": x["data"]["load_duration"],
-                               "full_duration": x["data"]["full_duration"]},
+                               "full_duration": x["data"]["full_duration"],
+                               "contexts": []},
                     data))
 
         mock_results = mock.Mock(return_value=data)
         mock_get.return_value = mock.Mock(get_results=mock_results)
-        mock_plot.plot.return_value = "html_report"
+        reports = []
+        mock_plot.write_report.side_effect = (
+            lambda results, out: reports.append(list(results)))
 
         def reset_mocks():
             for m in mock_get, mock_web, mock_plot, mock_open:
                 m.reset_mock()
         self.task.report(tasks=tasks, out="/tmp/1_test.html")
         mock_open.assert_called_once_with("/tmp/1_test.html", "w+")
-        mock_plot.plot.assert_called_once_with(results)
-
-        mock_open.side_effect().write.assert_called_once_with("html_report")
+        self.assertEqual([results], reports)
+        mock_plot.write_report.assert_called_once_with(
+            mock.ANY, mock_open.side_effect())
         expected_get_calls = [mock.call(task) for task in tasks]
         mock_get.assert_has_calls(expected_get_calls, any_order=True)
 
@@ -443,10 +745,13 @@ class TaskCommandsTestCase(test.TestCase):
                     "result": x["data"]["raw"],
                     "sla": x["data"]["sla"],
                     "load_duration": x["data"]["load_duration"],
-                    "full_duration": x["data"]["full_duration"]}
+                    "full_duration": x["data"]["full_duration"],
+                    "contexts": []}
                    for x in data]
 
-        mock_plot.plot.return_value = "html_report"
+        reports = []
+        mock_plot.write_report.side_effect = (
+            lambda results, out: reports.append(list(results)))
         mock_open.side_effect = mock.mock_open(read_data=results)
 
         mock_json_load.return_value = results
@@ -458,9 +763,9 @@ class TaskCommandsTestCase(test.TestCase):
         expected_open_calls = [mock.call(task_file, "r"),
                                mock.call("/tmp/1_test.html", "w+")]
         mock_open.assert_has_calls(expected_open_calls, any_order=True)
-        mock_plot.plot.assert_called_once_with(results)
-
-        mock_open.side_effect().write.assert_called_once_with("html_report")
+        self.assertEqual([results], reports)
+        mock_plot.write_report.assert_called_once_with(
+            mock.ANY, mock_open.side_effect())
 
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
     @mock.patch("rally.cli.commands.task.json.load")
@@ -488,6 +793,33 @@ class TaskCommandsTestCase(test.TestCase):
                                out="/tmp/tmp.hsml")
         self.assertEqual(ret, 1)
 
+    @mock.patch("rally.cli.commands.task.os.remove")
+    @mock.patch("rally.cli.commands.task.os.path.exists")
+    @mock.patch("rally.cli.commands.task.open",
+                side_effect=mock.mock_open(), create=True)
+    @mock.patch("rally.cli.commands.task.plot")
+    @mock.patch("rally.cli.commands.task.objects.Task.get")
+    def test_report_removes_partial_file(self, mock_get, mock_plot,
+                                         mock_open, mock_path_exists,
+                                         mock_remove):
+        task_id = "eb290c30-38d8-4c8f-bbcc-fc8f74b004ae"
+        mock_path_exists.side_effect = lambda path: path == "/tmp/1.html"
+        mock_get.side_effect = exceptions.TaskNotFound(uuid=task_id)
+        mock_plot.write_report.side_effect = (
+            lambda results, out: list(results))
+
+        self.assertRaises(exceptions.TaskNotFound, self.task.report,
+                          tasks=task_id, out="/tmp/1.html")
+        mock_open.assert_called_once_with("/tmp/1.html", "w+")
+        mock_remove.assert_called_once_with("/tmp/1.html")
+
+        mock_remove.reset_mock()
+        self.assertRaises(exceptions.TaskNotFound, self.task.report,
+                          tasks=task_id, out="/tmp/1.html",
+                          out_format="junit")
+        # Results are loaded before the report file is opened
+        self.assertFalse(mock_remove.called)
+
     @mock.patch("rally.cli.commands.task.sys.stderr")
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=True)
     @mock.patch("rally.cli.commands.task.json.load")
@@ -544,6 +876,31 @@ class TaskCommandsTestCase(test.TestCase):
             mock_objects_list.return_value, ["uuid"],
             print_header=False, print_border=False)
 
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.objects.Task.list",
+                return_value=[fakes.FakeTask(uuid="a",
+                                             created_at=date.datetime.now(),
+                                             updated_at=date.datetime.now(),
+                                             status="c",
+                                             tag="d",
+                                             deployment_name="some_name")])
+    def test_list_with_filters(self, mock_objects_list, mock_print_list):
+        self.task.list(deployment="fake", all_deployments=True, tag="d",
+                       created_after="2015-06-01",
+                       created_before="2015-06-02T12:00:00+02:00",
+                       limit=1, marker="b")
+        mock_objects_list.assert_called_once_with(
+            tag="d", limit=1, marker="b",
+            created_after=date.datetime(2015, 6, 1),
+            created_before=date.datetime(2015, 6, 2, 10))
+        self.assertTrue(mock_print_list.called)
+
+    @mock.patch("rally.cli.commands.task.objects.Task.list")
+    def test_list_wrong_date(self, mock_objects_list):
+        self.assertEqual(1, self.task.list(deployment="fake",
+                                           created_after="yesterday"))
+        self.assertFalse(mock_objects_list.called)
+
     def test_list_wrong_status(self):
         self.assertEqual(1, self.task.list(deployment="fake",
                                            status="wrong non existing status"))
@@ -601,6 +958,7 @@ class TaskCommandsTestCase(test.TestCase):
         result = self.task.sla_check(task_id="fake_task_id")
         self.assertEqual(1, result)
         mock_task_get.assert_called_with("fake_task_id")
+        mock_task_get().get_results.assert_called_with(raw=False)
 
         data[0]["data"]["sla"][0]["success"] = True
         mock_task_get().get_results.return_value = data
@@ -608,6 +966,42 @@ class TaskCommandsTestCase(test.TestCase):
         result = self.task.sla_check(task_id="fake_task_id", tojson=True)
         self.assertEqual(0, result)
 
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.self_benchmark")
+    def test_self_benchmark(self, mock_self_benchmark, mock_print_list):
+        result = {"runner": "constant", "concurrency": 10,
+                  "iterations": 100, "errors": 0, "workers": 2,
+                  "load_duration": 1.0, "throughput": 100.0, "lag": 0.001,
+                  "cpu_per_worker": 50.0}
+        mock_self_benchmark.run.return_value = [result]
+
+        self.assertIsNone(self.task.self_benchmark(runners=["constant"],
+                                                   concurrency=[10]))
+        mock_self_benchmark.run.assert_called_once_with(
+            runners=["constant"], concurrency=[10], times=1000,
+            duration=10.0)
+        self.assertEqual(1, mock_print_list.call_count)
+        self.assertFalse(mock_self_benchmark.compare.called)
+
+    @mock.patch("rally.cli.commands.task.open",
+                mock.mock_open(read_data="[]"), create=True)
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    @mock.patch("rally.cli.commands.task.self_benchmark")
+    def test_self_benchmark_regression(self, mock_self_benchmark,
+                                       mock_print_list):
+        result = {"runner": "constant", "concurrency": 10,
+                  "iterations": 100, "errors": 0, "workers": 2,
+                  "load_duration": 1.0, "throughput": 100.0, "lag": 0.001,
+                  "cpu_per_worker": 50.0}
+        mock_self_benchmark.run.return_value = [result]
+        mock_self_benchmark.compare.return_value = [
+            (result, dict(result, throughput=200.0))]
+
+        self.assertEqual(1, self.task.self_benchmark(baseline="base.json",
+                                                     tolerance=0.1))
+        mock_self_benchmark.compare.assert_called_once_with(
+            [result], [], tolerance=0.1)
+
     @mock.patch("rally.cli.commands.task.open",
                 mock.mock_open(read_data="{\"some\": \"json\"}"),
                 create=True)
@@ -27,7 +27,8 @@ class CmdManageTestCase(test.TestCase):
     def test_main(self, cli_mock):
         manage.main()
         categories = {"db": manage.DBCommands,
-                      "tempest": manage.TempestCommands}
+                      "tempest": manage.TempestCommands,
+                      "worker": manage.WorkerCommands}
         cli_mock.run.assert_called_once_with(sys.argv, categories)
 
 
@@ -57,3 +58,53 @@ class TempestCommandsTestCase(test.TestCase):
         self.tempest_commands.install(deployment_uuid)
         mock_api.Verification.install_tempest.assert_called_once_with(
             deployment_uuid, None)
+
+
+class WorkerCommandsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WorkerCommandsTestCase, self).setUp()
+        self.worker_commands = manage.WorkerCommands()
+
+    @mock.patch("rally.cli.manage.socket.gethostname", return_value="host")
+    @mock.patch("rally.cli.manage.distributed.WorkerService")
+    def test_start(self, mock_worker_service, mock_gethostname):
+        service = mock_worker_service.return_value
+        service.serve.side_effect = KeyboardInterrupt
+
+        self.worker_commands.start()
+
+        mock_worker_service.assert_called_once_with("host", 0)
+        service.start.assert_called_once_with()
+        service.serve.assert_called_once_with()
+        service.stop.assert_called_once_with()
+
+    @mock.patch("rally.cli.manage.distributed.WorkerService")
+    def test_start_host_port(self, mock_worker_service):
+        self.worker_commands.start(host="10.0.0.1", port=8000)
+
+        mock_worker_service.assert_called_once_with("10.0.0.1", 8000)
+
+    @mock.patch("rally.cli.manage.cliutils.print_list")
+    @mock.patch("rally.cli.manage.distributed.get_active_workers",
+                return_value=["a:1"])
+    @mock.patch("rally.cli.manage.db.worker_list",
+                return_value=[{"hostname": "a:1", "updated_at": "now"},
+                              {"hostname": "b:1", "updated_at": "before"}])
+    def test_list(self, mock_worker_list, mock_get_active_workers,
+                  mock_print_list):
+        self.worker_commands.list()
+
+        rows, headers = mock_print_list.call_args[0]
+        self.assertEqual([["a:1", "now", True], ["b:1", "before", False]],
+                         [[getattr(row, h) for h in headers] for row in rows])
+
+    @mock.patch("rally.cli.manage.cliutils.print_list")
+    @mock.patch("rally.cli.manage.distributed.get_active_workers",
+                return_value=[])
+    @mock.patch("rally.cli.manage.db.worker_list", return_value=[])
+    def test_list_empty(self, mock_worker_list, mock_get_active_workers,
+                        mock_print_list):
+        self.worker_commands.list()
+
+        self.assertFalse(mock_print_list.called)
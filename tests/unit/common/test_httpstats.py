@@ -0,0 +1,115 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import ddt
+import mock
+from requests import adapters
+import six
+
+from rally.common import httpstats
+from tests.unit import test
+
+
+@ddt.ddt
+class StatsTestCase(test.TestCase):
+
+    @ddt.data(
+        {"method": "GET", "url": "http://nova/v2/servers", "status": 200,
+         "resources": 0},
+        {"method": "POST", "url": "http://nova/v2/servers", "status": 202,
+         "resources": 1},
+        {"method": "POST", "url": "http://nova/v2/servers", "status": 413,
+         "resources": 0},
+        {"method": "POST", "url": "http://nova/v2/servers", "status": None,
+         "resources": 0},
+        {"method": "POST", "url": "http://nova/v2/servers/id/action",
+         "status": 202, "resources": 0},
+        {"method": "POST", "url": "http://keystone/v2.0/tokens/",
+         "status": 200, "resources": 0},
+        {"method": "POST", "url": "http://keystone/v3/auth/tokens?a=b",
+         "status": 201, "resources": 0})
+    @ddt.unpack
+    def test_add(self, method, url, status, resources):
+        stats = httpstats.Stats()
+        stats.add(method, url, status)
+        self.assertEqual(1, stats.api_calls)
+        self.assertEqual(resources, stats.resources)
+
+
+class HttpStatsTestCase(test.TestCase):
+
+    def test_collect(self):
+        outer = httpstats.Stats()
+        inner = httpstats.Stats()
+        self.assertIsNone(httpstats.current())
+        with httpstats.collect(outer):
+            self.assertIs(outer, httpstats.current())
+            with httpstats.collect(inner):
+                self.assertIs(inner, httpstats.current())
+            self.assertIs(outer, httpstats.current())
+        self.assertIsNone(httpstats.current())
+
+    def test_collect_installs(self):
+        with httpstats.collect(None):
+            pass
+        self.assertIs(httpstats._send,
+                      six.get_unbound_function(adapters.HTTPAdapter.send))
+
+    def test_inherit(self):
+        stats = httpstats.Stats()
+        collected = []
+
+        def func(arg):
+            collected.append((arg, httpstats.current()))
+
+        with httpstats.collect(stats):
+            thread = threading.Thread(target=httpstats.inherit(func),
+                                      args=("foo",))
+        thread.start()
+        thread.join()
+        self.assertEqual([("foo", stats)], collected)
+
+    @mock.patch("rally.common.httpstats._original_send")
+    def test__send(self, mock__original_send):
+        mock__original_send.return_value.status_code = 202
+        request = mock.Mock(method="POST", url="http://nova/v2/servers")
+        stats = httpstats.Stats()
+
+        with httpstats.collect(stats):
+            response = httpstats._send("adapter", request, timeout=3)
+
+        self.assertEqual(mock__original_send.return_value, response)
+        mock__original_send.assert_called_once_with("adapter", request,
+                                                    timeout=3)
+        self.assertEqual(1, stats.api_calls)
+        self.assertEqual(1, stats.resources)
+
+        # Requests of threads that don't collect stats aren't counted
+        httpstats._send("adapter", request)
+        self.assertEqual(1, stats.api_calls)
+
+    @mock.patch("rally.common.httpstats._original_send",
+                side_effect=IOError("connection refused"))
+    def test__send_failure(self, mock__original_send):
+        request = mock.Mock(method="POST", url="http://nova/v2/servers")
+        stats = httpstats.Stats()
+
+        with httpstats.collect(stats):
+            self.assertRaises(IOError, httpstats._send, "adapter", request)
+
+        self.assertEqual(1, stats.api_calls)
+        self.assertEqual(0, stats.resources)
@@ -0,0 +1,68 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import ddt
+import mock
+
+from rally.common import costilius
+from rally.common import jsoncodec
+from tests.unit import test
+
+
+PATH = "rally.common.jsoncodec"
+
+
+@ddt.ddt
+class JSONCodecTestCase(test.TestCase):
+
+    def setUp(self):
+        super(JSONCodecTestCase, self).setUp()
+        default = jsoncodec.get_codec().name
+        self.addCleanup(jsoncodec.use, default)
+
+    @ddt.data(*jsoncodec.get_codecs())
+    def test_roundtrip(self, name):
+        jsoncodec.use(name)
+        obj = {"raw": [{"duration": 1.5, "error": [],
+                        "atomic_actions": costilius.OrderedDict(
+                            [("z", 0.1), ("a", 0.2), ("m", None)])}],
+               "sla": [{"success": True, "detail": u"✓"}]}
+        data = jsoncodec.dumps(obj)
+        self.assertIsInstance(data, str)
+        loaded = jsoncodec.loads(data)
+        self.assertEqual(obj, loaded)
+        self.assertEqual(["z", "a", "m"],
+                         list(loaded["raw"][0]["atomic_actions"]))
+
+    def test_default_codec(self):
+        codecs = jsoncodec.get_codecs()
+        self.assertEqual(codecs[0], jsoncodec.get_codec().name)
+        self.assertEqual("json", codecs[-1])
+        self.assertIs(jsoncodec.STD_CODEC, jsoncodec.get_codec("json"))
+
+    def test_fallback_to_std_codec(self):
+        codec = jsoncodec.Codec("broken", mock.Mock(side_effect=TypeError),
+                                mock.Mock(side_effect=ValueError))
+        self.assertEqual('{"1": 2}', jsoncodec.dumps({1: 2}, codec=codec))
+        self.assertEqual({"a": 1}, jsoncodec.loads('{"a": 1}', codec=codec))
+        codec.dumps.assert_called_once_with({1: 2})
+        codec.loads.assert_called_once_with('{"a": 1}')
+
+    @mock.patch("%s.ORDERED_DICTS" % PATH, new=False)
+    def test_std_loads_ordered_dicts(self):
+        loaded = jsoncodec.loads('{"b": {"z": 1, "a": 2}}',
+                                 codec=jsoncodec.STD_CODEC)
+        self.assertIsInstance(loaded, costilius.OrderedDict)
+        self.assertEqual(["z", "a"], list(loaded["b"]))
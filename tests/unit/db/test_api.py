@@ -15,6 +15,8 @@
 
 """Tests for db.api layer."""
 
+import datetime
+
 from six import moves
 
 from rally import consts
@@ -72,6 +74,29 @@ class TasksTestCase(test.DBTestCase):
             db_task = self._get_task(_uuid)
             self.assertEqual(db_task["status"], status)
 
+    def test_task_update_status(self):
+        task = self._create_task({"status": consts.TaskStatus.RUNNING})
+        db.task_update_status(task["uuid"], consts.TaskStatus.ABORTING,
+                              [consts.TaskStatus.RUNNING])
+        db_task = self._get_task(task["uuid"])
+        self.assertEqual(consts.TaskStatus.ABORTING, db_task["status"])
+
+    def test_task_update_status_invalid(self):
+        task = self._create_task({"status": consts.TaskStatus.FINISHED})
+        self.assertRaises(exceptions.TaskInvalidStatus,
+                          db.task_update_status, task["uuid"],
+                          consts.TaskStatus.ABORTING,
+                          [consts.TaskStatus.RUNNING])
+        db_task = self._get_task(task["uuid"])
+        self.assertEqual(consts.TaskStatus.FINISHED, db_task["status"])
+
+    def test_task_update_status_not_found(self):
+        self.assertRaises(exceptions.TaskNotFound,
+                          db.task_update_status,
+                          "7ae1da26-feaa-4213-8208-76af2857a5ab",
+                          consts.TaskStatus.ABORTING,
+                          [consts.TaskStatus.RUNNING])
+
     def test_task_list_empty(self):
         self.assertEqual([], db.task_list())
 
@@ -102,6 +127,52 @@ class TasksTestCase(test.DBTestCase):
         self.assertEqual(task_init, get_uuids(INIT))
         self.assertEqual(sorted(task_finished), get_uuids(FINISHED))
 
+    def test_task_list_projection(self):
+        deploy = db.deployment_create({"name": "some_name"})
+        task = self._create_task({"deployment_uuid": deploy["uuid"],
+                                  "tag": "t"})
+        listed = db.task_list()
+        self.assertEqual(1, len(listed))
+        self.assertEqual(task["uuid"], listed[0]["uuid"])
+        self.assertEqual(task["uuid"], listed[0].uuid)
+        self.assertEqual("some_name", listed[0]["deployment_name"])
+        self.assertEqual("t", listed[0]["tag"])
+        self.assertNotIn("verification_log", listed[0])
+
+    def test_task_list_filters(self):
+        dt = datetime.datetime
+        first = self._create_task({"tag": "a",
+                                   "created_at": dt(2015, 1, 1)})["uuid"]
+        second = self._create_task({"tag": "b",
+                                    "created_at": dt(2015, 2, 1)})["uuid"]
+        third = self._create_task({"tag": "a",
+                                   "created_at": dt(2015, 3, 1)})["uuid"]
+
+        def get_uuids(**filters):
+            return [task["uuid"] for task in db.task_list(**filters)]
+
+        self.assertEqual([third, second, first], get_uuids())
+        self.assertEqual([third, first], get_uuids(tag="a"))
+        self.assertEqual([third, second],
+                         get_uuids(created_after=dt(2015, 2, 1)))
+        self.assertEqual([second, first],
+                         get_uuids(created_before=dt(2015, 3, 1)))
+        self.assertEqual([second],
+                         get_uuids(created_after=dt(2015, 1, 2),
+                                   created_before=dt(2015, 2, 2)))
+
+    def test_task_list_pagination(self):
+        uuids = [self._create_task()["uuid"] for i in moves.range(5)][::-1]
+        self.assertEqual(uuids[:2], [t["uuid"] for t in db.task_list(limit=2)])
+        self.assertEqual(uuids[2:4],
+                         [t["uuid"] for t in db.task_list(limit=2,
+                                                          marker=uuids[1])])
+        self.assertEqual(uuids[4:],
+                         [t["uuid"] for t in db.task_list(limit=2,
+                                                          marker=uuids[3])])
+        self.assertRaises(exceptions.TaskNotFound,
+                          db.task_list, marker="non-existing-task")
+
     def test_task_delete(self):
         task1, task2 = self._create_task()["uuid"], self._create_task()["uuid"]
         db.task_delete(task1)
@@ -162,6 +233,19 @@ class TasksTestCase(test.DBTestCase):
             self.assertEqual(res[0]["key"], data)
             self.assertEqual(res[0]["data"], data)
 
+    def test_task_result_get_all_by_uuid_without_raw(self):
+        task_id = self._create_task()["uuid"]
+        data = {"raw": [{"duration": 1}], "warmup": [{"duration": 2}],
+                "sla": [], "load_duration": 1}
+        db.task_result_create(task_id, {"name": "atata"}, data)
+
+        res = db.task_result_get_all_by_uuid(task_id, raw=False)
+        self.assertEqual(1, len(res))
+        self.assertEqual({"name": "atata"}, res[0]["key"])
+        self.assertEqual({"sla": [], "load_duration": 1}, res[0]["data"])
+        self.assertEqual(data, db.task_result_get_all_by_uuid(
+            task_id)[0]["data"])
+
     def test_task_get_detailed(self):
         task1 = self._create_task()
         key = {"name": "atata"}
@@ -174,6 +258,21 @@ class TasksTestCase(test.DBTestCase):
         self.assertEqual(results[0]["key"], key)
         self.assertEqual(results[0]["data"], data)
 
+    def test_task_get_detailed_without_raw(self):
+        task1 = self._create_task()
+        key = {"name": "atata"}
+        data = {"raw": [{"duration": 1}], "sla": [{"success": True}]}
+
+        db.task_result_create(task1["uuid"], key, data)
+        task1_full = db.task_get_detailed(task1["uuid"], raw=False)
+        self.assertEqual(task1["uuid"], task1_full["uuid"])
+        results = task1_full["results"]
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["key"], key)
+        self.assertEqual(results[0]["data"], {"sla": [{"success": True}]})
+        self.assertIsNone(db.task_get_detailed("non-existing-task",
+                                               raw=False))
+
     def test_task_get_detailed_last(self):
         task1 = self._create_task()
         key = {"name": "atata"}
@@ -450,3 +549,22 @@ class WorkerTestCase(test.DBTestCase):
 
     def test_update_worker_not_found(self):
         self.assertRaises(exceptions.WorkerNotFound, db.update_worker, "fake")
+
+    def test_worker_list(self):
+        db.register_worker({"hostname": "test2"})
+
+        workers = db.worker_list()
+
+        self.assertEqual(["test", "test2"],
+                         sorted(w["hostname"] for w in workers))
+
+    def test_worker_list_updated_after(self):
+        db.update_worker("test")
+        updated_at = db.get_worker("test")["updated_at"]
+
+        workers = db.worker_list(updated_after=updated_at)
+        self.assertEqual(["test"], [w["hostname"] for w in workers])
+
+        workers = db.worker_list(
+            updated_after=updated_at + datetime.timedelta(seconds=1))
+        self.assertEqual([], workers)
@@ -62,6 +62,23 @@ class TaskTestCase(test.TestCase):
         mock_get.assert_called_once_with(self.task["uuid"])
         self.assertEqual(task["uuid"], self.task["uuid"])
 
+    @mock.patch("rally.objects.task.db.task_list")
+    def test_list_with_filters(self, mock_db_task_list):
+        mock_db_task_list.return_value = [self.task]
+        tasks = objects.Task.list(deployment="d", tag="t", limit=10,
+                                  marker="m")
+        mock_db_task_list.assert_called_once_with(
+            None, "d", tag="t", created_after=None, created_before=None,
+            limit=10, marker="m")
+        self.assertEqual([self.task["uuid"]], [t["uuid"] for t in tasks])
+
+    @mock.patch("rally.objects.task.db.deployment_get")
+    def test_to_dict_listed(self, mock_deployment_get):
+        self.task["deployment_name"] = "some_name"
+        task = objects.Task(task=self.task)
+        self.assertEqual("some_name", task.to_dict()["deployment_name"])
+        self.assertFalse(mock_deployment_get.called)
+
     @mock.patch("rally.objects.task.db.task_delete")
     @mock.patch("rally.objects.task.db.task_create")
     def test_create_and_delete(self, mock_create, mock_delete):
@@ -84,6 +101,33 @@ class TaskTestCase(test.TestCase):
         objects.Task.delete_by_uuid(self.task["uuid"])
         mock_delete.assert_called_once_with(self.task["uuid"], status=None)
 
+    @mock.patch("rally.objects.task.db.task_get",
+                return_value={"status": consts.TaskStatus.ABORTING})
+    def test_get_status(self, mock_get):
+        self.assertEqual(consts.TaskStatus.ABORTING,
+                         objects.Task.get_status(self.task["uuid"]))
+        mock_get.assert_called_once_with(self.task["uuid"])
+
+    @mock.patch("rally.objects.task.db.task_update_status")
+    def test_abort(self, mock_update_status):
+        task = objects.Task(task=self.task)
+
+        task.abort()
+
+        mock_update_status.assert_called_once_with(
+            self.task["uuid"], consts.TaskStatus.ABORTING,
+            [consts.TaskStatus.RUNNING, consts.TaskStatus.SOFT_ABORTING])
+
+    @mock.patch("rally.objects.task.db.task_update_status")
+    def test_abort_soft(self, mock_update_status):
+        task = objects.Task(task=self.task)
+
+        task.abort(soft=True)
+
+        mock_update_status.assert_called_once_with(
+            self.task["uuid"], consts.TaskStatus.SOFT_ABORTING,
+            [consts.TaskStatus.RUNNING])
+
     @mock.patch("rally.objects.task.db.task_delete")
     def test_delete_by_uuid_status(self, mock_delete):
         objects.Task.delete_by_uuid(self.task["uuid"],
@@ -141,9 +185,13 @@ class TaskTestCase(test.TestCase):
     def test_get_results(self, mock_get):
         task = objects.Task(task=self.task)
         results = task.get_results()
-        mock_get.assert_called_once_with(self.task["uuid"])
+        mock_get.assert_called_once_with(self.task["uuid"], raw=True)
         self.assertEqual(results, "foo_results")
 
+        mock_get.reset_mock()
+        task.get_results(raw=False)
+        mock_get.assert_called_once_with(self.task["uuid"], raw=False)
+
     @mock.patch("rally.objects.task.db.task_result_create")
     def test_append_results(self, mock_append_results):
         task = objects.Task(task=self.task)
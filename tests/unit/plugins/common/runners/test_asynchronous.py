@@ -0,0 +1,286 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import jsonschema
+import mock
+import testtools
+
+from rally.benchmark import runner
+from rally import exceptions
+from rally.plugins.common.runners import asynchronous
+from tests.unit import fakes
+from tests.unit import test
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+
+RUNNERS = "rally.plugins.common.runners."
+
+
+class FakeAsyncScenario(fakes.FakeScenario):
+
+    def sleep(self, delay=0.05):
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        loop.call_later(delay, future.set_result, None)
+        return future
+
+    def fail(self):
+        future = asyncio.get_event_loop().create_future()
+        future.set_exception(ValueError("fail"))
+        return future
+
+
+def _max_in_flight(results):
+    events = []
+    for r in results:
+        events.append((r["timestamp"], 1))
+        events.append((r["timestamp"] + r["duration"], -1))
+    in_flight = max_in_flight = 0
+    for timestamp, delta in sorted(events):
+        in_flight += delta
+        max_in_flight = max(max_in_flight, in_flight)
+    return max_in_flight
+
+
+class AsyncioScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AsyncioScenarioRunnerTestCase, self).setUp()
+        self.task = mock.MagicMock()
+        self.context = fakes.FakeUserContext({}).context
+        self.context["task"] = {"uuid": "fake_uuid"}
+
+    def test_validate(self):
+        config = {
+            "type": "asyncio",
+            "times": 10,
+            "concurrency": 1000,
+            "rps": 100,
+            "timeout": 1,
+            "max_cpu_count": 2
+        }
+        asynchronous.AsyncioScenarioRunner.validate(config)
+
+    def test_validate_failed(self):
+        for config in ({"type": "asyncio", "a": 10},
+                       {"type": "asyncio", "rps": 0},
+                       {"type": "asyncio", "concurrency": 0}):
+            self.assertRaises(jsonschema.ValidationError,
+                              asynchronous.AsyncioScenarioRunner.validate,
+                              config)
+
+    @mock.patch(RUNNERS + "asynchronous._import_asyncio")
+    def test__run_scenario_asyncio_is_unavailable(self, mock_import_asyncio):
+        mock_import_asyncio.side_effect = exceptions.RallyException
+        runner_obj = asynchronous.AsyncioScenarioRunner(
+            self.task, {"times": 1})
+        self.assertRaises(exceptions.RallyException,
+                          runner_obj._run_scenario, FakeAsyncScenario,
+                          "sleep", self.context, {})
+
+    @testtools.skipIf(asyncio is None, "asyncio is not available")
+    def test__run_scenario(self):
+        config = {"times": 20, "concurrency": 5, "max_cpu_count": 1}
+        runner_obj = asynchronous.AsyncioScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(FakeAsyncScenario, "sleep", self.context, {})
+
+        results = list(runner_obj.result_queue)
+        self.assertEqual(config["times"], len(results))
+        for result in results:
+            self.assertIsNotNone(runner.ScenarioRunnerResult(result))
+            self.assertEqual([], result["error"])
+        self.assertEqual(config["concurrency"], _max_in_flight(results))
+
+    @testtools.skipIf(asyncio is None, "asyncio is not available")
+    def test__run_scenario_rps(self):
+        config = {"times": 10, "rps": 100, "concurrency": 2,
+                  "max_cpu_count": 1}
+        runner_obj = asynchronous.AsyncioScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(FakeAsyncScenario, "sleep", self.context,
+                                 {"delay": 0.05})
+
+        results = list(runner_obj.result_queue)
+        self.assertEqual(config["times"], len(results))
+        self.assertLessEqual(_max_in_flight(results), config["concurrency"])
+
+    @testtools.skipIf(asyncio is None, "asyncio is not available")
+    def test__run_scenario_rps_unlimited_concurrency(self):
+        config = {"times": 10, "rps": 100, "max_cpu_count": 1}
+        runner_obj = asynchronous.AsyncioScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(FakeAsyncScenario, "sleep", self.context,
+                                 {"delay": 0.05})
+
+        results = list(runner_obj.result_queue)
+        self.assertEqual(config["times"], len(results))
+        self.assertGreater(_max_in_flight(results), 1)
+
+    @testtools.skipIf(asyncio is None, "asyncio is not available")
+    def test__event_loop_worker_rps_waits_for_free_slot(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self.addCleanup(loop.close)
+        results = []
+        worker = asynchronous._EventLoopWorker(
+            loop, mock.Mock(put=results.append), iter(range(10)), 5, 1,
+            1000, 0, self.context, FakeAsyncScenario, "sleep",
+            {"delay": 0.02}, mock.Mock(**{"is_set.return_value": False}))
+
+        with mock.patch.object(worker, "_schedule",
+                               wraps=worker._schedule) as mock_schedule:
+            worker.run()
+
+        self.assertEqual(5, len(results))
+        # Scheduling isn't polled while the only slot is busy
+        self.assertGreaterEqual(12, mock_schedule.call_count)
+
+    @mock.patch(RUNNERS + "asynchronous.sys")
+    def test__import_asyncio_old_python(self, mock_sys):
+        mock_sys.version_info = (3, 5, 1)
+        self.assertRaises(exceptions.RallyException,
+                          asynchronous._import_asyncio)
+
+    @testtools.skipIf(asyncio is None, "asyncio is not available")
+    def test__run_scenario_synchronous(self):
+        config = {"times": 4, "concurrency": 2}
+        runner_obj = asynchronous.AsyncioScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(FakeAsyncScenario, "do_it", self.context,
+                                 {})
+
+        results = list(runner_obj.result_queue)
+        self.assertEqual(config["times"], len(results))
+        for result in results:
+            self.assertEqual([], result["error"])
+
+    @testtools.skipIf(asyncio is None, "asyncio is not available")
+    def test__run_scenario_exception(self):
+        config = {"times": 4, "concurrency": 2}
+        runner_obj = asynchronous.AsyncioScenarioRunner(self.task, config)
+
+        for method_name in ("fail", "something_went_wrong"):
+            runner_obj.result_queue.clear()
+            runner_obj._run_scenario(FakeAsyncScenario, method_name,
+                                     self.context, {})
+
+            results = list(runner_obj.result_queue)
+            self.assertEqual(config["times"], len(results))
+            for result in results:
+                self.assertIsNotNone(runner.ScenarioRunnerResult(result))
+                self.assertNotEqual([], result["error"])
+
+    @testtools.skipIf(asyncio is None, "asyncio is not available")
+    def test__run_scenario_timeout(self):
+        config = {"times": 2, "concurrency": 2, "timeout": 0.01}
+        runner_obj = asynchronous.AsyncioScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(FakeAsyncScenario, "sleep", self.context,
+                                 {"delay": 10})
+
+        results = list(runner_obj.result_queue)
+        self.assertEqual(config["times"], len(results))
+        for result in results:
+            self.assertEqual("TimeoutError", result["error"][0])
+            self.assertLess(result["duration"], 10)
+
+    @testtools.skipIf(asyncio is None, "asyncio is not available")
+    def test__run_scenario_aborted(self):
+        config = {"times": 20, "concurrency": 5}
+        runner_obj = asynchronous.AsyncioScenarioRunner(self.task, config)
+
+        runner_obj.abort()
+        runner_obj._run_scenario(FakeAsyncScenario, "sleep", self.context, {})
+
+        self.assertEqual(0, len(runner_obj.result_queue))
+
+    @mock.patch(RUNNERS + "asynchronous.multiprocessing.Queue")
+    @mock.patch(RUNNERS + "asynchronous.multiprocessing.cpu_count")
+    @mock.patch(RUNNERS + "asynchronous.AsyncioScenarioRunner._log_debug_info")
+    @mock.patch(RUNNERS +
+                "asynchronous.AsyncioScenarioRunner._create_process_pool")
+    @mock.patch(RUNNERS + "asynchronous.AsyncioScenarioRunner._join_processes")
+    def test_that_cpu_count_is_adjusted_properly(self, mock_join_processes,
+                                                 mock_create_pool, mock_log,
+                                                 mock_cpu_count, mock_queue):
+        mock_cpu_count.return_value = 4
+        config = {"times": 100, "concurrency": 10000, "rps": 1000,
+                  "max_cpu_count": 3}
+        runner_obj = asynchronous.AsyncioScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(FakeAsyncScenario, "sleep", self.context, {})
+
+        mock_log.assert_called_once_with(
+            times=100, concurrency=10000, rps=1000, timeout=0,
+            max_cpu_used=3, processes_to_start=3,
+            concurrency_per_worker=3333, concurrency_overhead=1,
+            rps_per_worker=1000.0 / 3)
+        args, kwargs = mock_create_pool.call_args
+        self.assertEqual(3, args[0])
+        self.assertEqual(asynchronous._worker_process, args[1])
+        concurrency = [next(args[2])[3] for i in range(3)]
+        self.assertEqual([3334, 3333, 3333], concurrency)
+        mock_join_processes.assert_called_once_with(mock_create_pool(),
+                                                    mock_queue())
+
+
+@testtools.skipIf(asyncio is None, "asyncio is not available")
+class LoopCleanupTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LoopCleanupTestCase, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def test__cleanup_loop(self):
+        calls = []
+
+        def close():
+            future = self.loop.create_future()
+            future.add_done_callback(lambda f: calls.append("close"))
+            self.loop.call_soon(future.set_result, None)
+            return future
+
+        def fail():
+            raise ValueError("fail")
+
+        asynchronous.add_loop_cleanup(self.loop, close)
+        asynchronous.add_loop_cleanup(self.loop, fail)
+        asynchronous.add_loop_cleanup(self.loop, lambda: calls.append("sync"))
+
+        asynchronous._cleanup_loop(self.loop)
+
+        self.assertEqual(["close", "sync"], calls)
+        self.assertNotIn(self.loop, asynchronous._LOOP_CLEANUPS)
+
+    @mock.patch(RUNNERS + "asynchronous._cleanup_loop")
+    @mock.patch(RUNNERS + "asynchronous._EventLoopWorker")
+    def test__worker_process_cleans_up_loop(self, mock__event_loop_worker,
+                                            mock__cleanup_loop):
+        mock__event_loop_worker.return_value.run.side_effect = ValueError
+        info = {"processes_to_start": 1, "processes_counter": 0}
+
+        self.assertRaises(ValueError, asynchronous._worker_process,
+                          mock.Mock(), iter(range(1)), 0, 1, None, 1, {},
+                          FakeAsyncScenario, "sleep", {}, mock.Mock(), info)
+
+        loop = mock__event_loop_worker.call_args[0][0]
+        mock__cleanup_loop.assert_called_once_with(loop)
+        self.assertTrue(loop.is_closed())
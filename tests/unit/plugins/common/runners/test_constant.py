@@ -48,15 +48,15 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                           self.config)
 
     @mock.patch(RUNNERS + "constant.time")
-    @mock.patch(RUNNERS + "constant.threading.Thread")
     @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
     @mock.patch(RUNNERS + "constant.runner")
-    def test__worker_process(self, mock_base, mock_queue, mock_thread,
-                             mock_time):
+    def test__worker_process(self, mock_base, mock_queue, mock_time):
 
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
+        def release_threads(pool, orphans):
+            pool.clear()
+
+        mock_base._release_threads.side_effect = release_threads
+        mock_thread_instance = mock_base._IterationThread.return_value
 
         mock_event = mock.MagicMock(
             is_set=mock.MagicMock(return_value=False))
@@ -73,31 +73,41 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                                  context, "Dummy", "dummy", (), mock_event,
                                  info)
 
-        self.assertEqual(times, mock_thread.call_count)
+        self.assertEqual(times, mock_base._IterationThread.call_count)
         self.assertEqual(times, mock_thread_instance.start.call_count)
-        self.assertEqual(times, mock_thread_instance.join.call_count)
+        self.assertEqual(times, mock_base._release_threads.call_count)
+        self.assertFalse(mock_time.sleep.called)
         self.assertEqual(times, mock_base._get_scenario_context.call_count)
+        mock_base._log_orphans.assert_called_once_with([])
 
         for i in range(times):
             scenario_context = mock_base._get_scenario_context(context)
-            call = mock.call(args=(mock_queue,
-                                   (i, "Dummy", "dummy",
-                                    scenario_context, ())),
-                             target=mock_base._worker_thread)
-            self.assertIn(call, mock_thread.mock_calls)
+            call = mock.call(mock_queue,
+                             (i, "Dummy", "dummy", scenario_context, ()), 1)
+            self.assertIn(call, mock_base._IterationThread.mock_calls)
 
-    @mock.patch(RUNNERS_BASE + "_run_scenario_once")
-    def test__worker_thread(self, mock_run_scenario_once):
-        mock_queue = mock.MagicMock()
+    @mock.patch(RUNNERS + "constant.time")
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_process_waits_for_slot(self, mock_base, mock_time):
+        released = []
 
-        args = ("some_args",)
+        def release_threads(pool, orphans):
+            # The first slot is released on the second check only
+            released.append(len(pool))
+            if len(released) > 1:
+                pool.popleft()
 
-        runner._worker_thread(mock_queue, args)
+        mock_base._release_threads.side_effect = release_threads
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+        info = {"processes_to_start": 1, "processes_counter": 1}
 
-        self.assertEqual(1, mock_queue.put.call_count)
+        constant._worker_process(mock.Mock(), iter(range(10)), 1, 1, 2,
+                                 {}, "Dummy", "dummy", (), mock_event, info)
 
-        expected_calls = [mock.call(("some_args",))]
-        self.assertEqual(expected_calls, mock_run_scenario_once.mock_calls)
+        self.assertEqual(2, mock_base._IterationThread.call_count)
+        self.assertEqual([1, 1, 1], released)
+        mock_time.sleep.assert_called_once_with(0.001)
 
     def test__run_scenario(self):
         runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
@@ -245,6 +255,25 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
                           runner.ScenarioRunner.validate,
                           self.config)
 
+    def test_validate_warmup(self):
+        self.config["warmup"] = {"duration": 10}
+        constant.ConstantForDurationScenarioRunner.validate(self.config)
+
+        self.config["warmup"] = {"duration": 10, "iterations": 5}
+        self.assertRaises(jsonschema.ValidationError,
+                          runner.ScenarioRunner.validate,
+                          self.config)
+
+    def test__get_warmup_config(self):
+        runner_obj = constant.ConstantForDurationScenarioRunner(
+            None, self.config)
+
+        config = runner_obj._get_warmup_config({"duration": 10})
+        self.assertEqual(dict(self.config, duration=10), config)
+
+        config = runner_obj._get_warmup_config({"iterations": 10})
+        self.assertEqual(runner.ScenarioRunner.UNLIMITED, config["duration"])
+
     def test_run_scenario_constantly_for_duration(self):
         runner_obj = constant.ConstantForDurationScenarioRunner(
             None, self.config)
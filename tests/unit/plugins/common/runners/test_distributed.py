@@ -0,0 +1,286 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import jsonschema
+import mock
+from oslo_config import fixture
+
+from rally.benchmark import runner
+from rally import exceptions
+from rally.plugins.common.runners import distributed
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.common.runners."
+
+
+def get_result(duration):
+    return {"duration": duration, "idle_duration": 0, "timestamp": 1,
+            "error": [], "scenario_output": {"errors": "", "data": {}},
+            "atomic_actions": {}}
+
+
+class FakeConnection(object):
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.sent = []
+        self.closed = False
+
+    def poll(self, timeout=None):
+        return True
+
+    def recv(self):
+        if not self.messages:
+            raise EOFError("Connection reset")
+        return self.messages.pop(0)
+
+    def send(self, obj):
+        self.sent.append(obj)
+
+    def close(self):
+        self.closed = True
+
+
+class HungConnection(FakeConnection):
+
+    def __init__(self):
+        super(HungConnection, self).__init__([])
+
+    def poll(self, timeout=None):
+        return False
+
+
+class DistributedScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DistributedScenarioRunnerTestCase, self).setUp()
+        self.conf = self.useFixture(fixture.Config()).conf
+        self.conf.set_override("worker_authkey", "secret", "benchmark")
+        self.config = {"type": "distributed",
+                       "runner": {"type": "constant", "times": 4,
+                                  "concurrency": 2}}
+        self.context = fakes.FakeUserContext({"task":
+                                             {"uuid": "uuid"}}).context
+        self.task = {"uuid": "uuid"}
+
+    def test_validate(self):
+        runner.ScenarioRunner.validate(self.config)
+
+        for config in ({"type": "serial", "times": 2},
+                       {"type": "constant_for_duration", "duration": 10},
+                       {"type": "rps", "rps": 5, "warmup": {"duration": 1}}):
+            self.config["runner"] = config
+            runner.ScenarioRunner.validate(self.config)
+
+    def test_validate_failed(self):
+        for config in ({"type": "distributed"},
+                       dict(self.config, workers=0),
+                       dict(self.config, runner={"type": "distributed"}),
+                       dict(self.config, runner={"type": "auto_rps",
+                                                 "start_rps": 1}),
+                       dict(self.config, runner={"type": "constant",
+                                                 "rps": 1}),
+                       dict(self.config, runner={"times": 2})):
+            self.assertRaises(jsonschema.ValidationError,
+                              runner.ScenarioRunner.validate, config)
+
+    @mock.patch(RUNNERS + "distributed.distributed.get_active_workers",
+                return_value=["a:1", "b:1", "c:1"])
+    def test__get_workers(self, mock_get_active_workers):
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+        self.assertEqual(["a:1", "b:1", "c:1"], runner_obj._get_workers())
+
+        runner_obj.config["workers"] = 2
+        self.assertEqual(["a:1", "b:1"], runner_obj._get_workers())
+
+        runner_obj.config["workers"] = 4
+        self.assertRaises(exceptions.WorkersNotAvailable,
+                          runner_obj._get_workers)
+
+    @mock.patch(RUNNERS + "distributed.distributed.get_active_workers",
+                return_value=[])
+    def test__get_workers_not_available(self, mock_get_active_workers):
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+
+        self.assertRaises(exceptions.WorkersNotAvailable,
+                          runner_obj._get_workers)
+
+    @mock.patch(RUNNERS + "distributed.distributed.connect")
+    @mock.patch(RUNNERS + "distributed.distributed.get_active_workers",
+                return_value=["a:1", "b:1", "c:1"])
+    def test__run_scenario(self, mock_get_active_workers, mock_connect):
+        connections = {
+            "a:1": FakeConnection([("warmup", get_result(0)),
+                                   ("result", get_result(1)),
+                                   ("result", get_result(2)),
+                                   ("done", None)]),
+            "b:1": FakeConnection([("result", get_result(3)),
+                                   ("error", ["KeyError", "x", "trace"])]),
+            "c:1": FakeConnection([("result", get_result(4))])}
+        mock_connect.side_effect = lambda hostname: connections[hostname]
+        self.config["runner"]["concurrency"] = 3
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it",
+                                 self.context, {"a": 1})
+
+        self.assertEqual([1, 2, 3, 4],
+                         sorted(r["duration"] for r in
+                                runner_obj.result_queue))
+        self.assertEqual([0], [r["duration"] for r in
+                               runner_obj.warmup_queue])
+        self.assertEqual(
+            {"workers": [
+                {"hostname": "a:1", "iterations": 2, "status": "finished"},
+                {"hostname": "b:1", "iterations": 1, "status": "failed",
+                 "error": ["KeyError", "x", "trace"]},
+                {"hostname": "c:1", "iterations": 1, "status": "lost",
+                 "error": "Connection reset"}]},
+            runner_obj.stats)
+        jobs = [connections[h].sent[0] for h in ("a:1", "b:1", "c:1")]
+        self.assertEqual([2, 1, 1], [job["config"]["times"] for job in jobs])
+        self.assertEqual([1, 1, 1],
+                         [job["config"]["concurrency"] for job in jobs])
+        for job in jobs:
+            self.assertEqual("FakeScenario.do_it", job["name"])
+            self.assertEqual({"uuid": "uuid"}, job["context"]["task"])
+            self.assertEqual({"a": 1}, job["args"])
+        self.assertTrue(all(c.closed for c in connections.values()))
+
+    @mock.patch(RUNNERS + "distributed.distributed.connect")
+    @mock.patch(RUNNERS + "distributed.distributed.get_active_workers")
+    def test__run_scenario_heartbeat_lost(self, mock_get_active_workers,
+                                          mock_connect):
+        self.conf.set_override("worker_heartbeat_interval", 0, "benchmark")
+        mock_get_active_workers.side_effect = [["a:1", "b:1"], ["a:1"], []]
+        connections = {"a:1": HungConnection(), "b:1": HungConnection()}
+        mock_connect.side_effect = lambda hostname: connections[hostname]
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it",
+                                 self.context, {})
+
+        self.assertEqual(3, mock_get_active_workers.call_count)
+        self.assertEqual(
+            {"workers": [
+                {"hostname": "a:1", "iterations": 0, "status": "lost",
+                 "error": "Worker didn't send heartbeat for 30 seconds"},
+                {"hostname": "b:1", "iterations": 0, "status": "lost",
+                 "error": "Worker didn't send heartbeat for 30 seconds"}]},
+            runner_obj.stats)
+        self.assertTrue(all(c.closed for c in connections.values()))
+
+    def test__get_runner_config(self):
+        for config, expected in (
+                ({"type": "constant"},
+                 {"type": "constant", "times": 1, "concurrency": 1}),
+                ({"type": "constant", "times": 5},
+                 {"type": "constant", "times": 5, "concurrency": 1}),
+                ({"type": "serial"}, {"type": "serial", "times": 1}),
+                ({"type": "constant_for_duration", "duration": 5},
+                 {"type": "constant_for_duration", "duration": 5,
+                  "concurrency": 1}),
+                ({"type": "rps", "rps": 2, "times": 10},
+                 {"type": "rps", "rps": 2, "times": 10})):
+            runner_obj = distributed.DistributedScenarioRunner(
+                self.task, {"type": "distributed", "runner": config})
+            self.assertEqual(expected, runner_obj._get_runner_config())
+
+    @mock.patch(RUNNERS + "distributed.distributed.get_active_workers",
+                return_value=["a:1"])
+    def test__mark_lost_workers(self, mock_get_active_workers):
+        stats = {"a:1": {"hostname": "a:1", "status": "running"},
+                 "b:1": {"hostname": "b:1", "status": "running"},
+                 "c:1": {"hostname": "c:1", "status": "finished"}}
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+
+        self.assertEqual(1, runner_obj._mark_lost_workers(stats))
+        self.assertEqual(
+            {"a:1": {"hostname": "a:1", "status": "running"},
+             "b:1": {"hostname": "b:1", "status": "lost",
+                     "error": "Worker didn't send heartbeat for 30 seconds"},
+             "c:1": {"hostname": "c:1", "status": "finished"}},
+            stats)
+
+    @mock.patch(RUNNERS + "distributed.distributed.connect")
+    @mock.patch(RUNNERS + "distributed.distributed.get_active_workers",
+                return_value=["a:1", "b:1"])
+    def test__run_scenario_aborted(self, mock_get_active_workers,
+                                   mock_connect):
+        conn = FakeConnection([("done", None)])
+        mock_connect.return_value = conn
+        runner_obj = distributed.DistributedScenarioRunner(
+            self.task, dict(self.config, workers=1))
+
+        runner_obj.abort()
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it",
+                                 self.context, {})
+
+        mock_connect.assert_called_once_with("a:1")
+        self.assertEqual("abort", conn.sent[1])
+
+    @mock.patch(RUNNERS + "distributed.distributed.connect")
+    @mock.patch(RUNNERS + "distributed.distributed.get_active_workers",
+                return_value=["a:1"])
+    def test__run_scenario_hard_aborted(self, mock_get_active_workers,
+                                        mock_connect):
+        conn = FakeConnection([("done", None)])
+        mock_connect.return_value = conn
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+
+        runner_obj.abort()
+        runner_obj.abort(hard=True)
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it",
+                                 self.context, {})
+
+        self.assertEqual(["hard_abort"], conn.sent[1:])
+
+    @mock.patch(RUNNERS + "distributed.distributed.connect")
+    @mock.patch(RUNNERS + "distributed.distributed.get_active_workers",
+                return_value=["a:1", "b:1"])
+    def test__run_scenario_connection_failed(self, mock_get_active_workers,
+                                             mock_connect):
+        conn = FakeConnection([])
+        mock_connect.side_effect = [conn, IOError("Connection refused")]
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+
+        self.assertRaises(IOError, runner_obj._run_scenario,
+                          fakes.FakeScenario, "do_it", self.context, {})
+        self.assertTrue(conn.closed)
+        self.assertEqual([], conn.sent)
+
+    @mock.patch(RUNNERS + "distributed.distributed.connect")
+    @mock.patch(RUNNERS + "distributed.distributed.get_active_workers",
+                return_value=["a:1"])
+    def test__run_scenario_authkey_not_set(self, mock_get_active_workers,
+                                           mock_connect):
+        self.conf.clear_override("worker_authkey", "benchmark")
+        runner_obj = distributed.DistributedScenarioRunner(self.task,
+                                                           self.config)
+
+        self.assertRaises(exceptions.WorkerAuthKeyNotSet,
+                          runner_obj._run_scenario,
+                          fakes.FakeScenario, "do_it", self.context, {})
+        self.assertFalse(mock_get_active_workers.called)
+        self.assertFalse(mock_connect.called)
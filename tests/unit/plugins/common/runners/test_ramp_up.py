@@ -0,0 +1,200 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import jsonschema
+import mock
+from six import moves
+
+from rally.benchmark import runner
+from rally.common import utils
+from rally.plugins.common.runners import ramp_up
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.common.runners."
+
+
+class ScheduleTestCase(test.TestCase):
+
+    def test_stepped(self):
+        schedule = ramp_up.Schedule(10, 35, 10, 60)
+
+        self.assertEqual(240, schedule.duration)
+        self.assertEqual([10, 10, 20, 30, 35, 35, None],
+                         [schedule.concurrency(t)
+                          for t in (0, 59.9, 60, 179, 180, 239.9, 240)])
+
+    def test_linear(self):
+        schedule = ramp_up.Schedule(10, 30, 10, 60, linear=True)
+
+        self.assertEqual(180, schedule.duration)
+        self.assertEqual([10, 10, 11, 15, 20, 29, 30, 30, None],
+                         [schedule.concurrency(t)
+                          for t in (0, 5.9, 6, 30, 60, 119.9, 120, 179.9,
+                                    180)])
+
+    def test_constant(self):
+        schedule = ramp_up.Schedule(5, 5, 1, 10)
+
+        self.assertEqual(10, schedule.duration)
+        self.assertEqual([5, 5, None],
+                         [schedule.concurrency(t) for t in (0, 9.9, 10)])
+
+
+class RampUpScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(RampUpScenarioRunnerTestCase, self).setUp()
+        self.config = {"type": "ramp_up", "start_concurrency": 1,
+                       "end_concurrency": 2, "step": 1,
+                       "step_duration": 0.05, "max_cpu_count": 2}
+        self.context = fakes.FakeUserContext({"task":
+                                             {"uuid": "uuid"}}).context
+        self.args = {"a": 1}
+        self.task = mock.MagicMock()
+
+    def test_validate(self):
+        ramp_up.RampUpScenarioRunner.validate(self.config)
+
+        self.config["schedule"] = "linear"
+        ramp_up.RampUpScenarioRunner.validate(self.config)
+
+    def test_validate_failed(self):
+        for config in (dict(self.config, schedule="exponential"),
+                       dict(self.config, step_duration=0),
+                       dict(self.config, concurrency=2)):
+            self.assertRaises(jsonschema.ValidationError,
+                              runner.ScenarioRunner.validate, config)
+
+        del self.config["end_concurrency"]
+        self.assertRaises(jsonschema.ValidationError,
+                          runner.ScenarioRunner.validate, self.config)
+
+    def test__get_schedule(self):
+        runner_obj = ramp_up.RampUpScenarioRunner(
+            self.task, {"end_concurrency": 5, "step_duration": 10,
+                        "schedule": "linear"})
+
+        schedule = runner_obj._get_schedule()
+
+        self.assertEqual((1, 5, 1, 10, True),
+                         (schedule.start, schedule.end, schedule.step,
+                          schedule.step_duration, schedule.linear))
+
+    def test__get_warmup_config(self):
+        runner_obj = ramp_up.RampUpScenarioRunner(self.task, self.config)
+
+        config = runner_obj._get_warmup_config({"iterations": 10})
+        runner_obj.config = config
+        schedule = runner_obj._get_schedule()
+
+        self.assertEqual(1, schedule.concurrency(0))
+        self.assertEqual(1, schedule.concurrency(10 ** 6))
+
+    @mock.patch(RUNNERS + "ramp_up.time.sleep")
+    @mock.patch(RUNNERS + "ramp_up.runner._run_scenario_once")
+    def test__worker_process(self, mock_run_scenario_once, mock_sleep):
+        # Iterations are in flight till the end of the load
+        load_over = threading.Event()
+
+        def run_scenario_once(args):
+            load_over.wait(5)
+            return {"iteration": args[0]}
+
+        levels = iter([1, 3, 5, None])
+
+        def concurrency(elapsed):
+            level = next(levels)
+            if level is None:
+                load_over.set()
+            return level
+
+        mock_run_scenario_once.side_effect = run_scenario_once
+        schedule = mock.Mock(start=1, end=5, step=2, step_duration=1,
+                             linear=False)
+        schedule.concurrency.side_effect = concurrency
+        queue = moves.queue.Queue()
+        aborted = mock.Mock()
+        aborted.is_set.return_value = False
+
+        ramp_up._worker_process(queue, iter(range(10)), schedule, 0,
+                                self.context, "Dummy", "dummy", (), aborted,
+                                {"processes_to_start": 2,
+                                 "processes_counter": 0})
+
+        results = sorted([queue.get_nowait() for i in range(queue.qsize())],
+                         key=lambda r: r["iteration"])
+        # Process 0 of 2 keeps 1, 2 and 3 iterations of 1, 3 and 5 in flight
+        self.assertEqual(3, mock_run_scenario_once.call_count)
+        self.assertEqual([1, 3, 5], [r["concurrency"] for r in results])
+
+    def test__worker_process_aborted(self):
+        schedule = mock.Mock()
+        aborted = mock.Mock()
+        aborted.is_set.return_value = True
+
+        ramp_up._worker_process(mock.Mock(), iter(range(10)), schedule, 0,
+                                self.context, "Dummy", "dummy", (), aborted,
+                                {"processes_to_start": 1,
+                                 "processes_counter": 0})
+
+        self.assertFalse(schedule.concurrency.called)
+
+    def test__run_scenario(self):
+        runner_obj = ramp_up.RampUpScenarioRunner(self.task, self.config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it",
+                                 self.context, self.args)
+
+        self.assertTrue(runner_obj.result_queue)
+        for result in runner_obj.result_queue:
+            self.assertIn(result["concurrency"], (1, 2))
+            self.assertIsNotNone(runner.ScenarioRunnerResult(result))
+
+    def test__run_scenario_aborted(self):
+        runner_obj = ramp_up.RampUpScenarioRunner(self.task, self.config)
+
+        runner_obj.abort()
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it",
+                                 self.context, self.args)
+
+        self.assertEqual(0, len(runner_obj.result_queue))
+
+    @mock.patch(RUNNERS + "ramp_up.multiprocessing.cpu_count",
+                return_value=8)
+    @mock.patch(RUNNERS + "ramp_up.RampUpScenarioRunner._join_processes")
+    @mock.patch(RUNNERS + "ramp_up.RampUpScenarioRunner._create_process_pool")
+    def test__run_scenario_processes(self, mock_create_process_pool,
+                                     mock_join_processes, mock_cpu_count):
+        for config, processes in (({"end_concurrency": 3}, 3),
+                                  ({"end_concurrency": 100}, 8),
+                                  ({"end_concurrency": 100,
+                                    "max_cpu_count": 2}, 2)):
+            mock_create_process_pool.reset_mock()
+            config["step_duration"] = 1
+            runner_obj = ramp_up.RampUpScenarioRunner(self.task, config)
+
+            runner_obj._run_scenario(fakes.FakeScenario, "do_it",
+                                     self.context, self.args)
+
+            mock_create_process_pool.assert_called_once_with(
+                processes, ramp_up._worker_process, mock.ANY)
+            args_gen = mock_create_process_pool.call_args[0][2]
+            args = next(args_gen)
+            self.assertIsInstance(args[1], utils.RAMInt)
+            self.assertEqual(config["end_concurrency"], args[2].end)
@@ -17,7 +17,9 @@ import jsonschema
 import mock
 
 from rally.benchmark import runner
+from rally import exceptions
 from rally.plugins.common.runners import rps
+from rally.plugins.common.sla import failure_rate
 from tests.unit import fakes
 from tests.unit import test
 
@@ -65,11 +67,10 @@ class RPSScenarioRunnerTestCase(test.TestCase):
 
     @mock.patch(RUNNERS + "rps.LOG")
     @mock.patch(RUNNERS + "rps.time")
-    @mock.patch(RUNNERS + "rps.threading.Thread")
     @mock.patch(RUNNERS + "rps.multiprocessing.Queue")
     @mock.patch(RUNNERS + "rps.runner")
-    def test__worker_process(self, mock_base, mock_queue, mock_thread,
-                             mock_time, mock_log):
+    def test__worker_process(self, mock_base, mock_queue, mock_time,
+                             mock_log):
 
         def time_side():
             time_side.last += 0.03
@@ -80,9 +81,11 @@ class RPSScenarioRunnerTestCase(test.TestCase):
 
         mock_time.time = time_side
 
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
+        def release_threads(pool, orphans):
+            pool.clear()
+
+        mock_base._release_threads.side_effect = release_threads
+        mock_thread_instance = mock_base._IterationThread.return_value
 
         mock_event = mock.MagicMock(
             is_set=mock.MagicMock(return_value=False))
@@ -101,34 +104,20 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                             (), mock_event, info)
 
         self.assertEqual(times, mock_log.debug.call_count)
-        self.assertEqual(times, mock_thread.call_count)
+        self.assertEqual(times, mock_base._IterationThread.call_count)
         self.assertEqual(times, mock_thread_instance.start.call_count)
         self.assertEqual(times, mock_thread_instance.join.call_count)
+        self.assertEqual(times, mock_base._release_threads.call_count)
         self.assertEqual(times - 1, mock_time.sleep.call_count)
-        self.assertEqual(times, mock_thread_instance.isAlive.call_count)
         self.assertEqual(times * 4 - 1, mock_time.time.count)
         self.assertEqual(times, mock_base._get_scenario_context.call_count)
+        mock_base._log_orphans.assert_called_once_with([])
 
         for i in range(times):
             scenario_context = mock_base._get_scenario_context(context)
-            call = mock.call(args=(mock_queue,
-                                   (i, "Dummy", "dummy",
-                                    scenario_context, ())),
-                             target=mock_base._worker_thread)
-            self.assertIn(call, mock_thread.mock_calls)
-
-    @mock.patch(RUNNERS + "rps.runner._run_scenario_once")
-    def test__worker_thread(self, mock_run_scenario_once):
-        mock_queue = mock.MagicMock()
-
-        args = ("some_args",)
-
-        runner._worker_thread(mock_queue, args)
-
-        self.assertEqual(1, mock_queue.put.call_count)
-
-        expected_calls = [mock.call(("some_args",))]
-        self.assertEqual(expected_calls, mock_run_scenario_once.mock_calls)
+            call = mock.call(mock_queue,
+                             (i, "Dummy", "dummy", scenario_context, ()), 1)
+            self.assertIn(call, mock_base._IterationThread.mock_calls)
 
     @mock.patch(RUNNERS + "rps.time.sleep")
     def test__run_scenario(self, mock_sleep):
@@ -292,3 +281,164 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         self.assertFalse(runner_obj.aborted.is_set())
         runner_obj.abort()
         self.assertTrue(runner_obj.aborted.is_set())
+
+
+class AutoRPSScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AutoRPSScenarioRunnerTestCase, self).setUp()
+        self.task = mock.MagicMock()
+        self.config = {"type": "auto_rps", "start_rps": 1}
+
+    def get_result(self, error=False):
+        return {"duration": 1.0, "idle_duration": 0, "atomic_actions": {},
+                "scenario_output": {"data": {}, "errors": ""},
+                "error": ["Error", "msg", "trace"] if error else []}
+
+    def test_validate(self):
+        self.config.update({"max_rps": 100, "probe_duration": 10,
+                            "precision": 0.05, "max_probes": 20,
+                            "times": 1000, "timeout": 10,
+                            "max_concurrency": 10, "max_cpu_count": 2,
+                            "warmup": {"iterations": 10}})
+        rps.AutoRPSScenarioRunner.validate(self.config)
+
+    def test_validate_failed(self):
+        for config in ({"type": "auto_rps"},
+                       dict(self.config, rps=10),
+                       dict(self.config, start_rps=0)):
+            self.assertRaises(jsonschema.ValidationError,
+                              rps.AutoRPSScenarioRunner.validate, config)
+
+    def test_validate_sla(self):
+        rps.AutoRPSScenarioRunner.validate(self.config,
+                                           {"failure_rate": {"max": 0}})
+        self.assertRaises(exceptions.InvalidTaskException,
+                          rps.AutoRPSScenarioRunner.validate, self.config, {})
+
+    def _find_capacity(self, capacity, **config):
+        self.config.update(config)
+        runner_obj = rps.AutoRPSScenarioRunner(self.task, self.config)
+        probes = []
+
+        def probe(rate):
+            probes.append(rate)
+            return rate <= capacity
+
+        return runner_obj._find_capacity(probe), probes
+
+    def test__find_capacity(self):
+        self.assertEqual((7, [1, 2, 4, 8, 6.0, 7.0, 7.5]),
+                         self._find_capacity(7.3))
+
+    def test__find_capacity_start_failed(self):
+        self.assertEqual((3.0, [8, 4.0, 2.0, 3.0, 3.5, 3.25]),
+                         self._find_capacity(3.1, start_rps=8))
+
+    def test__find_capacity_max_rps(self):
+        self.assertEqual((5, [1, 2, 4, 5]),
+                         self._find_capacity(100, max_rps=5))
+        self.assertEqual((2, [2]),
+                         self._find_capacity(100, start_rps=3, max_rps=2))
+
+    def test__find_capacity_max_probes(self):
+        self.assertEqual((4, [1, 2, 4]),
+                         self._find_capacity(100, max_probes=3))
+
+    def test__find_capacity_not_found(self):
+        self.assertEqual((None, [1, 0.5, 0.25]),
+                         self._find_capacity(0.1, max_probes=3))
+
+    def test__find_capacity_aborted(self):
+        runner_obj = rps.AutoRPSScenarioRunner(self.task, self.config)
+        runner_obj.abort()
+        probe = mock.Mock()
+
+        self.assertIsNone(runner_obj._find_capacity(probe))
+        self.assertFalse(probe.called)
+
+    @mock.patch(RUNNERS + "rps.RPSScenarioRunner._run_scenario",
+                autospec=True)
+    def test__run_scenario(self, mock_run_scenario):
+        self.config.update({"probe_duration": 2, "max_probes": 4})
+        runner_obj = rps.AutoRPSScenarioRunner(self.task, self.config)
+        runner_obj.sla_config = {failure_rate.FailureRate.get_name():
+                                 {"max": 0}}
+        configs = []
+
+        def run_scenario(self_, cls, method_name, context, args):
+            configs.append(self_.config)
+            for i in range(self_.config["times"]):
+                self_._send_result(
+                    self.get_result(error=self_.config["rps"] > 3))
+
+        mock_run_scenario.side_effect = run_scenario
+        runner_obj._run_scenario("cls", "method", {}, {})
+
+        self.assertEqual([(1, 2), (2, 4), (4, 8), (3.0, 6), (3.0, 6)],
+                         [(c["rps"], c["times"]) for c in configs])
+        self.assertEqual(3.0, runner_obj.stats["capacity"])
+        probes = runner_obj.stats["probes"]
+        self.assertEqual([1, 2, 4, 3.0], [p["rps"] for p in probes])
+        self.assertEqual([True, True, False, True],
+                         [p["success"] for p in probes])
+        self.assertEqual([0, 0, 8, 0], [p["errors"] for p in probes])
+        self.assertEqual([2, 4, 8, 6], [p["iterations"] for p in probes])
+        self.assertFalse(probes[2]["sla"][0]["success"])
+        # Only iterations of the load at the capacity are results
+        self.assertEqual(6, len(runner_obj.result_queue))
+        self.assertEqual(self.config, runner_obj.config)
+
+    @mock.patch(RUNNERS + "rps.RPSScenarioRunner._run_scenario",
+                autospec=True)
+    def test__run_scenario_times(self, mock_run_scenario):
+        self.config.update({"times": 10, "max_rps": 1})
+        runner_obj = rps.AutoRPSScenarioRunner(self.task, self.config)
+        configs = []
+
+        def run_scenario(self_, cls, method_name, context, args):
+            configs.append(self_.config)
+            self_._send_result(self.get_result())
+
+        mock_run_scenario.side_effect = run_scenario
+        runner_obj._run_scenario("cls", "method", {}, {})
+
+        # Probe of the default duration and the load of specified times
+        self.assertEqual([dict(self.config, rps=1, times=60),
+                          dict(self.config, rps=1, times=10)], configs)
+        self.assertEqual(1, runner_obj.stats["capacity"])
+
+    @mock.patch(RUNNERS + "rps.RPSScenarioRunner._run_scenario",
+                autospec=True)
+    def test__run_scenario_not_found(self, mock_run_scenario):
+        self.config.update({"max_probes": 1})
+        runner_obj = rps.AutoRPSScenarioRunner(self.task, self.config)
+        runner_obj.sla_config = {failure_rate.FailureRate.get_name():
+                                 {"max": 0}}
+
+        def run_scenario(self_, cls, method_name, context, args):
+            self_._send_result(self.get_result(error=True))
+
+        mock_run_scenario.side_effect = run_scenario
+        runner_obj._run_scenario("cls", "method", {}, {})
+
+        self.assertEqual(1, mock_run_scenario.call_count)
+        self.assertIsNone(runner_obj.stats["capacity"])
+        self.assertEqual(0, len(runner_obj.result_queue))
+
+    @mock.patch(RUNNERS + "rps.RPSScenarioRunner._run_scenario",
+                autospec=True)
+    def test__run_scenario_warmup(self, mock_run_scenario):
+        self.config["warmup"] = {"iterations": 2}
+        runner_obj = rps.AutoRPSScenarioRunner(self.task, self.config)
+        runner_obj._warmup = self.config["warmup"]
+        runner_obj.config = runner_obj._get_warmup_config(
+            self.config["warmup"])
+
+        runner_obj._run_scenario("cls", "method", {}, {})
+
+        mock_run_scenario.assert_called_once_with(runner_obj, "cls",
+                                                  "method", {}, {})
+        self.assertEqual(1, runner_obj.config["rps"])
+        self.assertEqual(2, runner_obj.config["times"])
+        self.assertEqual({}, runner_obj.stats)
@@ -36,3 +36,36 @@ class RequestsTestCase(test.TestCase):
                                       requests=[{"url": "sample_url"}])
         mock_random_choice.assert_called_once_with([{"url": "sample_url"}])
         mock_check.assert_called_once_with(status_code=200, url="sample_url")
+
+
+class SessionRequestsTestCase(test.TestCase):
+
+    @mock.patch("%s.requests.utils.SessionRequestScenario"
+                "._session_request" % SCN)
+    def test_check_request(self, mock_request):
+        scenario = http_requests.HttpSessionRequests()
+        scenario.check_request("sample_url", "GET", 200, timeout=1)
+        mock_request.assert_called_once_with("sample_url", "GET", 200,
+                                             timeout=1)
+
+    @mock.patch("%s.requests.utils.SessionRequestScenario"
+                "._run_pipeline" % SCN)
+    def test_check_pipeline(self, mock_run_pipeline):
+        scenario = http_requests.HttpSessionRequests()
+        scenario.check_pipeline([{"url": "sample_url"}],
+                                variables={"a": 1})
+        mock_run_pipeline.assert_called_once_with(
+            [{"url": "sample_url"}], status_code=200, variables={"a": 1})
+
+
+class AsyncRequestsTestCase(test.TestCase):
+
+    @mock.patch("%s.requests.utils.AsyncRequestScenario"
+                "._check_request_async" % SCN)
+    def test_check_request(self, mock_check):
+        scenario = http_requests.AsyncHttpRequests()
+        result = scenario.check_request("sample_url", "GET", 200,
+                                        allow_redirects=False)
+        self.assertEqual(mock_check.return_value, result)
+        mock_check.assert_called_once_with("sample_url", "GET", 200,
+                                           allow_redirects=False)
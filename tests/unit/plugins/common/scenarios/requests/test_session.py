@@ -0,0 +1,104 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+from six.moves import BaseHTTPServer
+
+from rally.plugins.common.scenarios.requests import session
+from tests.unit import test
+
+
+SESSION = "rally.plugins.common.scenarios.requests.session"
+
+
+class FakeHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Don't wait for next requests of kept alive connection forever
+    timeout = 5
+    connections = 0
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        FakeHandler.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+class SessionTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SessionTestCase, self).setUp()
+        patcher = mock.patch.dict(session._session, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _start_server(self):
+        FakeHandler.connections = 0
+        server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), FakeHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        # Close kept alive connections, so server is able to stop
+        self.addCleanup(session.get_session().close)
+        return "http://localhost:%d/" % server.server_port
+
+    def test_get_session(self):
+        s = session.get_session()
+        self.assertIs(s, session.get_session())
+        self.assertIsInstance(s.get_adapter("http://localhost"),
+                              session.TimedHTTPAdapter)
+        self.assertIsInstance(s.get_adapter("https://localhost"),
+                              session.TimedHTTPAdapter)
+
+    @mock.patch(SESSION + ".os.getpid")
+    def test_get_session_in_forked_process(self, mock_getpid):
+        mock_getpid.return_value = 1
+        parent = session.get_session()
+        mock_getpid.return_value = 2
+        child = session.get_session()
+        self.assertIsNot(parent, child)
+        self.assertEqual({2: child}, session._session)
+
+    def test_connection_timings(self):
+        url = self._start_server()
+        s = session.get_session()
+
+        with session.connection_timings() as timings:
+            self.assertEqual(200, s.get(url).status_code)
+        self.assertGreater(timings["dns"], 0)
+        self.assertGreater(timings["connect"], 0)
+        self.assertEqual(0, timings["tls"])
+
+        # Connection is kept alive
+        with session.connection_timings() as timings:
+            self.assertEqual(200, s.get(url).status_code)
+        self.assertEqual({"dns": 0, "connect": 0, "tls": 0}, timings)
+        self.assertEqual(1, FakeHandler.connections)
+
+    def test_requests_without_timings(self):
+        url = self._start_server()
+        self.assertEqual(200, session.get_session().get(url).status_code)
+        self.assertIsNone(getattr(session._local, "timings", None))
@@ -12,10 +12,16 @@
 
 
 import mock
+import testtools
 
 from rally.plugins.common.scenarios.requests import utils
 from tests.unit import test
 
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
 
 class RequestsTestCase(test.TestCase):
 
@@ -36,3 +42,161 @@ class RequestsTestCase(test.TestCase):
 
         self.assertRaises(ValueError, scenario._check_request,
                           status_code=201, url="sample", method="GET")
+
+
+class SessionRequestsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SessionRequestsTestCase, self).setUp()
+        patcher = mock.patch("rally.plugins.common.scenarios.requests.utils"
+                             ".session.get_session")
+        self.mock_get_session = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_request = self.mock_get_session.return_value.request
+
+    def _response(self, status_code=200, json=None):
+        return mock.MagicMock(status_code=status_code,
+                              json=mock.MagicMock(return_value=json))
+
+    def test__session_request(self):
+        self.mock_request.return_value = self._response()
+        scenario = utils.SessionRequestScenario()
+
+        resp = scenario._session_request("sample", "GET", 200, timeout=1)
+
+        self.assertEqual(self.mock_request.return_value, resp)
+        self.mock_request.assert_called_once_with("GET", "sample",
+                                                  stream=True, timeout=1)
+        self.assertEqual(["requests.dns", "requests.connect", "requests.tls",
+                          "requests.ttfb", "requests.transfer"],
+                         list(scenario.atomic_actions()))
+
+    def test__session_request_wrong_status(self):
+        self.mock_request.return_value = self._response(status_code=500)
+        scenario = utils.SessionRequestScenario()
+
+        self.assertRaises(ValueError, scenario._session_request,
+                          "sample", "GET", 200)
+        # Status isn't checked
+        scenario._session_request("sample", "GET", name="other")
+        self.assertIn("other.ttfb", scenario.atomic_actions())
+
+    def test__run_pipeline(self):
+        self.mock_request.side_effect = [
+            self._response(status_code=201,
+                           json={"server": {"id": "id1"},
+                                 "ports": [{"id": "p1"}]}),
+            self._response()]
+        scenario = utils.SessionRequestScenario(context={"iteration": 3})
+
+        scenario._run_pipeline(
+            [{"url": "http://{host}/{iteration}", "method": "POST",
+              "status_code": 201, "name": "create",
+              "extract": {"server": "server.id", "port": "ports.0.id"}},
+             {"url": "http://{host}/{server}/{port}", "json": {"a": 1}}],
+            status_code=200, variables={"host": "localhost"})
+
+        self.assertEqual(
+            [mock.call("POST", "http://localhost/3", stream=True),
+             mock.call("GET", "http://localhost/id1/p1", json={"a": 1},
+                       stream=True)],
+            self.mock_request.mock_calls)
+        self.assertIn("create.ttfb", scenario.atomic_actions())
+        self.assertIn("requests.1.ttfb", scenario.atomic_actions())
+
+    def test__run_pipeline_undefined_variable(self):
+        scenario = utils.SessionRequestScenario(context={})
+        self.assertRaises(ValueError, scenario._run_pipeline,
+                          [{"url": "http://{host}/"}])
+        self.assertFalse(self.mock_request.called)
+
+
+class GetSessionTestCase(test.TestCase):
+
+    @mock.patch("rally.plugins.common.scenarios.requests.utils.asynchronous"
+                ".add_loop_cleanup")
+    def test__get_session(self, mock_add_loop_cleanup):
+        mock_aiohttp = mock.MagicMock()
+        loop = mock.MagicMock()
+
+        with mock.patch.dict("sys.modules", {"aiohttp": mock_aiohttp}):
+            session = utils._get_session(loop)
+            self.assertEqual(session, utils._get_session(loop))
+
+        self.assertEqual(mock_aiohttp.ClientSession.return_value, session)
+        mock_aiohttp.ClientSession.assert_called_once_with(
+            connector=mock_aiohttp.TCPConnector.return_value)
+        mock_aiohttp.TCPConnector.assert_called_once_with(limit=0)
+        mock_add_loop_cleanup.assert_called_once_with(loop, mock.ANY)
+
+        cleanup = mock_add_loop_cleanup.call_args[0][1]
+        self.assertEqual(session.close.return_value, cleanup())
+        session.close.assert_called_once_with()
+        self.assertNotIn(loop, utils._SESSIONS)
+
+
+@testtools.skipIf(asyncio is None, "asyncio is not available")
+class AsyncRequestsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AsyncRequestsTestCase, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+        self.addCleanup(asyncio.set_event_loop, None)
+
+    def _mock_session(self, mock_get_session, status=None, exception=None):
+        response = self.loop.create_future()
+        if exception:
+            response.set_exception(exception)
+        else:
+            response.set_result(mock.MagicMock(status=status))
+        mock_get_session.return_value.request.return_value = response
+        return response
+
+    @mock.patch("rally.plugins.common.scenarios.requests.utils._get_session")
+    def test__check_request_async(self, mock_get_session):
+        response = self._mock_session(mock_get_session, status=200)
+        scenario = utils.AsyncRequestScenario()
+
+        result = scenario._check_request_async(status_code=200, url="sample",
+                                               method="GET", timeout=1)
+        self.assertIsNone(self.loop.run_until_complete(result))
+
+        mock_get_session.assert_called_once_with(self.loop)
+        mock_get_session.return_value.request.assert_called_once_with(
+            "GET", "sample", timeout=1)
+        response.result().release.assert_called_once_with()
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "requests.check_request")
+
+    @mock.patch("rally.plugins.common.scenarios.requests.utils._get_session")
+    def test__check_request_async_wrong_status(self, mock_get_session):
+        self._mock_session(mock_get_session, status=500)
+        scenario = utils.AsyncRequestScenario()
+
+        result = scenario._check_request_async(status_code=200, url="sample",
+                                               method="GET")
+        self.assertRaises(ValueError, self.loop.run_until_complete, result)
+
+    @mock.patch("rally.plugins.common.scenarios.requests.utils._get_session")
+    def test__check_request_async_failed(self, mock_get_session):
+        self._mock_session(mock_get_session, exception=IOError("fail"))
+        scenario = utils.AsyncRequestScenario()
+
+        result = scenario._check_request_async(status_code=200, url="sample",
+                                               method="GET")
+        self.assertRaises(IOError, self.loop.run_until_complete, result)
+        self.assertEqual({}, scenario.atomic_actions())
+
+    @mock.patch("rally.plugins.common.scenarios.requests.utils._get_session")
+    def test__check_request_async_cancelled(self, mock_get_session):
+        response = self.loop.create_future()
+        mock_get_session.return_value.request.return_value = response
+        scenario = utils.AsyncRequestScenario()
+
+        result = scenario._check_request_async(status_code=200, url="sample",
+                                               method="GET")
+        result.cancel()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.assertTrue(response.cancelled())
@@ -23,6 +23,15 @@ from tests.unit import test
 BASE = "rally.plugins.openstack.context.cleanup.context"
 
 
+class CleanupMixinTestCase(test.TestCase):
+
+    def test__get_cleanup_args_is_abstract(self):
+        class Cleanup(context.CleanupMixin):
+            pass
+
+        self.assertRaises(TypeError, Cleanup)
+
+
 class AdminCleanupTestCase(test.TestCase):
 
     @mock.patch("%s.manager" % BASE)
@@ -63,13 +72,35 @@ class AdminCleanupTestCase(test.TestCase):
         mock_find_res_mgr.assert_called_once_with(["a", "b"], True)
         mock_seek_and_destroy.assert_has_calls([
             mock.call(mock_find_res_mgr.return_value[0], ctx["admin"],
-                      ctx["users"]),
+                      ctx["users"], exclude=set()),
             mock.call().exterminate(),
             mock.call(mock_find_res_mgr.return_value[1], ctx["admin"],
-                      ctx["users"]),
+                      ctx["users"], exclude=set()),
             mock.call().exterminate()
         ])
 
+    @mock.patch("%s.manager" % BASE)
+    def test_cleanup_shared_contexts(self, mock_manager):
+        ctx = {
+            "config": {"admin_cleanup": ["a"]},
+            "admin": mock.MagicMock(),
+            "users": mock.MagicMock(),
+            "task": mock.MagicMock(),
+            "shared_contexts": ["roles", "users"]
+        }
+
+        admin_cleanup = context.AdminCleanup(ctx)
+        admin_cleanup.setup()
+        admin_cleanup.cleanup()
+
+        mock_manager.list_resource_ids.assert_called_once_with(
+            names=["a"], admin_required=True, admin=ctx["admin"],
+            users=ctx["users"])
+        mock_manager.cleanup.assert_called_once_with(
+            names=["a"], admin_required=True, admin=ctx["admin"],
+            users=ctx["users"],
+            exclude=mock_manager.list_resource_ids.return_value)
+
 
 class UserCleanupTestCase(test.TestCase):
 
@@ -110,8 +141,40 @@ class UserCleanupTestCase(test.TestCase):
         mock_find_res_mgr.assert_called_once_with(["a", "b"], False)
 
         mock_seek_and_destroy.assert_has_calls([
-            mock.call(mock_find_res_mgr.return_value[0], None, ctx["users"]),
+            mock.call(mock_find_res_mgr.return_value[0], None, ctx["users"],
+                      exclude=set()),
             mock.call().exterminate(),
-            mock.call(mock_find_res_mgr.return_value[1], None, ctx["users"]),
+            mock.call(mock_find_res_mgr.return_value[1], None, ctx["users"],
+                      exclude=set()),
             mock.call().exterminate()
         ])
+
+    @mock.patch("%s.manager" % BASE)
+    def test_cleanup_shared_contexts(self, mock_manager):
+        ctx = {
+            "config": {"cleanup": ["glance", "nova"]},
+            "users": mock.MagicMock(),
+            "task": mock.MagicMock(),
+            "shared_contexts": ["images", "users"]
+        }
+        mock_manager.list_resource_ids.return_value = {"image_id"}
+
+        user_cleanup = context.UserCleanup(ctx)
+        user_cleanup.setup()
+        user_cleanup.cleanup()
+
+        mock_manager.list_resource_ids.assert_called_once_with(
+            names=["glance", "nova"], admin_required=False,
+            users=ctx["users"])
+        mock_manager.cleanup.assert_called_once_with(
+            names=["glance", "nova"], admin_required=False,
+            users=ctx["users"], exclude={"image_id"})
+
+    @mock.patch("%s.manager" % BASE)
+    def test_setup_not_shared_contexts(self, mock_manager):
+        ctx = {"config": {"cleanup": ["glance"]}, "users": [],
+               "task": mock.MagicMock(), "shared_contexts": []}
+
+        context.UserCleanup(ctx).setup()
+
+        self.assertFalse(mock_manager.list_resource_ids.called)
@@ -120,6 +120,34 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_mgr.assert_called_once_with(admin=mock_get_client.return_value)
         self.assertEqual(queue, [(admin, None, x) for x in range(1, 4)])
 
+    def _manager_with_ids(self, list_side_effect):
+        mock_mgr = self._manager(list_side_effect,
+                                 _perform_for_admin_only=False)
+        mock_mgr.side_effect = lambda resource=None, **kw: (
+            mock.Mock(**{"id.return_value": "id_%s" % resource})
+            if resource else mock.DEFAULT)
+        return mock_mgr
+
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__gen_publisher_exclude(self, mock_get_client):
+        mock_mgr = self._manager_with_ids([[1, 2, 3]])
+        admin = mock.MagicMock()
+        publish = manager.SeekAndDestroy(
+            mock_mgr, admin, None, exclude={"id_2"})._gen_publisher()
+
+        queue = []
+        publish(queue)
+        self.assertEqual([(admin, None, 1), (admin, None, 3)], queue)
+
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test_list_ids(self, mock_get_client):
+        mock_mgr = self._manager_with_ids([[1, 2, 3]])
+
+        self.assertEqual(
+            {"id_1", "id_2", "id_3"},
+            manager.SeekAndDestroy(mock_mgr, mock.MagicMock(),
+                                   None).list_ids())
+
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
     def test__gen_publisher_admin_only(self, mock_get_client):
         mock_mgr = self._manager([Exception, Exception, [1, 2, 3]],
@@ -326,13 +354,33 @@ class ResourceManagerTestCase(test.TestCase):
                 return_value=[mock.MagicMock(), mock.MagicMock()])
     def test_cleanup(self, mock_find, mock_seek_and_destroy):
         manager.cleanup(names=["a", "b"], admin_required=True,
-                        admin="admin", users=["user"])
+                        admin="admin", users=["user"], exclude={"id"})
 
         mock_find.assert_called_once_with(["a", "b"], True)
 
         mock_seek_and_destroy.assert_has_calls([
-            mock.call(mock_find.return_value[0], "admin", ["user"]),
+            mock.call(mock_find.return_value[0], "admin", ["user"],
+                      exclude={"id"}),
             mock.call().exterminate(),
-            mock.call(mock_find.return_value[1], "admin", ["user"]),
+            mock.call(mock_find.return_value[1], "admin", ["user"],
+                      exclude={"id"}),
             mock.call().exterminate()
         ])
+
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE,
+                return_value=[mock.MagicMock(), mock.MagicMock()])
+    def test_list_resource_ids(self, mock_find, mock_seek_and_destroy):
+        mock_seek_and_destroy.return_value.list_ids.side_effect = [
+            {"a", "b"}, {"c"}]
+
+        self.assertEqual({"a", "b", "c"}, manager.list_resource_ids(
+            names=["a", "b"], admin_required=False, users=["user"]))
+
+        mock_find.assert_called_once_with(["a", "b"], False)
+        mock_seek_and_destroy.assert_has_calls([
+            mock.call(mock_find.return_value[0], None, ["user"]),
+            mock.call().list_ids(),
+            mock.call(mock_find.return_value[1], None, ["user"]),
+            mock.call().list_ids()
+        ])
@@ -123,7 +123,8 @@ class TaskAPITestCase(test.TestCase):
         mock_engine.assert_has_calls([
             mock.call("config", mock_task.return_value,
                       admin=mock_deployment_get.return_value["admin"],
-                      users=[], abort_on_sla_failure=False),
+                      users=[], abort_on_sla_failure=False,
+                      reuse_contexts=False, max_cpu_count=None),
             mock.call().validate(),
             mock.call().run()
         ])
@@ -155,8 +156,72 @@ class TaskAPITestCase(test.TestCase):
         mock_deployment_get().update_status.assert_called_once_with(
             consts.DeployStatus.DEPLOY_INCONSISTENT)
 
-    def test_abort(self):
-        self.assertRaises(NotImplementedError, api.Task.abort, self.task_uuid)
+    @mock.patch("rally.api.Task.create")
+    def test_import_results(self, mock_create):
+        results = [{"key": "key_%d" % i, "result": "raw_%d" % i,
+                    "sla": "sla_%d" % i, "load_duration": i,
+                    "full_duration": i + 1} for i in range(2)]
+        # Results of older versions don't have contexts, warm-up and
+        # runner stats
+        results[1]["contexts"] = [{"name": "users"}]
+        results[1]["warmup"] = ["warmup_1"]
+        results[1]["runner_stats"] = {"capacity": 1}
+
+        task = api.Task.import_results("deployment", iter(results), tag="t")
+
+        mock_create.assert_called_once_with("deployment", "t")
+        self.assertEqual(mock_create.return_value, task)
+        task.append_results.assert_has_calls([
+            mock.call("key_%d" % i, {"raw": "raw_%d" % i, "sla": "sla_%d" % i,
+                                     "load_duration": i,
+                                     "full_duration": i + 1,
+                                     "contexts": [{"name": "users"}] * i,
+                                     "warmup": ["warmup_1"] * i,
+                                     "runner_stats": {"capacity": 1} if i
+                                     else {}})
+            for i in range(2)])
+        task.update_status.assert_called_once_with(
+            consts.TaskStatus.FINISHED)
+
+    @mock.patch("rally.api.Task.create")
+    def test_import_results_failed(self, mock_create):
+        def results():
+            raise exceptions.InvalidResultsFile(path="foo", reason="bar")
+            yield
+
+        self.assertRaises(exceptions.InvalidResultsFile,
+                          api.Task.import_results, "deployment", results())
+        task = mock_create.return_value
+        self.assertEqual(1, task.set_failed.call_count)
+        self.assertFalse(task.update_status.called)
+
+    @mock.patch("rally.api.objects.Task.get")
+    def test_abort(self, mock_get):
+        api.Task.abort(self.task_uuid)
+
+        mock_get.assert_called_once_with(self.task_uuid)
+        mock_get.return_value.abort.assert_called_once_with(soft=False)
+
+    @mock.patch("rally.api.objects.Task.get")
+    def test_abort_soft(self, mock_get):
+        api.Task.abort(self.task_uuid, soft=True)
+
+        mock_get.return_value.abort.assert_called_once_with(soft=True)
+
+    @mock.patch("rally.api.timeline.timeline")
+    @mock.patch("rally.api.objects.Task.get")
+    def test_get_timeline(self, mock_get, mock_timeline):
+        mock_get.return_value.get_results.return_value = [
+            {"key": "key_1", "data": {"raw": "raw_1"}},
+            {"key": "key_2", "data": {"raw": "raw_2"}}]
+        mock_timeline.side_effect = lambda raw, window: "%s_%s" % (raw,
+                                                                   window)
+
+        result = api.Task.get_timeline(self.task_uuid, window=2)
+
+        mock_get.assert_called_once_with(self.task_uuid)
+        self.assertEqual([{"key": "key_1", "timeline": "raw_1_2"},
+                          {"key": "key_2", "timeline": "raw_2_2"}], result)
 
     @mock.patch("rally.objects.task.db.task_delete")
     def test_delete(self, mock_delete):
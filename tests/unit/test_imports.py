@@ -0,0 +1,74 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import subprocess
+import sys
+
+from tests.unit import test
+
+
+CLIENT_LIBRARIES = [
+    "ceilometerclient", "cinderclient", "designateclient", "glanceclient",
+    "heatclient", "ironicclient", "keystoneclient", "manilaclient",
+    "mistralclient", "muranoclient", "neutronclient", "novaclient",
+    "saharaclient", "swiftclient", "troveclient", "zaqarclient"
+]
+
+# Startup time is measured in a fresh interpreter, so this limit is
+# intentionally generous: it catches only big regressions like importing
+# all client libraries on startup.
+IMPORT_TIME_LIMIT = float(os.environ.get("RALLY_IMPORT_TIME_LIMIT", 10.0))
+
+IMPORT_SCRIPT = """
+import json
+import sys
+import time
+
+start = time.time()
+import rally.api
+import rally.benchmark.engine
+import rally.cli.main
+from rally.common import utils
+utils.import_modules_from_package("rally.plugins")
+duration = time.time() - start
+
+print(json.dumps({"duration": duration,
+                  "modules": [m.split(".")[0] for m in sys.modules]}))
+"""
+
+
+class ImportsTestCase(test.TestCase):
+
+    def _import_rally(self):
+        output = subprocess.check_output([sys.executable, "-c",
+                                          IMPORT_SCRIPT])
+        return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+    def test_client_libraries_are_not_imported_on_startup(self):
+        result = self._import_rally()
+        loaded = sorted(set(CLIENT_LIBRARIES) & set(result["modules"]))
+        self.assertEqual([], loaded,
+                         "Client libraries %s are imported at rally startup. "
+                         "Import them inside of functions that use them "
+                         "(see rally.osclients)." % loaded)
+
+    def test_import_time(self):
+        result = self._import_rally()
+        self.assertLess(result["duration"], IMPORT_TIME_LIMIT,
+                        "Importing rally with all plugins took %.2f sec, "
+                        "the limit is %.2f sec." % (result["duration"],
+                                                    IMPORT_TIME_LIMIT))